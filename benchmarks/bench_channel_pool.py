@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single channel vs. channel pool under many concurrent streams.
+
+Starts a local stand-in VllmEngine server in a subprocess, then drives
+1000+ concurrent Generate streams through AsyncVLLMGrpcClient with
+pool_size=1 and pool_size=N and reports wall time and latency percentiles.
+
+The stand-in server caps concurrent streams per HTTP/2 connection
+(--max-streams, 100 by default, as many proxies and servers do), which is
+the limit a channel pool is meant to work around.
+
+Usage:
+    python benchmarks/bench_channel_pool.py --streams 1000 --pool-size 16
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import time
+from typing import Optional
+
+import grpc
+
+from vllm_grpc_client import AsyncVLLMGrpcClient, VLLMGrpcError
+from vllm_grpc_client.proto import vllm_engine_pb2, vllm_engine_pb2_grpc
+
+
+class _StandInServicer(vllm_engine_pb2_grpc.VllmEngineServicer):
+    """Streams a fixed number of single-token chunks per request."""
+
+    def __init__(self, chunks: int, interval: float):
+        self._chunks = chunks
+        self._interval = interval
+
+    async def HealthCheck(self, request, context):  # noqa: N802
+        return vllm_engine_pb2.HealthCheckResponse(healthy=True, message="Health")
+
+    async def Generate(self, request, context):  # noqa: N802
+        for i in range(self._chunks):
+            await asyncio.sleep(self._interval)
+            yield vllm_engine_pb2.GenerateResponse(
+                chunk=vllm_engine_pb2.GenerateStreamChunk(
+                    token_ids=[i], prompt_tokens=4, completion_tokens=i + 1
+                )
+            )
+        yield vllm_engine_pb2.GenerateResponse(
+            complete=vllm_engine_pb2.GenerateComplete(
+                finish_reason="length", prompt_tokens=4, completion_tokens=self._chunks
+            )
+        )
+
+
+def _serve(port: int, max_streams: int, chunks: int, interval: float, ready) -> None:
+    async def run():
+        options = [("grpc.max_concurrent_streams", max_streams)] if max_streams else None
+        server = grpc.aio.server(options=options)
+        vllm_engine_pb2_grpc.add_VllmEngineServicer_to_server(
+            _StandInServicer(chunks, interval), server
+        )
+        server.add_insecure_port(f"127.0.0.1:{port}")
+        await server.start()
+        ready.set()
+        await server.wait_for_termination()
+
+    asyncio.run(run())
+
+
+async def _run_streams(port: int, pool_size: int, streams: int) -> dict:
+    async with AsyncVLLMGrpcClient(host="127.0.0.1", port=port, pool_size=pool_size) as client:
+        # Warm up every pooled connection before timing
+        await asyncio.gather(*[client.health.check() for _ in range(pool_size * 2)])
+
+        async def one() -> Optional[float]:
+            start = time.perf_counter()
+            try:
+                stream = await client.completions.create(prompt="x", max_tokens=8, stream=True)
+                async for _ in stream:
+                    pass
+            except VLLMGrpcError:
+                # Typically REFUSED_STREAM once a connection hits the stream cap
+                return None
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*[one() for _ in range(streams)])
+        wall = time.perf_counter() - start
+
+    latencies = sorted(r for r in results if r is not None)
+    return {
+        "wall": wall,
+        "ok": len(latencies),
+        "failed": streams - len(latencies),
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p99": latencies[max(int(len(latencies) * 0.99) - 1, 0)] if latencies else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--streams", type=int, default=1000, help="Concurrent streams")
+    parser.add_argument("--pool-size", type=int, default=16, help="Channels in the pool")
+    parser.add_argument(
+        "--max-streams", type=int, default=100, help="Server streams per connection (0 = no cap)"
+    )
+    parser.add_argument("--chunks", type=int, default=8, help="Chunks per stream")
+    parser.add_argument("--interval", type=float, default=0.01, help="Seconds between chunks")
+    parser.add_argument("--port", type=int, default=50561)
+    args = parser.parse_args()
+
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(
+        target=_serve,
+        args=(args.port, args.max_streams, args.chunks, args.interval, ready),
+        daemon=True,
+    )
+    server.start()
+    ready.wait(10)
+
+    try:
+        print(f"{args.streams} concurrent streams, {args.chunks} chunks each")
+        for pool_size in (1, args.pool_size):
+            result = asyncio.run(_run_streams(args.port, pool_size, args.streams))
+            print(
+                f"pool_size={pool_size:<3} wall={result['wall']:.3f}s "
+                f"ok={result['ok']} failed={result['failed']} "
+                f"streams/s={result['ok'] / result['wall']:.0f} "
+                f"p50={result['p50'] * 1000:.1f}ms p99={result['p99'] * 1000:.1f}ms"
+            )
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
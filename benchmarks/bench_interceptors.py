@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Generate streaming with and without client interceptors.
+
+Streams responses from an in-process gRPC server and reports the time per
+streamed chunk for a plain client and for clients with the bundled
+interceptors (latency, status counter, tracing), sync and async.
+
+Usage:
+    python benchmarks/bench_interceptors.py --streams 200 --chunks 256
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent import futures
+
+import grpc
+
+from vllm_grpc_client import (
+    AsyncVLLMGrpcClient,
+    LatencyInterceptor,
+    StatusCounterInterceptor,
+    TracingInterceptor,
+    VLLMGrpcClient,
+)
+from vllm_grpc_client.proto import vllm_engine_pb2, vllm_engine_pb2_grpc
+
+
+class _Servicer(vllm_engine_pb2_grpc.VllmEngineServicer):
+    def __init__(self, chunks: int):
+        chunk = vllm_engine_pb2.GenerateResponse(
+            chunk=vllm_engine_pb2.GenerateStreamChunk(token_ids=[1], prompt_tokens=8)
+        )
+        complete = vllm_engine_pb2.GenerateResponse(
+            complete=vllm_engine_pb2.GenerateComplete(finish_reason="length")
+        )
+        self._responses = [chunk] * chunks + [complete]
+
+    def Generate(self, request, context):  # noqa: N802
+        return iter(self._responses)
+
+
+def _interceptors():
+    return [LatencyInterceptor(), StatusCounterInterceptor(), TracingInterceptor()]
+
+
+def _time_sync(port: int, interceptors, streams: int, chunks: int) -> float:
+    """Per-chunk time in microseconds for the sync client."""
+    with VLLMGrpcClient(port=port, secure=False, interceptors=interceptors) as client:
+        start = time.perf_counter()
+        for _ in range(streams):
+            for _ in client.completions.create(prompt="x", stream=True, raw=True):
+                pass
+        return (time.perf_counter() - start) / (streams * chunks) * 1e6
+
+
+async def _time_async(port: int, interceptors, streams: int, chunks: int) -> float:
+    """Per-chunk time in microseconds for the async client."""
+    async with AsyncVLLMGrpcClient(port=port, secure=False, interceptors=interceptors) as client:
+        start = time.perf_counter()
+        for _ in range(streams):
+            async for _ in await client.completions.create(prompt="x", stream=True, raw=True):
+                pass
+        return (time.perf_counter() - start) / (streams * chunks) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--streams", type=int, default=200)
+    parser.add_argument("--chunks", type=int, default=256)
+    args = parser.parse_args()
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    vllm_engine_pb2_grpc.add_VllmEngineServicer_to_server(_Servicer(args.chunks), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    try:
+        for name, interceptors in (("none", None), ("bundled", _interceptors())):
+            sync_us = _time_sync(port, interceptors, args.streams, args.chunks)
+            async_us = asyncio.run(_time_async(port, interceptors, args.streams, args.chunks))
+            print(
+                f"interceptors={name:8s} sync {sync_us:6.2f} us/chunk  "
+                f"async {async_us:6.2f} us/chunk"
+            )
+    finally:
+        server.stop(None)
+
+
+if __name__ == "__main__":
+    main()
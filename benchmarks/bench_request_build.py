@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: GenerateRequest construction with and without a template.
+
+Compares building each request from sampling arguments (what create() does
+by default) with building it from a CompletionTemplate prepared once.
+
+Usage:
+    python benchmarks/bench_request_build.py --requests 100000
+"""
+
+import argparse
+import time
+
+from vllm_grpc_client import CompletionTemplate, StructuredOutputs
+from vllm_grpc_client.resources.completions import _build_generate_request
+
+SAMPLING_KWARGS = dict(
+    temperature=0.7,
+    top_p=0.9,
+    top_k=50,
+    max_tokens=256,
+    stop=["\n\n", "###"],
+    seed=1234,
+    logit_bias={token_id: -1.0 for token_id in range(32)},
+    structured_outputs=StructuredOutputs(json_schema='{"type": "object"}'),
+)
+
+
+def _time(build, requests: int, repeats: int) -> float:
+    """Best per-request time in microseconds."""
+    prompt = list(range(128))
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for i in range(requests):
+            build(prompt, f"req-{i}")
+        best = min(best, time.perf_counter() - start)
+    return best / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    template = CompletionTemplate(**SAMPLING_KWARGS)
+    assert template.build_request([1], "x", True) == _build_generate_request(
+        [1], "x", True, **SAMPLING_KWARGS
+    )
+
+    per_call_us = _time(
+        lambda prompt, request_id: _build_generate_request(
+            prompt, request_id, True, **SAMPLING_KWARGS
+        ),
+        args.requests,
+        args.repeats,
+    )
+    template_us = _time(
+        lambda prompt, request_id: template.build_request(prompt, request_id, True),
+        args.requests,
+        args.repeats,
+    )
+
+    print(f"per-call SamplingParams: {per_call_us:7.2f} us/request")
+    print(f"CompletionTemplate:      {template_us:7.2f} us/request")
+    print(f"speedup:                 {per_call_us / template_us:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
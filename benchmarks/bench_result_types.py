@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: pydantic result types vs fast_types.
+
+Measures client CPU per response, with no network, for:
+
+- the non-streaming path: completions.create() against an in-process stub
+  that returns one GenerateComplete with --output-tokens token IDs;
+- the streaming path: GenerateStream over pre-built chunk messages.
+
+Usage:
+    python benchmarks/bench_result_types.py --requests 20000 --chunks 200000
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+from vllm_grpc_client import GenerateStream, TimingStats
+from vllm_grpc_client.proto import vllm_engine_pb2
+from vllm_grpc_client.resources.completions import Completions
+
+
+def _stub_client(output_tokens: int, fast_types: bool) -> SimpleNamespace:
+    """A stand-in client whose Generate returns a fixed GenerateComplete."""
+    response = vllm_engine_pb2.GenerateResponse(
+        complete=vllm_engine_pb2.GenerateComplete(
+            output_ids=list(range(output_tokens)),
+            finish_reason="length",
+            prompt_tokens=32,
+            completion_tokens=output_tokens,
+        )
+    )
+    stub = SimpleNamespace(Generate=lambda request, timeout=None: iter((response,)))
+    return SimpleNamespace(
+        _stub=stub,
+        _timeout=60.0,
+        _model_name="bench",
+        _fast_types=fast_types,
+        _timing_stats=TimingStats(),
+    )
+
+
+def _time_create(requests: int, output_tokens: int, repeats: int, fast_types: bool) -> float:
+    """Best per-request time of completions.create() in microseconds."""
+    completions = Completions(_stub_client(output_tokens, fast_types))
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(requests):
+            completions.create(prompt=[1, 2, 3], max_tokens=output_tokens, request_id="bench")
+        best = min(best, time.perf_counter() - start)
+    return best / requests * 1e6
+
+
+def _time_stream(chunks: int, repeats: int, fast_types: bool) -> float:
+    """Best per-chunk time of GenerateStream in microseconds."""
+    messages = [
+        vllm_engine_pb2.GenerateResponse(
+            chunk=vllm_engine_pb2.GenerateStreamChunk(
+                token_ids=[i], prompt_tokens=32, completion_tokens=i + 1
+            )
+        )
+        for i in range(chunks)
+    ]
+    messages.append(
+        vllm_engine_pb2.GenerateResponse(
+            complete=vllm_engine_pb2.GenerateComplete(finish_reason="length", prompt_tokens=32)
+        )
+    )
+    best = float("inf")
+    for _ in range(repeats):
+        stream = GenerateStream(iter(messages), request_id="bench", fast_types=fast_types)
+        start = time.perf_counter()
+        for _ in stream:
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best / len(messages) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--output-tokens", type=int, default=256)
+    parser.add_argument("--chunks", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = [
+        (
+            f"create() x {args.requests}, {args.output_tokens} tokens (us/request)",
+            _time_create(args.requests, args.output_tokens, args.repeats, False),
+            _time_create(args.requests, args.output_tokens, args.repeats, True),
+        ),
+        (
+            f"stream x {args.chunks} chunks (us/chunk)",
+            _time_stream(args.chunks, args.repeats, False),
+            _time_stream(args.chunks, args.repeats, True),
+        ),
+    ]
+    print(f"{'':52} {'pydantic':>9} {'fast':>9} {'speedup':>8}")
+    for label, pydantic_us, fast_us in rows:
+        print(f"{label:52} {pydantic_us:9.2f} {fast_us:9.2f} {pydantic_us / fast_us:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-chunk client overhead of GenerateStream.
+
+Feeds pre-built GenerateResponse messages straight into GenerateStream (no
+network) and reports the time spent per chunk with the default pydantic
+CompletionChunk path and with raw=True, which yields the protobuf messages.
+
+Usage:
+    python benchmarks/bench_stream_chunks.py --chunks 200000 --tokens-per-chunk 1
+"""
+
+import argparse
+import time
+
+from vllm_grpc_client import GenerateStream
+from vllm_grpc_client.proto import vllm_engine_pb2
+
+
+def _responses(chunks: int, tokens_per_chunk: int):
+    messages = [
+        vllm_engine_pb2.GenerateResponse(
+            chunk=vllm_engine_pb2.GenerateStreamChunk(
+                token_ids=list(range(i, i + tokens_per_chunk)),
+                prompt_tokens=32,
+                completion_tokens=(i + 1) * tokens_per_chunk,
+            )
+        )
+        for i in range(chunks)
+    ]
+    messages.append(
+        vllm_engine_pb2.GenerateResponse(
+            complete=vllm_engine_pb2.GenerateComplete(
+                finish_reason="length",
+                prompt_tokens=32,
+                completion_tokens=chunks * tokens_per_chunk,
+            )
+        )
+    )
+    return messages
+
+
+def _time_stream(messages, repeats: int, **stream_kwargs) -> float:
+    """Best per-message time in microseconds over several runs."""
+    best = float("inf")
+    for _ in range(repeats):
+        stream = GenerateStream(iter(messages), request_id="bench", **stream_kwargs)
+        start = time.perf_counter()
+        for _ in stream:
+            pass
+        best = min(best, time.perf_counter() - start)
+        assert stream.get_final_completion() is not None
+    return best / len(messages) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunks", type=int, default=200_000)
+    parser.add_argument("--tokens-per-chunk", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    messages = _responses(args.chunks, args.tokens_per_chunk)
+    pydantic_us = _time_stream(messages, args.repeats)
+    raw_us = _time_stream(messages, args.repeats, raw=True)
+
+    print(f"{args.chunks} chunks x {args.tokens_per_chunk} tokens")
+    print(f"CompletionChunk (default): {pydantic_us:7.2f} us/chunk")
+    print(f"raw=True (protobuf):       {raw_us:7.2f} us/chunk")
+    print(f"speedup:                   {pydantic_us / raw_us:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,17 +17,59 @@ Usage:
         response = await client.completions.create(prompt="Hello, world!")
 """
 
+from vllm_grpc_client._abort import AbortCoalescer, AbortStats, AsyncAbortCoalescer
+from vllm_grpc_client._cache import ResponseCache, ResponseCacheStats
+from vllm_grpc_client._circuit import (
+    CircuitBreaker,
+    CircuitBreakerPolicy,
+    CircuitBreakerStats,
+    CircuitEvent,
+)
 from vllm_grpc_client._client import AsyncVLLMGrpcClient, VLLMGrpcClient
+from vllm_grpc_client._embedding_cache import EmbeddingCache, EmbeddingCacheStats
 from vllm_grpc_client._exceptions import (
     VLLMGrpcAbortedError,
+    VLLMGrpcCircuitOpenError,
     VLLMGrpcConnectionError,
     VLLMGrpcError,
     VLLMGrpcInvalidArgumentError,
+    VLLMGrpcOverloadedError,
+    VLLMGrpcRateLimitedError,
     VLLMGrpcTimeoutError,
     VLLMGrpcUnavailableError,
     VLLMGrpcUnimplementedError,
 )
+from vllm_grpc_client._fast_types import (
+    FastCompletion,
+    FastCompletionChoice,
+    FastCompletionChunk,
+    FastCompletionChunkChoice,
+    FastCompletionUsage,
+    FastEmbedding,
+    FastEmbeddingResponse,
+    FastEmbeddingUsage,
+)
+from vllm_grpc_client._hedge import HedgePolicy, HedgeStats
+from vllm_grpc_client._interceptors import (
+    ClientInterceptor,
+    LatencyInterceptor,
+    StatusCounterInterceptor,
+    TracingInterceptor,
+)
+from vllm_grpc_client._limiter import (
+    AdaptiveConcurrencyPolicy,
+    ConcurrencyLimiter,
+    ConcurrencyLimiterStats,
+)
+from vllm_grpc_client._load_balancing import AsyncLoadBalancedClient, LoadBalancedClient, Replica
+from vllm_grpc_client._pool import ChannelPool
+from vllm_grpc_client._ratelimit import RateLimit, RateLimiter, RateLimiterStats
+from vllm_grpc_client._retry import RetryPolicy, RetryStats
+from vllm_grpc_client._scheduler import RequestScheduler, SchedulerStats
+from vllm_grpc_client._singleflight import SingleFlight, SingleFlightStats
+from vllm_grpc_client._stop import JsonStop, RegexStop, StopCondition
 from vllm_grpc_client._streaming import AsyncGenerateStream, GenerateStream
+from vllm_grpc_client._timing import LatencyHistogram, RequestTiming, TimingStats
 from vllm_grpc_client._types import (
     ChoiceConstraint,
     Completion,
@@ -45,7 +87,9 @@ from vllm_grpc_client._types import (
     StructuredOutputs,
     TokenizedInput,
 )
-from vllm_grpc_client.utils import TokenDecoder
+from vllm_grpc_client.metrics import ClientMetrics, MetricsRegistry
+from vllm_grpc_client.resources.completions import CompletionTemplate
+from vllm_grpc_client.utils import IncrementalDecoder, TokenDecoder
 
 __version__ = "0.1.0"
 
@@ -53,9 +97,53 @@ __all__ = [
     # Client classes
     "VLLMGrpcClient",
     "AsyncVLLMGrpcClient",
+    "ChannelPool",
+    "LoadBalancedClient",
+    "AsyncLoadBalancedClient",
+    "Replica",
+    "AbortCoalescer",
+    "AsyncAbortCoalescer",
+    "AbortStats",
+    "RetryPolicy",
+    "RetryStats",
+    "HedgePolicy",
+    "HedgeStats",
+    "CircuitBreakerPolicy",
+    "CircuitBreaker",
+    "CircuitBreakerStats",
+    "CircuitEvent",
+    "AdaptiveConcurrencyPolicy",
+    "ConcurrencyLimiter",
+    "ConcurrencyLimiterStats",
+    "RequestScheduler",
+    "SchedulerStats",
+    "RateLimit",
+    "RateLimiter",
+    "RateLimiterStats",
+    "ResponseCache",
+    "ResponseCacheStats",
+    "SingleFlight",
+    "SingleFlightStats",
+    "EmbeddingCache",
+    "EmbeddingCacheStats",
     # Streaming
     "GenerateStream",
     "AsyncGenerateStream",
+    "StopCondition",
+    "RegexStop",
+    "JsonStop",
+    # Interceptors
+    "ClientInterceptor",
+    "LatencyInterceptor",
+    "StatusCounterInterceptor",
+    "TracingInterceptor",
+    # Timing
+    "RequestTiming",
+    "TimingStats",
+    "LatencyHistogram",
+    # Metrics
+    "ClientMetrics",
+    "MetricsRegistry",
     # Types
     "SamplingParams",
     "StructuredOutputs",
@@ -72,6 +160,16 @@ __all__ = [
     "ModelInfo",
     "ServerInfo",
     "TokenizedInput",
+    "CompletionTemplate",
+    # Fast types
+    "FastCompletion",
+    "FastCompletionChoice",
+    "FastCompletionUsage",
+    "FastCompletionChunk",
+    "FastCompletionChunkChoice",
+    "FastEmbedding",
+    "FastEmbeddingResponse",
+    "FastEmbeddingUsage",
     # Exceptions
     "VLLMGrpcError",
     "VLLMGrpcConnectionError",
@@ -79,7 +177,11 @@ __all__ = [
     "VLLMGrpcAbortedError",
     "VLLMGrpcInvalidArgumentError",
     "VLLMGrpcUnavailableError",
+    "VLLMGrpcCircuitOpenError",
+    "VLLMGrpcOverloadedError",
+    "VLLMGrpcRateLimitedError",
     "VLLMGrpcUnimplementedError",
     # Utilities
     "TokenDecoder",
+    "IncrementalDecoder",
 ]
@@ -0,0 +1,300 @@
+"""
+Coalesced server-side aborts for vLLM gRPC client.
+
+Cancelling a Generate RPC on the client does not stop the engine from
+decoding the request until max_tokens, so abandoned requests are aborted
+explicitly. AbortRequest carries repeated request_ids; the coalescers here
+buffer request IDs for a few milliseconds (or until a size limit) and send
+them in one Abort RPC, so a burst of cancellations costs a handful of RPCs
+instead of one per request. Submitting never blocks the caller.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, List, Optional, Set, Tuple
+
+from vllm_grpc_client.proto import vllm_engine_pb2
+
+# Timeout for Abort RPCs sent on behalf of abandoned requests
+ABORT_TIMEOUT = 5.0
+
+# Default seconds to buffer request IDs before flushing
+DEFAULT_ABORT_BATCH_DELAY = 0.005
+
+# Default maximum request IDs per Abort RPC
+DEFAULT_ABORT_BATCH_SIZE = 256
+
+
+class AbortStats:
+    """
+    Counters describing the Abort RPCs sent by a coalescer.
+
+    Attributes:
+        flushes: Number of Abort RPCs sent.
+        request_ids: Number of request IDs aborted.
+        errors: Number of Abort RPCs that failed.
+        max_batch_size: Largest number of request IDs in one Abort RPC.
+        total_flush_latency: Sum over flushes of the time from the first
+            buffered request ID to the end of the Abort RPC, in seconds.
+        max_flush_latency: Largest flush latency, in seconds.
+    """
+
+    def __init__(self) -> None:
+        self.flushes = 0
+        self.request_ids = 0
+        self.errors = 0
+        self.max_batch_size = 0
+        self.total_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+
+    def _record(self, batch_size: int, latency: float, failed: bool) -> None:
+        self.flushes += 1
+        self.request_ids += batch_size
+        self.errors += failed
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self.total_flush_latency += latency
+        self.max_flush_latency = max(self.max_flush_latency, latency)
+
+    def _copy(self) -> "AbortStats":
+        stats = AbortStats()
+        stats.__dict__.update(self.__dict__)
+        return stats
+
+    @property
+    def mean_batch_size(self) -> float:
+        """Average number of request IDs per Abort RPC."""
+        return self.request_ids / self.flushes if self.flushes else 0.0
+
+    @property
+    def mean_flush_latency(self) -> float:
+        """Average flush latency in seconds."""
+        return self.total_flush_latency / self.flushes if self.flushes else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"AbortStats(flushes={self.flushes}, request_ids={self.request_ids}, "
+            f"errors={self.errors}, mean_batch_size={self.mean_batch_size:.1f}, "
+            f"max_batch_size={self.max_batch_size}, "
+            f"mean_flush_latency={self.mean_flush_latency * 1000:.2f}ms, "
+            f"max_flush_latency={self.max_flush_latency * 1000:.2f}ms)"
+        )
+
+
+class _BaseAbortCoalescer:
+    """Configuration and stats shared by the sync and async coalescers."""
+
+    def __init__(
+        self,
+        stub: Any,
+        max_delay: float = DEFAULT_ABORT_BATCH_DELAY,
+        max_batch_size: int = DEFAULT_ABORT_BATCH_SIZE,
+        timeout: float = ABORT_TIMEOUT,
+    ):
+        if max_delay < 0:
+            raise ValueError(f"max_delay must be non-negative, got {max_delay}")
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+        self._stub = stub
+        self._max_delay = max_delay
+        self._max_batch_size = max_batch_size
+        self._timeout = timeout
+        self._buffer: List[str] = []
+        # When the oldest buffered request ID was submitted
+        self._first_submit = 0.0
+        self._closed = False
+        self._stats = AbortStats()
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered request IDs not yet sent."""
+        return len(self._buffer)
+
+    def _take_batch(self) -> Tuple[List[str], float]:
+        """Remove up to max_batch_size request IDs from the buffer."""
+        batch = self._buffer[: self._max_batch_size]
+        del self._buffer[: self._max_batch_size]
+        first_submit = self._first_submit
+        if self._buffer:
+            self._first_submit = time.monotonic()
+        return batch, first_submit
+
+
+class AbortCoalescer(_BaseAbortCoalescer):
+    """
+    Batches Abort RPCs for a sync client on a background thread.
+
+    Usage:
+        client.abort_coalescer.submit("cmpl-123")
+        print(client.abort_coalescer.stats)
+    """
+
+    def __init__(
+        self,
+        stub: Any,
+        max_delay: float = DEFAULT_ABORT_BATCH_DELAY,
+        max_batch_size: int = DEFAULT_ABORT_BATCH_SIZE,
+        timeout: float = ABORT_TIMEOUT,
+    ):
+        """
+        Initialize the coalescer.
+
+        Args:
+            stub: The (routed) VllmEngineStub to send Abort RPCs on.
+            max_delay: Seconds to buffer request IDs before flushing.
+            max_batch_size: Flush as soon as this many request IDs are buffered.
+            timeout: Timeout for each Abort RPC.
+        """
+        super().__init__(stub, max_delay, max_batch_size, timeout)
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def stats(self) -> AbortStats:
+        """A snapshot of the flush counters."""
+        with self._cond:
+            return self._stats._copy()
+
+    def submit(self, request_id: str) -> None:
+        """Queue a request ID to be aborted. Never blocks on the network."""
+        with self._cond:
+            if self._closed:
+                return
+            self._buffer.append(request_id)
+            if len(self._buffer) == 1:
+                self._first_submit = time.monotonic()
+                self._cond.notify()
+            elif len(self._buffer) >= self._max_batch_size:
+                self._cond.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="vllm-grpc-abort", daemon=True
+                )
+                self._thread.start()
+
+    def flush(self) -> None:
+        """Send every buffered request ID now, on the calling thread."""
+        while True:
+            with self._cond:
+                if not self._buffer:
+                    return
+                batch, first_submit = self._take_batch()
+            self._send(batch, first_submit)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush buffered request IDs and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._buffer and not self._closed:
+                    self._cond.wait()
+                if not self._buffer:
+                    return
+                deadline = self._first_submit + self._max_delay
+                while len(self._buffer) < self._max_batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, first_submit = self._take_batch()
+            self._send(batch, first_submit)
+
+    def _send(self, batch: List[str], first_submit: float) -> None:
+        failed = False
+        try:
+            self._stub.Abort(
+                vllm_engine_pb2.AbortRequest(request_ids=batch), timeout=self._timeout
+            )
+        except Exception:
+            # Best effort: the request still ends at max_tokens or its deadline
+            failed = True
+        latency = time.monotonic() - first_submit
+        with self._cond:
+            self._stats._record(len(batch), latency, failed)
+
+
+class AsyncAbortCoalescer(_BaseAbortCoalescer):
+    """
+    Batches Abort RPCs for an async client on its event loop.
+
+    submit() must be called from the loop's thread.
+
+    Usage:
+        client.abort_coalescer.submit("cmpl-123")
+        print(client.abort_coalescer.stats)
+    """
+
+    def __init__(
+        self,
+        stub: Any,
+        max_delay: float = DEFAULT_ABORT_BATCH_DELAY,
+        max_batch_size: int = DEFAULT_ABORT_BATCH_SIZE,
+        timeout: float = ABORT_TIMEOUT,
+    ):
+        """
+        Initialize the coalescer.
+
+        See AbortCoalescer.__init__ for detailed parameter documentation.
+        """
+        super().__init__(stub, max_delay, max_batch_size, timeout)
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Strong references to in-flight Abort RPCs so they are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def stats(self) -> AbortStats:
+        """A snapshot of the flush counters."""
+        return self._stats._copy()
+
+    def submit(self, request_id: str) -> None:
+        """Queue a request ID to be aborted. Never blocks."""
+        if self._closed:
+            return
+        self._buffer.append(request_id)
+        if len(self._buffer) >= self._max_batch_size:
+            self._flush_buffer()
+        elif len(self._buffer) == 1:
+            self._first_submit = time.monotonic()
+            self._timer = asyncio.get_running_loop().call_later(
+                self._max_delay, self._flush_buffer
+            )
+
+    async def flush(self) -> None:
+        """Send every buffered request ID now and wait for in-flight Abort RPCs."""
+        self._flush_buffer()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """Flush buffered request IDs and stop accepting new ones."""
+        await self.flush()
+        self._closed = True
+
+    def _flush_buffer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._buffer:
+            batch, first_submit = self._take_batch()
+            task = asyncio.ensure_future(self._send(batch, first_submit))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[str], first_submit: float) -> None:
+        failed = False
+        try:
+            await self._stub.Abort(
+                vllm_engine_pb2.AbortRequest(request_ids=batch), timeout=self._timeout
+            )
+        except Exception:
+            failed = True
+        self._stats._record(len(batch), time.monotonic() - first_submit, failed)
@@ -0,0 +1,294 @@
+"""
+Response cache for deterministic completions.
+
+A client created with response_cache=ResponseCache(...) answers repeated
+deterministic completions (temperature=0, or a fixed seed) from the cache
+instead of sending a Generate RPC. Entries are keyed on a SHA-256 hash of
+the prompt (text or token IDs) and the deterministically serialized
+SamplingParams, so requests built from keyword arguments and from an
+equivalent CompletionTemplate share entries.
+
+Hits carry cached=True and zero usage. Streaming requests replay a hit as
+chunks of replay_chunk_size tokens. Completed non-streaming requests fill
+the cache; aborted ones are not stored.
+
+Entries live in an in-memory LRU bounded by max_entries and, with a
+directory, also on disk (one JSON file per entry), where they survive
+restarts and can be shared by processes. ttl bounds the age of entries in
+both. The key does not include the model, so use one cache (and directory)
+per served model.
+"""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from vllm_grpc_client.proto import vllm_engine_pb2
+
+
+class ResponseCacheStats:
+    """
+    Counters of a response cache.
+
+    Attributes:
+        hits: Requests answered from the cache.
+        misses: Cacheable requests sent to the server.
+        stores: Completions added to the cache.
+        evictions: Entries dropped from memory to stay within max_entries.
+        expired: Entries dropped because they were older than ttl.
+        entries: Entries currently held in memory.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expired = 0
+        self.entries = 0
+
+    def _copy(self) -> ResponseCacheStats:
+        stats = ResponseCacheStats()
+        stats.__dict__.update(self.__dict__)
+        return stats
+
+    def __repr__(self) -> str:
+        return (
+            f"ResponseCacheStats(hits={self.hits}, misses={self.misses}, "
+            f"stores={self.stores}, evictions={self.evictions}, entries={self.entries})"
+        )
+
+
+class _CacheEntry:
+    """The parts of a completed generation needed to rebuild it."""
+
+    __slots__ = ("token_ids", "finish_reason", "prompt_tokens", "completion_tokens", "created")
+
+    def __init__(
+        self,
+        token_ids: List[int],
+        finish_reason: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        created: Optional[float] = None,
+    ):
+        self.token_ids = token_ids
+        self.finish_reason = finish_reason
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.created = time.time() if created is None else created
+
+    @classmethod
+    def from_complete(cls, complete: vllm_engine_pb2.GenerateComplete) -> _CacheEntry:
+        return cls(
+            list(complete.output_ids),
+            complete.finish_reason or "stop",
+            complete.prompt_tokens,
+            complete.completion_tokens,
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> _CacheEntry:
+        return cls(**{name: data[name] for name in cls.__slots__})
+
+
+class ResponseCache:
+    """
+    LRU cache of deterministic completions, optionally persisted on disk.
+
+    Usage:
+        cache = ResponseCache(10_000, ttl=3600, directory="~/.cache/vllm-completions")
+        client = VLLMGrpcClient(response_cache=cache)
+        first = client.completions.create(prompt="2+2=", temperature=0.0, max_tokens=4)
+        again = client.completions.create(prompt="2+2=", temperature=0.0, max_tokens=4)
+        assert again.cached and again.choices[0].token_ids == first.choices[0].token_ids
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        *,
+        ttl: Optional[float] = None,
+        directory: Optional[str] = None,
+        replay_chunk_size: int = 16,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Entries kept in memory; the least recently used are
+                evicted beyond it.
+            ttl: Seconds an entry stays valid. None keeps entries until evicted.
+            directory: Directory to also persist entries in. Created if missing.
+            replay_chunk_size: Tokens per chunk when a hit is replayed to a
+                streaming request.
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        if replay_chunk_size < 1:
+            raise ValueError(f"replay_chunk_size must be at least 1, got {replay_chunk_size}")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = os.path.expanduser(directory) if directory is not None else None
+        self.replay_chunk_size = replay_chunk_size
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[str, _CacheEntry] = collections.OrderedDict()
+        self._stats = ResponseCacheStats()
+
+    @property
+    def stats(self) -> ResponseCacheStats:
+        """A snapshot of the cache's counters."""
+        with self._lock:
+            stats = self._stats._copy()
+            stats.entries = len(self._entries)
+            return stats
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every entry, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+        if self.directory is None:
+            return
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(root, name))
+                    except OSError:
+                        pass
+
+    def _expired(self, entry: _CacheEntry) -> bool:
+        return self.ttl is not None and time.time() - entry.created > self.ttl
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")  # type: ignore[arg-type]
+
+    def _get(self, key: str) -> Optional[_CacheEntry]:
+        """Look up an entry, counting the hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._expired(entry):
+                    del self._entries[key]
+                    self._stats.expired += 1
+                    entry = None
+                else:
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return entry
+        if self.directory is not None:
+            entry = self._load(key)
+        with self._lock:
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._stats.hits += 1
+            self._remember(key, entry)
+            return entry
+
+    def _put(self, key: str, entry: _CacheEntry) -> None:
+        """Store an entry in memory and, with a directory, on disk."""
+        with self._lock:
+            self._remember(key, entry)
+            self._stats.stores += 1
+        if self.directory is not None:
+            self._save(key, entry)
+
+    def _remember(self, key: str, entry: _CacheEntry) -> None:
+        """Add an entry to the LRU; the lock must be held."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def _load(self, key: str) -> Optional[_CacheEntry]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = _CacheEntry.from_json(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if self._expired(entry):
+            with self._lock:
+                self._stats.expired += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry
+
+    def _save(self, key: str, entry: _CacheEntry) -> None:
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry.to_json(), f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def __repr__(self) -> str:
+        return (
+            f"ResponseCache(max_entries={self.max_entries}, ttl={self.ttl}, "
+            f"directory={self.directory!r}, entries={len(self._entries)})"
+        )
+
+
+def _cache_key(request: vllm_engine_pb2.GenerateRequest) -> Optional[str]:
+    """Cache key of a GenerateRequest, or None if its output is not deterministic."""
+    params = request.sampling_params
+    greedy = params.HasField("temperature") and params.temperature == 0.0
+    if not greedy and not params.HasField("seed"):
+        return None
+    digest = hashlib.sha256()
+    if request.WhichOneof("input") == "text":
+        digest.update(b"text\0")
+        digest.update(request.text.encode("utf-8"))
+    else:
+        input_ids = request.tokenized.input_ids
+        digest.update(b"tokens\0")
+        digest.update(struct.pack(f"<{len(input_ids)}I", *input_ids))
+    digest.update(b"\0params\0")
+    digest.update(params.SerializeToString(deterministic=True))
+    return digest.hexdigest()
+
+
+def _replay_responses(
+    entry: _CacheEntry, chunk_size: int
+) -> List[vllm_engine_pb2.GenerateResponse]:
+    """GenerateResponse messages replaying a cached completion as a stream."""
+    token_ids = entry.token_ids
+    responses = [
+        vllm_engine_pb2.GenerateResponse(
+            chunk=vllm_engine_pb2.GenerateStreamChunk(
+                token_ids=token_ids[start : start + chunk_size]
+            )
+        )
+        for start in range(0, len(token_ids), chunk_size)
+    ]
+    responses.append(
+        vllm_engine_pb2.GenerateResponse(
+            complete=vllm_engine_pb2.GenerateComplete(finish_reason=entry.finish_reason)
+        )
+    )
+    return responses
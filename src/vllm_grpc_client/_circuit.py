@@ -0,0 +1,427 @@
+"""
+Per-endpoint circuit breaking for vLLM gRPC client.
+
+A client created with circuit_breaker=CircuitBreakerPolicy() watches the
+outcome of its Generate, Embed and GetModelInfo RPCs. After a run of
+consecutive UNAVAILABLE / DEADLINE_EXCEEDED failures, or when the failure
+rate over recent RPCs gets too high, the circuit opens: further RPCs fail at
+once with VLLMGrpcCircuitOpenError instead of waiting for their timeout on a
+wedged server.
+
+After open_duration the circuit becomes half-open and a single HealthCheck
+probe is sent. A healthy answer closes the circuit; anything else opens it
+for another open_duration. Live requests are never used as probes.
+
+Load-balanced clients keep one breaker per replica and route around
+replicas whose circuit is not closed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, List, Sequence
+
+import grpc
+
+from vllm_grpc_client._exceptions import VLLMGrpcCircuitOpenError
+from vllm_grpc_client._interceptors import _on_aio_code
+from vllm_grpc_client._pool import _RPC_METHODS
+from vllm_grpc_client.proto import vllm_engine_pb2
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# RPCs that are rejected while the circuit is open and whose outcomes are tracked
+BREAKER_METHODS = ("Generate", "Embed", "GetModelInfo")
+
+
+class CircuitBreakerPolicy:
+    """
+    When to open an endpoint's circuit and how to probe it.
+
+    Usage:
+        client = VLLMGrpcClient(circuit_breaker=CircuitBreakerPolicy(consecutive_failures=5))
+        client.circuit_breaker.add_listener(print)
+    """
+
+    def __init__(
+        self,
+        *,
+        consecutive_failures: int = 5,
+        failure_rate: float = 0.5,
+        window_size: int = 100,
+        min_requests: int = 20,
+        open_duration: float = 5.0,
+        probe_timeout: float = 1.0,
+        failure_codes: Sequence[grpc.StatusCode] = (
+            grpc.StatusCode.UNAVAILABLE,
+            grpc.StatusCode.DEADLINE_EXCEEDED,
+        ),
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            consecutive_failures: Failures in a row that open the circuit.
+            failure_rate: Fraction of failed RPCs among the last window_size
+                that opens the circuit.
+            window_size: Number of recent RPCs the failure rate is computed over.
+            min_requests: RPCs needed in the window before failure_rate applies.
+            open_duration: Seconds the circuit stays open before a probe.
+            probe_timeout: Timeout of the HealthCheck probe, in seconds.
+            failure_codes: Status codes counted as failures. Other codes count
+                as successes (the server answered), except CANCELLED, which
+                the client caused and which is ignored.
+        """
+        if consecutive_failures < 1:
+            raise ValueError(
+                f"consecutive_failures must be at least 1, got {consecutive_failures}"
+            )
+        if not 0.0 < failure_rate <= 1.0:
+            raise ValueError(f"failure_rate must be in (0, 1], got {failure_rate}")
+        if window_size < 1:
+            raise ValueError(f"window_size must be at least 1, got {window_size}")
+        self.consecutive_failures = consecutive_failures
+        self.failure_rate = failure_rate
+        self.window_size = window_size
+        self.min_requests = min_requests
+        self.open_duration = open_duration
+        self.probe_timeout = probe_timeout
+        self.failure_codes = frozenset(failure_codes)
+
+    def __repr__(self) -> str:
+        return (
+            f"CircuitBreakerPolicy(consecutive_failures={self.consecutive_failures}, "
+            f"failure_rate={self.failure_rate}, window_size={self.window_size}, "
+            f"open_duration={self.open_duration})"
+        )
+
+
+class CircuitEvent:
+    """
+    A circuit state change, passed to CircuitBreaker listeners.
+
+    Attributes:
+        endpoint: The endpoint address.
+        previous: State before the change.
+        state: State after the change.
+        reason: Why the state changed: "consecutive_failures", "failure_rate",
+            "open_duration_elapsed", "probe_succeeded", "probe_failed" or "reset".
+        timestamp: When the change happened, as time.time().
+    """
+
+    __slots__ = ("endpoint", "previous", "state", "reason", "timestamp")
+
+    def __init__(self, endpoint: str, previous: str, state: str, reason: str):
+        self.endpoint = endpoint
+        self.previous = previous
+        self.state = state
+        self.reason = reason
+        self.timestamp = time.time()
+
+    def __repr__(self) -> str:
+        return (
+            f"CircuitEvent(endpoint={self.endpoint!r}, {self.previous} -> {self.state}, "
+            f"reason={self.reason!r})"
+        )
+
+
+class CircuitBreakerStats:
+    """
+    Counters describing a circuit breaker.
+
+    Attributes:
+        state: Current state.
+        successes: RPCs that got an answer from the server.
+        failures: RPCs that failed with one of the policy's failure codes.
+        rejected: RPCs rejected while the circuit was not closed.
+        opened: Times the circuit opened (including after failed probes).
+        probes: HealthCheck probes sent.
+    """
+
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+        self.probes = 0
+
+    def _copy(self) -> CircuitBreakerStats:
+        stats = CircuitBreakerStats()
+        stats.__dict__.update(self.__dict__)
+        return stats
+
+    def __repr__(self) -> str:
+        return (
+            f"CircuitBreakerStats(state={self.state!r}, successes={self.successes}, "
+            f"failures={self.failures}, rejected={self.rejected}, opened={self.opened}, "
+            f"probes={self.probes})"
+        )
+
+
+class CircuitBreaker:
+    """
+    Circuit state of one endpoint.
+
+    Created by clients given a CircuitBreakerPolicy and exposed as
+    client.circuit_breaker (for load-balanced clients, on each
+    replica's client).
+
+    Usage:
+        breaker = client.circuit_breaker
+        breaker.add_listener(lambda event: log.warning("%s", event))
+        print(breaker.state, breaker.stats)
+    """
+
+    def __init__(self, policy: CircuitBreakerPolicy, endpoint: str, stub: Any, aio: bool):
+        """
+        Initialize the breaker.
+
+        Args:
+            policy: The circuit breaker policy.
+            endpoint: Endpoint address, used in events and errors.
+            stub: Stub used for HealthCheck probes.
+            aio: Whether the stub is an async stub.
+        """
+        self.policy = policy
+        self.endpoint = endpoint
+        self._stub = stub
+        self._aio = aio
+        self._lock = threading.Lock()
+        self._stats = CircuitBreakerStats()
+        self._consecutive = 0
+        # Recent outcomes (True for failures) and the number of failures among them
+        self._window: Deque[bool] = deque()
+        self._window_failures = 0
+        self._opened_at = 0.0
+        self._listeners: List[Callable[[CircuitEvent], None]] = []
+
+    @property
+    def state(self) -> str:
+        """The current state: "closed", "open" or "half_open"."""
+        return self._stats.state
+
+    @property
+    def stats(self) -> CircuitBreakerStats:
+        """A snapshot of the breaker's counters."""
+        with self._lock:
+            return self._stats._copy()
+
+    def add_listener(self, listener: Callable[[CircuitEvent], None]) -> None:
+        """Call listener(event) with a CircuitEvent on every state change."""
+        with self._lock:
+            self._listeners = self._listeners + [listener]
+
+    def allow_request(self) -> bool:
+        """
+        Whether an RPC may be sent now.
+
+        Once an open circuit has been open for open_duration, this moves it
+        to half-open and starts the HealthCheck probe.
+        """
+        stats = self._stats
+        if stats.state == CLOSED:
+            return True
+        if stats.state != OPEN or time.monotonic() - self._opened_at < self.policy.open_duration:
+            return False
+        if self._aio:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # Async probes need the client's event loop
+                return False
+        with self._lock:
+            if stats.state != OPEN:
+                return False
+            event = self._transition(HALF_OPEN, "open_duration_elapsed")
+            stats.probes += 1
+        self._emit(event)
+        if self._aio:
+            loop.create_task(self._async_probe())
+        else:
+            threading.Thread(
+                target=self._probe, name="vllm-grpc-circuit-probe", daemon=True
+            ).start()
+        return False
+
+    def reset(self) -> None:
+        """Close the circuit and forget recent outcomes."""
+        with self._lock:
+            event = self._close("reset")
+        self._emit(event)
+
+    def _check(self) -> None:
+        """Raise VLLMGrpcCircuitOpenError unless an RPC may be sent now."""
+        if not self.allow_request():
+            with self._lock:
+                self._stats.rejected += 1
+            raise VLLMGrpcCircuitOpenError(self.endpoint, self._stats.state)
+
+    def _record(self, code: grpc.StatusCode) -> None:
+        """Record the outcome of a finished RPC."""
+        if code == grpc.StatusCode.CANCELLED:
+            return
+        failed = code in self.policy.failure_codes
+        policy = self.policy
+        event = None
+        with self._lock:
+            stats = self._stats
+            if failed:
+                stats.failures += 1
+            else:
+                stats.successes += 1
+            if stats.state != CLOSED:
+                # Stragglers from before the circuit opened
+                return
+            window = self._window
+            window.append(failed)
+            self._window_failures += failed
+            if len(window) > policy.window_size:
+                self._window_failures -= window.popleft()
+            if not failed:
+                self._consecutive = 0
+                return
+            self._consecutive += 1
+            if self._consecutive >= policy.consecutive_failures:
+                event = self._open("consecutive_failures")
+            elif (
+                len(window) >= policy.min_requests
+                and self._window_failures >= policy.failure_rate * len(window)
+            ):
+                event = self._open("failure_rate")
+        if event is not None:
+            self._emit(event)
+
+    def _transition(self, state: str, reason: str) -> CircuitEvent:
+        """Change state; the lock must be held."""
+        event = CircuitEvent(self.endpoint, self._stats.state, state, reason)
+        self._stats.state = state
+        return event
+
+    def _open(self, reason: str) -> CircuitEvent:
+        self._opened_at = time.monotonic()
+        self._stats.opened += 1
+        return self._transition(OPEN, reason)
+
+    def _close(self, reason: str) -> CircuitEvent:
+        self._consecutive = 0
+        self._window.clear()
+        self._window_failures = 0
+        return self._transition(CLOSED, reason)
+
+    def _probed(self, healthy: bool) -> None:
+        with self._lock:
+            if self._stats.state != HALF_OPEN:
+                return
+            event = self._close("probe_succeeded") if healthy else self._open("probe_failed")
+        self._emit(event)
+
+    def _emit(self, event: CircuitEvent) -> None:
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                # Observers must not break request handling
+                pass
+
+    def _probe(self) -> None:
+        try:
+            response = self._stub.HealthCheck(
+                vllm_engine_pb2.HealthCheckRequest(), timeout=self.policy.probe_timeout
+            )
+            healthy = response.healthy
+        except Exception:
+            healthy = False
+        self._probed(healthy)
+
+    async def _async_probe(self) -> None:
+        try:
+            response = await self._stub.HealthCheck(
+                vllm_engine_pb2.HealthCheckRequest(), timeout=self.policy.probe_timeout
+            )
+            healthy = response.healthy
+        except Exception:
+            healthy = False
+        self._probed(healthy)
+
+    def __repr__(self) -> str:
+        return f"CircuitBreaker(endpoint={self.endpoint!r}, state={self.state!r})"
+
+
+class _BreakerUnary:
+    """Sync unary-unary method guarded by a circuit breaker."""
+
+    __slots__ = ("_method", "_breaker")
+
+    def __init__(self, method: Any, breaker: CircuitBreaker):
+        self._method = method
+        self._breaker = breaker
+
+    def __call__(self, request: Any, **kwargs: Any) -> Any:
+        breaker = self._breaker
+        breaker._check()
+        try:
+            response = self._method(request, **kwargs)
+        except grpc.RpcError as e:
+            breaker._record(e.code())
+            raise
+        breaker._record(grpc.StatusCode.OK)
+        return response
+
+
+class _AsyncBreakerUnary(_BreakerUnary):
+    """Async unary-unary method guarded by a circuit breaker."""
+
+    __slots__ = ()
+
+    async def __call__(self, request: Any, **kwargs: Any) -> Any:
+        breaker = self._breaker
+        breaker._check()
+        try:
+            response = await self._method(request, **kwargs)
+        except grpc.RpcError as e:
+            breaker._record(e.code())
+            raise
+        breaker._record(grpc.StatusCode.OK)
+        return response
+
+
+class _BreakerStream:
+    """Generate method guarded by a circuit breaker; outcomes come from done callbacks."""
+
+    __slots__ = ("_method", "_breaker", "_aio")
+
+    def __init__(self, method: Any, breaker: CircuitBreaker, aio: bool):
+        self._method = method
+        self._breaker = breaker
+        self._aio = aio
+
+    def __call__(self, request: Any, **kwargs: Any) -> Any:
+        breaker = self._breaker
+        breaker._check()
+        call = self._method(request, **kwargs)
+        if self._aio:
+            call.add_done_callback(lambda done: _on_aio_code(done, breaker._record))
+        else:
+            call.add_done_callback(lambda done: breaker._record(done.code()))
+        return call
+
+
+class _BreakerStub:
+    """VllmEngineStub look-alike that guards BREAKER_METHODS with a circuit breaker."""
+
+    def __init__(self, stub: Any, breaker: CircuitBreaker, aio: bool):
+        unary = _AsyncBreakerUnary if aio else _BreakerUnary
+        for name in _RPC_METHODS:
+            method = getattr(stub, name)
+            if name == "Generate":
+                method = _BreakerStream(method, breaker, aio)
+            elif name in BREAKER_METHODS:
+                method = unary(method, breaker)
+            setattr(self, name, method)
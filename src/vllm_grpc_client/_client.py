@@ -8,10 +8,29 @@ client classes with an interface similar to the OpenAI Python client.
 from __future__ import annotations
 
 import os
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import grpc
 
+from vllm_grpc_client._abort import (
+    ABORT_TIMEOUT,
+    DEFAULT_ABORT_BATCH_DELAY,
+    DEFAULT_ABORT_BATCH_SIZE,
+    AbortCoalescer,
+    AsyncAbortCoalescer,
+)
+from vllm_grpc_client._cache import ResponseCache
+from vllm_grpc_client._circuit import CircuitBreaker, CircuitBreakerPolicy, _BreakerStub
+from vllm_grpc_client._embedding_cache import EmbeddingCache
+from vllm_grpc_client._interceptors import _channel_interceptors
+from vllm_grpc_client._limiter import AdaptiveConcurrencyPolicy, ConcurrencyLimiter, _LimitedStub
+from vllm_grpc_client._pool import ChannelPool, _RoutedStub
+from vllm_grpc_client._ratelimit import RateLimiter
+from vllm_grpc_client._retry import RetryPolicy, RetryStats, _Retrier, _RetryingStub
+from vllm_grpc_client._scheduler import RequestScheduler
+from vllm_grpc_client._singleflight import SingleFlight
+from vllm_grpc_client._timing import TimingStats
+from vllm_grpc_client.metrics import ClientMetrics
 from vllm_grpc_client.proto import vllm_engine_pb2_grpc
 
 # Default timeout for gRPC calls (in seconds)
@@ -21,6 +40,46 @@ DEFAULT_TIMEOUT = 60.0
 DEFAULT_MAX_MESSAGE_LENGTH = -1
 
 
+def _create_channel(
+    address: str,
+    secure: bool,
+    options: List[Tuple[str, Any]],
+    *,
+    aio: bool,
+    interceptors: Optional[Sequence[Any]] = None,
+) -> Any:
+    """Create a sync or async gRPC channel (secure or insecure), with interceptors."""
+    channel_interceptors = _channel_interceptors(interceptors, aio)
+    if aio:
+        kwargs: Dict[str, Any] = {"options": options}
+        if channel_interceptors:
+            kwargs["interceptors"] = channel_interceptors
+        if secure:
+            return grpc.aio.secure_channel(address, grpc.ssl_channel_credentials(), **kwargs)
+        return grpc.aio.insecure_channel(address, **kwargs)
+    if secure:
+        channel = grpc.secure_channel(address, grpc.ssl_channel_credentials(), options=options)
+    else:
+        channel = grpc.insecure_channel(address, options=options)
+    if channel_interceptors:
+        channel = grpc.intercept_channel(channel, *channel_interceptors)
+    return channel
+
+
+def _pool_channel_options(options: List[Tuple[str, Any]], pool_id: int) -> List[Tuple[str, Any]]:
+    """
+    Channel options for one member of a channel pool.
+
+    gRPC shares subchannels (and therefore HTTP/2 connections) between channels
+    with identical arguments, so each pool member gets a distinct pool id and
+    its own subchannel pool to force a separate connection.
+    """
+    return options + [
+        ("grpc.channel_pool_id", pool_id),
+        ("grpc.use_local_subchannel_pool", 1),
+    ]
+
+
 class VLLMGrpcClient:
     """
     Synchronous vLLM gRPC client.
@@ -54,12 +113,27 @@ class VLLMGrpcClient:
         timeout: Optional[float] = None,
         max_send_message_length: int = DEFAULT_MAX_MESSAGE_LENGTH,
         max_receive_message_length: int = DEFAULT_MAX_MESSAGE_LENGTH,
+        pool_size: int = 1,
+        pool_policy: str = "round_robin",
+        fast_types: bool = False,
+        abort_batch_delay: float = DEFAULT_ABORT_BATCH_DELAY,
+        abort_batch_size: int = DEFAULT_ABORT_BATCH_SIZE,
+        interceptors: Optional[Sequence[Any]] = None,
+        metrics: Optional[ClientMetrics] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreakerPolicy] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        response_cache: Optional[ResponseCache] = None,
+        singleflight: Optional[SingleFlight] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
     ):
         """
         Initialize the vLLM gRPC client.
 
         Args:
             host: The gRPC server host. Defaults to VLLM_GRPC_HOST env var or "localhost".
+                A "unix:<path>" host connects to a Unix socket and ignores port.
             port: The gRPC server port. Defaults to VLLM_GRPC_PORT env var or 9000.
             secure: Whether to use TLS/SSL for the connection.
                 Defaults to VLLM_GRPC_SECURE env var or False.
@@ -68,7 +142,42 @@ class VLLMGrpcClient:
                 Defaults to VLLM_GRPC_TIMEOUT env var or 60.0.
             max_send_message_length: Maximum send message size (-1 for unlimited).
             max_receive_message_length: Maximum receive message size (-1 for unlimited).
+            pool_size: Number of gRPC channels (HTTP/2 connections) to open.
+                Values above 1 spread RPCs across a ChannelPool, which avoids the
+                per-connection concurrent-stream cap under heavy streaming load.
+            pool_policy: How pooled channels are picked for each RPC,
+                "round_robin" or "least_in_flight".
+            fast_types: Return slotted FastCompletion / FastCompletionChunk /
+                FastEmbeddingResponse objects instead of validated pydantic models.
+                They have the same attributes and convert with to_pydantic().
+            abort_batch_delay: Seconds to buffer request IDs of abandoned requests
+                before sending them in one Abort RPC.
+            abort_batch_size: Maximum request IDs per coalesced Abort RPC.
+            interceptors: ClientInterceptors (e.g. LatencyInterceptor,
+                StatusCounterInterceptor, TracingInterceptor) and/or native gRPC
+                client interceptors, applied to every channel.
+            metrics: A ClientMetrics to record this client's traffic in
+                (request counts, in-flight RPCs, tokens, TTFT, aborts).
+            retry_policy: Retry HealthCheck, GetModelInfo, Embed, and Generate
+                before its first response, per this RetryPolicy.
+            circuit_breaker: Fail fast with VLLMGrpcCircuitOpenError while the
+                server keeps failing, per this CircuitBreakerPolicy.
+            concurrency_limiter: Cap in-flight Generate RPCs adaptively and
+                queue the excess locally, per this AdaptiveConcurrencyPolicy.
+            rate_limiter: A RateLimiter charging completions against per-tenant
+                request and token quotas. May be shared between clients.
+            response_cache: A ResponseCache answering repeated deterministic
+                completions (temperature=0 or a fixed seed) without an RPC.
+            singleflight: A SingleFlight sharing one Generate RPC between
+                concurrent identical deterministic completions.
+            embedding_cache: An EmbeddingCache answering embeddings of token
+                IDs embedded before without an RPC.
         """
+        if metrics is not None:
+            interceptors = [*(interceptors or ()), metrics]
+        if pool_size < 1:
+            raise ValueError(f"pool_size must be at least 1, got {pool_size}")
+
         # Resolve configuration from environment or defaults
         self._host = host or os.environ.get("VLLM_GRPC_HOST", "localhost")
         self._port = port or int(os.environ.get("VLLM_GRPC_PORT", "9000"))
@@ -83,8 +192,11 @@ class VLLMGrpcClient:
             # Default to secure if using standard HTTPS port
             self._secure = self._port == 443
 
-        # Build server address
-        self._address = f"{self._host}:{self._port}"
+        # Build server address ("unix:<path>" hosts are Unix socket targets)
+        if self._host.startswith("unix:"):
+            self._address = self._host
+        else:
+            self._address = f"{self._host}:{self._port}"
 
         # Create gRPC channel options
         options = [
@@ -92,18 +204,66 @@ class VLLMGrpcClient:
             ("grpc.max_receive_message_length", max_receive_message_length),
         ]
 
-        # Create the gRPC channel (secure or insecure)
-        if self._secure:
-            credentials = grpc.ssl_channel_credentials()
-            self._channel: grpc.Channel = grpc.secure_channel(
-                self._address, credentials, options=options
+        # Create the gRPC channel (secure or insecure), or a pool of channels
+        self._pool: Optional[ChannelPool] = None
+        if pool_size == 1:
+            self._channel: grpc.Channel = _create_channel(
+                self._address, self._secure, options, aio=False, interceptors=interceptors
             )
+            # Wrapped below by the routing, limiting, breaking and retrying stubs
+            self._stub: Any = vllm_engine_pb2_grpc.VllmEngineStub(self._channel)
         else:
-            self._channel: grpc.Channel = grpc.insecure_channel(self._address, options=options)
-        self._stub = vllm_engine_pb2_grpc.VllmEngineStub(self._channel)
+            self._pool = ChannelPool(
+                [
+                    _create_channel(
+                        self._address,
+                        self._secure,
+                        _pool_channel_options(options, i),
+                        aio=False,
+                        interceptors=interceptors,
+                    )
+                    for i in range(pool_size)
+                ],
+                policy=pool_policy,
+            )
+            self._channel = self._pool.channels[0]
+            self._stub = _RoutedStub(self._pool)
+
+        # The limiter sits below the breaker, so requests rejected by an open
+        # circuit never wait for a slot
+        self._concurrency_limiter: Optional[ConcurrencyLimiter] = None
+        if concurrency_limiter is not None:
+            self._concurrency_limiter = ConcurrencyLimiter(
+                concurrency_limiter, self._address, self._stub, aio=False
+            )
+            self._stub = _LimitedStub(self._stub, self._concurrency_limiter, aio=False)
+
+        # Retries wrap the breaker, so every attempt is recorded, and requests
+        # rejected by an open circuit are not retried
+        self._circuit_breaker: Optional[CircuitBreaker] = None
+        if circuit_breaker is not None:
+            self._circuit_breaker = CircuitBreaker(
+                circuit_breaker, self._address, self._stub, aio=False
+            )
+            self._stub = _BreakerStub(self._stub, self._circuit_breaker, aio=False)
+
+        self._retrier = _Retrier(retry_policy) if retry_policy is not None else None
+        if self._retrier is not None:
+            self._stub = _RetryingStub(self._stub, self._retrier, aio=False)
 
         # Model name (populated by retrieve on first access if needed)
         self._model_name: str = ""
+        self._fast_types = fast_types
+        self._abort_coalescer = AbortCoalescer(
+            self._stub, max_delay=abort_batch_delay, max_batch_size=abort_batch_size
+        )
+        self._timing_stats = TimingStats()
+        self._rate_limiter = rate_limiter
+        self._response_cache = response_cache
+        self._singleflight = singleflight
+        self._embedding_cache = embedding_cache
+        if metrics is not None:
+            metrics.attach(self)
 
         # Initialize resources lazily
         self._completions: Optional["Completions"] = None
@@ -147,9 +307,63 @@ class VLLMGrpcClient:
             self._health = Health(self)
         return self._health
 
+    @property
+    def pool(self) -> Optional[ChannelPool]:
+        """The channel pool, or None when the client uses a single channel."""
+        return self._pool
+
+    @property
+    def abort_coalescer(self) -> AbortCoalescer:
+        """Batches Abort RPCs for abandoned requests; see its stats for metrics."""
+        return self._abort_coalescer
+
+    @property
+    def timing_stats(self) -> TimingStats:
+        """TTFT, TPOT, tokens/s and queueing delay histograms of finished requests."""
+        return self._timing_stats
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        """Retry counters (all zero without a retry_policy)."""
+        return self._retrier.stats if self._retrier is not None else RetryStats()
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]:
+        """The server's circuit breaker, or None without a circuit_breaker policy."""
+        return self._circuit_breaker
+
+    @property
+    def concurrency_limiter(self) -> Optional[ConcurrencyLimiter]:
+        """The Generate concurrency limiter, or None without a concurrency_limiter policy."""
+        return self._concurrency_limiter
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """The completion rate limiter, or None without one."""
+        return self._rate_limiter
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """The completion response cache, or None without one."""
+        return self._response_cache
+
+    @property
+    def singleflight(self) -> Optional[SingleFlight]:
+        """The in-flight completion de-duplication, or None without it."""
+        return self._singleflight
+
+    @property
+    def embedding_cache(self) -> Optional[EmbeddingCache]:
+        """The embedding cache, or None without one."""
+        return self._embedding_cache
+
     def close(self) -> None:
-        """Close the gRPC channel."""
-        if self._channel is not None:
+        """Send pending aborts and close the gRPC channel(s)."""
+        self._abort_coalescer.close(timeout=ABORT_TIMEOUT)
+        if self._pool is not None:
+            for channel in self._pool.channels:
+                channel.close()
+        elif self._channel is not None:
             self._channel.close()
 
     def __enter__(self) -> "VLLMGrpcClient":
@@ -234,12 +448,28 @@ class AsyncVLLMGrpcClient:
         timeout: Optional[float] = None,
         max_send_message_length: int = DEFAULT_MAX_MESSAGE_LENGTH,
         max_receive_message_length: int = DEFAULT_MAX_MESSAGE_LENGTH,
+        pool_size: int = 1,
+        pool_policy: str = "round_robin",
+        fast_types: bool = False,
+        abort_batch_delay: float = DEFAULT_ABORT_BATCH_DELAY,
+        abort_batch_size: int = DEFAULT_ABORT_BATCH_SIZE,
+        interceptors: Optional[Sequence[Any]] = None,
+        metrics: Optional[ClientMetrics] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreakerPolicy] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyPolicy] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        response_cache: Optional[ResponseCache] = None,
+        singleflight: Optional[SingleFlight] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
     ):
         """
         Initialize the async vLLM gRPC client.
 
         Args:
             host: The gRPC server host. Defaults to VLLM_GRPC_HOST env var or "localhost".
+                A "unix:<path>" host connects to a Unix socket and ignores port.
             port: The gRPC server port. Defaults to VLLM_GRPC_PORT env var or 9000.
             secure: Whether to use TLS/SSL for the connection.
                 Defaults to VLLM_GRPC_SECURE env var or False.
@@ -248,7 +478,44 @@ class AsyncVLLMGrpcClient:
                 Defaults to VLLM_GRPC_TIMEOUT env var or 60.0.
             max_send_message_length: Maximum send message size (-1 for unlimited).
             max_receive_message_length: Maximum receive message size (-1 for unlimited).
+            pool_size: Number of gRPC channels (HTTP/2 connections) to open.
+                Values above 1 spread RPCs across a ChannelPool, which avoids the
+                per-connection concurrent-stream cap under heavy streaming load.
+            pool_policy: How pooled channels are picked for each RPC,
+                "round_robin" or "least_in_flight".
+            fast_types: Return slotted FastCompletion / FastCompletionChunk /
+                FastEmbeddingResponse objects instead of validated pydantic models.
+                They have the same attributes and convert with to_pydantic().
+            abort_batch_delay: Seconds to buffer request IDs of abandoned requests
+                before sending them in one Abort RPC.
+            abort_batch_size: Maximum request IDs per coalesced Abort RPC.
+            interceptors: ClientInterceptors (e.g. LatencyInterceptor,
+                StatusCounterInterceptor, TracingInterceptor) and/or native gRPC
+                client interceptors, applied to every channel.
+            metrics: A ClientMetrics to record this client's traffic in
+                (request counts, in-flight RPCs, tokens, TTFT, aborts).
+            retry_policy: Retry HealthCheck, GetModelInfo, Embed, and Generate
+                before its first response, per this RetryPolicy.
+            circuit_breaker: Fail fast with VLLMGrpcCircuitOpenError while the
+                server keeps failing, per this CircuitBreakerPolicy.
+            concurrency_limiter: Cap in-flight Generate RPCs adaptively and
+                queue the excess locally, per this AdaptiveConcurrencyPolicy.
+            scheduler: A RequestScheduler that admits completions by priority
+                class and fairly across tenants. May be shared between clients.
+            rate_limiter: A RateLimiter charging completions against per-tenant
+                request and token quotas. May be shared between clients.
+            response_cache: A ResponseCache answering repeated deterministic
+                completions (temperature=0 or a fixed seed) without an RPC.
+            singleflight: A SingleFlight sharing one Generate RPC between
+                concurrent identical deterministic completions.
+            embedding_cache: An EmbeddingCache answering embeddings of token
+                IDs embedded before without an RPC.
         """
+        if metrics is not None:
+            interceptors = [*(interceptors or ()), metrics]
+        if pool_size < 1:
+            raise ValueError(f"pool_size must be at least 1, got {pool_size}")
+
         # Resolve configuration from environment or defaults
         self._host = host or os.environ.get("VLLM_GRPC_HOST", "localhost")
         self._port = port or int(os.environ.get("VLLM_GRPC_PORT", "9000"))
@@ -263,8 +530,11 @@ class AsyncVLLMGrpcClient:
             # Default to secure if using standard HTTPS port
             self._secure = self._port == 443
 
-        # Build server address
-        self._address = f"{self._host}:{self._port}"
+        # Build server address ("unix:<path>" hosts are Unix socket targets)
+        if self._host.startswith("unix:"):
+            self._address = self._host
+        else:
+            self._address = f"{self._host}:{self._port}"
 
         # Create gRPC channel options
         options = [
@@ -272,20 +542,67 @@ class AsyncVLLMGrpcClient:
             ("grpc.max_receive_message_length", max_receive_message_length),
         ]
 
-        # Create the async gRPC channel (secure or insecure)
-        if self._secure:
-            credentials = grpc.ssl_channel_credentials()
-            self._channel: grpc.aio.Channel = grpc.aio.secure_channel(
-                self._address, credentials, options=options
+        # Create the async gRPC channel (secure or insecure), or a pool of channels
+        self._pool: Optional[ChannelPool] = None
+        if pool_size == 1:
+            self._channel: grpc.aio.Channel = _create_channel(
+                self._address, self._secure, options, aio=True, interceptors=interceptors
             )
+            # Wrapped below by the routing, limiting, breaking and retrying stubs
+            self._stub: Any = vllm_engine_pb2_grpc.VllmEngineStub(self._channel)
         else:
-            self._channel: grpc.aio.Channel = grpc.aio.insecure_channel(
-                self._address, options=options
+            self._pool = ChannelPool(
+                [
+                    _create_channel(
+                        self._address,
+                        self._secure,
+                        _pool_channel_options(options, i),
+                        aio=True,
+                        interceptors=interceptors,
+                    )
+                    for i in range(pool_size)
+                ],
+                policy=pool_policy,
             )
-        self._stub = vllm_engine_pb2_grpc.VllmEngineStub(self._channel)
+            self._channel = self._pool.channels[0]
+            self._stub = _RoutedStub(self._pool)
+
+        # The limiter sits below the breaker, so requests rejected by an open
+        # circuit never wait for a slot
+        self._concurrency_limiter: Optional[ConcurrencyLimiter] = None
+        if concurrency_limiter is not None:
+            self._concurrency_limiter = ConcurrencyLimiter(
+                concurrency_limiter, self._address, self._stub, aio=True
+            )
+            self._stub = _LimitedStub(self._stub, self._concurrency_limiter, aio=True)
+
+        # Retries wrap the breaker, so every attempt is recorded, and requests
+        # rejected by an open circuit are not retried
+        self._circuit_breaker: Optional[CircuitBreaker] = None
+        if circuit_breaker is not None:
+            self._circuit_breaker = CircuitBreaker(
+                circuit_breaker, self._address, self._stub, aio=True
+            )
+            self._stub = _BreakerStub(self._stub, self._circuit_breaker, aio=True)
+
+        self._retrier = _Retrier(retry_policy) if retry_policy is not None else None
+        if self._retrier is not None:
+            self._stub = _RetryingStub(self._stub, self._retrier, aio=True)
 
         # Model name (populated by retrieve on first access if needed)
         self._model_name: str = ""
+        self._fast_types = fast_types
+        self._abort_coalescer = AsyncAbortCoalescer(
+            self._stub, max_delay=abort_batch_delay, max_batch_size=abort_batch_size
+        )
+        self._timing_stats = TimingStats()
+        self._rate_limiter = rate_limiter
+        self._response_cache = response_cache
+        self._singleflight = singleflight
+        self._embedding_cache = embedding_cache
+        self._scheduler = scheduler
+        if metrics is not None:
+            metrics.attach(self)
 
         # Initialize resources lazily
         self._completions: Optional["AsyncCompletions"] = None
@@ -329,9 +646,68 @@ class AsyncVLLMGrpcClient:
             self._health = AsyncHealth(self)
         return self._health
 
+    @property
+    def pool(self) -> Optional[ChannelPool]:
+        """The channel pool, or None when the client uses a single channel."""
+        return self._pool
+
+    @property
+    def abort_coalescer(self) -> AsyncAbortCoalescer:
+        """Batches Abort RPCs for abandoned requests; see its stats for metrics."""
+        return self._abort_coalescer
+
+    @property
+    def timing_stats(self) -> TimingStats:
+        """TTFT, TPOT, tokens/s and queueing delay histograms of finished requests."""
+        return self._timing_stats
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        """Retry counters (all zero without a retry_policy)."""
+        return self._retrier.stats if self._retrier is not None else RetryStats()
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]:
+        """The server's circuit breaker, or None without a circuit_breaker policy."""
+        return self._circuit_breaker
+
+    @property
+    def concurrency_limiter(self) -> Optional[ConcurrencyLimiter]:
+        """The Generate concurrency limiter, or None without a concurrency_limiter policy."""
+        return self._concurrency_limiter
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """The completion rate limiter, or None without one."""
+        return self._rate_limiter
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """The completion response cache, or None without one."""
+        return self._response_cache
+
+    @property
+    def singleflight(self) -> Optional[SingleFlight]:
+        """The in-flight completion de-duplication, or None without it."""
+        return self._singleflight
+
+    @property
+    def embedding_cache(self) -> Optional[EmbeddingCache]:
+        """The embedding cache, or None without one."""
+        return self._embedding_cache
+
+    @property
+    def scheduler(self) -> Optional[RequestScheduler]:
+        """The completion request scheduler, or None without one."""
+        return self._scheduler
+
     async def close(self) -> None:
-        """Close the gRPC channel."""
-        if self._channel is not None:
+        """Send pending aborts and close the gRPC channel(s)."""
+        await self._abort_coalescer.aclose()
+        if self._pool is not None:
+            for channel in self._pool.channels:
+                await channel.close()
+        elif self._channel is not None:
             await self._channel.close()
 
     async def __aenter__(self) -> "AsyncVLLMGrpcClient":
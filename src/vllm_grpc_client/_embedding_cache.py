@@ -0,0 +1,253 @@
+"""
+Persistent embedding cache backed by a memory-mapped vector file.
+
+A client created with embedding_cache=EmbeddingCache(directory) answers
+embeddings.create for inputs it has embedded before from disk, and sends
+only misses to the Embed RPC. Entries are keyed on a 16-byte BLAKE2b hash of
+the input's token IDs; text inputs without token IDs are not cached, as the
+server tokenizes them.
+
+The directory holds two append-only files:
+
+- vectors.f32: the float32 vectors, one row of dim values per entry, read
+  through a read-only NumPy memmap. The file is grown ahead of the rows in
+  doubling steps, so it is remapped only when it grows, not per new row.
+- index.bin: the 16-byte key of each row, in row order, loaded into a dict
+  when the cache is opened.
+
+A vector is written before its key, so a crash leaves at most a partial
+row past the indexed ones, which is truncated away (with any spare rows) on
+the next open. With fast_types=True, hits
+(and stored misses) are returned as zero-copy views into the memmap;
+pydantic results copy them into lists.
+
+Requires numpy. Use one directory per served model, written by one process
+at a time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import threading
+from typing import Any, BinaryIO, Dict, Optional, Sequence
+
+from vllm_grpc_client._types import TokenizedInput
+
+# Bytes of the key of each row in index.bin
+KEY_SIZE = 16
+
+# Bytes of each vector value in vectors.f32
+VALUE_SIZE = 4
+
+# Rows vectors.f32 first grows to; it doubles from there
+INITIAL_CAPACITY = 1024
+
+VECTORS_FILE = "vectors.f32"
+INDEX_FILE = "index.bin"
+META_FILE = "meta.json"
+
+
+class EmbeddingCacheStats:
+    """
+    Counters of an embedding cache.
+
+    Attributes:
+        hits: Inputs answered from the cache.
+        misses: Cacheable inputs sent to the server.
+        stores: Vectors appended to the cache.
+        entries: Vectors held in the cache.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.entries = 0
+
+    def _copy(self) -> EmbeddingCacheStats:
+        stats = EmbeddingCacheStats()
+        stats.__dict__.update(self.__dict__)
+        return stats
+
+    def __repr__(self) -> str:
+        return (
+            f"EmbeddingCacheStats(hits={self.hits}, misses={self.misses}, "
+            f"stores={self.stores}, entries={self.entries})"
+        )
+
+
+class EmbeddingCache:
+    """
+    On-disk cache of embedding vectors keyed by token IDs.
+
+    Usage:
+        cache = EmbeddingCache("~/.cache/vllm-embeddings")
+        client = VLLMGrpcClient(embedding_cache=cache, fast_types=True)
+        vector = client.embeddings.create(input=[1, 2, 3]).data[0].embedding
+        again = client.embeddings.create(input=[1, 2, 3])  # no RPC
+        assert again.cached
+    """
+
+    def __init__(self, directory: str):
+        """
+        Open (or create) the cache.
+
+        Args:
+            directory: Directory holding the cache files. Created if missing.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError(
+                "numpy is required for EmbeddingCache. Install with: pip install numpy"
+            )
+        self._np = numpy
+        self.directory = os.path.expanduser(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._stats = EmbeddingCacheStats()
+        self._rows: Dict[bytes, int] = {}
+        self._map: Any = None
+        self._vectors_file: Optional[BinaryIO] = None
+        self._index_file: Optional[BinaryIO] = None
+        # Rows vectors.f32 has room for, once opened for writing
+        self._capacity = 0
+        self.dim: Optional[int] = None
+        try:
+            with open(self._path(META_FILE), encoding="utf-8") as f:
+                self.dim = int(json.load(f)["dim"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        self._load()
+
+    @property
+    def stats(self) -> EmbeddingCacheStats:
+        """A snapshot of the cache's counters."""
+        with self._lock:
+            stats = self._stats._copy()
+            stats.entries = len(self._rows)
+            return stats
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def close(self) -> None:
+        """Close the cache files. Views returned earlier stay valid."""
+        with self._lock:
+            for f in (self._vectors_file, self._index_file):
+                if f is not None:
+                    f.close()
+            self._vectors_file = self._index_file = None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load(self) -> None:
+        """Read the index, dropping rows a crash left incomplete."""
+        dim = self.dim
+        assert dim is not None
+        try:
+            with open(self._path(INDEX_FILE), "rb") as f:
+                index = f.read()
+            vectors_size = os.path.getsize(self._path(VECTORS_FILE))
+        except OSError:
+            return
+        rows = min(len(index) // KEY_SIZE, vectors_size // (dim * VALUE_SIZE))
+        if len(index) != rows * KEY_SIZE:
+            os.truncate(self._path(INDEX_FILE), rows * KEY_SIZE)
+        if vectors_size != rows * dim * VALUE_SIZE:
+            os.truncate(self._path(VECTORS_FILE), rows * dim * VALUE_SIZE)
+        for row in range(rows):
+            self._rows[index[row * KEY_SIZE : (row + 1) * KEY_SIZE]] = row
+
+    def _remap(self) -> None:
+        """Map every row the vector file has room for; the lock must be held."""
+        dim = self.dim
+        assert dim is not None
+        rows = os.path.getsize(self._path(VECTORS_FILE)) // (dim * VALUE_SIZE)
+        self._map = self._np.memmap(
+            self._path(VECTORS_FILE), dtype="<f4", mode="r", shape=(rows, dim)
+        )
+
+    def _get(self, key: bytes) -> Any:
+        """A read-only view of a cached vector, or None, counting the hit or miss."""
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                self._stats.misses += 1
+                return None
+            self._stats.hits += 1
+            if self._map is None or row >= len(self._map):
+                self._remap()
+            return self._map[row]
+
+    def _put(self, key: bytes, vector: Sequence[float]) -> Any:
+        """Append a vector and return a read-only view of it."""
+        values = self._np.asarray(vector, dtype="<f4")
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                row = self._append(key, values)
+            if self._map is None or row >= len(self._map):
+                self._remap()
+            return self._map[row]
+
+    def _append(self, key: bytes, values: Any) -> int:
+        """Write a vector, then its key; the lock must be held."""
+        if self.dim is None:
+            with open(self._path(META_FILE), "w", encoding="utf-8") as f:
+                json.dump({"dim": len(values)}, f)
+            self.dim = len(values)
+        elif len(values) != self.dim:
+            raise ValueError(
+                f"Embedding has {len(values)} dimensions, the cache holds {self.dim}"
+            )
+        row_size = self.dim * VALUE_SIZE
+        if self._vectors_file is None:
+            fd = os.open(self._path(VECTORS_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+            self._vectors_file = os.fdopen(fd, "r+b")
+            self._capacity = os.fstat(fd).st_size // row_size
+            self._index_file = open(self._path(INDEX_FILE), "ab")
+        assert self._index_file is not None
+        row = len(self._rows)
+        try:
+            if row >= self._capacity:
+                # Grown sparse; rows past the index are spare until written
+                capacity = max(INITIAL_CAPACITY, 2 * self._capacity)
+                self._vectors_file.truncate(capacity * row_size)
+                self._capacity = capacity
+            self._vectors_file.seek(row * row_size)
+            self._vectors_file.write(values.tobytes())
+            self._vectors_file.flush()
+            self._index_file.write(key)
+            self._index_file.flush()
+        except OSError:
+            # Drop the partial key, so later rows stay aligned with their keys
+            try:
+                self._index_file.truncate(row * KEY_SIZE)
+            except OSError:
+                pass
+            raise
+        self._rows[key] = row
+        self._stats.stores += 1
+        return row
+
+    def __repr__(self) -> str:
+        return (
+            f"EmbeddingCache(directory={self.directory!r}, dim={self.dim}, "
+            f"entries={len(self._rows)})"
+        )
+
+
+def _embedding_key(input: Any) -> Optional[bytes]:
+    """Cache key of an embedding input, or None if it carries no token IDs."""
+    if isinstance(input, TokenizedInput):
+        input = input.input_ids
+    if not isinstance(input, list) or not input:
+        return None
+    return hashlib.blake2b(
+        struct.pack(f"<{len(input)}I", *input), digest_size=KEY_SIZE
+    ).digest()
@@ -67,6 +67,38 @@ class VLLMGrpcUnavailableError(VLLMGrpcError):
     pass
 
 
+class VLLMGrpcCircuitOpenError(VLLMGrpcUnavailableError):
+    """Raised without sending the RPC while an endpoint's circuit breaker is open."""
+
+    def __init__(self, endpoint: str, state: str):
+        self.endpoint = endpoint
+        self.state = state
+        super().__init__(f"Circuit breaker is {state} for {endpoint}", code="UNAVAILABLE")
+
+
+class VLLMGrpcOverloadedError(VLLMGrpcError):
+    """Raised when a concurrency limiter sheds a request instead of sending it."""
+
+    def __init__(self, endpoint: str, reason: str):
+        self.endpoint = endpoint
+        self.reason = reason
+        super().__init__(
+            f"Concurrency limit reached for {endpoint}: {reason}", code="RESOURCE_EXHAUSTED"
+        )
+
+
+class VLLMGrpcRateLimitedError(VLLMGrpcError):
+    """Raised when a rate limiter rejects a request that is over its tenant's budget."""
+
+    def __init__(self, tenant: str, retry_after: float):
+        self.tenant = tenant
+        self.retry_after = retry_after
+        super().__init__(
+            f"Rate limit exceeded for tenant {tenant!r}, retry after {retry_after:.3f}s",
+            code="RESOURCE_EXHAUSTED",
+        )
+
+
 class VLLMGrpcUnimplementedError(VLLMGrpcError):
     """Raised when the requested RPC is not implemented on the server."""
 
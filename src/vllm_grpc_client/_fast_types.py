@@ -0,0 +1,298 @@
+"""
+Lightweight result types for vLLM gRPC client.
+
+The pydantic models in _types validate every field of every response, even
+though responses are built from trusted protobuf messages. The classes here
+are plain __slots__ objects with the same attributes, returned when a client
+is created with fast_types=True. Each converts to its pydantic counterpart
+on demand with to_pydantic().
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from typing import Any, ClassVar, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from vllm_grpc_client import _types
+from vllm_grpc_client._timing import RequestTiming
+from vllm_grpc_client._types import (
+    Completion,
+    CompletionChoice,
+    CompletionChunk,
+    CompletionChunkChoice,
+    CompletionUsage,
+    Embedding,
+    EmbeddingResponse,
+    EmbeddingUsage,
+)
+
+
+def _field_equal(value: Any, other: Any) -> bool:
+    """Compare two field values; NumPy arrays (cached embeddings) compare element-wise."""
+    if hasattr(value, "shape") or hasattr(other, "shape"):
+        import numpy
+
+        return bool(numpy.array_equal(value, other))
+    return bool(value == other)
+
+
+class _FastModel:
+    """Base class for slotted result types mirroring a pydantic model."""
+
+    __slots__: Tuple[str, ...] = ()
+
+    # The pydantic model with the same fields
+    _model: ClassVar[Type[BaseModel]]
+
+    # Per-request metadata left out of __eq__ and __repr__
+    _hidden: ClassVar[Tuple[str, ...]] = ()
+
+    def to_pydantic(self) -> BaseModel:
+        """Convert to the equivalent (validated) pydantic model."""
+        return self._model.model_validate(self, from_attributes=True)
+
+    def model_dump(self, **kwargs: Any) -> Dict[str, Any]:
+        """Serialize to a dict, as the pydantic model's model_dump() would."""
+        return self.to_pydantic().model_dump(**kwargs)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            _field_equal(getattr(self, name), getattr(other, name))
+            for name in self.__slots__
+            if name not in self._hidden
+        )
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for name in self.__slots__
+            if name not in self._hidden
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+# =====================
+# Completion Types
+# =====================
+
+
+class FastCompletionUsage(_FastModel):
+    """Slotted counterpart of CompletionUsage."""
+
+    __slots__ = ("prompt_tokens", "completion_tokens", "total_tokens", "cached_tokens")
+    _model = CompletionUsage
+
+    def __init__(
+        self,
+        prompt_tokens: int,
+        completion_tokens: int,
+        total_tokens: int,
+        cached_tokens: int = 0,
+    ):
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.total_tokens = total_tokens
+        self.cached_tokens = cached_tokens
+
+
+class FastCompletionChoice(_FastModel):
+    """Slotted counterpart of CompletionChoice."""
+
+    __slots__ = ("index", "text", "token_ids", "finish_reason")
+    _model = CompletionChoice
+
+    def __init__(
+        self,
+        index: int = 0,
+        text: str = "",
+        token_ids: Optional[List[int]] = None,
+        finish_reason: Optional[str] = None,
+    ):
+        self.index = index
+        self.text = text
+        self.token_ids = [] if token_ids is None else token_ids
+        self.finish_reason = finish_reason
+
+
+class FastCompletion(_FastModel):
+    """Slotted counterpart of Completion."""
+
+    __slots__ = ("id", "object", "created", "model", "choices", "usage", "cached", "timing")
+    _model = Completion
+    _hidden = ("timing",)
+
+    def __init__(
+        self,
+        id: Optional[str] = None,
+        model: str = "",
+        choices: Optional[List[FastCompletionChoice]] = None,
+        usage: Optional[FastCompletionUsage] = None,
+        object: str = "text_completion",
+        created: Optional[int] = None,
+        timing: Optional[RequestTiming] = None,
+        cached: bool = False,
+    ):
+        self.id = id or f"cmpl-{uuid.uuid4().hex[:24]}"
+        self.object = object
+        self.created = int(time.time()) if created is None else created
+        self.model = model
+        self.choices = [] if choices is None else choices
+        self.usage = usage
+        self.cached = cached
+        self.timing = timing
+
+
+# =====================
+# Streaming Types
+# =====================
+
+
+class FastCompletionChunkChoice(_FastModel):
+    """Slotted counterpart of CompletionChunkChoice."""
+
+    __slots__ = ("index", "delta_token_ids", "delta_text", "finish_reason")
+    _model = CompletionChunkChoice
+
+    def __init__(
+        self,
+        index: int = 0,
+        delta_token_ids: Optional[List[int]] = None,
+        delta_text: str = "",
+        finish_reason: Optional[str] = None,
+    ):
+        self.index = index
+        self.delta_token_ids = [] if delta_token_ids is None else delta_token_ids
+        self.delta_text = delta_text
+        self.finish_reason = finish_reason
+
+
+class FastCompletionChunk(_FastModel):
+    """Slotted counterpart of CompletionChunk."""
+
+    __slots__ = ("id", "object", "created", "model", "choices", "usage")
+    _model = CompletionChunk
+
+    def __init__(
+        self,
+        id: Optional[str] = None,
+        model: str = "",
+        choices: Optional[List[FastCompletionChunkChoice]] = None,
+        usage: Optional[FastCompletionUsage] = None,
+        object: str = "text_completion.chunk",
+        created: Optional[int] = None,
+    ):
+        self.id = id or f"cmpl-{uuid.uuid4().hex[:24]}"
+        self.object = object
+        self.created = int(time.time()) if created is None else created
+        self.model = model
+        self.choices = [] if choices is None else choices
+        self.usage = usage
+
+
+# =====================
+# Embedding Types
+# =====================
+
+
+class FastEmbedding(_FastModel):
+    """
+    Slotted counterpart of Embedding.
+
+    embedding is a read-only NumPy view into the cache file when the client
+    has an EmbeddingCache.
+    """
+
+    __slots__ = ("object", "embedding", "index")
+    _model = Embedding
+
+    def __init__(self, embedding: List[float], index: int = 0, object: str = "embedding"):
+        self.object = object
+        self.embedding = embedding
+        self.index = index
+
+
+class FastEmbeddingUsage(_FastModel):
+    """Slotted counterpart of EmbeddingUsage."""
+
+    __slots__ = ("prompt_tokens", "total_tokens")
+    _model = EmbeddingUsage
+
+    def __init__(self, prompt_tokens: int, total_tokens: int):
+        self.prompt_tokens = prompt_tokens
+        self.total_tokens = total_tokens
+
+
+class FastEmbeddingResponse(_FastModel):
+    """Slotted counterpart of EmbeddingResponse."""
+
+    __slots__ = ("object", "data", "model", "usage", "cached")
+    _model = EmbeddingResponse
+
+    def __init__(
+        self,
+        data: Optional[List[FastEmbedding]] = None,
+        model: str = "",
+        usage: Optional[FastEmbeddingUsage] = None,
+        object: str = "list",
+        cached: bool = False,
+    ):
+        self.object = object
+        self.data = [] if data is None else data
+        self.model = model
+        self.usage = usage
+        self.cached = cached
+
+
+class _ResultTypes(NamedTuple):
+    """
+    The set of result classes a client builds responses with.
+
+    Fields are Type[Any]: the pydantic models and their slotted mirrors take
+    the same arguments but share no base class, and typing the fields as
+    either family would check the other's constructors against the wrong
+    signature.
+    """
+
+    Completion: Type[Any]
+    CompletionChoice: Type[Any]
+    CompletionUsage: Type[Any]
+    CompletionChunk: Type[Any]
+    CompletionChunkChoice: Type[Any]
+    Embedding: Type[Any]
+    EmbeddingUsage: Type[Any]
+    EmbeddingResponse: Type[Any]
+
+
+# Default pydantic result types
+PYDANTIC_TYPES = _ResultTypes(
+    Completion,
+    CompletionChoice,
+    CompletionUsage,
+    CompletionChunk,
+    CompletionChunkChoice,
+    Embedding,
+    EmbeddingUsage,
+    EmbeddingResponse,
+)
+
+# Slotted result types used with fast_types=True
+FAST_TYPES = _ResultTypes(
+    FastCompletion,
+    FastCompletionChoice,
+    FastCompletionUsage,
+    FastCompletionChunk,
+    FastCompletionChunkChoice,
+    FastEmbedding,
+    FastEmbeddingUsage,
+    FastEmbeddingResponse,
+)
+
+
+def _result_types(fast_types: bool) -> _ResultTypes:
+    """Pick the result classes for a client's fast_types setting."""
+    return FAST_TYPES if fast_types else PYDANTIC_TYPES
@@ -0,0 +1,371 @@
+"""
+Hedged Generate requests for vLLM gRPC client.
+
+With completions.create(..., hedge=HedgePolicy()), a request that has not
+received its first response within the hedge delay is sent again under a
+new request ID. Whichever copy responds first wins; the others are
+cancelled and aborted on the server at once. If the deadline expires, every
+hedge still running is aborted too. The delay is either fixed or
+the observed TTFT percentile of the client, so only the slowest few percent
+of requests are duplicated.
+
+Hedges go through the client's normal routing: on a pooled client they use
+the next channel, and on a load-balanced client the least-loaded replica,
+which excludes the one already serving the request unless it is still the
+least loaded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import grpc
+
+from vllm_grpc_client._timing import TimingStats
+from vllm_grpc_client.proto import vllm_engine_pb2
+
+# Marks an attempt whose stream ended without any response
+_END = object()
+
+
+class HedgeStats:
+    """
+    Counters describing the hedging of a HedgePolicy.
+
+    Attributes:
+        requests: Requests started with the policy.
+        hedges: Duplicate requests sent.
+        hedge_wins: Requests answered first by a duplicate.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def _copy(self) -> HedgeStats:
+        stats = HedgeStats()
+        stats.__dict__.update(self.__dict__)
+        return stats
+
+    def __repr__(self) -> str:
+        return (
+            f"HedgeStats(requests={self.requests}, hedges={self.hedges}, "
+            f"hedge_wins={self.hedge_wins})"
+        )
+
+
+class HedgePolicy:
+    """
+    When to send duplicate Generate requests.
+
+    A policy may be shared by many requests and clients; its stats cover all
+    of them.
+
+    Usage:
+        hedge = HedgePolicy(percentile=0.95)
+        completion = client.completions.create(prompt="Hi", max_tokens=8, hedge=hedge)
+        print(hedge.stats)
+    """
+
+    def __init__(
+        self,
+        *,
+        delay: Optional[float] = None,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        initial_delay: float = 0.1,
+        min_delay: float = 0.005,
+        max_hedges: int = 1,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            delay: Fixed seconds to wait for a first response before hedging.
+                When None, the delay is the client's observed TTFT percentile.
+            percentile: TTFT quantile used as the delay (0.95 hedges about the
+                slowest 5% of requests).
+            min_samples: Finished requests needed before the percentile is
+                trusted; until then initial_delay is used.
+            initial_delay: Delay used while there are too few samples.
+            min_delay: Lower bound of the percentile-based delay.
+            max_hedges: Maximum duplicates per request; each waits another delay.
+        """
+        if max_hedges < 1:
+            raise ValueError(f"max_hedges must be at least 1, got {max_hedges}")
+        if not 0.0 < percentile < 1.0:
+            raise ValueError(f"percentile must be between 0 and 1, got {percentile}")
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_hedges = max_hedges
+        self._lock = threading.Lock()
+        self._stats = HedgeStats()
+
+    @property
+    def stats(self) -> HedgeStats:
+        """A snapshot of the hedging counters."""
+        with self._lock:
+            return self._stats._copy()
+
+    def hedge_delay(self, timing_stats: TimingStats) -> float:
+        """Seconds to wait for a first response, given a client's TimingStats."""
+        if self.delay is not None:
+            return self.delay
+        with timing_stats._lock:
+            ttft = timing_stats.ttft
+            if ttft.count < self.min_samples:
+                return self.initial_delay
+            return max(self.min_delay, ttft.quantile(self.percentile))
+
+    def _record(self, hedges: int, hedge_won: bool) -> None:
+        with self._lock:
+            stats = self._stats
+            stats.requests += 1
+            stats.hedges += hedges
+            stats.hedge_wins += hedge_won
+
+    def __repr__(self) -> str:
+        delay = f"delay={self.delay}" if self.delay is not None else f"p={self.percentile}"
+        return f"HedgePolicy({delay}, max_hedges={self.max_hedges})"
+
+
+def _hedge_request(request: Any, number: int) -> Any:
+    """A copy of a GenerateRequest under a new request ID."""
+    hedge = vllm_engine_pb2.GenerateRequest()
+    hedge.CopyFrom(request)
+    hedge.request_id = f"{request.request_id}-hedge{number}"
+    return hedge
+
+
+class _BaseHedgedCall:
+    """State shared by the sync and async hedged calls."""
+
+    def __init__(
+        self,
+        method: Any,
+        request: Any,
+        kwargs: Dict[str, Any],
+        policy: HedgePolicy,
+        delay: float,
+        on_abandon: Optional[Callable[[str], None]],
+    ):
+        self._method = method
+        self._request = request
+        self._kwargs = kwargs
+        self._policy = policy
+        self._delay = delay
+        self._on_abandon = on_abandon
+        # (request_id, call) per attempt; attempt 0 is the original request
+        self._attempts: List[Any] = []
+        self._winner: Optional[int] = None
+        self._cancelled = False
+        # Attempts already cancelled and aborted
+        self._aborted: Set[int] = set()
+
+    def _launch(self) -> Any:
+        number = len(self._attempts)
+        request = self._request if number == 0 else _hedge_request(self._request, number)
+        call = self._method(request, **self._kwargs)
+        self._attempts.append((request.request_id, call))
+        return call
+
+    def _abort(self, index: int, lost: bool) -> None:
+        request_id, call = self._attempts[index]
+        self._aborted.add(index)
+        call.cancel()
+        # The stream that owns this call aborts the original request ID when it
+        # is abandoned, but not when a hedge finished in its place
+        if (index or lost) and self._on_abandon is not None:
+            try:
+                self._on_abandon(request_id)
+            except Exception:
+                pass
+
+    def _won(self, index: int) -> None:
+        """Keep attempt index and abort the others."""
+        self._winner = index
+        for other in range(len(self._attempts)):
+            if other != index:
+                self._abort(other, lost=True)
+        self._policy._record(len(self._attempts) - 1, index > 0)
+
+    def _expired(self, error: BaseException) -> None:
+        """
+        Abort the hedges the engine may still be decoding past our deadline.
+
+        The stream aborts the original request ID itself, but a hedge that won
+        (or is still running) is only known here.
+        """
+        code = getattr(error, "code", None)
+        if not isinstance(error, grpc.RpcError) or code is None:
+            return
+        if code() != grpc.StatusCode.DEADLINE_EXCEEDED:
+            return
+        for index in range(1, len(self._attempts)):
+            if index not in self._aborted:
+                self._abort(index, lost=True)
+
+    def cancel(self) -> bool:
+        self._cancelled = True
+        if self._winner is not None:
+            self._abort(self._winner, lost=False)
+        else:
+            for index in range(len(self._attempts)):
+                self._abort(index, lost=False)
+        return True
+
+    def __getattr__(self, name: str) -> Any:
+        index = self._winner or 0
+        return getattr(self._attempts[index][1], name)
+
+
+class _HedgedCall(_BaseHedgedCall):
+    """
+    Sync Generate call that hedges until the first response.
+
+    The first response of every attempt is read on a helper thread; once one
+    arrives, the rest of the winner's stream is read on the caller's thread.
+    """
+
+    def __init__(self, *args: Any):
+        super().__init__(*args)
+        self._queue: queue.Queue = queue.Queue()
+        self._start()
+
+    def _start(self) -> None:
+        index = len(self._attempts)
+        call = self._launch()
+        threading.Thread(
+            target=self._read_first, args=(index, call), name="vllm-grpc-hedge", daemon=True
+        ).start()
+
+    def _read_first(self, index: int, call: Any) -> None:
+        try:
+            self._queue.put((index, next(call), None))
+        except StopIteration:
+            self._queue.put((index, _END, None))
+        except Exception as e:
+            self._queue.put((index, None, e))
+
+    def __iter__(self) -> _HedgedCall:
+        return self
+
+    def __next__(self) -> Any:
+        if self._winner is not None:
+            try:
+                return next(self._attempts[self._winner][1])
+            except Exception as failure:
+                self._expired(failure)
+                raise
+        pending, error = 1, None
+        deadline = time.monotonic() + self._delay
+        while True:
+            hedging = len(self._attempts) <= self._policy.max_hedges and not self._cancelled
+            try:
+                if hedging:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                else:
+                    item = self._queue.get()
+            except queue.Empty:
+                self._start()
+                pending += 1
+                deadline = time.monotonic() + self._delay
+                continue
+            index, response, e = item
+            pending -= 1
+            if e is not None:
+                error = e
+                if pending:
+                    continue
+                self._expired(error)
+                raise error
+            self._won(index)
+            if response is _END:
+                raise StopIteration
+            return response
+
+
+class _AsyncHedgedCall(_BaseHedgedCall):
+    """Async Generate call that hedges until the first response."""
+
+    def __init__(self, *args: Any):
+        super().__init__(*args)
+        self._aiters: List[Any] = []
+        self._add_attempt()
+
+    def _add_attempt(self) -> int:
+        self._aiters.append(self._launch().__aiter__())
+        return len(self._aiters) - 1
+
+    def __aiter__(self) -> _AsyncHedgedCall:
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._winner is not None:
+            try:
+                return await self._aiters[self._winner].__anext__()
+            except Exception as e:
+                self._expired(e)
+                raise
+        tasks = {asyncio.ensure_future(self._aiters[0].__anext__()): 0}
+        error: Optional[BaseException] = None
+        try:
+            while tasks:
+                hedging = len(self._attempts) <= self._policy.max_hedges and not self._cancelled
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=self._delay if hedging else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    index = self._add_attempt()
+                    tasks[asyncio.ensure_future(self._aiters[index].__anext__())] = index
+                    continue
+                for task in done:
+                    index = tasks.pop(task)
+                    exception = task.exception()
+                    if exception is None or isinstance(exception, StopAsyncIteration):
+                        self._won(index)
+                        if exception is not None:
+                            raise StopAsyncIteration
+                        return task.result()
+                    error = exception
+        finally:
+            for task in tasks:
+                task.cancel()
+        assert error is not None
+        self._expired(error)
+        raise error
+
+
+class _HedgedGenerate:
+    """Generate method that starts hedged calls under a policy."""
+
+    __slots__ = ("_method", "_policy", "_client", "_aio")
+
+    def __init__(self, method: Any, policy: HedgePolicy, client: Any, aio: bool):
+        self._method = method
+        self._policy = policy
+        self._client = client
+        self._aio = aio
+
+    def __call__(self, request: Any, **kwargs: Any) -> Any:
+        client = self._client
+        delay = self._policy.hedge_delay(client._timing_stats)
+        call_type = _AsyncHedgedCall if self._aio else _HedgedCall
+        return call_type(
+            self._method,
+            request,
+            kwargs,
+            self._policy,
+            delay,
+            client._abort_coalescer.submit,
+        )
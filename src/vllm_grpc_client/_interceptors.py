@@ -0,0 +1,350 @@
+"""
+Client interceptors for vLLM gRPC client.
+
+Both clients accept interceptors=[...]. Entries may be native gRPC
+interceptors (grpc.*ClientInterceptor for the sync client,
+grpc.aio.*ClientInterceptor for the async client), or ClientInterceptor
+objects, which work with either client and cover unary-unary and
+unary-stream RPCs alike.
+
+All ClientInterceptors of a client run inside a single gRPC interceptor, and
+they hook only the start and the end of each RPC: nothing runs per streamed
+message, so Generate streams cost one start() and one done() call per
+interceptor regardless of length. (The async gRPC runtime itself wraps
+intercepted streams, which adds a small per-message cost once any
+interceptor is installed.)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import grpc
+
+from vllm_grpc_client._timing import LatencyHistogram
+
+# gRPC metadata: a list of (key, value) pairs
+Metadata = List[Tuple[str, str]]
+
+
+class ClientInterceptor:
+    """
+    Base class for interceptors that work with sync and async clients.
+
+    Override start() to observe or mutate outgoing RPCs and done() to observe
+    their outcome. done() is only wired up when a subclass overrides it.
+
+    Usage:
+        class LogInterceptor(ClientInterceptor):
+            def done(self, method, code, state):
+                print(method, code)
+
+        client = VLLMGrpcClient(interceptors=[LogInterceptor()])
+    """
+
+    def start(self, method: str, request: Any, metadata: Metadata) -> Any:
+        """
+        Called before an RPC is sent.
+
+        Args:
+            method: The RPC name, e.g. "Generate".
+            request: The request message; it may be modified in place.
+            metadata: Outgoing metadata; append (key, value) pairs to add headers.
+
+        Returns:
+            A value passed back to done() for this RPC.
+        """
+        return None
+
+    def done(self, method: str, code: grpc.StatusCode, state: Any) -> None:
+        """
+        Called once an RPC finished; for streams, after the last message.
+
+        Args:
+            method: The RPC name.
+            code: The final status code.
+            state: The value start() returned for this RPC.
+        """
+
+
+class LatencyInterceptor(ClientInterceptor):
+    """
+    Records the latency of every RPC in a LatencyHistogram per method.
+
+    For Generate streams the latency spans the whole stream.
+
+    Usage:
+        latency = LatencyInterceptor()
+        client = VLLMGrpcClient(interceptors=[latency])
+        print(latency.snapshot()["Generate"]["p99"])
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    def start(self, method: str, request: Any, metadata: Metadata) -> float:
+        return time.perf_counter()
+
+    def done(self, method: str, code: grpc.StatusCode, state: float) -> None:
+        latency = time.perf_counter() - state
+        with self._lock:
+            histogram = self._histograms.get(method)
+            if histogram is None:
+                histogram = self._histograms[method] = LatencyHistogram()
+            histogram.record(latency)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Latency summaries in seconds (count, mean, p50, p90, p99, max) by method."""
+        with self._lock:
+            return {method: h.summary() for method, h in self._histograms.items()}
+
+    def reset(self) -> None:
+        """Drop all recorded latencies."""
+        with self._lock:
+            self._histograms.clear()
+
+
+class StatusCounterInterceptor(ClientInterceptor):
+    """
+    Counts finished RPCs by method and status code.
+
+    Usage:
+        counter = StatusCounterInterceptor()
+        client = VLLMGrpcClient(interceptors=[counter])
+        print(counter.counts)  # {("Generate", "OK"): 12, ...}
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, str], int] = {}
+
+    def done(self, method: str, code: grpc.StatusCode, state: Any) -> None:
+        key = (method, code.name)
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    @property
+    def counts(self) -> Dict[Tuple[str, str], int]:
+        """A snapshot of the counts, keyed by (method, status code name)."""
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self) -> None:
+        """Drop all counts."""
+        with self._lock:
+            self._counts.clear()
+
+
+def _random_traceparent() -> Dict[str, str]:
+    """A W3C traceparent header for a new, sampled trace."""
+    return {"traceparent": f"00-{os.urandom(16).hex()}-{os.urandom(8).hex()}-01"}
+
+
+class TracingInterceptor(ClientInterceptor):
+    """
+    Injects trace context into the metadata of every RPC.
+
+    By default the current OpenTelemetry context is injected when
+    opentelemetry is installed; otherwise each RPC gets a new W3C
+    traceparent header so server-side logs can still be correlated.
+
+    Usage:
+        client = VLLMGrpcClient(interceptors=[TracingInterceptor()])
+
+        # Or with your own context source
+        TracingInterceptor(lambda: {"traceparent": current_traceparent()})
+    """
+
+    def __init__(self, context: Optional[Any] = None):
+        """
+        Initialize the interceptor.
+
+        Args:
+            context: Callable returning the headers to inject as a dict.
+                Defaults to OpenTelemetry propagation if available, else a
+                random traceparent per RPC.
+        """
+        if context is None:
+            try:
+                from opentelemetry import propagate
+            except ImportError:
+                context = _random_traceparent
+            else:
+
+                def context() -> Dict[str, str]:
+                    carrier: Dict[str, str] = {}
+                    propagate.inject(carrier)
+                    return carrier
+
+        self._context = context
+
+    def start(self, method: str, request: Any, metadata: Metadata) -> None:
+        metadata.extend(self._context().items())
+
+
+# Concrete sync ClientCallDetails (the grpc class is abstract)
+class _ClientCallDetails(
+    namedtuple(
+        "_ClientCallDetails",
+        ("method", "timeout", "metadata", "credentials", "wait_for_ready", "compression"),
+    ),
+    grpc.ClientCallDetails,
+):
+    pass
+
+
+def _method_name(method: Any) -> str:
+    """Short RPC name from a full method path like /vllm.grpc.engine.VllmEngine/Generate."""
+    if isinstance(method, bytes):
+        method = method.decode()
+    return str(method).rsplit("/", 1)[-1]
+
+
+def _on_aio_code(call: Any, callback: Callable[[grpc.StatusCode], None]) -> None:
+    """Pass the status code of a finished aio call to callback, once it is read."""
+
+    def deliver(task: "asyncio.Future[grpc.StatusCode]") -> None:
+        if task.cancelled() or task.exception() is not None:
+            callback(grpc.StatusCode.UNKNOWN)
+        else:
+            callback(task.result())
+
+    # The call is done, so the task completes on its first step
+    asyncio.ensure_future(call.code()).add_done_callback(deliver)
+
+
+class _InterceptorChain:
+    """Runs a list of ClientInterceptors around one RPC."""
+
+    def __init__(self, interceptors: Sequence[ClientInterceptor], aio: bool):
+        self._interceptors = tuple(interceptors)
+        # Indexes of the interceptors that override done()
+        self._with_done = tuple(
+            index
+            for index, interceptor in enumerate(self._interceptors)
+            if type(interceptor).done is not ClientInterceptor.done
+        )
+        self._aio = aio
+        self._method_names: Dict[Any, str] = {}
+
+    def before(self, details: Any, request: Any) -> Tuple[Any, str, List[Any]]:
+        method = self._method_names.get(details.method)
+        if method is None:
+            method = self._method_names[details.method] = _method_name(details.method)
+        metadata = list(details.metadata) if details.metadata else []
+        size = len(metadata)
+        states = [i.start(method, request, metadata) for i in self._interceptors]
+        if len(metadata) != size:
+            if self._aio:
+                details = details._replace(metadata=grpc.aio.Metadata(*metadata))
+            else:
+                details = _ClientCallDetails(
+                    details.method,
+                    details.timeout,
+                    metadata,
+                    details.credentials,
+                    details.wait_for_ready,
+                    getattr(details, "compression", None),
+                )
+        return details, method, states
+
+    def after(self, call: Any, method: str, states: List[Any]) -> None:
+        if not self._with_done:
+            return
+
+        def report(code: grpc.StatusCode) -> None:
+            for index in self._with_done:
+                try:
+                    self._interceptors[index].done(method, code, states[index])
+                except Exception:
+                    # Observers must not break the RPC callback
+                    pass
+
+        if self._aio:
+            call.add_done_callback(lambda finished: _on_aio_code(finished, report))
+        else:
+            call.add_done_callback(lambda finished: report(finished.code()))
+
+
+class _SyncInterceptorAdapter(
+    grpc.UnaryUnaryClientInterceptor, grpc.UnaryStreamClientInterceptor
+):
+    """Runs ClientInterceptors as a sync gRPC interceptor."""
+
+    def __init__(self, chain: _InterceptorChain):
+        self._chain = chain
+
+    def intercept_unary_unary(
+        self, continuation: Any, client_call_details: Any, request: Any
+    ) -> Any:
+        details, method, states = self._chain.before(client_call_details, request)
+        call = continuation(details, request)
+        self._chain.after(call, method, states)
+        return call
+
+    def intercept_unary_stream(
+        self, continuation: Any, client_call_details: Any, request: Any
+    ) -> Any:
+        details, method, states = self._chain.before(client_call_details, request)
+        call = continuation(details, request)
+        self._chain.after(call, method, states)
+        return call
+
+
+class _AioUnaryUnaryAdapter(grpc.aio.UnaryUnaryClientInterceptor):
+    """Runs ClientInterceptors around async unary-unary RPCs."""
+
+    def __init__(self, chain: _InterceptorChain):
+        self._chain = chain
+
+    async def intercept_unary_unary(
+        self, continuation: Any, client_call_details: Any, request: Any
+    ) -> Any:
+        details, method, states = self._chain.before(client_call_details, request)
+        call = await continuation(details, request)
+        self._chain.after(call, method, states)
+        return call
+
+
+class _AioUnaryStreamAdapter(grpc.aio.UnaryStreamClientInterceptor):
+    """Runs ClientInterceptors around async unary-stream RPCs."""
+
+    def __init__(self, chain: _InterceptorChain):
+        self._chain = chain
+
+    async def intercept_unary_stream(
+        self, continuation: Any, client_call_details: Any, request: Any
+    ) -> Any:
+        details, method, states = self._chain.before(client_call_details, request)
+        call = await continuation(details, request)
+        self._chain.after(call, method, states)
+        return call
+
+
+def _channel_interceptors(interceptors: Optional[Sequence[Any]], aio: bool) -> List[Any]:
+    """
+    Translate a client's interceptors argument into gRPC channel interceptors.
+
+    ClientInterceptors are combined into one adapter, placed where the first
+    of them appears; native gRPC interceptors are passed through unchanged.
+    """
+    if not interceptors:
+        return []
+    ours = [i for i in interceptors if isinstance(i, ClientInterceptor)]
+    result: List[Any] = []
+    for interceptor in interceptors:
+        if not isinstance(interceptor, ClientInterceptor):
+            result.append(interceptor)
+        elif interceptor is ours[0]:
+            chain = _InterceptorChain(ours, aio)
+            if aio:
+                result.extend([_AioUnaryUnaryAdapter(chain), _AioUnaryStreamAdapter(chain)])
+            else:
+                result.append(_SyncInterceptorAdapter(chain))
+    return result
@@ -0,0 +1,603 @@
+"""
+Adaptive concurrency limiting for vLLM gRPC client.
+
+A client created with concurrency_limiter=AdaptiveConcurrencyPolicy() caps
+the number of Generate RPCs it has in flight on its server. Requests over
+the cap wait in a bounded local queue instead of joining the server's
+queue, where they would only add to everyone's time to first token.
+
+The cap adapts to the time to first response of each Generate RPC:
+
+- "gradient" (the default) compares recent latency to its long-term
+  average and shrinks the cap as soon as latency grows, then probes upwards
+  again while latency stays flat.
+- "aimd" adds one slot per response while the cap is in use and cuts it by
+  backoff_ratio on overload (responses slower than ttft_target).
+
+Either way, RPCs failing with UNAVAILABLE, DEADLINE_EXCEEDED or
+RESOURCE_EXHAUSTED cut the cap by backoff_ratio.
+
+With max_server_requests, the server's own GetServerInfo.active_requests
+(polled by the limiter, or pushed by a load-balanced client's poller) also
+caps admissions, so the client sheds load before the server saturates even
+when other clients share it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import math
+import threading
+import time
+from typing import Any, Callable, Deque, List, Optional
+
+import grpc
+
+from vllm_grpc_client._exceptions import VLLMGrpcOverloadedError
+from vllm_grpc_client._interceptors import _on_aio_code
+from vllm_grpc_client._pool import _RPC_METHODS
+from vllm_grpc_client.proto import vllm_engine_pb2
+
+# Adaptive limit algorithms
+LIMIT_ALGORITHMS = ("gradient", "aimd")
+
+# Status codes that signal an overloaded server
+_OVERLOAD_CODES = frozenset(
+    (
+        grpc.StatusCode.UNAVAILABLE,
+        grpc.StatusCode.DEADLINE_EXCEEDED,
+        grpc.StatusCode.RESOURCE_EXHAUSTED,
+    )
+)
+
+
+class AdaptiveConcurrencyPolicy:
+    """
+    How many Generate RPCs a client may have in flight on one server.
+
+    Usage:
+        client = AsyncVLLMGrpcClient(
+            concurrency_limiter=AdaptiveConcurrencyPolicy(initial_limit=32, max_queue=500)
+        )
+        print(client.concurrency_limiter.stats)
+    """
+
+    def __init__(
+        self,
+        *,
+        algorithm: str = "gradient",
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 512,
+        max_queue: int = 1000,
+        queue_timeout: Optional[float] = 10.0,
+        backoff_ratio: float = 0.9,
+        smoothing: float = 0.2,
+        tolerance: float = 1.5,
+        long_window: int = 600,
+        ttft_target: Optional[float] = None,
+        max_server_requests: Optional[int] = None,
+        server_poll_interval: float = 1.0,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            algorithm: "gradient" or "aimd".
+            initial_limit: Cap before any latency was observed.
+            min_limit: Lower bound of the cap.
+            max_limit: Upper bound of the cap.
+            max_queue: Requests that may wait for a slot; more are rejected
+                with VLLMGrpcOverloadedError at once.
+            queue_timeout: Seconds a request may wait for a slot before it is
+                rejected with VLLMGrpcOverloadedError. None waits indefinitely.
+            backoff_ratio: Factor applied to the cap on overload.
+            smoothing: Weight of each new gradient estimate in the cap.
+            tolerance: Latency growth over the long-term average tolerated by
+                "gradient" before the cap shrinks.
+            long_window: Samples averaged into the long-term latency.
+            ttft_target: For "aimd", first responses slower than this many
+                seconds count as overload. None only reacts to errors.
+            max_server_requests: Cap on the server's active requests from all
+                clients, read from GetServerInfo. None disables the feedback.
+            server_poll_interval: Seconds between GetServerInfo polls.
+        """
+        if algorithm not in LIMIT_ALGORITHMS:
+            raise ValueError(
+                f"Unknown limit algorithm {algorithm!r}, expected one of {LIMIT_ALGORITHMS}"
+            )
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                "Expected 1 <= min_limit <= initial_limit <= max_limit, got "
+                f"{min_limit}, {initial_limit}, {max_limit}"
+            )
+        if not 0.0 < backoff_ratio < 1.0:
+            raise ValueError(f"backoff_ratio must be between 0 and 1, got {backoff_ratio}")
+        self.algorithm = algorithm
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.backoff_ratio = backoff_ratio
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self.long_window = long_window
+        self.ttft_target = ttft_target
+        self.max_server_requests = max_server_requests
+        self.server_poll_interval = server_poll_interval
+
+    def __repr__(self) -> str:
+        return (
+            f"AdaptiveConcurrencyPolicy(algorithm={self.algorithm!r}, "
+            f"initial_limit={self.initial_limit}, min_limit={self.min_limit}, "
+            f"max_limit={self.max_limit}, max_queue={self.max_queue})"
+        )
+
+
+class ConcurrencyLimiterStats:
+    """
+    State and counters of a concurrency limiter.
+
+    Attributes:
+        limit: Current cap on in-flight Generate RPCs, including the server
+            load cap.
+        estimated_limit: The adaptive estimate before the server load cap.
+        in_flight: Generate RPCs in flight.
+        queued: Requests waiting for a slot.
+        admitted: Requests admitted (immediately or after waiting).
+        waited: Requests admitted after waiting in the queue.
+        rejected: Requests rejected because the queue was full.
+        timed_out: Requests rejected after waiting queue_timeout.
+        server_active_requests: Last active_requests reported by the server,
+            or None without server feedback.
+    """
+
+    def __init__(self) -> None:
+        self.limit = 0
+        self.estimated_limit = 0.0
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.waited = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.server_active_requests: Optional[int] = None
+
+    def _copy(self) -> ConcurrencyLimiterStats:
+        stats = ConcurrencyLimiterStats()
+        stats.__dict__.update(self.__dict__)
+        return stats
+
+    def __repr__(self) -> str:
+        return (
+            f"ConcurrencyLimiterStats(limit={self.limit}, in_flight={self.in_flight}, "
+            f"queued={self.queued}, admitted={self.admitted}, rejected={self.rejected}, "
+            f"timed_out={self.timed_out})"
+        )
+
+
+class ConcurrencyLimiter:
+    """
+    Adaptive cap on one endpoint's in-flight Generate RPCs.
+
+    Created by clients given an AdaptiveConcurrencyPolicy and exposed as
+    client.concurrency_limiter (for load-balanced clients, on each
+    replica's client).
+    """
+
+    def __init__(self, policy: AdaptiveConcurrencyPolicy, endpoint: str, stub: Any, aio: bool):
+        """
+        Initialize the limiter.
+
+        Args:
+            policy: The concurrency policy.
+            endpoint: Endpoint address, used in errors.
+            stub: Stub used for GetServerInfo polls.
+            aio: Whether the stub is an async stub.
+        """
+        self.policy = policy
+        self.endpoint = endpoint
+        self._stub = stub
+        self._aio = aio
+        self._lock = threading.Lock()
+        # Sync callers wait on the condition; async callers on futures, in order
+        self._condition = threading.Condition(self._lock)
+        self._waiters: Deque[asyncio.Future] = collections.deque()
+        self._limit = float(policy.initial_limit)
+        self._in_flight = 0
+        self._queued = 0
+        self._long_latency: Optional[float] = None
+        self._samples = 0
+        self._server_cap: Optional[int] = None
+        self._server_polled = -math.inf
+        self._polling = False
+        self._stats = ConcurrencyLimiterStats()
+
+    @property
+    def limit(self) -> int:
+        """Current cap on in-flight Generate RPCs."""
+        return self._effective_limit()
+
+    @property
+    def in_flight(self) -> int:
+        """Generate RPCs currently in flight."""
+        return self._in_flight
+
+    @property
+    def stats(self) -> ConcurrencyLimiterStats:
+        """A snapshot of the limiter's state and counters."""
+        with self._lock:
+            stats = self._stats._copy()
+            stats.limit = self._effective_limit()
+            stats.estimated_limit = self._limit
+            stats.in_flight = self._in_flight
+            stats.queued = self._queued
+            return stats
+
+    def update_server_load(self, active_requests: int) -> None:
+        """
+        Record the server's active requests, as reported by GetServerInfo.
+
+        Load-balanced clients call this from their replica poller; other
+        clients poll by themselves when the policy sets max_server_requests.
+        """
+        maximum = self.policy.max_server_requests
+        with self._lock:
+            self._server_polled = time.monotonic()
+            self._stats.server_active_requests = active_requests
+            if maximum is not None:
+                # Requests from other clients count against the server's capacity
+                others = max(0, active_requests - self._in_flight)
+                self._server_cap = max(self.policy.min_limit, maximum - others)
+            self._wake()
+
+    def _effective_limit(self) -> int:
+        limit = int(self._limit)
+        if self._server_cap is not None:
+            limit = min(limit, self._server_cap)
+        return limit
+
+    def _poll_due(self) -> bool:
+        policy = self.policy
+        if policy.max_server_requests is None or self._polling:
+            return False
+        return time.monotonic() - self._server_polled >= policy.server_poll_interval
+
+    def _try_acquire(self) -> bool:
+        """Take a free slot if nobody is waiting; the lock must be held."""
+        if self._queued or self._in_flight >= self._effective_limit():
+            return False
+        self._in_flight += 1
+        self._stats.admitted += 1
+        return True
+
+    def _check_queue(self) -> None:
+        """Reject a request that cannot wait; the lock must be held."""
+        if self._queued >= self.policy.max_queue:
+            self._stats.rejected += 1
+            raise VLLMGrpcOverloadedError(self.endpoint, "queue full")
+
+    def _acquire(self) -> None:
+        """Wait for a slot (sync)."""
+        if self._poll_due():
+            self._start_poll()
+        with self._lock:
+            if self._try_acquire():
+                return
+            self._check_queue()
+            timeout = self.policy.queue_timeout
+            deadline = None if timeout is None else time.monotonic() + timeout
+            self._queued += 1
+            try:
+                while self._in_flight >= self._effective_limit():
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._stats.timed_out += 1
+                        raise VLLMGrpcOverloadedError(self.endpoint, "queue timeout")
+                    self._condition.wait(remaining)
+            finally:
+                self._queued -= 1
+            self._in_flight += 1
+            self._stats.admitted += 1
+            self._stats.waited += 1
+
+    async def _acquire_async(self) -> None:
+        """Wait for a slot (async); a slot is handed over by _wake()."""
+        with self._lock:
+            # A slot may have been freed since the caller last tried, with no waiter to wake
+            if self._try_acquire():
+                return
+            self._check_queue()
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self._queued += 1
+            self._wake()
+        try:
+            await asyncio.wait_for(waiter, self.policy.queue_timeout)
+        except BaseException as e:
+            with self._lock:
+                granted = waiter.done() and not waiter.cancelled()
+                if not granted:
+                    self._queued -= 1
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                    if isinstance(e, asyncio.TimeoutError):
+                        self._stats.timed_out += 1
+                        raise VLLMGrpcOverloadedError(self.endpoint, "queue timeout") from None
+                    raise
+                if not isinstance(e, asyncio.TimeoutError):
+                    # Cancelled right after a slot was handed over
+                    self._in_flight -= 1
+                    self._wake()
+                    raise
+        with self._lock:
+            self._stats.waited += 1
+
+    def _wake(self) -> None:
+        """Hand free slots to waiters; the lock must be held."""
+        free = self._effective_limit() - self._in_flight
+        if free <= 0:
+            return
+        if not self._aio:
+            self._condition.notify(free)
+            return
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            waiter.set_result(None)
+            self._queued -= 1
+            self._in_flight += 1
+            self._stats.admitted += 1
+            free -= 1
+
+    def _release(self, code: grpc.StatusCode) -> None:
+        """An admitted RPC finished."""
+        with self._lock:
+            self._in_flight -= 1
+            if code in _OVERLOAD_CODES:
+                self._backoff()
+            self._wake()
+
+    def _backoff(self) -> None:
+        policy = self.policy
+        self._limit = max(float(policy.min_limit), self._limit * policy.backoff_ratio)
+
+    def _sample(self, latency: float) -> None:
+        """Adapt the limit to the time to first response of an RPC."""
+        policy = self.policy
+        with self._lock:
+            limit = self._limit
+            if policy.algorithm == "aimd":
+                if policy.ttft_target is not None and latency > policy.ttft_target:
+                    self._backoff()
+                elif self._in_flight * 2 >= limit:
+                    self._limit = min(float(policy.max_limit), limit + 1.0)
+            else:
+                self._gradient(latency)
+            self._wake()
+
+    def _gradient(self, latency: float) -> None:
+        """Gradient update; the lock must be held."""
+        policy = self.policy
+        self._samples += 1
+        long_latency = self._long_latency
+        if long_latency is None:
+            self._long_latency = latency
+            return
+        # Exponential average over long_window samples, plain mean while warming up
+        weight = 1.0 / min(self._samples, policy.long_window)
+        long_latency += (latency - long_latency) * weight
+        if long_latency > 2.0 * latency:
+            # Latency dropped for good: let the average catch up faster
+            long_latency *= 0.95
+        self._long_latency = long_latency
+        limit = self._limit
+        if self._in_flight < limit / 2:
+            # Too little traffic to tell whether the limit is too high
+            return
+        gradient = max(0.5, min(1.0, policy.tolerance * long_latency / max(latency, 1e-9)))
+        estimate = limit * gradient + math.sqrt(limit)
+        limit = limit * (1.0 - policy.smoothing) + estimate * policy.smoothing
+        self._limit = max(float(policy.min_limit), min(float(policy.max_limit), limit))
+
+    def _start_poll(self) -> None:
+        self._polling = True
+        if self._aio:
+            try:
+                asyncio.get_running_loop().create_task(self._async_poll())
+            except RuntimeError:
+                self._polling = False
+        else:
+            threading.Thread(
+                target=self._poll, name="vllm-grpc-limiter-poll", daemon=True
+            ).start()
+
+    def _poll(self) -> None:
+        try:
+            info = self._stub.GetServerInfo(
+                vllm_engine_pb2.GetServerInfoRequest(), timeout=self.policy.server_poll_interval
+            )
+            self.update_server_load(info.active_requests)
+        except Exception:
+            # Keep the last known load; the next request triggers another poll
+            with self._lock:
+                self._server_polled = time.monotonic()
+        finally:
+            self._polling = False
+
+    async def _async_poll(self) -> None:
+        try:
+            info = await self._stub.GetServerInfo(
+                vllm_engine_pb2.GetServerInfoRequest(), timeout=self.policy.server_poll_interval
+            )
+            self.update_server_load(info.active_requests)
+        except Exception:
+            with self._lock:
+                self._server_polled = time.monotonic()
+        finally:
+            self._polling = False
+
+    def __repr__(self) -> str:
+        return (
+            f"ConcurrencyLimiter(endpoint={self.endpoint!r}, limit={self.limit}, "
+            f"in_flight={self._in_flight})"
+        )
+
+
+class _LimitedCall:
+    """Sync Generate call holding a limiter slot; times its first response."""
+
+    def __init__(self, call: Any, limiter: ConcurrencyLimiter):
+        self._call = call
+        self._limiter = limiter
+        self._started: Optional[float] = time.perf_counter()
+
+    def __iter__(self) -> _LimitedCall:
+        return self
+
+    def __next__(self) -> Any:
+        if self._started is None:
+            return next(self._call)
+        started, self._started = self._started, None
+        response = next(self._call)
+        self._limiter._sample(time.perf_counter() - started)
+        return response
+
+    def cancel(self) -> Any:
+        return self._call.cancel()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._call, name)
+
+
+class _AsyncLimitedCall:
+    """
+    Async Generate call that starts its RPC once the limiter grants a slot.
+
+    With a free slot the RPC starts at once; otherwise the first __anext__
+    waits in the limiter's queue. Done callbacks added before the RPC
+    starts are moved to it, or called with this object (whose code() is
+    CANCELLED) if it never starts.
+    """
+
+    def __init__(self, method: Any, request: Any, kwargs: Any, limiter: ConcurrencyLimiter):
+        self._method = method
+        self._request = request
+        self._kwargs = kwargs
+        self._limiter = limiter
+        self._call: Any = None
+        self._aiter: Any = None
+        self._callbacks: List[Callable[[Any], None]] = []
+        self._cancelled = False
+        self._started: Optional[float] = None
+        if limiter._poll_due():
+            limiter._start_poll()
+        with limiter._lock:
+            acquired = limiter._try_acquire()
+        if acquired:
+            self._start()
+
+    def _start(self) -> None:
+        limiter = self._limiter
+        try:
+            self._call = self._method(self._request, **self._kwargs)
+        except BaseException:
+            limiter._release(grpc.StatusCode.CANCELLED)
+            raise
+        self._started = time.perf_counter()
+        self._call.add_done_callback(lambda done: _on_aio_code(done, limiter._release))
+        for callback in self._callbacks:
+            self._call.add_done_callback(callback)
+        self._callbacks = []
+
+    def _finish_unstarted(self) -> None:
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+    def __aiter__(self) -> _AsyncLimitedCall:
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._call is None:
+            if self._cancelled:
+                raise asyncio.CancelledError()
+            try:
+                await self._limiter._acquire_async()
+            except BaseException:
+                self._finish_unstarted()
+                raise
+            if self._cancelled:
+                self._limiter._release(grpc.StatusCode.CANCELLED)
+                self._finish_unstarted()
+                raise asyncio.CancelledError()
+            self._start()
+        if self._aiter is None:
+            self._aiter = self._call.__aiter__()
+        if self._started is None:
+            return await self._aiter.__anext__()
+        started, self._started = self._started, None
+        response = await self._aiter.__anext__()
+        self._limiter._sample(time.perf_counter() - started)
+        return response
+
+    def add_done_callback(self, callback: Callable[[Any], None]) -> None:
+        if self._call is not None:
+            self._call.add_done_callback(callback)
+        else:
+            self._callbacks.append(callback)
+
+    def cancel(self) -> bool:
+        if self._call is not None:
+            return bool(self._call.cancel())
+        if not self._cancelled:
+            self._cancelled = True
+            self._finish_unstarted()
+        return True
+
+    async def code(self) -> grpc.StatusCode:
+        if self._call is not None:
+            return await self._call.code()
+        return grpc.StatusCode.CANCELLED
+
+    def __getattr__(self, name: str) -> Any:
+        call = self.__dict__.get("_call")
+        if call is None:
+            raise AttributeError(name)
+        return getattr(call, name)
+
+
+class _LimitedGenerate:
+    """Generate method that runs RPCs within a concurrency limiter's slots."""
+
+    __slots__ = ("_method", "_limiter", "_aio")
+
+    def __init__(self, method: Any, limiter: ConcurrencyLimiter, aio: bool):
+        self._method = method
+        self._limiter = limiter
+        self._aio = aio
+
+    def __call__(self, request: Any, **kwargs: Any) -> Any:
+        limiter = self._limiter
+        if self._aio:
+            return _AsyncLimitedCall(self._method, request, kwargs, limiter)
+        limiter._acquire()
+        try:
+            call = self._method(request, **kwargs)
+        except BaseException:
+            limiter._release(grpc.StatusCode.CANCELLED)
+            raise
+        call.add_done_callback(lambda done: limiter._release(done.code()))
+        return _LimitedCall(call, limiter)
+
+
+class _LimitedStub:
+    """VllmEngineStub look-alike whose Generate RPCs go through a concurrency limiter."""
+
+    def __init__(self, stub: Any, limiter: ConcurrencyLimiter, aio: bool):
+        for name in _RPC_METHODS:
+            setattr(self, name, getattr(stub, name))
+        self.Generate = _LimitedGenerate(stub.Generate, limiter, aio)
@@ -0,0 +1,670 @@
+"""
+Replica-aware load balancing for vLLM gRPC client.
+
+Provides sync (LoadBalancedClient) and async (AsyncLoadBalancedClient) clients
+that spread requests over several vLLM replicas. Each replica is polled in the
+background with HealthCheck and GetServerInfo, and every request goes to the
+available replica with the fewest server-reported active requests plus
+requests this client still has in flight on it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import itertools
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from vllm_grpc_client._abort import ABORT_TIMEOUT, AbortCoalescer, AsyncAbortCoalescer
+from vllm_grpc_client._cache import ResponseCache
+from vllm_grpc_client._circuit import CLOSED
+from vllm_grpc_client._client import AsyncVLLMGrpcClient, VLLMGrpcClient
+from vllm_grpc_client._embedding_cache import EmbeddingCache
+from vllm_grpc_client._pool import _RoutedMethod, _RoutedStub
+from vllm_grpc_client._ratelimit import RateLimiter
+from vllm_grpc_client._retry import RetryStats, _Retrier, _RetryingStub
+from vllm_grpc_client._scheduler import RequestScheduler
+from vllm_grpc_client._singleflight import SingleFlight
+from vllm_grpc_client._timing import TimingStats
+from vllm_grpc_client.proto import vllm_engine_pb2
+
+# Default interval between background replica polls (in seconds)
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Finished requests whose replica is remembered, for aborts sent after they end
+RELEASED_OWNERS = 4096
+
+# Endpoint specification: "host:port" or (host, port)
+Endpoint = Union[str, Tuple[str, int]]
+
+
+def _parse_endpoint(endpoint: Endpoint) -> Tuple[str, int]:
+    """Split an endpoint into host and port."""
+    if isinstance(endpoint, tuple):
+        host, port = endpoint
+        return host, int(port)
+    host, sep, port_text = endpoint.rpartition(":")
+    if not sep or not host:
+        raise ValueError(f"Endpoint must be 'host:port', got {endpoint!r}")
+    return host, int(port_text)
+
+
+class Replica:
+    """
+    Load-balancing state of one vLLM replica.
+
+    Attributes:
+        endpoint: The replica address as "host:port".
+        client: The per-replica VLLMGrpcClient or AsyncVLLMGrpcClient.
+        healthy: Whether the last HealthCheck succeeded.
+        is_paused: Whether the last GetServerInfo reported the server as paused.
+        active_requests: Active requests reported by the last GetServerInfo.
+        in_flight: Requests this client currently has in flight on the replica.
+        last_error: Error message from the last failed poll, if any.
+    """
+
+    def __init__(self, endpoint: str, client: Any):
+        self.endpoint = endpoint
+        self.client = client
+        # Optimistic until the first poll says otherwise
+        self.healthy = True
+        self.is_paused = False
+        self.active_requests = 0
+        self.in_flight = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def available(self) -> bool:
+        """
+        Whether the replica may receive new requests.
+
+        With a circuit breaker, the replica's circuit must also be closed.
+        Asking has no side effects; polls move an open circuit to half-open.
+        """
+        if not self.healthy or self.is_paused:
+            return False
+        breaker = getattr(self.client, "circuit_breaker", None)
+        return breaker is None or breaker.state == CLOSED
+
+    @property
+    def load(self) -> int:
+        """Load score used for replica selection."""
+        return self.active_requests + self.in_flight
+
+    def __repr__(self) -> str:
+        return (
+            f"Replica(endpoint={self.endpoint!r}, healthy={self.healthy}, "
+            f"is_paused={self.is_paused}, active_requests={self.active_requests}, "
+            f"in_flight={self.in_flight})"
+        )
+
+
+class _ReplicaSelector:
+    """Selector over replicas for _RoutedStub (see vllm_grpc_client._pool)."""
+
+    def __init__(self, replicas: List[Replica]):
+        self._replicas = replicas
+        self._stubs = [replica.client._stub for replica in replicas]
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        # request_id -> replica index, for routing aborts to the owning replica
+        self._owners: Dict[str, int] = {}
+        # Owners of finished requests, oldest first. A cancelled call finishes
+        # before its Abort is flushed, so the owner must outlive the call.
+        self._released: collections.OrderedDict[str, int] = collections.OrderedDict()
+
+    @property
+    def stubs(self) -> List[Any]:
+        return self._stubs
+
+    def pick(self) -> int:
+        """Index of the available replica with the lowest load."""
+        replicas = self._replicas
+        size = len(replicas)
+        # Rotate the starting point so ties are spread across replicas
+        start = next(self._counter) % size
+        order = [(start + offset) % size for offset in range(size)]
+        candidates = [i for i in order if replicas[i].available]
+        if not candidates:
+            # Nothing looks available: fail open rather than rejecting every request
+            candidates = order
+        return min(candidates, key=lambda i: replicas[i].load)
+
+    def acquire(self, request: Any = None) -> int:
+        with self._lock:
+            index = self.pick()
+            self._replicas[index].in_flight += 1
+            request_id = getattr(request, "request_id", None)
+            if request_id:
+                self._owners[request_id] = index
+        return index
+
+    def release(self, index: int, request: Any = None) -> None:
+        with self._lock:
+            self._replicas[index].in_flight -= 1
+            request_id = getattr(request, "request_id", None)
+            if request_id and self._owners.get(request_id) == index:
+                del self._owners[request_id]
+                self._released[request_id] = index
+                if len(self._released) > RELEASED_OWNERS:
+                    self._released.popitem(last=False)
+
+    def group_by_owner(self, request_ids: Sequence[str]) -> Dict[int, List[str]]:
+        """
+        Group request IDs by the replica serving them.
+
+        IDs this client did not route, or that finished too long ago to be
+        remembered, are sent to every replica.
+        """
+        groups: Dict[int, List[str]] = {}
+        unknown: List[str] = []
+        with self._lock:
+            for request_id in request_ids:
+                index = self._owners.get(request_id)
+                if index is None:
+                    index = self._released.pop(request_id, None)
+                if index is None:
+                    unknown.append(request_id)
+                else:
+                    groups.setdefault(index, []).append(request_id)
+        if unknown:
+            for index in range(len(self._replicas)):
+                groups.setdefault(index, []).extend(unknown)
+        return groups
+
+
+class _BalancedAbort:
+    """Abort RPC that fans request IDs out to the replicas that own them."""
+
+    def __init__(self, selector: _ReplicaSelector, aio: bool):
+        self._selector = selector
+        self._aio = aio
+
+    def __call__(self, request: vllm_engine_pb2.AbortRequest, **kwargs: Any) -> Any:
+        """
+        Send each replica its Abort, returning the responses in replica order.
+
+        A failing replica does not stop the others from being aborted; the
+        first error is raised once every Abort was sent.
+        """
+        groups = self._selector.group_by_owner(list(request.request_ids))
+        stubs = self._selector.stubs
+        aborts = [
+            (stubs[index], vllm_engine_pb2.AbortRequest(request_ids=ids))
+            for index, ids in sorted(groups.items())
+        ]
+        if self._aio:
+            return self._abort_async(aborts, kwargs)
+        results: List[Any] = []
+        for stub, abort in aborts:
+            try:
+                results.append(stub.Abort(abort, **kwargs))
+            except Exception as e:
+                results.append(e)
+        return _raise_first_error(results)
+
+    async def _abort_async(self, aborts: List[Tuple[Any, Any]], kwargs: Dict[str, Any]) -> Any:
+        results = await asyncio.gather(
+            *[stub.Abort(abort, **kwargs) for stub, abort in aborts], return_exceptions=True
+        )
+        return _raise_first_error(results)
+
+
+def _raise_first_error(results: List[Any]) -> List[Any]:
+    """The responses of the per-replica Aborts, or the first error among them."""
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+class _BalancedStub(_RoutedStub):
+    """Routed stub whose Abort follows each request to its replica."""
+
+    def __init__(self, selector: _ReplicaSelector, aio: bool):
+        super().__init__(selector)
+        self.Abort = _BalancedAbort(selector, aio)
+
+
+def _apply_server_info(replica: Replica, healthy: bool, info: Any) -> None:
+    """Record the outcome of one replica poll."""
+    replica.healthy = healthy
+    replica.is_paused = info.is_paused
+    replica.active_requests = info.active_requests
+    replica.last_error = None
+    limiter = getattr(replica.client, "concurrency_limiter", None)
+    if limiter is not None:
+        limiter.update_server_load(info.active_requests)
+    breaker = getattr(replica.client, "circuit_breaker", None)
+    if breaker is not None:
+        # Starts the breaker's probe once an open circuit's open_duration elapsed
+        breaker.allow_request()
+
+
+class LoadBalancedClient:
+    """
+    Synchronous client that balances requests over several vLLM replicas.
+
+    Replicas are polled in a background thread. Each request goes to the
+    healthy, unpaused replica with the fewest `active_requests` plus this
+    client's own in-flight requests on it.
+
+    Usage:
+        client = LoadBalancedClient(["10.0.0.1:9000", "10.0.0.2:9000"])
+        completion = client.completions.create(prompt="Hello", max_tokens=10)
+        print(client.replicas)
+        client.close()
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[Endpoint],
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        poll_timeout: Optional[float] = None,
+        **client_kwargs: Any,
+    ):
+        """
+        Initialize the load-balanced client.
+
+        Args:
+            endpoints: Replica addresses as "host:port" strings or (host, port) tuples.
+            poll_interval: Seconds between background replica polls.
+            poll_timeout: Timeout for each poll RPC. Defaults to poll_interval.
+            **client_kwargs: Extra arguments for each replica's VLLMGrpcClient
+                (for example secure, timeout, pool_size, fast_types, metrics,
+                retry_policy, circuit_breaker or concurrency_limiter; retries
+                may pick a different replica, and each replica gets its own
+                circuit breaker and concurrency limiter). A rate_limiter charges
+                requests, and a response_cache and singleflight answer them,
+                before a replica is picked. So does an embedding_cache for
+                embeddings.
+        """
+        if not endpoints:
+            raise ValueError("LoadBalancedClient requires at least one endpoint")
+
+        # Retries happen here, so a retried request can move to another replica
+        retry_policy = client_kwargs.pop("retry_policy", None)
+        self._retrier = _Retrier(retry_policy) if retry_policy is not None else None
+        self._rate_limiter: Optional[RateLimiter] = client_kwargs.pop("rate_limiter", None)
+        self._response_cache: Optional[ResponseCache] = client_kwargs.pop("response_cache", None)
+        self._singleflight: Optional[SingleFlight] = client_kwargs.pop("singleflight", None)
+        self._embedding_cache: Optional[EmbeddingCache] = client_kwargs.pop(
+            "embedding_cache", None
+        )
+
+        self._replicas: List[Replica] = []
+        for endpoint in endpoints:
+            host, port = _parse_endpoint(endpoint)
+            client = VLLMGrpcClient(host=host, port=port, **client_kwargs)
+            self._replicas.append(Replica(client._address, client))
+
+        self._selector = _ReplicaSelector(self._replicas)
+        self._stub: Any = _BalancedStub(self._selector, aio=False)
+        if self._retrier is not None:
+            self._stub = _RetryingStub(self._stub, self._retrier, aio=False)
+        self._timeout = self._replicas[0].client._timeout
+        self._fast_types = self._replicas[0].client._fast_types
+        self._abort_coalescer = AbortCoalescer(
+            self._stub,
+            max_delay=self._replicas[0].client._abort_coalescer._max_delay,
+            max_batch_size=self._replicas[0].client._abort_coalescer._max_batch_size,
+        )
+        self._timing_stats = TimingStats()
+        if client_kwargs.get("metrics") is not None:
+            # Replicas record RPCs; requests and aborts are tracked here
+            client_kwargs["metrics"].attach(self)
+        self._model_name: str = ""
+
+        self._poll_interval = poll_interval
+        self._poll_timeout = poll_timeout or poll_interval
+        self._stop = threading.Event()
+        self._poller = threading.Thread(
+            target=self._poll_loop, name="vllm-grpc-lb-poller", daemon=True
+        )
+        self._poller.start()
+
+        # Initialize resources lazily
+        self._completions: Optional["Completions"] = None
+        self._embeddings: Optional["Embeddings"] = None
+        self._models: Optional["Models"] = None
+
+    @property
+    def replicas(self) -> List[Replica]:
+        """Load-balancing state of every replica."""
+        return self._replicas
+
+    @property
+    def abort_coalescer(self) -> AbortCoalescer:
+        """Batches Abort RPCs for abandoned requests; see its stats for metrics."""
+        return self._abort_coalescer
+
+    @property
+    def timing_stats(self) -> TimingStats:
+        """TTFT, TPOT, tokens/s and queueing delay histograms of finished requests."""
+        return self._timing_stats
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        """Retry counters (all zero without a retry_policy)."""
+        return self._retrier.stats if self._retrier is not None else RetryStats()
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """The completion rate limiter, or None without one."""
+        return self._rate_limiter
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """The completion response cache, or None without one."""
+        return self._response_cache
+
+    @property
+    def singleflight(self) -> Optional[SingleFlight]:
+        """The in-flight completion de-duplication, or None without it."""
+        return self._singleflight
+
+    @property
+    def embedding_cache(self) -> Optional[EmbeddingCache]:
+        """The embedding cache, or None without one."""
+        return self._embedding_cache
+
+    @property
+    def completions(self) -> "Completions":
+        """Completions resource for text generation."""
+        if self._completions is None:
+            from vllm_grpc_client.resources.completions import Completions
+
+            self._completions = Completions(self)
+        return self._completions
+
+    @property
+    def embeddings(self) -> "Embeddings":
+        """Embeddings resource (not yet implemented in vLLM gRPC server)."""
+        if self._embeddings is None:
+            from vllm_grpc_client.resources.embeddings import Embeddings
+
+            self._embeddings = Embeddings(self)
+        return self._embeddings
+
+    @property
+    def models(self) -> "Models":
+        """Models resource for model information (served by any replica)."""
+        if self._models is None:
+            from vllm_grpc_client.resources.models import Models
+
+            self._models = Models(self)
+        return self._models
+
+    def abort(self, request_ids: List[str], timeout: Optional[float] = None) -> None:
+        """
+        Abort running requests on whichever replicas are serving them.
+
+        Args:
+            request_ids: List of request IDs to abort.
+            timeout: Request timeout in seconds.
+        """
+        from vllm_grpc_client.resources.health import Health
+
+        Health(self).abort(request_ids, timeout=timeout)
+
+    def refresh(self) -> None:
+        """Poll every replica once, updating its health and load."""
+        for replica in self._replicas:
+            self._poll_replica(replica)
+
+    def _poll_replica(self, replica: Replica) -> None:
+        try:
+            health = replica.client.health.check(timeout=self._poll_timeout)
+            info = replica.client.health.server_info(timeout=self._poll_timeout)
+            _apply_server_info(replica, health.healthy, info)
+            if not self._model_name and health.healthy:
+                self._model_name = replica.client.models.retrieve(
+                    timeout=self._poll_timeout
+                ).model_path
+        except Exception as e:
+            replica.healthy = False
+            replica.last_error = str(e)
+
+    def _poll_loop(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self._poll_interval)
+
+    def close(self) -> None:
+        """Stop polling, send pending aborts and close every replica's channel."""
+        self._stop.set()
+        self._abort_coalescer.close(timeout=ABORT_TIMEOUT)
+        for replica in self._replicas:
+            replica.client.close()
+
+    def __enter__(self) -> "LoadBalancedClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class AsyncLoadBalancedClient:
+    """
+    Asynchronous client that balances requests over several vLLM replicas.
+
+    Replicas are polled by a background task started on first use. Each
+    request goes to the healthy, unpaused replica with the fewest
+    `active_requests` plus this client's own in-flight requests on it.
+
+    Usage:
+        async with AsyncLoadBalancedClient(["10.0.0.1:9000", "10.0.0.2:9000"]) as client:
+            completion = await client.completions.create(prompt="Hello", max_tokens=10)
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[Endpoint],
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        poll_timeout: Optional[float] = None,
+        **client_kwargs: Any,
+    ):
+        """
+        Initialize the async load-balanced client.
+
+        See LoadBalancedClient.__init__ for detailed parameter documentation.
+        A scheduler in client_kwargs also admits requests before a replica is picked.
+        """
+        if not endpoints:
+            raise ValueError("AsyncLoadBalancedClient requires at least one endpoint")
+
+        # Retries happen here, so a retried request can move to another replica
+        retry_policy = client_kwargs.pop("retry_policy", None)
+        self._retrier = _Retrier(retry_policy) if retry_policy is not None else None
+        self._rate_limiter: Optional[RateLimiter] = client_kwargs.pop("rate_limiter", None)
+        self._response_cache: Optional[ResponseCache] = client_kwargs.pop("response_cache", None)
+        self._singleflight: Optional[SingleFlight] = client_kwargs.pop("singleflight", None)
+        self._embedding_cache: Optional[EmbeddingCache] = client_kwargs.pop(
+            "embedding_cache", None
+        )
+        # One scheduler in front of all replicas
+        self._scheduler: Optional[RequestScheduler] = client_kwargs.pop("scheduler", None)
+
+        self._replicas: List[Replica] = []
+        for endpoint in endpoints:
+            host, port = _parse_endpoint(endpoint)
+            client = AsyncVLLMGrpcClient(host=host, port=port, **client_kwargs)
+            self._replicas.append(Replica(client._address, client))
+
+        self._selector = _ReplicaSelector(self._replicas)
+        self._stub: Any = _BalancedStub(self._selector, aio=True)
+        # Start the poller on the first routed RPC, when an event loop is running
+        self._stub.Generate = _PollingMethod(self, self._stub.Generate)
+        self._stub.Embed = _PollingMethod(self, self._stub.Embed)
+        if self._retrier is not None:
+            self._stub = _RetryingStub(self._stub, self._retrier, aio=True)
+        self._timeout = self._replicas[0].client._timeout
+        self._fast_types = self._replicas[0].client._fast_types
+        self._abort_coalescer = AsyncAbortCoalescer(
+            self._stub,
+            max_delay=self._replicas[0].client._abort_coalescer._max_delay,
+            max_batch_size=self._replicas[0].client._abort_coalescer._max_batch_size,
+        )
+        self._timing_stats = TimingStats()
+        if client_kwargs.get("metrics") is not None:
+            # Replicas record RPCs; requests and aborts are tracked here
+            client_kwargs["metrics"].attach(self)
+        self._model_name: str = ""
+
+        self._poll_interval = poll_interval
+        self._poll_timeout = poll_timeout or poll_interval
+        self._poller: Optional[asyncio.Task] = None
+
+        # Initialize resources lazily
+        self._completions: Optional["AsyncCompletions"] = None
+        self._embeddings: Optional["AsyncEmbeddings"] = None
+        self._models: Optional["AsyncModels"] = None
+
+    @property
+    def replicas(self) -> List[Replica]:
+        """Load-balancing state of every replica."""
+        return self._replicas
+
+    @property
+    def abort_coalescer(self) -> AsyncAbortCoalescer:
+        """Batches Abort RPCs for abandoned requests; see its stats for metrics."""
+        return self._abort_coalescer
+
+    @property
+    def timing_stats(self) -> TimingStats:
+        """TTFT, TPOT, tokens/s and queueing delay histograms of finished requests."""
+        return self._timing_stats
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        """Retry counters (all zero without a retry_policy)."""
+        return self._retrier.stats if self._retrier is not None else RetryStats()
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """The completion rate limiter, or None without one."""
+        return self._rate_limiter
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """The completion response cache, or None without one."""
+        return self._response_cache
+
+    @property
+    def singleflight(self) -> Optional[SingleFlight]:
+        """The in-flight completion de-duplication, or None without it."""
+        return self._singleflight
+
+    @property
+    def embedding_cache(self) -> Optional[EmbeddingCache]:
+        """The embedding cache, or None without one."""
+        return self._embedding_cache
+
+    @property
+    def scheduler(self) -> Optional[RequestScheduler]:
+        """The completion request scheduler, or None without one."""
+        return self._scheduler
+
+    @property
+    def completions(self) -> "AsyncCompletions":
+        """Completions resource for text generation."""
+        if self._completions is None:
+            from vllm_grpc_client.resources.completions import AsyncCompletions
+
+            self._completions = AsyncCompletions(self)
+        return self._completions
+
+    @property
+    def embeddings(self) -> "AsyncEmbeddings":
+        """Embeddings resource (not yet implemented in vLLM gRPC server)."""
+        if self._embeddings is None:
+            from vllm_grpc_client.resources.embeddings import AsyncEmbeddings
+
+            self._embeddings = AsyncEmbeddings(self)
+        return self._embeddings
+
+    @property
+    def models(self) -> "AsyncModels":
+        """Models resource for model information (served by any replica)."""
+        if self._models is None:
+            from vllm_grpc_client.resources.models import AsyncModels
+
+            self._models = AsyncModels(self)
+        return self._models
+
+    async def abort(self, request_ids: List[str], timeout: Optional[float] = None) -> None:
+        """
+        Abort running requests on whichever replicas are serving them.
+
+        Args:
+            request_ids: List of request IDs to abort.
+            timeout: Request timeout in seconds.
+        """
+        from vllm_grpc_client.resources.health import AsyncHealth
+
+        await AsyncHealth(self).abort(request_ids, timeout=timeout)
+
+    async def refresh(self) -> None:
+        """Poll every replica once, updating its health and load."""
+        await asyncio.gather(*[self._poll_replica(replica) for replica in self._replicas])
+
+    def start(self) -> None:
+        """Start background polling. Must be called with a running event loop."""
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.get_running_loop().create_task(self._poll_loop())
+
+    async def _poll_replica(self, replica: Replica) -> None:
+        try:
+            health = await replica.client.health.check(timeout=self._poll_timeout)
+            info = await replica.client.health.server_info(timeout=self._poll_timeout)
+            _apply_server_info(replica, health.healthy, info)
+            if not self._model_name and health.healthy:
+                model_info = await replica.client.models.retrieve(timeout=self._poll_timeout)
+                self._model_name = model_info.model_path
+        except Exception as e:
+            replica.healthy = False
+            replica.last_error = str(e)
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self._poll_interval)
+
+    async def close(self) -> None:
+        """Stop polling, send pending aborts and close every replica's channel."""
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+        await self._abort_coalescer.aclose()
+        for replica in self._replicas:
+            await replica.client.close()
+
+    async def __aenter__(self) -> "AsyncLoadBalancedClient":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+
+class _PollingMethod:
+    """Wraps a routed method so the first call starts the async client's poller."""
+
+    def __init__(self, client: AsyncLoadBalancedClient, method: _RoutedMethod):
+        self._client = client
+        self._method = method
+
+    def __call__(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        if self._client._poller is None:
+            self._client.start()
+        return self._method(request, *args, **kwargs)
+
+
+# Type hints for lazy imports
+if False:  # TYPE_CHECKING equivalent that doesn't cause import issues
+    from vllm_grpc_client.resources.completions import AsyncCompletions, Completions
+    from vllm_grpc_client.resources.embeddings import AsyncEmbeddings, Embeddings
+    from vllm_grpc_client.resources.models import AsyncModels, Models
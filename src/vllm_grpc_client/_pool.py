@@ -0,0 +1,178 @@
+"""
+Channel pooling for vLLM gRPC client.
+
+A single gRPC channel multiplexes every RPC over one HTTP/2 connection, so all
+Generate streams share that connection's concurrent-stream limit and suffer
+head-of-line blocking under heavy load. ChannelPool holds several sub-channels
+to the same server and spreads RPCs across them.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from typing import Any, Callable, List, Sequence
+
+from vllm_grpc_client.proto import vllm_engine_pb2_grpc
+
+# Channel selection policies supported by ChannelPool
+POOL_POLICIES = ("round_robin", "least_in_flight")
+
+# RPC method names exposed by VllmEngineStub
+_RPC_METHODS = (
+    "Generate",
+    "Embed",
+    "HealthCheck",
+    "Abort",
+    "GetModelInfo",
+    "GetServerInfo",
+)
+
+
+class ChannelPool:
+    """
+    A fixed set of gRPC channels to one server with per-channel in-flight tracking.
+
+    Each RPC acquires a channel index, and releases it when the call finishes.
+    With the "round_robin" policy channels are used in turn; with
+    "least_in_flight" the channel with the fewest unfinished RPCs is chosen.
+
+    Usage:
+        client = AsyncVLLMGrpcClient(host="localhost", port=9000, pool_size=4)
+        print(client.pool.in_flight)
+    """
+
+    def __init__(
+        self,
+        channels: Sequence[Any],
+        policy: str = "round_robin",
+    ):
+        """
+        Initialize the channel pool.
+
+        Args:
+            channels: The sync or async gRPC channels to pool.
+            policy: Channel selection policy, "round_robin" or "least_in_flight".
+        """
+        if not channels:
+            raise ValueError("ChannelPool requires at least one channel")
+        if policy not in POOL_POLICIES:
+            raise ValueError(f"Unknown pool policy {policy!r}, expected one of {POOL_POLICIES}")
+
+        self._channels = list(channels)
+        self._stubs = [vllm_engine_pb2_grpc.VllmEngineStub(c) for c in self._channels]
+        self._policy = policy
+        self._in_flight = [0] * len(self._channels)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def channels(self) -> List[Any]:
+        """The pooled gRPC channels."""
+        return self._channels
+
+    @property
+    def stubs(self) -> List[vllm_engine_pb2_grpc.VllmEngineStub]:
+        """One VllmEngineStub per pooled channel."""
+        return self._stubs
+
+    @property
+    def policy(self) -> str:
+        """The channel selection policy."""
+        return self._policy
+
+    @property
+    def in_flight(self) -> List[int]:
+        """Number of unfinished RPCs on each channel."""
+        with self._lock:
+            return list(self._in_flight)
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def acquire(self, request: Any = None) -> int:
+        """
+        Pick a channel for a new RPC and mark it as in flight.
+
+        Args:
+            request: The request message (unused, accepted for selector compatibility).
+
+        Returns:
+            Index of the selected channel.
+        """
+        size = len(self._channels)
+        start = next(self._counter) % size
+        with self._lock:
+            if self._policy == "least_in_flight":
+                index = start
+                lowest = self._in_flight[start]
+                for offset in range(1, size):
+                    candidate = (start + offset) % size
+                    if self._in_flight[candidate] < lowest:
+                        index = candidate
+                        lowest = self._in_flight[candidate]
+            else:
+                index = start
+            self._in_flight[index] += 1
+        return index
+
+    def release(self, index: int, request: Any = None) -> None:
+        """Mark an RPC on the given channel as finished."""
+        with self._lock:
+            self._in_flight[index] -= 1
+
+
+def _when_done(result: Any, callback: Callable[[], None]) -> None:
+    """
+    Run callback once an RPC started by a stub method has finished.
+
+    Streaming calls and async calls expose add_done_callback; blocking sync
+    unary calls have already finished by the time they return a message.
+    """
+    add_done_callback = getattr(result, "add_done_callback", None)
+    if add_done_callback is None:
+        callback()
+    else:
+        add_done_callback(lambda _: callback())
+
+
+class _RoutedMethod:
+    """Callable that dispatches one RPC method to the stub picked by a selector."""
+
+    __slots__ = ("_selector", "_name")
+
+    def __init__(self, selector: Any, name: str):
+        self._selector = selector
+        self._name = name
+
+    def __call__(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        selector = self._selector
+        index = selector.acquire(request)
+        try:
+            result = getattr(selector.stubs[index], self._name)(request, *args, **kwargs)
+        except BaseException:
+            selector.release(index, request)
+            raise
+        _when_done(result, lambda: selector.release(index, request))
+        return result
+
+
+class _RoutedStub:
+    """
+    VllmEngineStub look-alike that routes every RPC through a selector.
+
+    A selector provides a `stubs` list plus `acquire(request) -> index` and
+    `release(index, request)`, as ChannelPool does.
+    """
+
+    # One _RoutedMethod per RPC, set in __init__
+    Generate: Any
+    Embed: Any
+    HealthCheck: Any
+    Abort: Any
+    GetModelInfo: Any
+    GetServerInfo: Any
+
+    def __init__(self, selector: Any):
+        for name in _RPC_METHODS:
+            setattr(self, name, _RoutedMethod(selector, name))
@@ -0,0 +1,339 @@
+"""
+Token-bucket rate limiting for vLLM gRPC client.
+
+A client created with rate_limiter=RateLimiter(...) charges every
+completion against its tenant's quota before the Generate RPC is sent:
+
+- one request against requests_per_second, and
+- the estimated prompt tokens against tokens_per_second. Token-id prompts
+  are counted exactly; text prompts are counted with the limiter's
+  tokenizer (or the request's decoder), else estimated from their length.
+
+When the GenerateComplete arrives, the charge is corrected to the actual
+prompt plus completion tokens, so long generations draw down the budget
+of the tenant's following requests. Requests that get no response at all
+(rejected by the client's scheduler or concurrency limiter, or failed
+before the server answered) are refunded. Callers over budget wait for it
+to refill, or are rejected with VLLMGrpcRateLimitedError.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from vllm_grpc_client._exceptions import VLLMGrpcRateLimitedError
+from vllm_grpc_client._types import TokenizedInput
+from vllm_grpc_client.utils import TokenDecoder
+
+# Tenant of requests created without one
+DEFAULT_TENANT = ""
+
+# Characters per token assumed for text prompts without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Tenants' buckets held before those that refilled are dropped
+PRUNE_THRESHOLD = 1024
+
+
+class RateLimit:
+    """
+    A request and token quota.
+
+    Usage:
+        RateLimit(requests_per_second=5, tokens_per_second=20_000)
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        tokens_per_second: Optional[float] = None,
+        *,
+        request_burst: Optional[float] = None,
+        token_burst: Optional[float] = None,
+    ):
+        """
+        Initialize the quota.
+
+        Args:
+            requests_per_second: Sustained request rate. None for no request limit.
+            tokens_per_second: Sustained prompt plus completion token rate.
+                None for no token limit.
+            request_burst: Requests that may be sent at once after an idle
+                period. Defaults to one second of requests_per_second (at least 1).
+            token_burst: Tokens that may be charged at once after an idle
+                period. Defaults to one second of tokens_per_second.
+        """
+        if requests_per_second is None and tokens_per_second is None:
+            raise ValueError("RateLimit needs requests_per_second and/or tokens_per_second")
+        for name, value in (
+            ("requests_per_second", requests_per_second),
+            ("tokens_per_second", tokens_per_second),
+            ("request_burst", request_burst),
+            ("token_burst", token_burst),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive, got {value}")
+        self.requests_per_second = requests_per_second
+        self.tokens_per_second = tokens_per_second
+        if request_burst is None and requests_per_second is not None:
+            request_burst = max(1.0, requests_per_second)
+        if token_burst is None and tokens_per_second is not None:
+            token_burst = tokens_per_second
+        self.request_burst = request_burst
+        self.token_burst = token_burst
+
+    def __repr__(self) -> str:
+        return (
+            f"RateLimit(requests_per_second={self.requests_per_second}, "
+            f"tokens_per_second={self.tokens_per_second}, "
+            f"request_burst={self.request_burst}, token_burst={self.token_burst})"
+        )
+
+
+class RateLimiterStats:
+    """
+    Counters of a rate limiter.
+
+    Attributes:
+        admitted: Requests admitted (immediately or after waiting).
+        delayed: Requests admitted after waiting for budget.
+        rejected: Requests rejected for lack of budget.
+        wait_seconds: Total seconds admitted requests waited.
+        estimated_tokens: Prompt tokens charged up front.
+        reconciled_tokens: Tokens charged (or refunded, when negative) once
+            actual usage arrived.
+    """
+
+    def __init__(self) -> None:
+        self.admitted = 0
+        self.delayed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.estimated_tokens = 0
+        self.reconciled_tokens = 0
+
+    def _copy(self) -> RateLimiterStats:
+        stats = RateLimiterStats()
+        stats.__dict__.update(self.__dict__)
+        return stats
+
+    def __repr__(self) -> str:
+        return (
+            f"RateLimiterStats(admitted={self.admitted}, delayed={self.delayed}, "
+            f"rejected={self.rejected}, estimated_tokens={self.estimated_tokens}, "
+            f"reconciled_tokens={self.reconciled_tokens})"
+        )
+
+
+class _TokenBucket:
+    """Bucket refilled at rate up to burst; charges may take it below zero."""
+
+    __slots__ = ("rate", "burst", "level", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.level = burst
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.burst, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def full(self, now: float) -> bool:
+        """Whether the bucket refilled, i.e. is the same as a new one."""
+        self.refill(now)
+        return self.level >= self.burst
+
+    def delay(self, amount: float) -> float:
+        """Seconds until amount is available; charges over burst only wait for a full bucket."""
+        return max(0.0, (min(amount, self.burst) - self.level) / self.rate)
+
+
+class RateLimiter:
+    """
+    Per-tenant token-bucket quotas on requests and tokens per second.
+
+    Tenants listed in tenants get their own quota; every other tenant gets
+    its own buckets with the default quota, or no limit without one. The
+    tenant is the tenant= argument of completions.create(). Buckets that
+    refilled are dropped as the number of tenants grows, so arbitrary
+    tenant keys do not accumulate.
+
+    Usage:
+        limiter = RateLimiter(
+            RateLimit(requests_per_second=5, tokens_per_second=20_000),
+            tenants={"batch": RateLimit(tokens_per_second=5_000)},
+        )
+        client = VLLMGrpcClient(rate_limiter=limiter)
+        client.completions.create(prompt="Hello", tenant="batch")
+        print(limiter.stats)
+    """
+
+    def __init__(
+        self,
+        default: Optional[RateLimit] = None,
+        *,
+        tenants: Optional[Dict[str, RateLimit]] = None,
+        block: bool = True,
+        max_wait: Optional[float] = None,
+        tokenizer: Optional[Any] = None,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            default: Quota of each tenant missing from tenants. None leaves
+                them unlimited.
+            tenants: Quota per tenant key.
+            block: Wait for budget to refill. False rejects requests over
+                budget at once with VLLMGrpcRateLimitedError.
+            max_wait: With block=True, reject requests that would wait longer
+                than this many seconds. None waits as long as needed.
+            tokenizer: A tokenizer (with encode()) or TokenDecoder used to
+                count the tokens of text prompts.
+        """
+        self.default = default
+        self.block = block
+        self.max_wait = max_wait
+        if isinstance(tokenizer, TokenDecoder):
+            tokenizer = tokenizer.tokenizer
+        self.tokenizer = tokenizer
+        self._lock = threading.Lock()
+        self._limits: Dict[str, RateLimit] = dict(tenants or {})
+        self._buckets: Dict[str, Tuple[Optional[_TokenBucket], Optional[_TokenBucket]]] = {}
+        self._prune_at = PRUNE_THRESHOLD
+        self._stats = RateLimiterStats()
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        """A snapshot of the limiter's counters."""
+        with self._lock:
+            return self._stats._copy()
+
+    def set_limit(self, tenant: str, limit: Optional[RateLimit]) -> None:
+        """Set a tenant's quota (None for the default), starting from full buckets."""
+        with self._lock:
+            if limit is None:
+                self._limits.pop(tenant, None)
+            else:
+                self._limits[tenant] = limit
+            self._buckets.pop(tenant, None)
+
+    def _estimate(self, prompt: Any, decoder: Optional[TokenDecoder] = None) -> int:
+        """Prompt tokens of a request, counted or estimated."""
+        if isinstance(prompt, TokenizedInput):
+            return len(prompt.input_ids)
+        if isinstance(prompt, list):
+            return len(prompt)
+        tokenizer = self.tokenizer
+        if tokenizer is None and decoder is not None:
+            tokenizer = decoder.tokenizer
+        if tokenizer is not None:
+            return len(tokenizer.encode(prompt, add_special_tokens=False))
+        return -(-len(prompt) // CHARS_PER_TOKEN)
+
+    def _tenant_buckets(
+        self, tenant: str, now: float
+    ) -> Tuple[Optional[_TokenBucket], Optional[_TokenBucket]]:
+        """A tenant's request and token buckets; the lock must be held."""
+        buckets = self._buckets.get(tenant)
+        if buckets is not None:
+            return buckets
+        limit = self._limits.get(tenant, self.default)
+        if limit is None:
+            # Unlimited tenants keep no state
+            return None, None
+        requests = tokens = None
+        if limit.requests_per_second is not None and limit.request_burst is not None:
+            requests = _TokenBucket(limit.requests_per_second, limit.request_burst, now)
+        if limit.tokens_per_second is not None and limit.token_burst is not None:
+            tokens = _TokenBucket(limit.tokens_per_second, limit.token_burst, now)
+        if len(self._buckets) >= self._prune_at:
+            self._prune(now)
+        buckets = self._buckets[tenant] = (requests, tokens)
+        return buckets
+
+    def _prune(self, now: float) -> None:
+        """Drop the buckets that refilled; the lock must be held."""
+        for tenant, buckets in list(self._buckets.items()):
+            if all(bucket is None or bucket.full(now) for bucket in buckets):
+                del self._buckets[tenant]
+        # Amortized: prune again once the tenants held doubled
+        self._prune_at = max(PRUNE_THRESHOLD, 2 * len(self._buckets))
+
+    def _reserve(self, tenant: Optional[str], tokens: int) -> float:
+        """Charge a request and return the seconds to wait before sending it."""
+        tenant = DEFAULT_TENANT if tenant is None else tenant
+        now = time.monotonic()
+        with self._lock:
+            requests_bucket, tokens_bucket = self._tenant_buckets(tenant, now)
+            delay = 0.0
+            if requests_bucket is not None:
+                requests_bucket.refill(now)
+                delay = requests_bucket.delay(1)
+            if tokens_bucket is not None:
+                tokens_bucket.refill(now)
+                delay = max(delay, tokens_bucket.delay(tokens))
+            if delay > 0 and (
+                not self.block or (self.max_wait is not None and delay > self.max_wait)
+            ):
+                self._stats.rejected += 1
+                raise VLLMGrpcRateLimitedError(tenant, delay)
+            if requests_bucket is not None:
+                requests_bucket.level -= 1
+            if tokens_bucket is not None:
+                tokens_bucket.level -= tokens
+            stats = self._stats
+            stats.admitted += 1
+            stats.estimated_tokens += tokens
+            if delay > 0:
+                stats.delayed += 1
+                stats.wait_seconds += delay
+            return delay
+
+    def _refund(self, tenant: Optional[str], tokens: int) -> None:
+        """Give back the charge of a request that got no response."""
+        tenant = DEFAULT_TENANT if tenant is None else tenant
+        with self._lock:
+            requests_bucket, tokens_bucket = self._tenant_buckets(tenant, time.monotonic())
+            if requests_bucket is not None:
+                requests_bucket.level = min(requests_bucket.burst, requests_bucket.level + 1)
+            if tokens_bucket is not None:
+                tokens_bucket.level = min(tokens_bucket.burst, tokens_bucket.level + tokens)
+            self._stats.admitted -= 1
+            self._stats.estimated_tokens -= tokens
+
+    def _acquire(self, tenant: Optional[str], tokens: int) -> None:
+        """Charge a request and wait until it may be sent (sync)."""
+        delay = self._reserve(tenant, tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def _acquire_async(self, tenant: Optional[str], tokens: int) -> None:
+        """Charge a request and wait until it may be sent (async)."""
+        delay = self._reserve(tenant, tokens)
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except BaseException:
+                self._refund(tenant, tokens)
+                raise
+
+    def _reconcile(self, tenant: Optional[str], estimated: int, actual: int) -> None:
+        """Correct a request's charge to its actual prompt plus completion tokens."""
+        tenant = DEFAULT_TENANT if tenant is None else tenant
+        with self._lock:
+            _, tokens_bucket = self._tenant_buckets(tenant, time.monotonic())
+            if tokens_bucket is not None:
+                tokens_bucket.level -= actual - estimated
+            self._stats.reconciled_tokens += actual - estimated
+
+    def __repr__(self) -> str:
+        return (
+            f"RateLimiter(default={self.default!r}, tenants={sorted(self._limits)}, "
+            f"block={self.block}, max_wait={self.max_wait})"
+        )
@@ -0,0 +1,356 @@
+"""
+Retries with exponential backoff for vLLM gRPC client.
+
+A RetryPolicy passed to a client retries HealthCheck, GetModelInfo and Embed
+RPCs, and Generate RPCs that fail before their first response arrives, on
+retryable status codes (UNAVAILABLE by default, as during a replica
+restart). Generate is never retried after a response was received, so no
+tokens are ever duplicated or lost.
+
+Delays grow exponentially with jitter. Each client also keeps a retry budget:
+a token bucket that every request tops up by budget_ratio and every retry
+drains by one, so under a full outage retries add at most budget_ratio extra
+RPCs per request (plus a small per-second allowance) instead of multiplying
+the load by max_attempts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+import grpc
+
+from vllm_grpc_client._pool import _RPC_METHODS
+
+# RPCs a RetryPolicy applies to
+RETRY_METHODS = ("Generate", "Embed", "HealthCheck", "GetModelInfo")
+
+
+class RetryPolicy:
+    """
+    Configuration for retrying failed RPCs.
+
+    Usage:
+        client = VLLMGrpcClient(retry_policy=RetryPolicy(max_attempts=4))
+        ...
+        print(client.retry_stats)
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 3,
+        initial_backoff: float = 0.05,
+        max_backoff: float = 2.0,
+        backoff_multiplier: float = 2.0,
+        jitter: float = 1.0,
+        retryable_codes: Sequence[grpc.StatusCode] = (grpc.StatusCode.UNAVAILABLE,),
+        budget_ratio: float = 0.1,
+        budget_min_per_second: float = 1.0,
+        budget_max_tokens: float = 10.0,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Attempts per RPC, including the first.
+            initial_backoff: Delay before the first retry, in seconds.
+            max_backoff: Upper bound of the delay, in seconds.
+            backoff_multiplier: Factor applied to the delay after each retry.
+            jitter: Fraction of each delay that is randomized: the delay is
+                drawn from [(1 - jitter) * backoff, backoff]. 1.0 is "full jitter".
+            retryable_codes: Status codes that are retried.
+            budget_ratio: Retry tokens earned by every request.
+            budget_min_per_second: Retry tokens earned per second regardless
+                of traffic, so low-traffic clients can still retry.
+            budget_max_tokens: Capacity of the retry budget (and its initial level).
+        """
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+        if not 0.0 <= jitter <= 1.0:
+            raise ValueError(f"jitter must be between 0 and 1, got {jitter}")
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.backoff_multiplier = backoff_multiplier
+        self.jitter = jitter
+        self.retryable_codes = frozenset(retryable_codes)
+        self.budget_ratio = budget_ratio
+        self.budget_min_per_second = budget_min_per_second
+        self.budget_max_tokens = budget_max_tokens
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retrying after the given (1-based) failed attempt, with jitter."""
+        delay = min(
+            self.max_backoff, self.initial_backoff * self.backoff_multiplier ** (attempt - 1)
+        )
+        return delay * (1.0 - self.jitter * random.random())
+
+    def __repr__(self) -> str:
+        codes = sorted(code.name for code in self.retryable_codes)
+        return (
+            f"RetryPolicy(max_attempts={self.max_attempts}, "
+            f"initial_backoff={self.initial_backoff}, max_backoff={self.max_backoff}, "
+            f"retryable_codes={codes}, budget_ratio={self.budget_ratio})"
+        )
+
+
+class RetryStats:
+    """
+    Counters describing a client's retries.
+
+    Attributes:
+        requests: RPCs started under the policy (first attempts).
+        retries: Retry attempts sent.
+        recovered: RPCs that succeeded after at least one retry.
+        exhausted: RPCs that failed after max_attempts attempts.
+        budget_exhausted: Retries skipped because the retry budget was empty.
+        retries_by_code: Retries by the status code name that triggered them.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.retries = 0
+        self.recovered = 0
+        self.exhausted = 0
+        self.budget_exhausted = 0
+        self.retries_by_code: Dict[str, int] = {}
+
+    def _copy(self) -> RetryStats:
+        stats = RetryStats()
+        stats.__dict__.update(self.__dict__)
+        stats.retries_by_code = dict(self.retries_by_code)
+        return stats
+
+    def __repr__(self) -> str:
+        return (
+            f"RetryStats(requests={self.requests}, retries={self.retries}, "
+            f"recovered={self.recovered}, exhausted={self.exhausted}, "
+            f"budget_exhausted={self.budget_exhausted})"
+        )
+
+
+class _Retrier:
+    """Per-client retry state: the budget and the stats."""
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self._lock = threading.Lock()
+        self._stats = RetryStats()
+        self._tokens = policy.budget_max_tokens
+        self._refilled = time.monotonic()
+
+    @property
+    def stats(self) -> RetryStats:
+        with self._lock:
+            return self._stats._copy()
+
+    def _started(self) -> None:
+        """Count a new RPC and top up the budget."""
+        policy = self.policy
+        with self._lock:
+            self._stats.requests += 1
+            self._tokens = min(policy.budget_max_tokens, self._tokens + policy.budget_ratio)
+
+    def _succeeded(self, attempt: int) -> None:
+        if attempt > 1:
+            with self._lock:
+                self._stats.recovered += 1
+
+    def _retry_delay(self, error: grpc.RpcError, attempt: int) -> Optional[float]:
+        """
+        Decide whether to retry after a failed attempt.
+
+        Returns:
+            Seconds to wait before the next attempt, or None to give up.
+        """
+        policy = self.policy
+        code = error.code()
+        if code not in policy.retryable_codes:
+            return None
+        with self._lock:
+            stats = self._stats
+            if attempt >= policy.max_attempts:
+                stats.exhausted += 1
+                return None
+            now = time.monotonic()
+            self._tokens = min(
+                policy.budget_max_tokens,
+                self._tokens + (now - self._refilled) * policy.budget_min_per_second,
+            )
+            self._refilled = now
+            if self._tokens < 1.0:
+                stats.budget_exhausted += 1
+                return None
+            self._tokens -= 1.0
+            stats.retries += 1
+            stats.retries_by_code[code.name] = stats.retries_by_code.get(code.name, 0) + 1
+        return policy.backoff(attempt)
+
+
+class _RetryingUnary:
+    """Sync unary-unary method that retries failed attempts."""
+
+    __slots__ = ("_method", "_retrier")
+
+    def __init__(self, method: Any, retrier: _Retrier):
+        self._method = method
+        self._retrier = retrier
+
+    def __call__(self, request: Any, **kwargs: Any) -> Any:
+        retrier = self._retrier
+        retrier._started()
+        attempt = 1
+        while True:
+            try:
+                response = self._method(request, **kwargs)
+            except grpc.RpcError as e:
+                delay = retrier._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            retrier._succeeded(attempt)
+            return response
+
+
+class _AsyncRetryingUnary(_RetryingUnary):
+    """Async unary-unary method that retries failed attempts."""
+
+    __slots__ = ()
+
+    async def __call__(self, request: Any, **kwargs: Any) -> Any:
+        retrier = self._retrier
+        retrier._started()
+        attempt = 1
+        while True:
+            try:
+                response = await self._method(request, **kwargs)
+            except grpc.RpcError as e:
+                delay = retrier._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            retrier._succeeded(attempt)
+            return response
+
+
+class _RetryingCall:
+    """
+    Sync Generate call that restarts the RPC if it fails before any response.
+
+    Behaves like the underlying streaming call: it iterates responses and
+    cancel() cancels the current attempt.
+    """
+
+    def __init__(self, method: Any, request: Any, kwargs: Dict[str, Any], retrier: _Retrier):
+        self._method = method
+        self._request = request
+        self._kwargs = kwargs
+        self._retrier = retrier
+        self._attempt = 1
+        self._received = False
+        self._cancelled = False
+        retrier._started()
+        self._call = method(request, **kwargs)
+
+    def __iter__(self) -> _RetryingCall:
+        return self
+
+    def __next__(self) -> Any:
+        while True:
+            try:
+                response = next(self._call)
+            except grpc.RpcError as e:
+                if self._received or self._cancelled:
+                    raise
+                delay = self._retrier._retry_delay(e, self._attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                if self._cancelled:
+                    raise
+                self._attempt += 1
+                self._call = self._method(self._request, **self._kwargs)
+                continue
+            if not self._received:
+                self._received = True
+                self._retrier._succeeded(self._attempt)
+            return response
+
+    def cancel(self) -> Any:
+        self._cancelled = True
+        return self._call.cancel()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._call, name)
+
+
+class _AsyncRetryingCall(_RetryingCall):
+    """Async Generate call that restarts the RPC if it fails before any response."""
+
+    def __init__(self, method: Any, request: Any, kwargs: Dict[str, Any], retrier: _Retrier):
+        super().__init__(method, request, kwargs, retrier)
+        self._aiter: Any = None
+
+    def __aiter__(self) -> _AsyncRetryingCall:
+        return self
+
+    async def __anext__(self) -> Any:
+        while True:
+            try:
+                if self._aiter is None:
+                    self._aiter = self._call.__aiter__()
+                response = await self._aiter.__anext__()
+            except grpc.RpcError as e:
+                if self._received or self._cancelled:
+                    raise
+                delay = self._retrier._retry_delay(e, self._attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                if self._cancelled:
+                    raise
+                self._attempt += 1
+                self._call = self._method(self._request, **self._kwargs)
+                self._aiter = None
+                continue
+            if not self._received:
+                self._received = True
+                self._retrier._succeeded(self._attempt)
+            return response
+
+
+class _RetryingGenerate:
+    """Generate method returning calls that retry until the first response."""
+
+    __slots__ = ("_method", "_retrier", "_call_type")
+
+    def __init__(self, method: Any, retrier: _Retrier, aio: bool):
+        self._method = method
+        self._retrier = retrier
+        self._call_type = _AsyncRetryingCall if aio else _RetryingCall
+
+    def __call__(self, request: Any, **kwargs: Any) -> Any:
+        return self._call_type(self._method, request, kwargs, self._retrier)
+
+
+class _RetryingStub:
+    """VllmEngineStub look-alike that applies a retry policy to RETRY_METHODS."""
+
+    def __init__(self, stub: Any, retrier: _Retrier, aio: bool):
+        unary = _AsyncRetryingUnary if aio else _RetryingUnary
+        for name in _RPC_METHODS:
+            method = getattr(stub, name)
+            if name == "Generate":
+                method = _RetryingGenerate(method, retrier, aio)
+            elif name in RETRY_METHODS:
+                method = unary(method, retrier)
+            setattr(self, name, method)
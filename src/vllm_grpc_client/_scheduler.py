@@ -0,0 +1,289 @@
+"""
+Priority and fair-share scheduling of async completion requests.
+
+An AsyncVLLMGrpcClient created with scheduler=RequestScheduler(...) admits
+at most max_in_flight completions at once. Requests over the window wait
+in the scheduler and are released as earlier ones finish:
+
+- Priority classes are strict: a request of an earlier class always goes
+  before any waiting request of a later class.
+- Within a class, tenants share the window by weighted fair queuing
+  (start-time fair queuing), so a tenant with weight 2 gets twice the
+  admissions of a tenant with weight 1 while both have requests waiting,
+  and a tenant flooding the queue does not delay the others' next request.
+
+Streams hold their place in the window until they are finished, closed or
+garbage collected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from vllm_grpc_client._exceptions import VLLMGrpcOverloadedError
+from vllm_grpc_client._timing import LatencyHistogram
+
+# Default priority classes, most urgent first
+DEFAULT_PRIORITY_CLASSES = ("interactive", "batch")
+
+# Tenant of requests created without one
+DEFAULT_TENANT = ""
+
+
+class SchedulerStats:
+    """
+    State and counters of a request scheduler.
+
+    Attributes:
+        in_flight: Requests admitted and not finished yet.
+        queued: Waiting requests per priority class.
+        admitted: Requests admitted per priority class (immediately or after
+            waiting).
+        wait: LatencyHistogram summary of the seconds admitted requests
+            waited, per priority class.
+        rejected: Requests rejected because the queue was full.
+        timed_out: Requests rejected after waiting queue_timeout.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.queued: Dict[str, int] = {}
+        self.admitted: Dict[str, int] = {}
+        self.wait: Dict[str, Dict[str, float]] = {}
+        self.rejected = 0
+        self.timed_out = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"SchedulerStats(in_flight={self.in_flight}, queued={self.queued}, "
+            f"admitted={self.admitted}, rejected={self.rejected}, timed_out={self.timed_out})"
+        )
+
+
+class _PriorityClass:
+    """Waiting requests of one priority class, ordered by virtual finish time."""
+
+    def __init__(self) -> None:
+        # (finish tag, sequence number, start tag, waiter)
+        self.heap: List[Tuple[float, int, float, asyncio.Future]] = []
+        self.queued = 0
+        self.admitted = 0
+        self.virtual_time = 0.0
+        self.finish_tags: Dict[str, float] = {}
+        self.wait = LatencyHistogram()
+
+
+class RequestScheduler:
+    """
+    Admits async completion requests in priority order, fairly across tenants.
+
+    Usage:
+        scheduler = RequestScheduler(32, tenant_weights={"search": 3.0})
+        client = AsyncVLLMGrpcClient(scheduler=scheduler)
+        completion = await client.completions.create(
+            prompt="Hello", priority="batch", tenant="reports"
+        )
+        print(scheduler.stats)
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 64,
+        *,
+        classes: Sequence[str] = DEFAULT_PRIORITY_CLASSES,
+        default_class: Optional[str] = None,
+        tenant_weights: Optional[Dict[str, float]] = None,
+        default_weight: float = 1.0,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_in_flight: Requests admitted at once.
+            classes: Priority class names, most urgent first.
+            default_class: Class of requests created without a priority.
+                Defaults to the last (least urgent) class.
+            tenant_weights: Fair-share weight per tenant key.
+            default_weight: Weight of tenants missing from tenant_weights.
+            max_queue: Requests that may wait across all classes; more are
+                rejected with VLLMGrpcOverloadedError at once. None is unbounded.
+            queue_timeout: Seconds a request may wait before it is rejected
+                with VLLMGrpcOverloadedError. None waits indefinitely.
+        """
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {max_in_flight}")
+        if not classes or len(set(classes)) != len(classes):
+            raise ValueError(f"classes must be distinct and non-empty, got {classes!r}")
+        if default_class is None:
+            default_class = classes[-1]
+        if default_class not in classes:
+            raise ValueError(f"default_class {default_class!r} is not one of {classes!r}")
+        if default_weight <= 0:
+            raise ValueError(f"default_weight must be positive, got {default_weight}")
+        self.max_in_flight = max_in_flight
+        self.classes = tuple(classes)
+        self.default_class = default_class
+        self.default_weight = default_weight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._weights: Dict[str, float] = {}
+        for tenant, weight in (tenant_weights or {}).items():
+            self.set_weight(tenant, weight)
+        self._lock = threading.Lock()
+        self._classes = {name: _PriorityClass() for name in self.classes}
+        self._in_flight = 0
+        self._queued = 0
+        self._sequence = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._listeners: List[Callable[[str, float], None]] = []
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently admitted."""
+        return self._in_flight
+
+    @property
+    def stats(self) -> SchedulerStats:
+        """A snapshot of the scheduler's state and counters."""
+        with self._lock:
+            stats = SchedulerStats()
+            stats.in_flight = self._in_flight
+            stats.rejected = self._rejected
+            stats.timed_out = self._timed_out
+            for name, queue in self._classes.items():
+                stats.queued[name] = queue.queued
+                stats.admitted[name] = queue.admitted
+                stats.wait[name] = queue.wait.summary()
+            return stats
+
+    def queue_depth(self, priority: str) -> int:
+        """Requests of a priority class currently waiting."""
+        return self._classes[priority].queued
+
+    def set_weight(self, tenant: str, weight: float) -> None:
+        """Set a tenant's fair-share weight; applies to its next queued request."""
+        if weight <= 0:
+            raise ValueError(f"Weight of tenant {tenant!r} must be positive, got {weight}")
+        self._weights[tenant] = weight
+
+    def add_listener(self, listener: Callable[[str, float], None]) -> None:
+        """Call listener(priority, wait_seconds) for every admitted request."""
+        with self._lock:
+            self._listeners = self._listeners + [listener]
+
+    def _class(self, priority: Optional[str]) -> _PriorityClass:
+        if priority is None:
+            priority = self.default_class
+        queue = self._classes.get(priority)
+        if queue is None:
+            raise ValueError(f"Unknown priority {priority!r}, expected one of {self.classes}")
+        return queue
+
+    async def _acquire(self, priority: Optional[str], tenant: Optional[str]) -> None:
+        """Wait until the request may start; every success must be paired with _release()."""
+        name = self.default_class if priority is None else priority
+        queue = self._class(name)
+        tenant = DEFAULT_TENANT if tenant is None else tenant
+        started = time.monotonic()
+        with self._lock:
+            if not self._queued and self._in_flight < self.max_in_flight:
+                self._in_flight += 1
+                queue.admitted += 1
+                queue.wait.record(0.0)
+                waiter = None
+            else:
+                if self.max_queue is not None and self._queued >= self.max_queue:
+                    self._rejected += 1
+                    raise VLLMGrpcOverloadedError("scheduler", "queue full")
+                weight = self._weights.get(tenant, self.default_weight)
+                start = max(queue.virtual_time, queue.finish_tags.get(tenant, 0.0))
+                finish = start + 1.0 / weight
+                queue.finish_tags[tenant] = finish
+                waiter = asyncio.get_running_loop().create_future()
+                self._sequence += 1
+                heapq.heappush(queue.heap, (finish, self._sequence, start, waiter))
+                queue.queued += 1
+                self._queued += 1
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(waiter, self.queue_timeout)
+            except BaseException as e:
+                with self._lock:
+                    granted = waiter.done() and not waiter.cancelled()
+                    if not granted:
+                        queue.queued -= 1
+                        self._queued -= 1
+                        self._forget_idle(queue)
+                        if isinstance(e, asyncio.TimeoutError):
+                            self._timed_out += 1
+                            raise VLLMGrpcOverloadedError("scheduler", "queue timeout") from None
+                        raise
+                    if not isinstance(e, asyncio.TimeoutError):
+                        # Cancelled right after being admitted
+                        self._in_flight -= 1
+                        self._dispatch()
+                        raise
+            waited = time.monotonic() - started
+            with self._lock:
+                queue.wait.record(waited)
+        else:
+            waited = 0.0
+        for listener in self._listeners:
+            try:
+                listener(name, waited)
+            except Exception:
+                # Observers must not break request handling
+                pass
+
+    def _release(self) -> None:
+        """An admitted request finished."""
+        with self._lock:
+            self._in_flight -= 1
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit waiting requests into free slots; the lock must be held."""
+        while self._queued and self._in_flight < self.max_in_flight:
+            for queue in self._classes.values():
+                if self._admit_next(queue):
+                    break
+            else:
+                return
+
+    def _admit_next(self, queue: _PriorityClass) -> bool:
+        """Admit a class's next request; the lock must be held."""
+        while queue.heap:
+            _, _, start, waiter = heapq.heappop(queue.heap)
+            if waiter.done():
+                # Cancelled or timed out; already taken off the counts
+                continue
+            waiter.set_result(None)
+            queue.virtual_time = start
+            queue.queued -= 1
+            queue.admitted += 1
+            self._queued -= 1
+            self._in_flight += 1
+            self._forget_idle(queue)
+            return True
+        return False
+
+    @staticmethod
+    def _forget_idle(queue: _PriorityClass) -> None:
+        """Reset a class's fair-queuing tags once nothing waits in it."""
+        if not queue.queued:
+            queue.heap.clear()
+            queue.finish_tags.clear()
+            queue.virtual_time = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"RequestScheduler(max_in_flight={self.max_in_flight}, classes={self.classes}, "
+            f"in_flight={self._in_flight}, queued={self._queued})"
+        )
@@ -0,0 +1,384 @@
+"""
+In-flight de-duplication of identical deterministic Generate calls.
+
+A client created with singleflight=SingleFlight() collapses concurrent
+completions.create calls that would produce the same output (temperature=0
+or a fixed seed, the same prompt and SamplingParams, and the same stream
+flag) into one Generate RPC. Every caller reads the shared call's responses:
+non-streaming callers get the same final completion, and streaming callers
+subscribe to one broadcast of the chunks, each from the first response on,
+whenever they joined.
+
+The shared RPC runs under its own request ID. It is cancelled and aborted
+only when every caller has left it, so one caller closing its stream does
+not affect the others. Callers that join a call in flight skip the client's
+rate limiter and scheduler, as they add no load.
+
+Only calls to the same servers and model are shared, and async calls only
+within one event loop, so one SingleFlight may serve several clients.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from vllm_grpc_client._cache import _cache_key
+from vllm_grpc_client.proto import vllm_engine_pb2
+
+# (event loop of async calls, servers, model, cache key, stream flag) of a request
+_FlightKey = Tuple[Optional[asyncio.AbstractEventLoop], str, str, str, bool]
+
+
+class SingleFlightStats:
+    """
+    Counters of a SingleFlight.
+
+    Attributes:
+        calls: Shared Generate RPCs started.
+        joined: Requests served by joining a call in flight, i.e. RPCs saved.
+        in_flight: Shared calls currently in flight.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.joined = 0
+        self.in_flight = 0
+
+    def _copy(self) -> SingleFlightStats:
+        stats = SingleFlightStats()
+        stats.__dict__.update(self.__dict__)
+        return stats
+
+    def __repr__(self) -> str:
+        return (
+            f"SingleFlightStats(calls={self.calls}, joined={self.joined}, "
+            f"in_flight={self.in_flight})"
+        )
+
+
+class SingleFlight:
+    """
+    Shares one Generate RPC between concurrent identical deterministic requests.
+
+    May be shared by several clients, sync and async; calls are only shared
+    between clients of the same servers and model, and async calls only
+    within one event loop.
+
+    Usage:
+        flights = SingleFlight()
+        client = AsyncVLLMGrpcClient(singleflight=flights)
+        results = await asyncio.gather(
+            *[client.completions.create(prompt="2+2=", temperature=0.0) for _ in range(8)]
+        )
+        print(flights.stats.joined)  # 7
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[_FlightKey, Any] = {}
+        self._stats = SingleFlightStats()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        """A snapshot of the counters."""
+        with self._lock:
+            stats = self._stats._copy()
+            stats.in_flight = len(self._flights)
+            return stats
+
+    @staticmethod
+    def _key(
+        request: vllm_engine_pb2.GenerateRequest, client: Any, aio: bool
+    ) -> Optional[_FlightKey]:
+        key = _cache_key(request)
+        if key is None:
+            return None
+        loop = asyncio.get_running_loop() if aio else None
+        model = getattr(client, "_model_name", "")
+        return (loop, _target(client), model, key, request.stream)
+
+    def _has_flight(
+        self, request: vllm_engine_pb2.GenerateRequest, client: Any, aio: bool
+    ) -> bool:
+        """Whether an identical request to the client's servers is in flight."""
+        key = self._key(request, client, aio)
+        return key is not None and key in self._flights
+
+    def _remove(self, key: _FlightKey, flight: Any) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def __repr__(self) -> str:
+        return f"SingleFlight(in_flight={len(self._flights)})"
+
+
+def _target(client: Any) -> str:
+    """The servers a client sends to: its replicas' endpoints, or its address."""
+    replicas: Optional[List[Any]] = getattr(client, "replicas", None)
+    if replicas is not None:
+        return ",".join(sorted(replica.endpoint for replica in replicas))
+    return str(getattr(client, "_address", ""))
+
+
+def _shared_request(request: vllm_engine_pb2.GenerateRequest) -> Any:
+    """A copy of a GenerateRequest under the shared call's request ID."""
+    shared = vllm_engine_pb2.GenerateRequest()
+    shared.CopyFrom(request)
+    shared.request_id = f"{request.request_id}-shared"
+    return shared
+
+
+class _BaseFlight:
+    """A shared call and the responses it produced so far."""
+
+    def __init__(
+        self,
+        group: SingleFlight,
+        key: _FlightKey,
+        request_id: str,
+        on_abandon: Optional[Callable[[str], None]],
+    ):
+        self._group = group
+        self._key = key
+        self._call: Any = None
+        self._request_id = request_id
+        self._on_abandon = on_abandon
+        self.responses: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        # Counted under the group lock by _SingleFlightGenerate
+        self._subscribers = 0
+
+    def _unsubscribe(self) -> None:
+        """A subscriber left; cancel the call once nobody reads it."""
+        with self._group._lock:
+            self._subscribers -= 1
+            abandoned = self._subscribers == 0 and not self.done
+        if abandoned:
+            self._group._remove(self._key, self)
+            self._abandon()
+
+    def _start(self, call: Any) -> None:
+        """Attach the shared call once it was sent."""
+        self._call = call
+
+    def _abandon(self) -> None:
+        if self._call is not None:
+            self._call.cancel()
+        if self._on_abandon is not None:
+            try:
+                self._on_abandon(self._request_id)
+            except Exception:
+                pass
+
+    def _finish(self, error: Optional[BaseException]) -> None:
+        self.error = error
+        self.done = True
+        self._group._remove(self._key, self)
+
+
+class _Flight(_BaseFlight):
+    """
+    Sync shared call.
+
+    Whichever subscriber needs a response not read yet reads it from the
+    call; the others wait on a condition.
+    """
+
+    def __init__(self, *args: Any):
+        super().__init__(*args)
+        self._condition = threading.Condition()
+        self._reading = False
+        self._started = threading.Event()
+
+    def _start(self, call: Any) -> None:
+        super()._start(call)
+        self._started.set()
+
+    def _fail(self, error: BaseException) -> None:
+        """The shared call could not be sent."""
+        with self._condition:
+            self._finish(error)
+            self._condition.notify_all()
+        self._started.set()
+
+    def _next(self, index: int) -> Any:
+        """Response number index, reading the call when it is not buffered yet."""
+        while True:
+            with self._condition:
+                while True:
+                    if index < len(self.responses):
+                        return self.responses[index]
+                    if self.done:
+                        if self.error is not None:
+                            raise self.error
+                        raise StopIteration
+                    if not self._reading:
+                        self._reading = True
+                        break
+                    self._condition.wait()
+            self._started.wait()
+            try:
+                response = next(self._call)
+            except StopIteration:
+                self._finish(None)
+            except Exception as e:
+                self._finish(e)
+            else:
+                self.responses.append(response)
+            with self._condition:
+                self._reading = False
+                self._condition.notify_all()
+
+
+class _FlightCall:
+    """One caller's iterator over a sync shared call."""
+
+    def __init__(self, flight: _Flight):
+        self._flight = flight
+        self._index = 0
+        self._left = False
+
+    def __iter__(self) -> _FlightCall:
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            response = self._flight._next(self._index)
+        except BaseException:
+            self._leave()
+            raise
+        self._index += 1
+        return response
+
+    def _leave(self) -> None:
+        if not self._left:
+            self._left = True
+            self._flight._unsubscribe()
+
+    def cancel(self) -> bool:
+        self._leave()
+        return True
+
+
+class _AsyncFlight(_BaseFlight):
+    """Async shared call, read by a task that wakes subscribers on every response."""
+
+    def __init__(self, *args: Any):
+        super().__init__(*args)
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Future] = None
+
+    def _start(self, call: Any) -> None:
+        super()._start(call)
+        self._task = asyncio.ensure_future(self._pump())
+
+    def _fail(self, error: BaseException) -> None:
+        """The shared call could not be sent."""
+        self._finish(error)
+        self._notify()
+
+    async def _pump(self) -> None:
+        error: Optional[BaseException] = None
+        try:
+            async for response in self._call:
+                self.responses.append(response)
+                self._notify()
+        except asyncio.CancelledError:
+            error = asyncio.CancelledError()
+        except Exception as e:
+            error = e
+        self._finish(error)
+        self._notify()
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _abandon(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        super()._abandon()
+
+    async def _next(self, index: int) -> Any:
+        while True:
+            if index < len(self.responses):
+                return self.responses[index]
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                raise StopAsyncIteration
+            await self._changed.wait()
+
+
+class _AsyncFlightCall:
+    """One caller's async iterator over a shared call."""
+
+    def __init__(self, flight: _AsyncFlight):
+        self._flight = flight
+        self._index = 0
+        self._left = False
+
+    def __aiter__(self) -> _AsyncFlightCall:
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            response = await self._flight._next(self._index)
+        except BaseException:
+            self._leave()
+            raise
+        self._index += 1
+        return response
+
+    def _leave(self) -> None:
+        if not self._left:
+            self._left = True
+            self._flight._unsubscribe()
+
+    def cancel(self) -> bool:
+        self._leave()
+        return True
+
+
+class _SingleFlightGenerate:
+    """Generate method that joins identical deterministic calls in flight."""
+
+    __slots__ = ("_method", "_group", "_client", "_aio")
+
+    def __init__(self, method: Any, group: SingleFlight, client: Any, aio: bool):
+        self._method = method
+        self._group = group
+        self._client = client
+        self._aio = aio
+
+    def __call__(self, request: Any, **kwargs: Any) -> Any:
+        group = self._group
+        key = group._key(request, self._client, self._aio)
+        if key is None:
+            return self._method(request, **kwargs)
+        flight_type = _AsyncFlight if self._aio else _Flight
+        call_type: Any = _AsyncFlightCall if self._aio else _FlightCall
+        shared = _shared_request(request)
+        with group._lock:
+            flight = group._flights.get(key)
+            if flight is not None:
+                flight._subscribers += 1
+                group._stats.joined += 1
+                return call_type(flight)
+            group._stats.calls += 1
+            # Registered before the call is sent, so concurrent callers join it
+            flight = group._flights[key] = flight_type(
+                group, key, shared.request_id, self._client._abort_coalescer.submit
+            )
+            flight._subscribers += 1
+        try:
+            call = self._method(shared, **kwargs)
+        except BaseException as e:
+            flight._fail(e)
+            raise
+        flight._start(call)
+        return call_type(flight)
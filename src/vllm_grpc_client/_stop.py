@@ -0,0 +1,176 @@
+"""
+Client-side stop conditions for streamed generations.
+
+SamplingParams.stop only matches literal strings on the server. The
+conditions here are evaluated by the client over the incrementally decoded
+text of a stream; when one matches, the stream ends and the request is
+aborted on the server instead of running to max_tokens.
+
+Each condition declares its lookback, the number of characters before the
+newly decoded text it needs to see. Streams pass conditions with a bounded
+lookback only that tail plus the new text, so checking them costs the same
+on every chunk however long the output grows.
+"""
+
+from __future__ import annotations
+
+import abc
+import re
+from typing import Callable, Optional, Pattern, Union
+
+
+class StopCondition(abc.ABC):
+    """
+    Base class for client-side stop conditions.
+
+    Subclasses implement check(). Conditions that keep state between calls
+    also override fork(), which is called once per stream so one condition
+    object can be shared by many requests.
+    """
+
+    # Characters before the new text that check() needs; None for all of them
+    lookback: Optional[int] = None
+
+    @abc.abstractmethod
+    def check(self, text: str, start: int) -> Optional[int]:
+        """
+        Test the decoded text after new text arrived.
+
+        Args:
+            text: The decoded text: all of it when lookback is None, else at
+                least the last lookback characters before the new text.
+            start: Offset in text where the newly decoded text begins.
+
+        Returns:
+            The offset in text where the output should end, or None to
+            keep generating.
+        """
+
+    def fork(self) -> "StopCondition":
+        """Return the instance to use for one stream."""
+        return self
+
+
+class RegexStop(StopCondition):
+    """
+    Stop once a regular expression matches the decoded text.
+
+    The output ends after the match. By default the whole text is searched
+    on every chunk; set lookback to only search the last lookback characters
+    before the new text, which bounds the cost on long outputs when matches
+    are short.
+
+    Usage:
+        stream = client.completions.create(
+            prompt=prompt,
+            stream=True,
+            decoder=decoder,
+            stop_conditions=[RegexStop(r"\\n\\n")],
+        )
+    """
+
+    def __init__(
+        self, pattern: Union[str, Pattern[str]], flags: int = 0, lookback: Optional[int] = None
+    ):
+        """
+        Initialize the condition.
+
+        Args:
+            pattern: The regular expression, as a string or compiled pattern.
+            flags: re flags, used when pattern is a string.
+            lookback: Characters before the new text to include in each search.
+                None searches the whole text.
+        """
+        self.pattern = re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+        self.lookback = lookback
+
+    def check(self, text: str, start: int) -> Optional[int]:
+        pos = 0 if self.lookback is None else max(start - self.lookback, 0)
+        match = self.pattern.search(text, pos)
+        return match.end() if match is not None else None
+
+    def __repr__(self) -> str:
+        return f"RegexStop({self.pattern.pattern!r})"
+
+
+class JsonStop(StopCondition):
+    """
+    Stop when the first top-level JSON object or array is closed.
+
+    Text before the first "{" or "[" is ignored; brackets inside strings are
+    skipped. Each stream scans only the new text of every chunk, so the cost
+    is linear in the output length.
+
+    Usage:
+        stream = client.completions.create(
+            prompt=prompt, stream=True, decoder=decoder, stop_conditions=[JsonStop()]
+        )
+    """
+
+    lookback = 0
+
+    def __init__(self) -> None:
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def fork(self) -> "JsonStop":
+        return JsonStop()
+
+    def check(self, text: str, start: int) -> Optional[int]:
+        depth = self._depth
+        in_string = self._in_string
+        escaped = self._escaped
+        end = None
+        for i in range(start, len(text)):
+            char = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                if depth:
+                    in_string = True
+            elif char == "{" or char == "[":
+                depth += 1
+            elif (char == "}" or char == "]") and depth:
+                depth -= 1
+                if not depth:
+                    end = i + 1
+                    break
+        self._depth = depth
+        self._in_string = in_string
+        self._escaped = escaped
+        return end
+
+    def __repr__(self) -> str:
+        return "JsonStop()"
+
+
+class _PredicateStop(StopCondition):
+    """Adapts a plain callable to StopCondition; the whole text is kept."""
+
+    def __init__(self, predicate: Callable[[str], bool]):
+        self.predicate = predicate
+
+    def check(self, text: str, start: int) -> Optional[int]:
+        return len(text) if self.predicate(text) else None
+
+    def __repr__(self) -> str:
+        return f"StopCondition({self.predicate!r})"
+
+
+# A StopCondition, or a callable taking the decoded text and returning True to stop
+StopConditionLike = Union[StopCondition, Callable[[str], bool]]
+
+
+def _as_stop_condition(condition: StopConditionLike) -> StopCondition:
+    """Wrap a predicate if needed and fork the condition for a new stream."""
+    if isinstance(condition, StopCondition):
+        return condition.fork()
+    if callable(condition):
+        return _PredicateStop(condition)
+    raise TypeError(f"Expected a StopCondition or callable, got {type(condition).__name__}")
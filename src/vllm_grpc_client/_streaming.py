@@ -3,79 +3,277 @@ Streaming response handlers for vLLM gRPC client.
 
 Provides both sync and async iterators for streaming generation responses,
 similar to OpenAI's Stream and AsyncStream classes.
+
+A stream that is closed, garbage collected, or hits its client-side deadline
+before the server finished cancels its gRPC call and asks the server to abort
+the request, so abandoned generations stop using decode capacity. Streams
+with client-side stop conditions end, and abort the request, as soon as one
+matches the decoded text.
 """
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, AsyncIterator, Iterator, List, Optional, Union
-
-from vllm_grpc_client._exceptions import _exception_from_grpc_error
-from vllm_grpc_client._types import Completion, CompletionChunk, CompletionChunkChoice, CompletionUsage
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from vllm_grpc_client._exceptions import VLLMGrpcTimeoutError, _exception_from_grpc_error
+from vllm_grpc_client._fast_types import FastCompletion, FastCompletionChunk, _result_types
+from vllm_grpc_client._stop import StopCondition, StopConditionLike, _as_stop_condition
+from vllm_grpc_client._timing import RequestTiming, TimingStats
+from vllm_grpc_client._types import Completion, CompletionChunk
+from vllm_grpc_client.utils import IncrementalDecoder
 
 if TYPE_CHECKING:
     import grpc
 
     from vllm_grpc_client.proto import vllm_engine_pb2
 
+# Item yielded by a stream: a CompletionChunk, or the protobuf response in raw mode
+StreamItem = Union[CompletionChunk, FastCompletionChunk, "vllm_engine_pb2.GenerateResponse"]
 
-class GenerateStream:
-    """
-    Synchronous streaming iterator for generation responses.
+# Non-blocking callback that asks the server to abort a request ID
+AbortCallback = Callable[[str], None]
 
-    Yields CompletionChunk objects for each streaming response, and provides
-    access to the final Completion when streaming is complete.
 
-    Usage:
-        stream = client.completions.create(prompt="Hello", stream=True)
-        for chunk in stream:
-            print(chunk.choices[0].delta_token_ids)
-        # Access final completion
-        final = stream.get_final_completion()
+def _abandon_call(call: Any, on_abandon: Optional[AbortCallback], request_id: str) -> None:
+    """Cancel a gRPC call and request a server-side abort, ignoring failures."""
+    cancel = getattr(call, "cancel", None)
+    if cancel is not None:
+        cancel()
+    if on_abandon is not None:
+        try:
+            on_abandon(request_id)
+        except Exception:
+            pass
+
+
+class _BaseGenerateStream:
+    """
+    Response processing shared by GenerateStream and AsyncGenerateStream.
+
+    In the default mode every gRPC response is converted into a pydantic
+    CompletionChunk. In raw mode the GenerateResponse protobuf is passed
+    through untouched; only the running totals needed for
+    get_final_completion() are kept. With fast_types the chunks and the final
+    completion are slotted FastCompletionChunk / FastCompletion objects.
+    With a detokenizer, chunks carry delta_text and the final completion text,
+    and stop conditions are checked against the text after every chunk.
+    The arrival of every response is recorded in the stream's RequestTiming,
+    which is added to timing_stats when the request completes.
     """
 
     def __init__(
         self,
-        response_iterator: Iterator["vllm_engine_pb2.GenerateResponse"],
         request_id: str,
         model: str = "",
+        raw: bool = False,
+        fast_types: bool = False,
+        on_abandon: Optional[AbortCallback] = None,
+        detokenizer: Optional[IncrementalDecoder] = None,
+        stop_conditions: Optional[Sequence[StopConditionLike]] = None,
+        timing: Optional[RequestTiming] = None,
+        timing_stats: Optional[TimingStats] = None,
+        on_finish: Optional[Callable[[], None]] = None,
+        cached: bool = False,
     ):
-        """
-        Initialize the streaming iterator.
-
-        Args:
-            response_iterator: The gRPC response iterator.
-            request_id: The request ID for this generation.
-            model: The model name (for response metadata).
-        """
-        self._response_iterator = response_iterator
+        if stop_conditions and detokenizer is None:
+            raise ValueError("stop_conditions require a detokenizer")
         self._request_id = request_id
         self._model = model
-        self._final_completion: Optional[Completion] = None
+        self._raw = raw
+        self._types = _result_types(fast_types)
+        self._final_completion: Optional[Union[Completion, FastCompletion]] = None
         self._accumulated_token_ids: List[int] = []
         self._total_prompt_tokens: int = 0
         self._total_completion_tokens: int = 0
         self._cached_tokens: int = 0
+        self._process = self._process_raw_response if raw else self._process_response
+        self._response_iterator: Any = None
+        self._on_abandon = on_abandon
+        self._detokenizer = detokenizer
+        self._stop_conditions: Optional[List[StopCondition]] = (
+            [_as_stop_condition(condition) for condition in stop_conditions]
+            if stop_conditions
+            else None
+        )
+        # Characters before new text the stop conditions need; None for all text
+        self._stop_lookback: Optional[int] = None
+        if self._stop_conditions is not None and all(
+            condition.lookback is not None for condition in self._stop_conditions
+        ):
+            self._stop_lookback = max(
+                condition.lookback or 0 for condition in self._stop_conditions
+            )
+        # The last _stop_lookback characters of the text, starting at _stop_offset
+        self._stop_tail = ""
+        self._stop_offset = 0
+        self._stopped_by: Optional[StopCondition] = None
+        # Length of text to keep once a stop condition matched
+        self._text_end: Optional[int] = None
+        self._timing = timing if timing is not None else RequestTiming()
+        self._timing_stats = timing_stats
+        # Set once the server has finished the request (or the stream failed)
+        self._finished = False
+        self._on_finish = on_finish
+        self._cached = cached
+        self._closed = False
+
+    @property
+    def request_id(self) -> str:
+        """The request ID of this generation."""
+        return self._request_id
+
+    @property
+    def text(self) -> str:
+        """Text decoded so far; empty unless the stream has a detokenizer."""
+        if self._detokenizer is None:
+            return ""
+        text = self._detokenizer.text
+        return text if self._text_end is None else text[: self._text_end]
+
+    @property
+    def timing(self) -> RequestTiming:
+        """Timestamps of this request."""
+        return self._timing
+
+    @property
+    def cached(self) -> bool:
+        """Whether the stream replays a ResponseCache hit."""
+        return self._cached
+
+    @property
+    def stopped_by(self) -> Optional[StopCondition]:
+        """The client-side stop condition that ended the stream, if any."""
+        return self._stopped_by
+
+    def _decode(self, token_ids: Any, final: bool = False) -> str:
+        """Detokenize new tokens, flushing held-back text at the end."""
+        detokenizer = self._detokenizer
+        if detokenizer is None:
+            return ""
+        delta_text = detokenizer.decode(token_ids)
+        if final:
+            delta_text += detokenizer.flush()
+        return delta_text
+
+    def _check_stop(self, delta_text: str) -> Tuple[str, Optional[str]]:
+        """
+        Run the stop conditions after new text was decoded.
 
-    def __iter__(self) -> Iterator[CompletionChunk]:
-        return self
-
-    def __next__(self) -> CompletionChunk:
-        try:
-            response = next(self._response_iterator)
-            return self._process_response(response)
-        except StopIteration:
-            raise
-        except Exception as e:
-            import grpc
-
-            if isinstance(e, grpc.RpcError):
-                raise _exception_from_grpc_error(e) from e
-            raise
+        On a match the RPC is cancelled, an Abort is sent and the final
+        completion is recorded. Returns the (possibly truncated) delta text
+        and the chunk's finish reason.
+        """
+        lookback = self._stop_lookback
+        if lookback is None:
+            offset = 0
+            text = self._detokenizer.text  # type: ignore[union-attr]
+        else:
+            # Only the tail the conditions look at, so long outputs are not rescanned
+            offset = self._stop_offset
+            text = self._stop_tail + delta_text
+        start = len(text) - len(delta_text)
+        for condition in self._stop_conditions:  # type: ignore[union-attr]
+            end = condition.check(text, start)
+            if end is None:
+                continue
+            end = max(end, start)
+            self._stopped_by = condition
+            self._text_end = offset + end
+            self._record_final([], "stop", self._total_prompt_tokens, self._cached_tokens)
+            _abandon_call(self._response_iterator, self._on_abandon, self._request_id)
+            return delta_text[: end - start], "stop"
+        if lookback is not None:
+            kept = max(len(text) - lookback, 0)
+            self._stop_tail = text[kept:]
+            self._stop_offset = offset + kept
+        return delta_text, None
+
+    def _record_complete(self, complete: "vllm_engine_pb2.GenerateComplete") -> None:
+        """Store the final completion built from the accumulated chunks."""
+        self._record_final(
+            list(complete.output_ids),
+            complete.finish_reason or "stop",
+            complete.prompt_tokens or self._total_prompt_tokens,
+            complete.cached_tokens or self._cached_tokens,
+        )
+
+    def _record_final(
+        self, output_ids: List[int], finish_reason: str, prompt_tokens: int, cached_tokens: int
+    ) -> None:
+        """Store the final completion from the accumulated chunks plus output_ids."""
+        completion_tokens = self._total_completion_tokens + len(output_ids)
+        self._timing._complete(completion_tokens, prompt_tokens, cached_tokens)
+        # on_finish sees the completed timing
+        self._mark_finished()
+        if self._timing_stats is not None:
+            self._timing_stats.record(self._timing)
+        types = self._types
+        if self._cached:
+            # A cache hit costs the server nothing
+            prompt_tokens = completion_tokens = cached_tokens = 0
+        self._final_completion = types.Completion(
+            id=self._request_id,
+            model=self._model,
+            choices=[
+                types.CompletionChoice(
+                    index=0,
+                    text=self.text,
+                    token_ids=self._accumulated_token_ids + output_ids,
+                    finish_reason=finish_reason,
+                )
+            ],
+            usage=types.CompletionUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+                cached_tokens=cached_tokens,
+            ),
+            cached=self._cached,
+            timing=self._timing,
+        )
+
+    def _process_raw_response(
+        self, response: "vllm_engine_pb2.GenerateResponse"
+    ) -> "vllm_engine_pb2.GenerateResponse":
+        """Update running totals and pass the protobuf response through."""
+        kind = response.WhichOneof("response")
+        if kind == "chunk":
+            chunk = response.chunk
+            token_ids = chunk.token_ids
+            self._accumulated_token_ids.extend(token_ids)
+            self._total_prompt_tokens = chunk.prompt_tokens
+            self._total_completion_tokens += len(token_ids)
+            self._cached_tokens = chunk.cached_tokens
+            if self._detokenizer is not None:
+                delta_text = self._decode(token_ids)
+                if self._stop_conditions is not None and delta_text:
+                    # The response is passed through whole; a match ends the stream after it
+                    self._check_stop(delta_text)
+        elif kind == "complete":
+            complete = response.complete
+            if self._detokenizer is not None:
+                self._decode(complete.output_ids, final=True)
+            self._record_complete(complete)
+        return response
 
     def _process_response(
         self, response: "vllm_engine_pb2.GenerateResponse"
-    ) -> CompletionChunk:
+    ) -> Union[CompletionChunk, FastCompletionChunk]:
         """Process a single gRPC response message."""
+        types = self._types
+        result: Union[CompletionChunk, FastCompletionChunk]
         if response.HasField("chunk"):
             chunk = response.chunk
             token_ids = list(chunk.token_ids)
@@ -83,17 +281,23 @@ class GenerateStream:
             self._total_prompt_tokens = chunk.prompt_tokens
             self._total_completion_tokens += len(token_ids)
             self._cached_tokens = chunk.cached_tokens
+            delta_text = self._decode(token_ids)
+            finish_reason = None
+            if self._stop_conditions is not None and delta_text:
+                delta_text, finish_reason = self._check_stop(delta_text)
 
-            return CompletionChunk(
+            result = types.CompletionChunk(
                 id=self._request_id,
                 model=self._model,
                 choices=[
-                    CompletionChunkChoice(
+                    types.CompletionChunkChoice(
                         index=0,
                         delta_token_ids=token_ids,
+                        delta_text=delta_text,
+                        finish_reason=finish_reason,
                     )
                 ],
-                usage=CompletionUsage(
+                usage=types.CompletionUsage(
                     prompt_tokens=chunk.prompt_tokens,
                     completion_tokens=len(token_ids),
                     total_tokens=chunk.prompt_tokens + len(token_ids),
@@ -102,43 +306,22 @@ class GenerateStream:
             )
         elif response.HasField("complete"):
             complete = response.complete
-            # Store final completion
-            from vllm_grpc_client._types import CompletionChoice
+            delta_text = self._decode(complete.output_ids, final=True)
+            self._record_complete(complete)
 
-            self._final_completion = Completion(
+            # Final chunk with finish_reason
+            result = types.CompletionChunk(
                 id=self._request_id,
                 model=self._model,
                 choices=[
-                    CompletionChoice(
-                        index=0,
-                        token_ids=self._accumulated_token_ids + list(complete.output_ids),
-                        finish_reason=complete.finish_reason or "stop",
-                    )
-                ],
-                usage=CompletionUsage(
-                    prompt_tokens=complete.prompt_tokens or self._total_prompt_tokens,
-                    completion_tokens=self._total_completion_tokens + len(complete.output_ids),
-                    total_tokens=(
-                        (complete.prompt_tokens or self._total_prompt_tokens)
-                        + self._total_completion_tokens
-                        + len(complete.output_ids)
-                    ),
-                    cached_tokens=complete.cached_tokens or self._cached_tokens,
-                ),
-            )
-
-            # Return final chunk with finish_reason
-            return CompletionChunk(
-                id=self._request_id,
-                model=self._model,
-                choices=[
-                    CompletionChunkChoice(
+                    types.CompletionChunkChoice(
                         index=0,
                         delta_token_ids=list(complete.output_ids),
+                        delta_text=delta_text,
                         finish_reason=complete.finish_reason or "stop",
                     )
                 ],
-                usage=CompletionUsage(
+                usage=types.CompletionUsage(
                     prompt_tokens=complete.prompt_tokens,
                     completion_tokens=len(complete.output_ids),
                     total_tokens=complete.prompt_tokens + len(complete.output_ids),
@@ -146,13 +329,48 @@ class GenerateStream:
                 ),
             )
         else:
-            # Unknown response type, return empty chunk
-            return CompletionChunk(
+            # Unknown response type, an empty chunk
+            result = types.CompletionChunk(
                 id=self._request_id,
                 model=self._model,
             )
-
-    def get_final_completion(self) -> Optional[Completion]:
+        return result
+
+    def _mark_finished(self) -> None:
+        """Record that the request is over, calling on_finish once."""
+        if self._finished:
+            return
+        self._finished = True
+        if self._on_finish is not None:
+            self._on_finish()
+
+    def _abandon(self) -> None:
+        """Cancel the RPC and ask the server to abort the request, once."""
+        if self._finished:
+            return
+        self._mark_finished()
+        _abandon_call(self._response_iterator, self._on_abandon, self._request_id)
+
+    def _handle_error(self, error: Exception) -> BaseException:
+        """Map an exception raised by the response iterator."""
+        import grpc
+
+        if not isinstance(error, grpc.RpcError):
+            self._mark_finished()
+            return error
+        mapped = _exception_from_grpc_error(error)
+        if isinstance(mapped, VLLMGrpcTimeoutError):
+            # Our deadline expired, but the engine may still be decoding
+            self._abandon()
+        self._mark_finished()
+        return mapped
+
+    @property
+    def closed(self) -> bool:
+        """Whether close() has been called."""
+        return self._closed
+
+    def get_final_completion(self) -> Optional[Union[Completion, FastCompletion]]:
         """
         Get the final completion after streaming is complete.
 
@@ -162,17 +380,142 @@ class GenerateStream:
         return self._final_completion
 
 
-class AsyncGenerateStream:
+class GenerateStream(_BaseGenerateStream):
+    """
+    Synchronous streaming iterator for generation responses.
+
+    Yields CompletionChunk objects for each streaming response, and provides
+    access to the final Completion when streaming is complete. With raw=True
+    the protobuf GenerateResponse messages are yielded instead.
+
+    Leaving the stream early (close(), the end of a with block, or garbage
+    collection) or a matching stop condition cancels the RPC and sends an
+    Abort for the request.
+
+    Usage:
+        with client.completions.create(prompt="Hello", stream=True) as stream:
+            for chunk in stream:
+                print(chunk.choices[0].delta_token_ids)
+        # Access final completion
+        final = stream.get_final_completion()
+    """
+
+    def __init__(
+        self,
+        response_iterator: Iterator["vllm_engine_pb2.GenerateResponse"],
+        request_id: str,
+        model: str = "",
+        raw: bool = False,
+        fast_types: bool = False,
+        on_abandon: Optional[AbortCallback] = None,
+        detokenizer: Optional[IncrementalDecoder] = None,
+        stop_conditions: Optional[Sequence[StopConditionLike]] = None,
+        timing: Optional[RequestTiming] = None,
+        timing_stats: Optional[TimingStats] = None,
+        on_finish: Optional[Callable[[], None]] = None,
+        cached: bool = False,
+    ):
+        """
+        Initialize the streaming iterator.
+
+        Args:
+            response_iterator: The gRPC response iterator.
+            request_id: The request ID for this generation.
+            model: The model name (for response metadata).
+            raw: Yield protobuf GenerateResponse messages instead of CompletionChunks.
+            fast_types: Build slotted FastCompletionChunk objects instead of
+                pydantic CompletionChunks.
+            on_abandon: Non-blocking callback that sends an Abort for a request ID,
+                called when the stream is left before the server finished.
+            detokenizer: IncrementalDecoder used to fill delta_text and the
+                final completion's text.
+            stop_conditions: Client-side StopConditions (or predicates over the
+                decoded text). When one matches, the stream ends with
+                finish_reason "stop" and the request is aborted. Requires a
+                detokenizer. In raw mode the matching response is yielded
+                whole and ends the stream; the final completion's text is cut
+                at the match.
+            timing: RequestTiming started when the request was created. A new
+                one is started if not given.
+            timing_stats: Aggregator the timing is added to on completion.
+            on_finish: Callback run once when the request is over, whether it
+                completed, failed or was abandoned.
+            cached: The responses replay a ResponseCache hit; the final
+                completion then carries cached=True and zero usage.
+        """
+        super().__init__(
+            request_id,
+            model,
+            raw,
+            fast_types,
+            on_abandon,
+            detokenizer,
+            stop_conditions,
+            timing,
+            timing_stats,
+            on_finish,
+            cached,
+        )
+        self._response_iterator = response_iterator
+
+    def __iter__(self) -> Iterator[StreamItem]:
+        return self
+
+    def __next__(self) -> StreamItem:
+        if self._closed or self._stopped_by is not None:
+            raise StopIteration
+        try:
+            response = next(self._response_iterator)
+        except StopIteration:
+            self._mark_finished()
+            raise
+        except Exception as e:
+            error = self._handle_error(e)
+            if error is e:
+                raise
+            raise error from e
+        self._timing._chunk()
+        return self._process(response)
+
+    def close(self) -> None:
+        """
+        Stop the stream.
+
+        If the server has not finished the request, the gRPC call is cancelled
+        and an Abort is sent for the request ID.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._abandon()
+
+    def __enter__(self) -> "GenerateStream":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if not getattr(self, "_finished", True):
+            self.close()
+
+
+class AsyncGenerateStream(_BaseGenerateStream):
     """
     Asynchronous streaming iterator for generation responses.
 
     Yields CompletionChunk objects for each streaming response, and provides
-    access to the final Completion when streaming is complete.
+    access to the final Completion when streaming is complete. With raw=True
+    the protobuf GenerateResponse messages are yielded instead.
+
+    Leaving the stream early (aclose(), the end of an async with block,
+    cancellation of the consuming task, or garbage collection) cancels the RPC
+    and sends an Abort for the request.
 
     Usage:
-        stream = await client.completions.create(prompt="Hello", stream=True)
-        async for chunk in stream:
-            print(chunk.choices[0].delta_token_ids)
+        async with await client.completions.create(prompt="Hello", stream=True) as stream:
+            async for chunk in stream:
+                print(chunk.choices[0].delta_token_ids)
         # Access final completion
         final = stream.get_final_completion()
     """
@@ -182,6 +525,15 @@ class AsyncGenerateStream:
         response_iterator: AsyncIterator["vllm_engine_pb2.GenerateResponse"],
         request_id: str,
         model: str = "",
+        raw: bool = False,
+        fast_types: bool = False,
+        on_abandon: Optional[AbortCallback] = None,
+        detokenizer: Optional[IncrementalDecoder] = None,
+        stop_conditions: Optional[Sequence[StopConditionLike]] = None,
+        timing: Optional[RequestTiming] = None,
+        timing_stats: Optional[TimingStats] = None,
+        on_finish: Optional[Callable[[], None]] = None,
+        cached: bool = False,
     ):
         """
         Initialize the async streaming iterator.
@@ -190,125 +542,109 @@ class AsyncGenerateStream:
             response_iterator: The gRPC async response iterator.
             request_id: The request ID for this generation.
             model: The model name (for response metadata).
+            raw: Yield protobuf GenerateResponse messages instead of CompletionChunks.
+            fast_types: Build slotted FastCompletionChunk objects instead of
+                pydantic CompletionChunks.
+            on_abandon: Non-blocking callback that sends an Abort for a request ID,
+                called on the event loop when the stream is left before the
+                server finished.
+            detokenizer: IncrementalDecoder used to fill delta_text and the
+                final completion's text.
+            stop_conditions: Client-side StopConditions (or predicates over the
+                decoded text). When one matches, the stream ends with
+                finish_reason "stop" and the request is aborted. Requires a
+                detokenizer. In raw mode the matching response is yielded
+                whole and ends the stream; the final completion's text is cut
+                at the match.
+            timing: RequestTiming started when the request was created. A new
+                one is started if not given.
+            timing_stats: Aggregator the timing is added to on completion.
+            on_finish: Callback run once when the request is over, whether it
+                completed, failed or was abandoned.
+            cached: The responses replay a ResponseCache hit; the final
+                completion then carries cached=True and zero usage.
         """
+        super().__init__(
+            request_id,
+            model,
+            raw,
+            fast_types,
+            on_abandon,
+            detokenizer,
+            stop_conditions,
+            timing,
+            timing_stats,
+            on_finish,
+            cached,
+        )
         self._response_iterator = response_iterator
         # Get the actual async iterator from the gRPC call object
         self._aiter: Optional[AsyncIterator] = None
-        self._request_id = request_id
-        self._model = model
-        self._final_completion: Optional[Completion] = None
-        self._accumulated_token_ids: List[int] = []
-        self._total_prompt_tokens: int = 0
-        self._total_completion_tokens: int = 0
-        self._cached_tokens: int = 0
+        # Loop the call belongs to, for aborts triggered by garbage collection
+        try:
+            self._loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
 
-    def __aiter__(self) -> AsyncIterator[CompletionChunk]:
+    def __aiter__(self) -> AsyncIterator[StreamItem]:
         return self
 
-    async def __anext__(self) -> CompletionChunk:
+    async def __anext__(self) -> StreamItem:
+        if self._closed or self._stopped_by is not None:
+            raise StopAsyncIteration
         try:
             # Initialize the async iterator if not already done
             if self._aiter is None:
                 self._aiter = self._response_iterator.__aiter__()
             response = await self._aiter.__anext__()
-            return self._process_response(response)
         except StopAsyncIteration:
+            self._mark_finished()
             raise
-        except Exception as e:
-            import grpc
-
-            if isinstance(e, grpc.RpcError):
-                raise _exception_from_grpc_error(e) from e
+        except asyncio.CancelledError:
+            # The consuming task was cancelled; nobody will read the rest
+            self._abandon()
             raise
+        except Exception as e:
+            error = self._handle_error(e)
+            if error is e:
+                raise
+            raise error from e
+        self._timing._chunk()
+        return self._process(response)
+
+    async def aclose(self) -> None:
+        """
+        Stop the stream.
 
-    def _process_response(
-        self, response: "vllm_engine_pb2.GenerateResponse"
-    ) -> CompletionChunk:
-        """Process a single gRPC response message."""
-        if response.HasField("chunk"):
-            chunk = response.chunk
-            token_ids = list(chunk.token_ids)
-            self._accumulated_token_ids.extend(token_ids)
-            self._total_prompt_tokens = chunk.prompt_tokens
-            self._total_completion_tokens += len(token_ids)
-            self._cached_tokens = chunk.cached_tokens
+        If the server has not finished the request, the gRPC call is cancelled
+        and an Abort is sent for the request ID.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._abandon()
 
-            return CompletionChunk(
-                id=self._request_id,
-                model=self._model,
-                choices=[
-                    CompletionChunkChoice(
-                        index=0,
-                        delta_token_ids=token_ids,
-                    )
-                ],
-                usage=CompletionUsage(
-                    prompt_tokens=chunk.prompt_tokens,
-                    completion_tokens=len(token_ids),
-                    total_tokens=chunk.prompt_tokens + len(token_ids),
-                    cached_tokens=chunk.cached_tokens,
-                ),
-            )
-        elif response.HasField("complete"):
-            complete = response.complete
-            # Store final completion
-            from vllm_grpc_client._types import CompletionChoice
+    async def __aenter__(self) -> "AsyncGenerateStream":
+        return self
 
-            self._final_completion = Completion(
-                id=self._request_id,
-                model=self._model,
-                choices=[
-                    CompletionChoice(
-                        index=0,
-                        token_ids=self._accumulated_token_ids + list(complete.output_ids),
-                        finish_reason=complete.finish_reason or "stop",
-                    )
-                ],
-                usage=CompletionUsage(
-                    prompt_tokens=complete.prompt_tokens or self._total_prompt_tokens,
-                    completion_tokens=self._total_completion_tokens + len(complete.output_ids),
-                    total_tokens=(
-                        (complete.prompt_tokens or self._total_prompt_tokens)
-                        + self._total_completion_tokens
-                        + len(complete.output_ids)
-                    ),
-                    cached_tokens=complete.cached_tokens or self._cached_tokens,
-                ),
-            )
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
 
-            # Return final chunk with finish_reason
-            return CompletionChunk(
-                id=self._request_id,
-                model=self._model,
-                choices=[
-                    CompletionChunkChoice(
-                        index=0,
-                        delta_token_ids=list(complete.output_ids),
-                        finish_reason=complete.finish_reason or "stop",
-                    )
-                ],
-                usage=CompletionUsage(
-                    prompt_tokens=complete.prompt_tokens,
-                    completion_tokens=len(complete.output_ids),
-                    total_tokens=complete.prompt_tokens + len(complete.output_ids),
-                    cached_tokens=complete.cached_tokens,
-                ),
-            )
-        else:
-            # Unknown response type, return empty chunk
-            return CompletionChunk(
-                id=self._request_id,
-                model=self._model,
+    def __del__(self) -> None:
+        if getattr(self, "_finished", True):
+            return
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        # gRPC aio calls must be cancelled on their own loop
+        try:
+            loop.call_soon_threadsafe(
+                _abandon_call, self._response_iterator, self._on_abandon, self._request_id
             )
-
-    def get_final_completion(self) -> Optional[Completion]:
-        """
-        Get the final completion after streaming is complete.
-
-        Returns None if streaming has not finished yet or if no complete
-        response was received.
-        """
-        return self._final_completion
+            if self._on_finish is not None:
+                loop.call_soon_threadsafe(self._on_finish)
+        except RuntimeError:
+            pass
 
 
 # Type alias for stream return types
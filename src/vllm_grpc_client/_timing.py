@@ -0,0 +1,275 @@
+"""
+Per-request latency instrumentation for vLLM gRPC client.
+
+Every Generate request records a RequestTiming: when create() was called,
+when the RPC started, when each response arrived and when the request
+completed. Completions and streams expose it as .timing, and each client
+aggregates finished requests into a TimingStats with histograms for
+time-to-first-token, time-per-output-token, tokens/second and queueing delay.
+
+Timestamps are time.perf_counter() values; only differences between them
+are meaningful.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Smallest value resolved by LatencyHistogram; smaller values share the first bucket
+HISTOGRAM_MIN_VALUE = 1e-6
+
+# Buckets per doubling of the value (relative error about 4%)
+HISTOGRAM_BUCKETS_PER_DOUBLING = 8
+
+# Number of buckets, covering HISTOGRAM_MIN_VALUE up to about 1e9 (larger values
+# share the last bucket)
+HISTOGRAM_NUM_BUCKETS = 8 * 50
+
+_LOG_BUCKET_WIDTH = math.log(2) / HISTOGRAM_BUCKETS_PER_DOUBLING
+
+
+class RequestTiming:
+    """
+    Timestamps of one Generate request.
+
+    Attributes:
+        enqueue_time: When the request was created (create() was called).
+        rpc_start_time: When the Generate RPC was started.
+        first_chunk_time: When the first response arrived.
+        chunk_times: Arrival time of every response.
+        complete_time: When the request completed.
+        output_tokens: Number of generated tokens.
+        prompt_tokens: Number of prompt tokens.
+        cached_tokens: Number of prompt tokens served from the prefix cache.
+
+    Usage:
+        completion = client.completions.create(prompt="Hello", max_tokens=32)
+        print(completion.timing.ttft, completion.timing.tpot)
+    """
+
+    __slots__ = (
+        "enqueue_time",
+        "rpc_start_time",
+        "first_chunk_time",
+        "chunk_times",
+        "complete_time",
+        "output_tokens",
+        "prompt_tokens",
+        "cached_tokens",
+    )
+
+    def __init__(self, enqueue_time: Optional[float] = None):
+        self.enqueue_time = time.perf_counter() if enqueue_time is None else enqueue_time
+        self.rpc_start_time: Optional[float] = None
+        self.first_chunk_time: Optional[float] = None
+        self.chunk_times: List[float] = []
+        self.complete_time: Optional[float] = None
+        self.output_tokens = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+
+    def _rpc_started(self) -> None:
+        self.rpc_start_time = time.perf_counter()
+
+    def _chunk(self) -> None:
+        now = time.perf_counter()
+        if self.first_chunk_time is None:
+            self.first_chunk_time = now
+        self.chunk_times.append(now)
+
+    def _complete(self, output_tokens: int, prompt_tokens: int = 0, cached_tokens: int = 0) -> None:
+        self.complete_time = time.perf_counter()
+        self.output_tokens = output_tokens
+        self.prompt_tokens = prompt_tokens
+        self.cached_tokens = cached_tokens
+
+    @property
+    def queueing_delay(self) -> Optional[float]:
+        """Seconds from creation to the start of the RPC."""
+        if self.rpc_start_time is None:
+            return None
+        return self.rpc_start_time - self.enqueue_time
+
+    @property
+    def ttft(self) -> Optional[float]:
+        """Time to first token: seconds from creation to the first response."""
+        if self.first_chunk_time is None:
+            return None
+        return self.first_chunk_time - self.enqueue_time
+
+    @property
+    def tpot(self) -> Optional[float]:
+        """Time per output token after the first, in seconds."""
+        if self.complete_time is None or self.first_chunk_time is None:
+            return None
+        if self.output_tokens < 2:
+            return None
+        return (self.complete_time - self.first_chunk_time) / (self.output_tokens - 1)
+
+    @property
+    def e2e_latency(self) -> Optional[float]:
+        """Seconds from creation to completion."""
+        if self.complete_time is None:
+            return None
+        return self.complete_time - self.enqueue_time
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Output tokens divided by the end-to-end latency."""
+        latency = self.e2e_latency
+        if not latency:
+            return None
+        return self.output_tokens / latency
+
+    @property
+    def inter_chunk_latencies(self) -> List[float]:
+        """Seconds between consecutive responses."""
+        times = self.chunk_times
+        return [later - earlier for earlier, later in zip(times, times[1:])]
+
+    def __repr__(self) -> str:
+        def ms(value: Optional[float]) -> str:
+            return "None" if value is None else f"{value * 1000:.2f}ms"
+
+        return (
+            f"RequestTiming(queueing_delay={ms(self.queueing_delay)}, ttft={ms(self.ttft)}, "
+            f"tpot={ms(self.tpot)}, e2e_latency={ms(self.e2e_latency)}, "
+            f"chunks={len(self.chunk_times)}, output_tokens={self.output_tokens})"
+        )
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed histogram of non-negative values.
+
+    Buckets grow by 2 ** (1 / HISTOGRAM_BUCKETS_PER_DOUBLING), so quantiles
+    are accurate to a few percent at any scale and recording is O(1).
+    Not thread-safe on its own; TimingStats serializes access.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all recorded values."""
+        self._counts = [0] * HISTOGRAM_NUM_BUCKETS
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        """Add a value."""
+        if value > HISTOGRAM_MIN_VALUE:
+            index = int(math.log(value / HISTOGRAM_MIN_VALUE) / _LOG_BUCKET_WIDTH) + 1
+            index = min(index, HISTOGRAM_NUM_BUCKETS - 1)
+        else:
+            index = 0
+        self._counts[index] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        """Mean of the recorded values (0.0 when empty)."""
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: The quantile, between 0 and 1 (0.99 for p99).
+
+        Returns:
+            The estimated value, clamped to the observed min and max
+            (0.0 when empty).
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank and count:
+                break
+        if index == 0:
+            value = self.min
+        elif index == HISTOGRAM_NUM_BUCKETS - 1:
+            value = self.max
+        else:
+            # Geometric midpoint of the bucket
+            value = HISTOGRAM_MIN_VALUE * math.exp((index - 0.5) * _LOG_BUCKET_WIDTH)
+        return min(max(value, self.min), self.max)
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, p50, p90, p99 and max."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+class TimingStats:
+    """
+    Client-wide aggregate of finished requests' timings.
+
+    Each histogram is a LatencyHistogram: ttft, tpot, e2e_latency and
+    queueing_delay are in seconds, tokens_per_second in tokens/s.
+
+    Usage:
+        stats = client.timing_stats
+        print(stats.ttft.quantile(0.99))
+        print(stats.snapshot())
+    """
+
+    METRICS = ("ttft", "tpot", "tokens_per_second", "queueing_delay", "e2e_latency")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.ttft = LatencyHistogram()
+        self.tpot = LatencyHistogram()
+        self.tokens_per_second = LatencyHistogram()
+        self.queueing_delay = LatencyHistogram()
+        self.e2e_latency = LatencyHistogram()
+        self._listeners: List[Callable[[RequestTiming], None]] = []
+
+    def add_listener(self, listener: Callable[[RequestTiming], None]) -> None:
+        """Call listener(timing) for every finished request, e.g. to export metrics."""
+        with self._lock:
+            self._listeners = self._listeners + [listener]
+
+    def record(self, timing: RequestTiming) -> None:
+        """Add a finished request."""
+        with self._lock:
+            for name in self.METRICS:
+                value = getattr(timing, name)
+                if value is not None:
+                    getattr(self, name).record(value)
+        for listener in self._listeners:
+            listener(timing)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Summaries of every histogram, keyed by metric name."""
+        with self._lock:
+            return {name: getattr(self, name).summary() for name in self.METRICS}
+
+    def reset(self) -> None:
+        """Drop all recorded values."""
+        with self._lock:
+            for name in self.METRICS:
+                getattr(self, name).reset()
+
+    def __repr__(self) -> str:
+        return f"TimingStats(requests={self.e2e_latency.count})"
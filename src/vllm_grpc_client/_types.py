@@ -9,9 +9,11 @@ from __future__ import annotations
 
 import time
 import uuid
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from vllm_grpc_client._timing import RequestTiming
 
 
 # =====================
@@ -217,12 +219,26 @@ class Completion(BaseModel):
     response in a streaming sequence.
     """
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     id: str = Field(default_factory=lambda: f"cmpl-{uuid.uuid4().hex[:24]}")
     object: str = Field(default="text_completion")
     created: int = Field(default_factory=lambda: int(time.time()))
     model: str = Field(default="")
     choices: List[CompletionChoice] = Field(default_factory=list)
     usage: Optional[CompletionUsage] = Field(default=None)
+    cached: bool = Field(
+        default=False, description="Served from a client-side ResponseCache, at no server cost"
+    )
+    timing: Optional[RequestTiming] = Field(
+        default=None, exclude=True, repr=False, description="Client-side request timing"
+    )
+
+    def __eq__(self, other: Any) -> bool:
+        # Timing differs between otherwise identical results
+        if type(other) is not type(self):
+            return NotImplemented
+        return {**self.__dict__, "timing": None} == {**other.__dict__, "timing": None}
 
     @classmethod
     def from_grpc_complete(
@@ -332,6 +348,9 @@ class EmbeddingResponse(BaseModel):
     data: List[Embedding] = Field(default_factory=list)
     model: str = Field(default="")
     usage: Optional[EmbeddingUsage] = Field(default=None)
+    cached: bool = Field(
+        default=False, description="Served from a client-side EmbeddingCache, at no server cost"
+    )
 
     @classmethod
     def from_grpc_response(
@@ -0,0 +1,338 @@
+"""
+Offline JSONL batch runner for vLLM gRPC client.
+
+Reads completion requests from a JSONL file one line at a time, drives
+AsyncVLLMGrpcClient at a fixed concurrency, and appends one result line per
+request to an output JSONL file. Progress is checkpointed so an interrupted
+run resumes without redoing finished requests.
+
+Input lines are JSON objects with a "prompt" (text or list of token IDs), an
+optional "request_id", and any sampling arguments accepted by
+completions.create (max_tokens, temperature, stop, ...). Other keys are ignored.
+
+Usage:
+    python -m vllm_grpc_client.batch requests.jsonl -o results.jsonl \\
+        --host localhost --port 9000 --concurrency 64
+
+Checkpointing:
+    The checkpoint file (default: <output>.ckpt) records a watermark line below
+    which every request is finished, the finished lines above it, and the byte
+    offsets of the watermark in the input and of the output file. Resuming
+    seeks the input to the watermark and truncates output written after the
+    last checkpoint, so each request appears exactly once in the output.
+    Memory stays flat: at most a bounded window of lines past the watermark is
+    tracked, regardless of input size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from vllm_grpc_client._client import AsyncVLLMGrpcClient
+
+# Default number of requests in flight
+DEFAULT_CONCURRENCY = 64
+
+# Default seconds between checkpoint writes
+DEFAULT_CHECKPOINT_INTERVAL = 5.0
+
+# Lines that may be read past the watermark, as a multiple of the concurrency
+_WINDOW_FACTOR = 64
+
+
+def _create_arguments() -> Set[str]:
+    """Keyword arguments of AsyncCompletions.create that input lines may set."""
+    from vllm_grpc_client.resources.completions import AsyncCompletions
+
+    names = set(inspect.signature(AsyncCompletions.create).parameters)
+    return names - {"self", "prompt", "stream", "request_id"}
+
+
+class BatchCheckpoint:
+    """
+    Resumable progress of a batch run.
+
+    Attributes:
+        next_line: Watermark; every input line before it is finished.
+        input_offset: Byte offset of the watermark line in the input file.
+        output_offset: Size of the output file when the checkpoint was taken.
+        done: Finished line numbers at or above the watermark.
+    """
+
+    def __init__(
+        self,
+        input_path: str,
+        next_line: int = 0,
+        input_offset: int = 0,
+        output_offset: int = 0,
+        done: Optional[Set[int]] = None,
+    ):
+        self.input_path = input_path
+        self.next_line = next_line
+        self.input_offset = input_offset
+        self.output_offset = output_offset
+        self.done: Set[int] = done or set()
+
+    @classmethod
+    def load(cls, path: str, input_path: str) -> Optional["BatchCheckpoint"]:
+        """Load a checkpoint, or return None if there is none."""
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            data = json.load(f)
+        if data["input"] != input_path:
+            raise ValueError(
+                f"Checkpoint {path} belongs to {data['input']}, not {input_path}; "
+                "use --no-resume to start over"
+            )
+        return cls(
+            input_path,
+            next_line=data["next_line"],
+            input_offset=data["input_offset"],
+            output_offset=data["output_offset"],
+            done=set(data["done"]),
+        )
+
+    def save(self, path: str) -> None:
+        """Write the checkpoint atomically."""
+        data = {
+            "input": self.input_path,
+            "next_line": self.next_line,
+            "input_offset": self.input_offset,
+            "output_offset": self.output_offset,
+            "done": sorted(self.done),
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+class BatchStats:
+    """Counters for a batch run."""
+
+    def __init__(self) -> None:
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.started = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def __str__(self) -> str:
+        rate = self.completed / self.elapsed if self.elapsed > 0 else 0.0
+        return (
+            f"completed={self.completed} failed={self.failed} skipped={self.skipped} "
+            f"elapsed={self.elapsed:.1f}s rate={rate:.1f} req/s"
+        )
+
+
+async def _run_line(
+    client: AsyncVLLMGrpcClient,
+    line_no: int,
+    raw: bytes,
+    allowed: Set[str],
+) -> Tuple[int, Dict[str, Any]]:
+    """Run the request on one input line and build its output record."""
+    request_id = f"line-{line_no}"
+    try:
+        spec = json.loads(raw)
+        request_id = str(spec.get("request_id") or request_id)
+        if "prompt" not in spec:
+            raise ValueError("missing 'prompt'")
+        kwargs = {key: value for key, value in spec.items() if key in allowed}
+        completion = await client.completions.create(
+            prompt=spec["prompt"], request_id=request_id, **kwargs
+        )
+    except Exception as e:
+        return line_no, {"line": line_no, "request_id": request_id, "error": str(e)}
+
+    choice = completion.choices[0] if completion.choices else None
+    return line_no, {
+        "line": line_no,
+        "request_id": request_id,
+        "token_ids": choice.token_ids if choice else [],
+        "finish_reason": choice.finish_reason if choice else None,
+        "usage": completion.usage.model_dump() if completion.usage else None,
+    }
+
+
+async def run_batch(
+    client: AsyncVLLMGrpcClient,
+    input_path: str,
+    output_path: str,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+    resume: bool = True,
+) -> BatchStats:
+    """
+    Run every request in a JSONL file and write results to an output JSONL file.
+
+    Args:
+        client: The async client to send requests with.
+        input_path: Path of the input JSONL file.
+        output_path: Path of the output JSONL file (appended to on resume).
+        concurrency: Maximum number of requests in flight.
+        checkpoint_path: Checkpoint file. Defaults to "<output_path>.ckpt".
+        checkpoint_interval: Seconds between checkpoint writes.
+        resume: Whether to continue from an existing checkpoint.
+
+    Returns:
+        BatchStats for this run.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    input_path = os.path.abspath(input_path)
+    checkpoint_path = checkpoint_path or f"{output_path}.ckpt"
+
+    state = BatchCheckpoint.load(checkpoint_path, input_path) if resume else None
+    if state is None:
+        state = BatchCheckpoint(input_path)
+        open(output_path, "wb").close()
+
+    allowed = _create_arguments()
+    stats = BatchStats()
+    window = concurrency * _WINDOW_FACTOR
+    # Input byte offset of every read line at or above the watermark
+    offsets: Dict[int, int] = {}
+    pending: Set[asyncio.Task] = set()
+
+    with open(input_path, "rb") as infile, open(output_path, "r+b") as outfile:
+        # Drop results written after the last checkpoint; they will be redone
+        outfile.truncate(state.output_offset)
+        outfile.seek(state.output_offset)
+        infile.seek(state.input_offset)
+        line_no = state.next_line
+        eof = False
+        last_checkpoint = time.monotonic()
+
+        def finish(index: int) -> None:
+            state.done.add(index)
+            while state.next_line in state.done:
+                state.done.discard(state.next_line)
+                offsets.pop(state.next_line, None)
+                state.next_line += 1
+
+        def checkpoint() -> None:
+            outfile.flush()
+            os.fsync(outfile.fileno())
+            state.output_offset = outfile.tell()
+            state.input_offset = offsets.get(state.next_line, infile.tell())
+            state.save(checkpoint_path)
+
+        try:
+            while True:
+                while (
+                    not eof
+                    and len(pending) < concurrency
+                    and line_no - state.next_line < window
+                ):
+                    offset = infile.tell()
+                    raw = infile.readline()
+                    if not raw:
+                        eof = True
+                        break
+                    index = line_no
+                    line_no += 1
+                    offsets[index] = offset
+                    if index in state.done:
+                        stats.skipped += 1
+                    elif not raw.strip():
+                        finish(index)
+                    else:
+                        task = asyncio.ensure_future(_run_line(client, index, raw, allowed))
+                        pending.add(task)
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index, record = task.result()
+                    outfile.write(json.dumps(record).encode() + b"\n")
+                    if "error" in record:
+                        stats.failed += 1
+                    else:
+                        stats.completed += 1
+                    finish(index)
+
+                if time.monotonic() - last_checkpoint >= checkpoint_interval:
+                    checkpoint()
+                    last_checkpoint = time.monotonic()
+        finally:
+            # Stop in-flight requests if the run is interrupted
+            for task in pending:
+                task.cancel()
+
+        checkpoint()
+
+    return stats
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m vllm_grpc_client.batch",
+        description="Run a JSONL file of completion requests against a vLLM gRPC server.",
+    )
+    parser.add_argument("input", help="Input JSONL file, one request per line")
+    parser.add_argument(
+        "-o", "--output", help="Output JSONL file (default: <input>.results.jsonl)"
+    )
+    parser.add_argument("--host", default=None, help="Server host (default: VLLM_GRPC_HOST)")
+    parser.add_argument(
+        "--port", type=int, default=None, help="Server port (default: VLLM_GRPC_PORT)"
+    )
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--pool-size", type=int, default=1, help="gRPC channels to open")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-request timeout")
+    parser.add_argument(
+        "--checkpoint", default=None, help="Checkpoint file (default: <output>.ckpt)"
+    )
+    parser.add_argument(
+        "--checkpoint-interval", type=float, default=DEFAULT_CHECKPOINT_INTERVAL
+    )
+    parser.add_argument(
+        "--no-resume", action="store_true", help="Ignore any checkpoint and start over"
+    )
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> BatchStats:
+    output = args.output or f"{os.path.splitext(args.input)[0]}.results.jsonl"
+    async with AsyncVLLMGrpcClient(
+        host=args.host, port=args.port, timeout=args.timeout, pool_size=args.pool_size
+    ) as client:
+        return await run_batch(
+            client,
+            args.input,
+            output,
+            concurrency=args.concurrency,
+            checkpoint_path=args.checkpoint,
+            checkpoint_interval=args.checkpoint_interval,
+            resume=not args.no_resume,
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    args = _parse_args(argv)
+    stats = asyncio.run(_main(args))
+    print(stats, file=sys.stderr)
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+"""
+Load-generation benchmark for vLLM gRPC client.
+
+Drives AsyncVLLMGrpcClient with streaming Generate requests, either at a
+fixed rate with Poisson arrivals (--qps) or at a fixed number of requests in
+flight (--concurrency), and reports throughput, TTFT, TPOT and end-to-end
+latency percentiles, plus the client CPU time spent per output token.
+
+Prompts are random token IDs, so no tokenizer is needed; requests set
+ignore_eos so servers generate exactly the sampled output length. Prompt
+and output lengths are drawn from distributions given as:
+
+    128                 fixed
+    uniform:64:256      uniform integer in [64, 256]
+    normal:128:32       normal with mean 128 and standard deviation 32
+    exponential:128     exponential with mean 128
+
+Lengths are rounded and clamped to at least 1.
+
+Usage:
+    python -m vllm_grpc_client.bench --host localhost --port 9000 \\
+        --qps 20 --num-requests 500 --input-len uniform:64:512 --output-len 128
+
+    # Against an in-process fake server, to measure client-side overhead
+    python -m vllm_grpc_client.bench --fake --concurrency 64 --num-requests 2000
+
+CPU per token:
+    cpu_per_token is process CPU time divided by output tokens; with --fake it
+    includes the fake server. loop_cpu_per_token counts only the event loop
+    thread, where the client decodes responses and builds requests, and is
+    the number to watch for client regressions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from vllm_grpc_client._client import AsyncVLLMGrpcClient
+from vllm_grpc_client._timing import LatencyHistogram
+
+# Default number of requests to send
+DEFAULT_NUM_REQUESTS = 200
+
+# Default requests in flight when neither --qps nor --concurrency is given
+DEFAULT_CONCURRENCY = 16
+
+# Prompt token IDs are drawn below this value
+_PROMPT_VOCAB_SIZE = 1000
+
+LengthSampler = Callable[[random.Random], int]
+
+
+def parse_length(spec: str) -> LengthSampler:
+    """
+    Parse a length distribution spec (see the module docstring).
+
+    Args:
+        spec: "N", "uniform:LO:HI", "normal:MEAN:STD" or "exponential:MEAN".
+
+    Returns:
+        A function drawing a length (at least 1) from a random.Random.
+    """
+    kind, _, rest = spec.partition(":")
+    try:
+        if not rest:
+            value = int(kind)
+            return lambda rng: max(1, value)
+        args = [float(a) for a in rest.split(":")]
+        if kind == "uniform" and len(args) == 2:
+            low, high = int(args[0]), int(args[1])
+            return lambda rng: max(1, rng.randint(low, high))
+        if kind == "normal" and len(args) == 2:
+            mean, std = args
+            return lambda rng: max(1, round(rng.gauss(mean, std)))
+        if kind == "exponential" and len(args) == 1:
+            mean = args[0]
+            return lambda rng: max(1, round(rng.expovariate(1.0 / mean)))
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid length distribution: {spec!r}")
+
+
+class BenchResult:
+    """Measurements of a benchmark run."""
+
+    def __init__(self) -> None:
+        self.completed = 0
+        self.failed = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.duration = 0.0
+        self.cpu_time = 0.0
+        self.loop_cpu_time = 0.0
+        self.ttft = LatencyHistogram()
+        self.tpot = LatencyHistogram()
+        self.e2e_latency = LatencyHistogram()
+        self.errors: Dict[str, int] = {}
+
+    def summary(self) -> Dict[str, Any]:
+        """Throughput, latency summaries (in seconds) and CPU per token (in seconds)."""
+        duration = self.duration or 1e-9
+        tokens = self.output_tokens or 1
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "duration": self.duration,
+            "request_throughput": self.completed / duration,
+            "output_token_throughput": self.output_tokens / duration,
+            "total_token_throughput": (self.prompt_tokens + self.output_tokens) / duration,
+            "ttft": self.ttft.summary(),
+            "tpot": self.tpot.summary(),
+            "e2e_latency": self.e2e_latency.summary(),
+            "cpu_per_token": self.cpu_time / tokens,
+            "loop_cpu_per_token": self.loop_cpu_time / tokens,
+            "errors": dict(self.errors),
+        }
+
+    def __str__(self) -> str:
+        s = self.summary()
+
+        def ms(name: str) -> str:
+            h = s[name]
+            return (
+                f"{name:12s} mean {h['mean'] * 1e3:9.2f}  p50 {h['p50'] * 1e3:9.2f}  "
+                f"p90 {h['p90'] * 1e3:9.2f}  p99 {h['p99'] * 1e3:9.2f} ms"
+            )
+
+        lines = [
+            f"requests     completed {s['completed']}  failed {s['failed']}  "
+            f"duration {s['duration']:.2f}s",
+            f"throughput   {s['request_throughput']:.2f} req/s  "
+            f"{s['output_token_throughput']:.1f} output tok/s  "
+            f"{s['total_token_throughput']:.1f} total tok/s",
+            ms("ttft"),
+            ms("tpot"),
+            ms("e2e_latency"),
+            f"client cpu   {s['cpu_per_token'] * 1e6:.2f} us/token  "
+            f"(event loop {s['loop_cpu_per_token'] * 1e6:.2f} us/token)",
+        ]
+        if s["errors"]:
+            lines.append(f"errors       {s['errors']}")
+        return "\n".join(lines)
+
+
+async def _run_request(
+    client: Any,
+    rng: random.Random,
+    input_len: LengthSampler,
+    output_len: LengthSampler,
+    result: BenchResult,
+    create_kwargs: Dict[str, Any],
+) -> None:
+    prompt = [rng.randrange(_PROMPT_VOCAB_SIZE) for _ in range(input_len(rng))]
+    max_tokens = output_len(rng)
+    try:
+        stream = await client.completions.create(
+            prompt=prompt, max_tokens=max_tokens, ignore_eos=True, stream=True, **create_kwargs
+        )
+        async for _ in stream:
+            pass
+    except Exception as e:
+        result.failed += 1
+        name = type(e).__name__
+        result.errors[name] = result.errors.get(name, 0) + 1
+        return
+    timing = stream.timing
+    result.completed += 1
+    result.prompt_tokens += len(prompt)
+    result.output_tokens += timing.output_tokens
+    for name in ("ttft", "tpot", "e2e_latency"):
+        value = getattr(timing, name)
+        if value is not None:
+            getattr(result, name).record(value)
+
+
+async def run_benchmark(
+    client: Any,
+    *,
+    num_requests: int = DEFAULT_NUM_REQUESTS,
+    qps: Optional[float] = None,
+    concurrency: Optional[int] = None,
+    input_len: LengthSampler = parse_length("128"),
+    output_len: LengthSampler = parse_length("128"),
+    seed: int = 0,
+    **create_kwargs: Any,
+) -> BenchResult:
+    """
+    Run a benchmark against a client.
+
+    Args:
+        client: An AsyncVLLMGrpcClient (or AsyncLoadBalancedClient).
+        num_requests: Number of requests to send.
+        qps: Mean request rate with Poisson arrivals; requests are not limited
+            in number in flight.
+        concurrency: Requests kept in flight (used when qps is None).
+        input_len: Prompt length sampler, see parse_length().
+        output_len: Output length sampler.
+        seed: Seed for lengths, prompts and arrivals.
+        **create_kwargs: Extra arguments for completions.create (e.g. raw=True).
+
+    Returns:
+        The BenchResult.
+    """
+    rng = random.Random(seed)
+    result = BenchResult()
+    cpu_start, loop_cpu_start = time.process_time(), time.thread_time()
+    start = time.perf_counter()
+
+    def request() -> Any:
+        return _run_request(client, rng, input_len, output_len, result, create_kwargs)
+
+    if qps is not None:
+        tasks: List[asyncio.Task] = []
+        next_arrival = start
+        for _ in range(num_requests):
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(request()))
+            next_arrival += rng.expovariate(qps)
+        await asyncio.gather(*tasks)
+    else:
+        remaining = num_requests
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                await request()
+
+        workers = concurrency or DEFAULT_CONCURRENCY
+        await asyncio.gather(*(worker() for _ in range(min(workers, num_requests))))
+
+    result.duration = time.perf_counter() - start
+    result.cpu_time = time.process_time() - cpu_start
+    result.loop_cpu_time = time.thread_time() - loop_cpu_start
+    return result
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m vllm_grpc_client.bench",
+        description="Generate streaming load against a vLLM gRPC server and report latencies.",
+    )
+    parser.add_argument("--host", default=None, help="Server host (default: VLLM_GRPC_HOST)")
+    parser.add_argument(
+        "--port", type=int, default=None, help="Server port (default: VLLM_GRPC_PORT)"
+    )
+    parser.add_argument("--pool-size", type=int, default=1, help="gRPC channels to open")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-request timeout")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--qps", type=float, default=None, help="Poisson arrival rate")
+    mode.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help=f"Requests in flight (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument("--num-requests", type=int, default=DEFAULT_NUM_REQUESTS)
+    parser.add_argument(
+        "--input-len", type=parse_length, default="128", help="Prompt length distribution"
+    )
+    parser.add_argument(
+        "--output-len", type=parse_length, default="128", help="Output length distribution"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fast-types", action="store_true", help="Use slotted result types")
+    parser.add_argument("--raw", action="store_true", help="Stream raw protobuf responses")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    parser.add_argument(
+        "--fake", action="store_true", help="Run against an in-process fake server"
+    )
+    parser.add_argument("--fake-ttft", type=float, default=0.0, help="Fake server TTFT in seconds")
+    parser.add_argument(
+        "--fake-tokens-per-second",
+        type=float,
+        default=None,
+        help="Fake server per-request token rate (default: unlimited)",
+    )
+    parser.add_argument(
+        "--fake-chunk-size", type=int, default=1, help="Fake server tokens per chunk"
+    )
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> BenchResult:
+    server = None
+    host, port = args.host, args.port
+    if args.fake:
+        from vllm_grpc_client.testing import FakeVllmServer
+
+        server = FakeVllmServer(
+            ttft=args.fake_ttft,
+            tokens_per_second=args.fake_tokens_per_second,
+            chunk_size=args.fake_chunk_size,
+        ).start()
+        host, port = server.host, server.port
+    try:
+        async with AsyncVLLMGrpcClient(
+            host=host,
+            port=port,
+            secure=False if server is not None else None,
+            timeout=args.timeout,
+            pool_size=args.pool_size,
+            fast_types=args.fast_types,
+        ) as client:
+            return await run_benchmark(
+                client,
+                num_requests=args.num_requests,
+                qps=args.qps,
+                concurrency=args.concurrency,
+                input_len=args.input_len,
+                output_len=args.output_len,
+                seed=args.seed,
+                raw=args.raw,
+            )
+    finally:
+        if server is not None:
+            server.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    args = _parse_args(argv)
+    result = asyncio.run(_main(args))
+    print(json.dumps(result.summary(), indent=2) if args.json else result)
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,638 @@
+"""
+Prometheus-format metrics for vLLM gRPC client traffic.
+
+MetricsRegistry holds counters, gauges and histograms and renders them in
+the Prometheus text exposition format, in process, with no external
+service. Updates are lock-free on the hot path: every thread writes its own
+cells, and render() sums them. The cells of a thread that exited are folded
+into a retired total, so short-lived worker threads do not accumulate.
+
+ClientMetrics instruments clients with request counts by RPC and status
+code, in-flight RPCs (streams included), RPC durations, token counts from
+CompletionUsage, time to first token, queueing delay and aborts.
+
+Usage:
+    from vllm_grpc_client import ClientMetrics, VLLMGrpcClient
+
+    metrics = ClientMetrics()
+    client = VLLMGrpcClient(host="localhost", port=9000, metrics=metrics)
+    metrics.registry.serve(port=9464)  # or: text = metrics.registry.render()
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import threading
+import time
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+import grpc
+
+from vllm_grpc_client._interceptors import ClientInterceptor, Metadata
+from vllm_grpc_client._timing import RequestTiming
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Values of the circuit breaker state gauge
+_CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+# Default histogram buckets (in seconds) for latencies
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _ThreadOwner:
+    """Kept in a thread's local data; collected when the thread exits."""
+
+    __slots__ = ("__weakref__",)
+
+
+class _ShardedCells:
+    """
+    Per-thread float cells summed on read.
+
+    Each thread only ever writes its own cell, so increments need no lock;
+    the lock is taken once per thread, when its cell is created, and once
+    more when the thread exits and its cells are added to the retired totals.
+    """
+
+    def __init__(self, size: int = 1):
+        self._size = size
+        self._lock = threading.Lock()
+        self._shards: Dict[int, List[float]] = {}
+        self._retired = [0.0] * size
+        self._keys = itertools.count()
+        self._local = threading.local()
+
+    def cells(self) -> List[float]:
+        """The calling thread's cells."""
+        try:
+            cells: List[float] = self._local.cells
+        except AttributeError:
+            return self._add_cells()
+        return cells
+
+    def _add_cells(self) -> List[float]:
+        cells = [0.0] * self._size
+        owner = _ThreadOwner()
+        with self._lock:
+            key = next(self._keys)
+            self._shards[key] = cells
+        # Thread-local data is released when its thread exits
+        weakref.finalize(owner, _retire_cells, weakref.ref(self), key)
+        self._local.owner = owner
+        self._local.cells = cells
+        return cells
+
+    def _retire(self, key: int) -> None:
+        with self._lock:
+            cells = self._shards.pop(key)
+            for index, value in enumerate(cells):
+                self._retired[index] += value
+
+    def totals(self) -> List[float]:
+        """Sum of every thread's cells."""
+        with self._lock:
+            totals = list(self._retired)
+            shards = list(self._shards.values())
+        for cells in shards:
+            for index, value in enumerate(cells):
+                totals[index] += value
+        return totals
+
+
+def _retire_cells(ref: "weakref.ref[_ShardedCells]", key: int) -> None:
+    """Finalizer of a thread's cells; a no-op once the metric itself is gone."""
+    sharded = ref()
+    if sharded is not None:
+        sharded._retire(key)
+
+
+class _Metric:
+    """Common parts of labelled metrics."""
+
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        # The child of an unlabelled metric
+        self._default: Any = self._new_child() if not self.labelnames else None
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> Any:
+        """The child metric for the given label values, in labelnames order."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _samples(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        if self._default is not None:
+            return [((), self._default)]
+        with self._lock:
+            return sorted(self._children.items())
+
+    def _render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.documentation}")
+        lines.append(f"# TYPE {self.name} {self.TYPE}")
+        for values, child in self._samples():
+            child._render(self.name, self.labelnames, values, lines)
+
+
+class _CounterChild:
+    __slots__ = ("_cells", "_function")
+
+    def __init__(self) -> None:
+        self._cells = _ShardedCells()
+        self._function: Optional[Callable[[], float]] = None
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._cells.cells()[0] += amount
+
+    def get(self) -> float:
+        if self._function is not None:
+            return self._function()
+        return self._cells.totals()[0]
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._function = function
+
+    def _render(self, name: str, names: Sequence[str], values: Sequence[str], lines: List[str]):
+        lines.append(f"{name}{_format_labels(names, values)} {_format_value(self.get())}")
+
+
+class Counter(_Metric):
+    """
+    A monotonically increasing value.
+
+    Usage:
+        requests = registry.counter("requests_total", "Requests", ["rpc"])
+        requests.labels("Generate").inc()
+    """
+
+    TYPE = "counter"
+    _default: _CounterChild
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment an unlabelled counter."""
+        self._default.inc(amount)
+
+    def get(self) -> float:
+        """Current value of an unlabelled counter."""
+        return self._default.get()
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Report function() for an unlabelled counter, for counts kept elsewhere."""
+        self._default.set_function(function)
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._cells.cells()[0] -= amount
+
+
+class Gauge(_Metric):
+    """
+    A value that goes up and down, like the number of in-flight requests.
+
+    Increments and decrements may happen on different threads.
+    """
+
+    TYPE = "gauge"
+    _default: _GaugeChild
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment an unlabelled gauge."""
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrement an unlabelled gauge."""
+        self._default.dec(amount)
+
+    def get(self) -> float:
+        """Current value of an unlabelled gauge."""
+        return self._default.get()
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Report function() for an unlabelled gauge, for values kept elsewhere."""
+        self._default.set_function(function)
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_cells")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        # One cell per bucket including +Inf, plus sum and count
+        self._cells = _ShardedCells(len(bounds) + 3)
+
+    def observe(self, value: float) -> None:
+        cells = self._cells.cells()
+        bounds = self._bounds
+        index = 0
+        while index < len(bounds) and value > bounds[index]:
+            index += 1
+        cells[index] += 1
+        cells[-2] += value
+        cells[-1] += 1
+
+    def _render(self, name: str, names: Sequence[str], values: Sequence[str], lines: List[str]):
+        totals = self._cells.totals()
+        names = tuple(names) + ("le",)
+        cumulative = 0.0
+        for bound, count in zip(self._bounds, totals):
+            cumulative += count
+            labels = _format_labels(names, tuple(values) + (_format_value(bound),))
+            lines.append(f"{name}_bucket{labels} {_format_value(cumulative)}")
+        labels = _format_labels(names, tuple(values) + ("+Inf",))
+        lines.append(f"{name}_bucket{labels} {_format_value(totals[-1])}")
+        labels = _format_labels(names[:-1], values)
+        lines.append(f"{name}_sum{labels} {_format_value(totals[-2])}")
+        lines.append(f"{name}_count{labels} {_format_value(totals[-1])}")
+
+
+class Histogram(_Metric):
+    """
+    Observations counted in cumulative buckets, with their sum and count.
+
+    Usage:
+        ttft = registry.histogram("ttft_seconds", "Time to first token")
+        ttft.observe(0.042)
+    """
+
+    TYPE = "histogram"
+    _default: _HistogramChild
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self._bounds = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self._bounds)
+
+    def observe(self, value: float) -> None:
+        """Record a value in an unlabelled histogram."""
+        self._default.observe(value)
+
+
+_MetricT = TypeVar("_MetricT", bound=_Metric)
+
+
+class MetricsRegistry:
+    """
+    An in-process collection of metrics rendered in Prometheus text format.
+
+    Usage:
+        registry = MetricsRegistry()
+        hits = registry.counter("cache_hits_total", "Cache hits")
+        hits.inc()
+        print(registry.render())
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _MetricT) -> _MetricT:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name!r} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a Counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Create and register a Gauge."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Create and register a Histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            metric._render(lines)
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "") -> ThreadingHTTPServer:
+        """
+        Serve render() over HTTP on a daemon thread.
+
+        Args:
+            port: Port to listen on (0 picks a free port).
+            host: Interface to bind; all interfaces by default.
+
+        Returns:
+            The HTTP server; call shutdown() to stop it.
+        """
+        registry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        thread = threading.Thread(
+            target=server.serve_forever, name="vllm-grpc-metrics", daemon=True
+        )
+        thread.start()
+        return server
+
+
+class ClientMetrics(ClientInterceptor):
+    """
+    Client traffic metrics, registered in a MetricsRegistry.
+
+    Pass it to a client as metrics=...; one ClientMetrics may be shared by
+    several clients. Metric names start with the given prefix:
+
+        <prefix>_requests_total{rpc, code}         finished RPCs by status
+        <prefix>_requests_in_flight{rpc}           started, unfinished RPCs
+        <prefix>_request_duration_seconds{rpc}     RPC duration (whole stream)
+        <prefix>_prompt_tokens_total               from CompletionUsage
+        <prefix>_completion_tokens_total
+        <prefix>_cached_tokens_total
+        <prefix>_time_to_first_token_seconds       completed Generate requests
+        <prefix>_queueing_delay_seconds            create() to RPC start
+        <prefix>_aborted_requests_total            request IDs sent in Abort RPCs
+        <prefix>_retries_total                     retry attempts (see RetryPolicy)
+        <prefix>_retries_budget_exhausted_total    retries skipped by the retry budget
+        <prefix>_circuit_breaker_state{endpoint}   0 closed, 1 half-open, 2 open
+        <prefix>_circuit_breaker_transitions_total{endpoint, state}
+                                                   circuit state changes by new state
+        <prefix>_circuit_breaker_rejected_total    RPCs rejected by open circuits
+        <prefix>_concurrency_limit{endpoint}       adaptive Generate concurrency cap
+        <prefix>_concurrency_queued{endpoint}      requests waiting for a slot
+        <prefix>_concurrency_rejected_total        requests shed by concurrency limiters
+        <prefix>_scheduler_queued{priority}        requests waiting in a RequestScheduler
+        <prefix>_scheduler_wait_seconds{priority}  scheduler wait of admitted requests
+    """
+
+    def __init__(
+        self,
+        registry: Optional[MetricsRegistry] = None,
+        prefix: str = "vllm_grpc_client",
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        """
+        Initialize the metrics.
+
+        Args:
+            registry: Registry to add the metrics to. A new one by default.
+            prefix: Prefix of every metric name.
+            buckets: Histogram bucket bounds in seconds.
+        """
+        self.registry = registry if registry is not None else MetricsRegistry()
+        r = self.registry
+        self.requests = r.counter(
+            f"{prefix}_requests_total", "Finished RPCs by method and status code", ["rpc", "code"]
+        )
+        self.in_flight = r.gauge(
+            f"{prefix}_requests_in_flight", "RPCs started and not yet finished", ["rpc"]
+        )
+        self.duration = r.histogram(
+            f"{prefix}_request_duration_seconds", "RPC duration in seconds", ["rpc"], buckets
+        )
+        self.prompt_tokens = r.counter(f"{prefix}_prompt_tokens_total", "Prompt tokens")
+        self.completion_tokens = r.counter(
+            f"{prefix}_completion_tokens_total", "Generated tokens"
+        )
+        self.cached_tokens = r.counter(f"{prefix}_cached_tokens_total", "Prefix-cached tokens")
+        self.ttft = r.histogram(
+            f"{prefix}_time_to_first_token_seconds", "Time to first token in seconds", (), buckets
+        )
+        self.queueing_delay = r.histogram(
+            f"{prefix}_queueing_delay_seconds",
+            "Seconds from create() to the start of the RPC",
+            (),
+            buckets,
+        )
+        self.aborts = r.counter(
+            f"{prefix}_aborted_requests_total", "Request IDs sent in Abort RPCs"
+        )
+        self.retries = r.counter(f"{prefix}_retries_total", "Retry attempts sent")
+        self.retries_budget_exhausted = r.counter(
+            f"{prefix}_retries_budget_exhausted_total", "Retries skipped by the retry budget"
+        )
+        self.circuit_state = r.gauge(
+            f"{prefix}_circuit_breaker_state",
+            "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+            ["endpoint"],
+        )
+        self.circuit_transitions = r.counter(
+            f"{prefix}_circuit_breaker_transitions_total",
+            "Circuit breaker state changes by new state",
+            ["endpoint", "state"],
+        )
+        self.circuit_rejected = r.counter(
+            f"{prefix}_circuit_breaker_rejected_total", "RPCs rejected by open circuit breakers"
+        )
+        self.concurrency_limit = r.gauge(
+            f"{prefix}_concurrency_limit", "Adaptive cap on in-flight Generate RPCs", ["endpoint"]
+        )
+        self.concurrency_queued = r.gauge(
+            f"{prefix}_concurrency_queued",
+            "Requests waiting for a concurrency limiter slot",
+            ["endpoint"],
+        )
+        self.concurrency_rejected = r.counter(
+            f"{prefix}_concurrency_rejected_total",
+            "Requests rejected by concurrency limiters (queue full or timed out)",
+        )
+        self.scheduler_queued = r.gauge(
+            f"{prefix}_scheduler_queued",
+            "Requests waiting in a request scheduler by priority class",
+            ["priority"],
+        )
+        self.scheduler_wait = r.histogram(
+            f"{prefix}_scheduler_wait_seconds",
+            "Seconds admitted requests waited in a request scheduler by priority class",
+            ["priority"],
+            buckets,
+        )
+        self._clients: List[Any] = []
+        self._schedulers: List[Any] = []
+        self._lock = threading.Lock()
+        self.aborts.set_function(self._abort_count)
+        self.retries.set_function(lambda: self._retry_count("retries"))
+        self.retries_budget_exhausted.set_function(lambda: self._retry_count("budget_exhausted"))
+        self.circuit_rejected.set_function(self._circuit_rejected_count)
+        self.concurrency_rejected.set_function(self._concurrency_rejected_count)
+
+    def attach(self, client: Any) -> None:
+        """
+        Record a client's requests, aborts, retries, breaker, limiter and scheduler.
+
+        Clients created with metrics=... call this themselves; RPC counts,
+        in-flight RPCs and durations need the instance among the client's
+        interceptors, which metrics=... also arranges.
+        """
+        client.timing_stats.add_listener(self.observe)
+        with self._lock:
+            self._clients.append(client)
+        breaker = getattr(client, "circuit_breaker", None)
+        if breaker is not None:
+            self.circuit_state.labels(breaker.endpoint).set_function(
+                lambda: _CIRCUIT_STATE_VALUES[breaker.state]
+            )
+            breaker.add_listener(self._on_circuit_event)
+        limiter = getattr(client, "concurrency_limiter", None)
+        if limiter is not None:
+            self.concurrency_limit.labels(limiter.endpoint).set_function(lambda: limiter.limit)
+            self.concurrency_queued.labels(limiter.endpoint).set_function(
+                lambda: limiter.stats.queued
+            )
+        scheduler = getattr(client, "scheduler", None)
+        if scheduler is not None:
+            with self._lock:
+                # A scheduler may be shared by several clients
+                new = scheduler not in self._schedulers
+                if new:
+                    self._schedulers.append(scheduler)
+            if new:
+                self._attach_scheduler(scheduler)
+
+    def observe(self, timing: RequestTiming) -> None:
+        """Record a completed Generate request."""
+        self.prompt_tokens.inc(timing.prompt_tokens)
+        self.completion_tokens.inc(timing.output_tokens)
+        self.cached_tokens.inc(timing.cached_tokens)
+        ttft = timing.ttft
+        if ttft is not None:
+            self.ttft.observe(ttft)
+        queueing_delay = timing.queueing_delay
+        if queueing_delay is not None:
+            self.queueing_delay.observe(queueing_delay)
+
+    def start(self, method: str, request: Any, metadata: Metadata) -> Tuple[Any, float]:
+        in_flight = self.in_flight.labels(method)
+        in_flight.inc()
+        return in_flight, time.perf_counter()
+
+    def done(self, method: str, code: grpc.StatusCode, state: Tuple[Any, float]) -> None:
+        in_flight, start = state
+        in_flight.dec()
+        self.duration.labels(method).observe(time.perf_counter() - start)
+        self.requests.labels(method, code.name).inc()
+
+    def _attach_scheduler(self, scheduler: Any) -> None:
+        for priority in scheduler.classes:
+            self.scheduler_queued.labels(priority).set_function(
+                lambda priority=priority: scheduler.queue_depth(priority)
+            )
+        scheduler.add_listener(self._on_scheduled)
+
+    def _on_scheduled(self, priority: str, wait: float) -> None:
+        self.scheduler_wait.labels(priority).observe(wait)
+
+    def _on_circuit_event(self, event: Any) -> None:
+        self.circuit_transitions.labels(event.endpoint, event.state).inc()
+
+    def _abort_count(self) -> float:
+        # Abort counts live in the clients' coalescers
+        with self._lock:
+            clients = list(self._clients)
+        return float(sum(client.abort_coalescer.stats.request_ids for client in clients))
+
+    def _retry_count(self, name: str) -> float:
+        # Retry counts live in the clients' retry state
+        with self._lock:
+            clients = list(self._clients)
+        return float(sum(getattr(client.retry_stats, name) for client in clients))
+
+    def _circuit_rejected_count(self) -> float:
+        with self._lock:
+            clients = list(self._clients)
+        breakers = [getattr(client, "circuit_breaker", None) for client in clients]
+        return float(sum(breaker.stats.rejected for breaker in breakers if breaker is not None))
+
+    def _concurrency_rejected_count(self) -> float:
+        with self._lock:
+            clients = list(self._clients)
+        total = 0
+        for client in clients:
+            limiter = getattr(client, "concurrency_limiter", None)
+            if limiter is not None:
+                stats = limiter.stats
+                total += stats.rejected + stats.timed_out
+        return total
@@ -0,0 +1,32 @@
+"""
+What resources need from the client they belong to.
+
+VLLMGrpcClient, LoadBalancedClient and their async counterparts all provide
+these attributes, so resources are typed against the protocols rather than
+a concrete client class.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Optional, Protocol
+
+if TYPE_CHECKING:
+    from vllm_grpc_client._scheduler import RequestScheduler
+    from vllm_grpc_client._timing import TimingStats
+
+
+class _Client(Protocol):
+    """Client attributes used by the sync resources."""
+
+    _stub: Any
+    _timeout: float
+    _model_name: str
+    _fast_types: bool
+    _abort_coalescer: Any
+    _timing_stats: TimingStats
+
+
+class _AsyncClient(_Client, Protocol):
+    """Client attributes used by the async resources."""
+
+    _scheduler: Optional[RequestScheduler]
@@ -6,28 +6,160 @@ Handles the Generate RPC for text generation.
 
 from __future__ import annotations
 
+import asyncio
 import uuid
-from typing import TYPE_CHECKING, Dict, List, Optional, Union, overload
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
 
 from typing_extensions import Literal
 
-from vllm_grpc_client._exceptions import _exception_from_grpc_error
+from vllm_grpc_client._cache import ResponseCache, _cache_key, _CacheEntry, _replay_responses
+from vllm_grpc_client._exceptions import VLLMGrpcTimeoutError, _exception_from_grpc_error
+from vllm_grpc_client._fast_types import _result_types
+from vllm_grpc_client._hedge import HedgePolicy, _HedgedGenerate
+from vllm_grpc_client._ratelimit import RateLimiter
+from vllm_grpc_client._scheduler import RequestScheduler
+from vllm_grpc_client._singleflight import _SingleFlightGenerate
+from vllm_grpc_client._stop import StopConditionLike
 from vllm_grpc_client._streaming import AsyncGenerateStream, GenerateStream
+from vllm_grpc_client._timing import RequestTiming
 from vllm_grpc_client._types import (
     Completion,
-    CompletionChoice,
-    CompletionUsage,
     PromptInput,
     SamplingParams,
     StructuredOutputs,
     TokenizedInput,
 )
 from vllm_grpc_client.proto import vllm_engine_pb2
+from vllm_grpc_client.utils import IncrementalDecoder, TokenDecoder
 
 if TYPE_CHECKING:
     import grpc
 
-    from vllm_grpc_client._client import AsyncVLLMGrpcClient, VLLMGrpcClient
+    from vllm_grpc_client.resources._base import _AsyncClient, _Client
+
+# Default number of in-flight requests for batched completions
+DEFAULT_BATCH_CONCURRENCY = 16
+
+# Result of one batched completion: the Completion, or the exception it raised
+BatchResult = Union[Completion, BaseException]
+
+
+def _check_batch_arguments(max_concurrency: int, kwargs: Dict[str, Any]) -> None:
+    """Validate arguments shared by create_batch and as_completed."""
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+    for name in ("prompt", "stream", "request_id"):
+        if name in kwargs:
+            raise ValueError(f"{name!r} cannot be passed to batched completions")
+
+
+class CompletionTemplate:
+    """
+    A frozen, reusable set of sampling parameters.
+
+    The SamplingParams message is built and serialized once by
+    completions.prepare(). Each request built from the template copies a
+    prebuilt GenerateRequest and sets only the request ID, stream flag and prompt.
+
+    Usage:
+        greedy = client.completions.prepare(max_tokens=32, temperature=0.0)
+        for prompt in prompts:
+            completion = client.completions.create(prompt=prompt, template=greedy)
+    """
+
+    __slots__ = ("_sampling_kwargs", "_prototype", "_serialized")
+
+    _sampling_kwargs: Dict[str, Any]
+    _prototype: vllm_engine_pb2.GenerateRequest
+    _serialized: bytes
+
+    def __init__(self, **sampling_kwargs: Any):
+        """
+        Build the template.
+
+        Args:
+            **sampling_kwargs: Sampling arguments accepted by completions.create
+                (temperature, max_tokens, stop, logit_bias, structured_outputs, ...).
+        """
+        sampling_params = _build_sampling_params(**sampling_kwargs)
+        object.__setattr__(self, "_sampling_kwargs", dict(sampling_kwargs))
+        object.__setattr__(
+            self,
+            "_prototype",
+            vllm_engine_pb2.GenerateRequest(sampling_params=sampling_params),
+        )
+        object.__setattr__(self, "_serialized", sampling_params.SerializeToString())
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("CompletionTemplate is immutable")
+
+    @property
+    def sampling_kwargs(self) -> Dict[str, Any]:
+        """The sampling arguments the template was prepared with."""
+        return dict(self._sampling_kwargs)
+
+    @property
+    def serialized_sampling_params(self) -> bytes:
+        """The serialized SamplingParams message."""
+        return self._serialized
+
+    def sampling_params(self) -> vllm_engine_pb2.SamplingParams:
+        """Return a copy of the SamplingParams message."""
+        params: vllm_engine_pb2.SamplingParams = vllm_engine_pb2.SamplingParams.FromString(
+            self._serialized
+        )
+        return params
+
+    def build_request(
+        self,
+        prompt: PromptInput,
+        request_id: str,
+        stream: bool = False,
+    ) -> vllm_engine_pb2.GenerateRequest:
+        """
+        Build a GenerateRequest from the template.
+
+        Args:
+            prompt: Text, list of token IDs, or a TokenizedInput.
+            request_id: The request ID.
+            stream: Value of the request's stream flag.
+
+        Returns:
+            A new GenerateRequest carrying the template's sampling parameters.
+        """
+        request = vllm_engine_pb2.GenerateRequest()
+        request.CopyFrom(self._prototype)
+        request.request_id = request_id
+        request.stream = stream
+        _set_prompt(request, prompt)
+        return request
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompletionTemplate):
+            return NotImplemented
+        return self._serialized == other._serialized
+
+    def __hash__(self) -> int:
+        return hash(self._serialized)
+
+    def __repr__(self) -> str:
+        args = ", ".join(f"{key}={value!r}" for key, value in self._sampling_kwargs.items())
+        return f"CompletionTemplate({args})"
 
 
 class Completions:
@@ -45,7 +177,7 @@ class Completions:
         )
     """
 
-    def __init__(self, client: "VLLMGrpcClient"):
+    def __init__(self, client: "_Client"):
         """
         Initialize the completions resource.
 
@@ -82,6 +214,12 @@ class Completions:
         logit_bias: Optional[Dict[int, float]] = None,
         structured_outputs: Optional[StructuredOutputs] = None,
         timeout: Optional[float] = None,
+        raw: bool = False,
+        template: Optional[CompletionTemplate] = None,
+        decoder: Optional[TokenDecoder] = None,
+        stop_conditions: Optional[Sequence[StopConditionLike]] = None,
+        hedge: Optional[HedgePolicy] = None,
+        tenant: Optional[str] = None,
     ) -> Completion:
         """Non-streaming completion."""
         ...
@@ -114,6 +252,12 @@ class Completions:
         logit_bias: Optional[Dict[int, float]] = None,
         structured_outputs: Optional[StructuredOutputs] = None,
         timeout: Optional[float] = None,
+        raw: bool = False,
+        template: Optional[CompletionTemplate] = None,
+        decoder: Optional[TokenDecoder] = None,
+        stop_conditions: Optional[Sequence[StopConditionLike]] = None,
+        hedge: Optional[HedgePolicy] = None,
+        tenant: Optional[str] = None,
     ) -> GenerateStream:
         """Streaming completion."""
         ...
@@ -145,6 +289,12 @@ class Completions:
         logit_bias: Optional[Dict[int, float]] = None,
         structured_outputs: Optional[StructuredOutputs] = None,
         timeout: Optional[float] = None,
+        raw: bool = False,
+        template: Optional[CompletionTemplate] = None,
+        decoder: Optional[TokenDecoder] = None,
+        stop_conditions: Optional[Sequence[StopConditionLike]] = None,
+        hedge: Optional[HedgePolicy] = None,
+        tenant: Optional[str] = None,
     ) -> Union[Completion, GenerateStream]:
         """
         Create a completion for the given prompt.
@@ -175,42 +325,107 @@ class Completions:
             logit_bias: Token ID to bias mapping.
             structured_outputs: Structured output constraints.
             timeout: Request timeout in seconds.
+            raw: Only with stream=True. Yield the protobuf GenerateResponse messages
+                as received instead of building a CompletionChunk per message,
+                which removes most per-chunk client CPU at high token rates.
+            template: A CompletionTemplate from prepare(). When given, the request
+                is built from the template and the sampling arguments above are
+                ignored.
+            decoder: A TokenDecoder for the served model. Streamed chunks then carry
+                delta_text (decoded incrementally, so characters split across
+                chunks come out whole) and completions carry text.
+            stop_conditions: Only with stream=True and a decoder. Client-side
+                StopConditions (e.g. RegexStop, JsonStop) or predicates over the
+                decoded text; when one matches, the stream ends and the request
+                is aborted on the server.
+            hedge: A HedgePolicy. If no response arrives within its delay, a
+                duplicate request (with a new request ID) is sent through the
+                client's router; the first to respond wins and the others are
+                aborted.
+            tenant: Quota key for the client's RateLimiter. Ignored without one.
 
         Returns:
             A Completion object if stream=False, otherwise a GenerateStream iterator.
+            Clients created with fast_types=True return FastCompletion objects instead.
         """
+        if raw and not stream:
+            raise ValueError("raw=True requires stream=True")
+        if stop_conditions and (not stream or decoder is None):
+            raise ValueError("stop_conditions require stream=True and a decoder")
+        timing = RequestTiming()
         if request_id is None:
             request_id = f"cmpl-{uuid.uuid4().hex[:24]}"
 
         # Build the gRPC request
-        grpc_request = self._build_generate_request(
-            prompt=prompt,
-            request_id=request_id,
-            stream=stream,
-            temperature=temperature,
-            top_p=top_p,
-            top_k=top_k,
-            min_p=min_p,
-            frequency_penalty=frequency_penalty,
-            presence_penalty=presence_penalty,
-            repetition_penalty=repetition_penalty,
-            max_tokens=max_tokens,
-            min_tokens=min_tokens,
-            stop=stop,
-            stop_token_ids=stop_token_ids,
-            skip_special_tokens=skip_special_tokens,
-            ignore_eos=ignore_eos,
-            n=n,
-            logprobs=logprobs,
-            prompt_logprobs=prompt_logprobs,
-            seed=seed,
-            include_stop_str_in_output=include_stop_str_in_output,
-            logit_bias=logit_bias,
-            structured_outputs=structured_outputs,
-        )
+        if template is not None:
+            grpc_request = template.build_request(prompt, request_id, stream)
+        else:
+            grpc_request = self._build_generate_request(
+                prompt=prompt,
+                request_id=request_id,
+                stream=stream,
+                temperature=temperature,
+                top_p=top_p,
+                top_k=top_k,
+                min_p=min_p,
+                frequency_penalty=frequency_penalty,
+                presence_penalty=presence_penalty,
+                repetition_penalty=repetition_penalty,
+                max_tokens=max_tokens,
+                min_tokens=min_tokens,
+                stop=stop,
+                stop_token_ids=stop_token_ids,
+                skip_special_tokens=skip_special_tokens,
+                ignore_eos=ignore_eos,
+                n=n,
+                logprobs=logprobs,
+                prompt_logprobs=prompt_logprobs,
+                seed=seed,
+                include_stop_str_in_output=include_stop_str_in_output,
+                logit_bias=logit_bias,
+                structured_outputs=structured_outputs,
+            )
 
+        cache: Optional[ResponseCache] = getattr(self._client, "_response_cache", None)
+        cache_key = _cache_key(grpc_request) if cache is not None else None
+        if cache is not None and cache_key is not None:
+            entry = cache._get(cache_key)
+            if entry is not None:
+                if stream:
+                    responses = _replay_responses(entry, cache.replay_chunk_size)
+                    return GenerateStream(
+                        response_iterator=iter(responses),
+                        request_id=request_id,
+                        model=self._client._model_name,
+                        raw=raw,
+                        fast_types=self._client._fast_types,
+                        detokenizer=_incremental_decoder(
+                            decoder, prompt, skip_special_tokens, template
+                        ),
+                        stop_conditions=stop_conditions,
+                        timing=timing,
+                        cached=True,
+                    )
+                return _from_cache(
+                    self._client, entry, request_id, decoder, skip_special_tokens, template, timing
+                )
+
+        flights = getattr(self._client, "_singleflight", None)
+        # Joining an identical call in flight adds no load to charge or schedule
+        joining = flights is not None and flights._has_flight(grpc_request, self._client, aio=False)
+        rate_limiter = None if joining else getattr(self._client, "_rate_limiter", None)
+        charged = 0
+        if rate_limiter is not None:
+            charged = rate_limiter._estimate(prompt, decoder)
+            rate_limiter._acquire(tenant, charged)
         try:
-            response_iterator = self._client._stub.Generate(
+            timing._rpc_started()
+            generate = self._client._stub.Generate
+            if hedge is not None:
+                generate = _HedgedGenerate(generate, hedge, self._client, aio=False)
+            if flights is not None:
+                generate = _SingleFlightGenerate(generate, flights, self._client, aio=False)
+            response_iterator = generate(
                 grpc_request,
                 timeout=timeout or self._client._timeout,
             )
@@ -220,29 +435,61 @@ class Completions:
                     response_iterator=response_iterator,
                     request_id=request_id,
                     model=self._client._model_name,
+                    raw=raw,
+                    fast_types=self._client._fast_types,
+                    on_abandon=self._client._abort_coalescer.submit,
+                    detokenizer=_incremental_decoder(
+                        decoder, prompt, skip_special_tokens, template
+                    ),
+                    stop_conditions=stop_conditions,
+                    timing=timing,
+                    timing_stats=self._client._timing_stats,
+                    on_finish=_on_stream_finish(None, rate_limiter, tenant, charged, timing),
                 )
             else:
                 # Collect all responses and return final completion
                 final_response = None
                 for response in response_iterator:
+                    timing._chunk()
                     if response.HasField("complete"):
                         final_response = response.complete
 
+                types = _result_types(self._client._fast_types)
+                completion: Completion
                 if final_response is None:
                     # No complete response received
-                    return Completion(id=request_id, model=self._client._model_name)
-
-                return Completion(
+                    completion = types.Completion(id=request_id, model=self._client._model_name)
+                    return completion
+
+                token_ids = list(final_response.output_ids)
+                timing._complete(
+                    final_response.completion_tokens,
+                    final_response.prompt_tokens,
+                    final_response.cached_tokens,
+                )
+                self._client._timing_stats.record(timing)
+                if rate_limiter is not None:
+                    rate_limiter._reconcile(
+                        tenant, charged, timing.prompt_tokens + timing.output_tokens
+                    )
+                if (
+                    cache is not None
+                    and cache_key is not None
+                    and final_response.finish_reason != "abort"
+                ):
+                    cache._put(cache_key, _CacheEntry.from_complete(final_response))
+                completion = types.Completion(
                     id=request_id,
                     model=self._client._model_name,
                     choices=[
-                        CompletionChoice(
+                        types.CompletionChoice(
                             index=0,
-                            token_ids=list(final_response.output_ids),
+                            text=_decode_text(decoder, token_ids, skip_special_tokens, template),
+                            token_ids=token_ids,
                             finish_reason=final_response.finish_reason or "stop",
                         )
                     ],
-                    usage=CompletionUsage(
+                    usage=types.CompletionUsage(
                         prompt_tokens=final_response.prompt_tokens,
                         completion_tokens=final_response.completion_tokens,
                         total_tokens=(
@@ -250,15 +497,147 @@ class Completions:
                         ),
                         cached_tokens=final_response.cached_tokens,
                     ),
+                    timing=timing,
                 )
+                return completion
 
-        except Exception as e:
+        except BaseException as e:
+            if rate_limiter is not None and timing.first_chunk_time is None:
+                # Nothing ran: rejected by the scheduler or limiter, or no response
+                rate_limiter._refund(tenant, charged)
             import grpc
 
             if isinstance(e, grpc.RpcError):
-                raise _exception_from_grpc_error(e) from e
+                error = _exception_from_grpc_error(e)
+                if isinstance(error, VLLMGrpcTimeoutError):
+                    # Our deadline expired, but the engine may still be decoding
+                    self._client._abort_coalescer.submit(request_id)
+                raise error from e
             raise
 
+    def prepare(self, **sampling_kwargs: Any) -> CompletionTemplate:
+        """
+        Prepare a reusable request template for a fixed set of sampling arguments.
+
+        Building SamplingParams field by field on every call is the bulk of
+        request construction; a template builds it once. Pass the result to
+        create(template=...) (or create_batch / as_completed).
+
+        Args:
+            **sampling_kwargs: Sampling arguments accepted by create()
+                (temperature, top_p, max_tokens, stop, logit_bias, ...).
+
+        Returns:
+            A frozen CompletionTemplate.
+
+        Usage:
+            greedy = client.completions.prepare(max_tokens=32, temperature=0.0)
+            completion = client.completions.create(prompt="Hello", template=greedy)
+        """
+        return CompletionTemplate(**sampling_kwargs)
+
+    def create_batch(
+        self,
+        prompts: Iterable[PromptInput],
+        *,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> List[BatchResult]:
+        """
+        Create non-streaming completions for many prompts concurrently.
+
+        Requests run on a thread pool sharing the client's channel, with at most
+        max_concurrency in flight at once. Results are returned in input order.
+
+        Args:
+            prompts: The prompts to complete.
+            max_concurrency: Maximum number of requests in flight.
+            return_exceptions: If True, a failed request's exception is returned in
+                its slot instead of being raised.
+            **kwargs: Sampling and request arguments passed to create() for every
+                prompt (stream and request_id are not allowed).
+
+        Returns:
+            One Completion (or exception) per prompt, in input order.
+
+        Usage:
+            completions = client.completions.create_batch(
+                ["Hello", "The sky is"], max_tokens=16, max_concurrency=8
+            )
+        """
+        results: Dict[int, BatchResult] = {}
+        for index, result in self.as_completed(
+            prompts,
+            max_concurrency=max_concurrency,
+            return_exceptions=return_exceptions,
+            **kwargs,
+        ):
+            results[index] = result
+        return [results[index] for index in range(len(results))]
+
+    def as_completed(
+        self,
+        prompts: Iterable[PromptInput],
+        *,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> Iterator[Tuple[int, BatchResult]]:
+        """
+        Create completions concurrently and yield each one as soon as it finishes.
+
+        Prompts are consumed lazily, so at most max_concurrency requests are
+        pending at any time even for very large inputs.
+
+        Args:
+            prompts: The prompts to complete.
+            max_concurrency: Maximum number of requests in flight.
+            return_exceptions: If True, yield exceptions instead of raising them.
+            **kwargs: Arguments passed to create() for every prompt.
+
+        Yields:
+            (index, result) tuples, where index is the prompt's input position.
+
+        Usage:
+            for index, completion in client.completions.as_completed(prompts, max_tokens=16):
+                print(index, completion.choices[0].token_ids)
+        """
+        _check_batch_arguments(max_concurrency, kwargs)
+        items = enumerate(prompts)
+        pending: Dict[Future, int] = {}
+        # stream is rejected above, so every call returns a Completion
+        create: Callable[..., Completion] = self.create
+
+        with ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="vllm-grpc-batch"
+        ) as executor:
+
+            def submit_more() -> None:
+                while len(pending) < max_concurrency:
+                    item = next(items, None)
+                    if item is None:
+                        return
+                    index, prompt = item
+                    future = executor.submit(create, prompt=prompt, **kwargs)
+                    pending[future] = index
+
+            try:
+                submit_more()
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = pending.pop(future)
+                        error = future.exception()
+                        if error is not None and not return_exceptions:
+                            raise error
+                        yield index, error if error is not None else future.result()
+                    submit_more()
+            finally:
+                # Drop queued work if the caller stops early or a request failed
+                for future in pending:
+                    future.cancel()
+
     def _build_generate_request(
         self,
         prompt: PromptInput,
@@ -388,7 +767,7 @@ class AsyncCompletions:
         )
     """
 
-    def __init__(self, client: "AsyncVLLMGrpcClient"):
+    def __init__(self, client: "_AsyncClient"):
         """
         Initialize the async completions resource.
 
@@ -425,6 +804,13 @@ class AsyncCompletions:
         logit_bias: Optional[Dict[int, float]] = None,
         structured_outputs: Optional[StructuredOutputs] = None,
         timeout: Optional[float] = None,
+        raw: bool = False,
+        template: Optional[CompletionTemplate] = None,
+        decoder: Optional[TokenDecoder] = None,
+        stop_conditions: Optional[Sequence[StopConditionLike]] = None,
+        hedge: Optional[HedgePolicy] = None,
+        priority: Optional[str] = None,
+        tenant: Optional[str] = None,
     ) -> Completion:
         """Non-streaming async completion."""
         ...
@@ -457,6 +843,13 @@ class AsyncCompletions:
         logit_bias: Optional[Dict[int, float]] = None,
         structured_outputs: Optional[StructuredOutputs] = None,
         timeout: Optional[float] = None,
+        raw: bool = False,
+        template: Optional[CompletionTemplate] = None,
+        decoder: Optional[TokenDecoder] = None,
+        stop_conditions: Optional[Sequence[StopConditionLike]] = None,
+        hedge: Optional[HedgePolicy] = None,
+        priority: Optional[str] = None,
+        tenant: Optional[str] = None,
     ) -> AsyncGenerateStream:
         """Streaming async completion."""
         ...
@@ -488,76 +881,181 @@ class AsyncCompletions:
         logit_bias: Optional[Dict[int, float]] = None,
         structured_outputs: Optional[StructuredOutputs] = None,
         timeout: Optional[float] = None,
+        raw: bool = False,
+        template: Optional[CompletionTemplate] = None,
+        decoder: Optional[TokenDecoder] = None,
+        stop_conditions: Optional[Sequence[StopConditionLike]] = None,
+        hedge: Optional[HedgePolicy] = None,
+        priority: Optional[str] = None,
+        tenant: Optional[str] = None,
     ) -> Union[Completion, AsyncGenerateStream]:
         """
         Create a completion for the given prompt asynchronously.
 
         See Completions.create for detailed parameter documentation.
+
+        Args:
+            priority: Priority class for the client's RequestScheduler (its
+                default_class if not given). Ignored without a scheduler.
+            tenant: Fair-share key for the client's RequestScheduler and quota
+                key for its RateLimiter. Ignored without either.
         """
+        if raw and not stream:
+            raise ValueError("raw=True requires stream=True")
+        if stop_conditions and (not stream or decoder is None):
+            raise ValueError("stop_conditions require stream=True and a decoder")
+        timing = RequestTiming()
         if request_id is None:
             request_id = f"cmpl-{uuid.uuid4().hex[:24]}"
 
         # Build the gRPC request (reuse the sync method's helper)
-        grpc_request = _build_generate_request(
-            prompt=prompt,
-            request_id=request_id,
-            stream=stream,
-            temperature=temperature,
-            top_p=top_p,
-            top_k=top_k,
-            min_p=min_p,
-            frequency_penalty=frequency_penalty,
-            presence_penalty=presence_penalty,
-            repetition_penalty=repetition_penalty,
-            max_tokens=max_tokens,
-            min_tokens=min_tokens,
-            stop=stop,
-            stop_token_ids=stop_token_ids,
-            skip_special_tokens=skip_special_tokens,
-            ignore_eos=ignore_eos,
-            n=n,
-            logprobs=logprobs,
-            prompt_logprobs=prompt_logprobs,
-            seed=seed,
-            include_stop_str_in_output=include_stop_str_in_output,
-            logit_bias=logit_bias,
-            structured_outputs=structured_outputs,
-        )
+        if template is not None:
+            grpc_request = template.build_request(prompt, request_id, stream)
+        else:
+            grpc_request = _build_generate_request(
+                prompt=prompt,
+                request_id=request_id,
+                stream=stream,
+                temperature=temperature,
+                top_p=top_p,
+                top_k=top_k,
+                min_p=min_p,
+                frequency_penalty=frequency_penalty,
+                presence_penalty=presence_penalty,
+                repetition_penalty=repetition_penalty,
+                max_tokens=max_tokens,
+                min_tokens=min_tokens,
+                stop=stop,
+                stop_token_ids=stop_token_ids,
+                skip_special_tokens=skip_special_tokens,
+                ignore_eos=ignore_eos,
+                n=n,
+                logprobs=logprobs,
+                prompt_logprobs=prompt_logprobs,
+                seed=seed,
+                include_stop_str_in_output=include_stop_str_in_output,
+                logit_bias=logit_bias,
+                structured_outputs=structured_outputs,
+            )
+
+        cache: Optional[ResponseCache] = getattr(self._client, "_response_cache", None)
+        cache_key = _cache_key(grpc_request) if cache is not None else None
+        if cache is not None and cache_key is not None:
+            entry = cache._get(cache_key)
+            if entry is not None:
+                if stream:
+                    responses = _replay_responses(entry, cache.replay_chunk_size)
+                    return AsyncGenerateStream(
+                        response_iterator=_async_iter(responses),
+                        request_id=request_id,
+                        model=self._client._model_name,
+                        raw=raw,
+                        fast_types=self._client._fast_types,
+                        detokenizer=_incremental_decoder(
+                            decoder, prompt, skip_special_tokens, template
+                        ),
+                        stop_conditions=stop_conditions,
+                        timing=timing,
+                        cached=True,
+                    )
+                return _from_cache(
+                    self._client, entry, request_id, decoder, skip_special_tokens, template, timing
+                )
 
+        flights = getattr(self._client, "_singleflight", None)
+        # Joining an identical call in flight adds no load to charge or schedule
+        joining = flights is not None and flights._has_flight(grpc_request, self._client, aio=True)
+        rate_limiter = None if joining else getattr(self._client, "_rate_limiter", None)
+        charged = 0
+        if rate_limiter is not None:
+            charged = rate_limiter._estimate(prompt, decoder)
+            await rate_limiter._acquire_async(tenant, charged)
+        scheduler = None if joining else self._client._scheduler
+        # Released when a non-streaming request returns, or by the stream once it ends
+        held = None
         try:
-            response_iterator = self._client._stub.Generate(
+            if scheduler is not None:
+                await scheduler._acquire(priority, tenant)
+                held = scheduler
+            timing._rpc_started()
+            generate = self._client._stub.Generate
+            if hedge is not None:
+                generate = _HedgedGenerate(generate, hedge, self._client, aio=True)
+            if flights is not None:
+                generate = _SingleFlightGenerate(generate, flights, self._client, aio=True)
+            response_iterator = generate(
                 grpc_request,
                 timeout=timeout or self._client._timeout,
             )
 
             if stream:
-                return AsyncGenerateStream(
+                generate_stream = AsyncGenerateStream(
                     response_iterator=response_iterator,
                     request_id=request_id,
                     model=self._client._model_name,
+                    raw=raw,
+                    fast_types=self._client._fast_types,
+                    on_abandon=self._client._abort_coalescer.submit,
+                    detokenizer=_incremental_decoder(
+                        decoder, prompt, skip_special_tokens, template
+                    ),
+                    stop_conditions=stop_conditions,
+                    timing=timing,
+                    timing_stats=self._client._timing_stats,
+                    on_finish=_on_stream_finish(scheduler, rate_limiter, tenant, charged, timing),
                 )
+                held = None
+                return generate_stream
             else:
                 # Collect all responses and return final completion
                 final_response = None
-                async for response in response_iterator:
-                    if response.HasField("complete"):
-                        final_response = response.complete
-
+                try:
+                    async for response in response_iterator:
+                        timing._chunk()
+                        if response.HasField("complete"):
+                            final_response = response.complete
+                except asyncio.CancelledError:
+                    # The caller gave up on this request; stop the server too
+                    response_iterator.cancel()
+                    self._client._abort_coalescer.submit(request_id)
+                    raise
+
+                types = _result_types(self._client._fast_types)
+                completion: Completion
                 if final_response is None:
                     # No complete response received
-                    return Completion(id=request_id, model=self._client._model_name)
-
-                return Completion(
+                    completion = types.Completion(id=request_id, model=self._client._model_name)
+                    return completion
+
+                token_ids = list(final_response.output_ids)
+                timing._complete(
+                    final_response.completion_tokens,
+                    final_response.prompt_tokens,
+                    final_response.cached_tokens,
+                )
+                self._client._timing_stats.record(timing)
+                if rate_limiter is not None:
+                    rate_limiter._reconcile(
+                        tenant, charged, timing.prompt_tokens + timing.output_tokens
+                    )
+                if (
+                    cache is not None
+                    and cache_key is not None
+                    and final_response.finish_reason != "abort"
+                ):
+                    cache._put(cache_key, _CacheEntry.from_complete(final_response))
+                completion = types.Completion(
                     id=request_id,
                     model=self._client._model_name,
                     choices=[
-                        CompletionChoice(
+                        types.CompletionChoice(
                             index=0,
-                            token_ids=list(final_response.output_ids),
+                            text=_decode_text(decoder, token_ids, skip_special_tokens, template),
+                            token_ids=token_ids,
                             finish_reason=final_response.finish_reason or "stop",
                         )
                     ],
-                    usage=CompletionUsage(
+                    usage=types.CompletionUsage(
                         prompt_tokens=final_response.prompt_tokens,
                         completion_tokens=final_response.completion_tokens,
                         total_tokens=(
@@ -565,14 +1063,216 @@ class AsyncCompletions:
                         ),
                         cached_tokens=final_response.cached_tokens,
                     ),
+                    timing=timing,
                 )
+                return completion
 
-        except Exception as e:
+        except BaseException as e:
+            if rate_limiter is not None and timing.first_chunk_time is None:
+                # Nothing ran: rejected by the scheduler or limiter, or no response
+                rate_limiter._refund(tenant, charged)
             import grpc
 
             if isinstance(e, grpc.RpcError):
-                raise _exception_from_grpc_error(e) from e
+                error = _exception_from_grpc_error(e)
+                if isinstance(error, VLLMGrpcTimeoutError):
+                    # Our deadline expired, but the engine may still be decoding
+                    self._client._abort_coalescer.submit(request_id)
+                raise error from e
             raise
+        finally:
+            if held is not None:
+                held._release()
+
+    def prepare(self, **sampling_kwargs: Any) -> CompletionTemplate:
+        """
+        Prepare a reusable request template for a fixed set of sampling arguments.
+
+        See Completions.prepare for details.
+        """
+        return CompletionTemplate(**sampling_kwargs)
+
+    async def create_batch(
+        self,
+        prompts: Iterable[PromptInput],
+        *,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> List[BatchResult]:
+        """
+        Create non-streaming completions for many prompts concurrently.
+
+        Each request runs as a task gated by a semaphore, so at most
+        max_concurrency are in flight at once. Results are returned in input order.
+
+        See Completions.create_batch for detailed parameter documentation.
+        """
+        _check_batch_arguments(max_concurrency, kwargs)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(prompt: PromptInput) -> Completion:
+            async with semaphore:
+                completion: Completion = await self.create(prompt=prompt, **kwargs)
+                return completion
+
+        tasks = [asyncio.ensure_future(run(prompt)) for prompt in prompts]
+        try:
+            return list(await asyncio.gather(*tasks, return_exceptions=return_exceptions))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def as_completed(
+        self,
+        prompts: Iterable[PromptInput],
+        *,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> AsyncIterator[Tuple[int, BatchResult]]:
+        """
+        Create completions concurrently and yield each one as soon as it finishes.
+
+        Prompts are consumed lazily, so at most max_concurrency tasks exist at
+        any time even for very large inputs.
+
+        See Completions.as_completed for detailed parameter documentation.
+
+        Usage:
+            async for index, completion in client.completions.as_completed(prompts):
+                print(index, completion.choices[0].token_ids)
+        """
+        _check_batch_arguments(max_concurrency, kwargs)
+        items = enumerate(prompts)
+        pending: Dict[asyncio.Future, int] = {}
+
+        def submit_more() -> None:
+            while len(pending) < max_concurrency:
+                item = next(items, None)
+                if item is None:
+                    return
+                index, prompt = item
+                pending[asyncio.ensure_future(self.create(prompt=prompt, **kwargs))] = index
+
+        try:
+            submit_more()
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = pending.pop(task)
+                    error = task.exception()
+                    if error is not None and not return_exceptions:
+                        raise error
+                    yield index, error if error is not None else task.result()
+                submit_more()
+        finally:
+            # Cancel in-flight requests if the caller stops early or a request failed
+            for task in pending:
+                task.cancel()
+
+
+def _from_cache(
+    client: Any,
+    entry: _CacheEntry,
+    request_id: str,
+    decoder: Optional[TokenDecoder],
+    skip_special_tokens: bool,
+    template: Optional[CompletionTemplate],
+    timing: RequestTiming,
+) -> Completion:
+    """Answer a non-streaming request from a cache entry."""
+    types = _result_types(client._fast_types)
+    completion: Completion = types.Completion(
+        id=request_id,
+        model=client._model_name,
+        choices=[
+            types.CompletionChoice(
+                index=0,
+                text=_decode_text(decoder, entry.token_ids, skip_special_tokens, template),
+                token_ids=list(entry.token_ids),
+                finish_reason=entry.finish_reason,
+            )
+        ],
+        usage=types.CompletionUsage(prompt_tokens=0, completion_tokens=0, total_tokens=0),
+        cached=True,
+        timing=timing,
+    )
+    return completion
+
+
+async def _async_iter(items: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+def _on_stream_finish(
+    scheduler: Optional[RequestScheduler],
+    rate_limiter: Optional[RateLimiter],
+    tenant: Optional[str],
+    charged: int,
+    timing: RequestTiming,
+) -> Optional[Callable[[], None]]:
+    """Stream callback reconciling the rate-limit charge and freeing the scheduler slot."""
+    if scheduler is None and rate_limiter is None:
+        return None
+
+    def finished() -> None:
+        if rate_limiter is not None:
+            if timing.complete_time is not None:
+                rate_limiter._reconcile(
+                    tenant, charged, timing.prompt_tokens + timing.output_tokens
+                )
+            elif timing.first_chunk_time is None:
+                # The stream ended before any response arrived
+                rate_limiter._refund(tenant, charged)
+        if scheduler is not None:
+            scheduler._release()
+
+    return finished
+
+
+def _skip_special_tokens(
+    skip_special_tokens: bool, template: Optional[CompletionTemplate]
+) -> bool:
+    """The effective skip_special_tokens setting of a request."""
+    if template is not None:
+        return bool(template._sampling_kwargs.get("skip_special_tokens", True))
+    return skip_special_tokens
+
+
+def _incremental_decoder(
+    decoder: Optional[TokenDecoder],
+    prompt: PromptInput,
+    skip_special_tokens: bool,
+    template: Optional[CompletionTemplate],
+) -> Optional[IncrementalDecoder]:
+    """Create the stream detokenizer for a request, if a decoder was given."""
+    if decoder is None:
+        return None
+    if isinstance(prompt, TokenizedInput):
+        prompt_token_ids: Optional[List[int]] = prompt.input_ids
+    elif isinstance(prompt, list):
+        prompt_token_ids = prompt
+    else:
+        prompt_token_ids = None
+    return decoder.incremental(
+        skip_special_tokens=_skip_special_tokens(skip_special_tokens, template),
+        prompt_token_ids=prompt_token_ids,
+    )
+
+
+def _decode_text(
+    decoder: Optional[TokenDecoder],
+    token_ids: List[int],
+    skip_special_tokens: bool,
+    template: Optional[CompletionTemplate],
+) -> str:
+    """Decode a non-streaming completion's tokens, if a decoder was given."""
+    if decoder is None:
+        return ""
+    return decoder.decode(token_ids, _skip_special_tokens(skip_special_tokens, template))
 
 
 # Helper function to build generate request (shared by sync and async)
@@ -580,29 +1280,42 @@ def _build_generate_request(
     prompt: PromptInput,
     request_id: str,
     stream: bool,
-    temperature: Optional[float],
-    top_p: float,
-    top_k: int,
-    min_p: float,
-    frequency_penalty: float,
-    presence_penalty: float,
-    repetition_penalty: float,
-    max_tokens: Optional[int],
-    min_tokens: int,
-    stop: Optional[List[str]],
-    stop_token_ids: Optional[List[int]],
-    skip_special_tokens: bool,
-    ignore_eos: bool,
-    n: int,
-    logprobs: Optional[int],
-    prompt_logprobs: Optional[int],
-    seed: Optional[int],
-    include_stop_str_in_output: bool,
-    logit_bias: Optional[Dict[int, float]],
-    structured_outputs: Optional[StructuredOutputs],
+    **sampling_kwargs: Any,
 ) -> vllm_engine_pb2.GenerateRequest:
     """Build a gRPC GenerateRequest from parameters."""
-    # Build sampling params
+    request = vllm_engine_pb2.GenerateRequest(
+        request_id=request_id,
+        sampling_params=_build_sampling_params(**sampling_kwargs),
+        stream=stream,
+    )
+    _set_prompt(request, prompt)
+    return request
+
+
+def _build_sampling_params(
+    *,
+    temperature: Optional[float] = None,
+    top_p: float = 1.0,
+    top_k: int = 0,
+    min_p: float = 0.0,
+    frequency_penalty: float = 0.0,
+    presence_penalty: float = 0.0,
+    repetition_penalty: float = 1.0,
+    max_tokens: Optional[int] = None,
+    min_tokens: int = 0,
+    stop: Optional[List[str]] = None,
+    stop_token_ids: Optional[List[int]] = None,
+    skip_special_tokens: bool = True,
+    ignore_eos: bool = False,
+    n: int = 1,
+    logprobs: Optional[int] = None,
+    prompt_logprobs: Optional[int] = None,
+    seed: Optional[int] = None,
+    include_stop_str_in_output: bool = False,
+    logit_bias: Optional[Dict[int, float]] = None,
+    structured_outputs: Optional[StructuredOutputs] = None,
+) -> vllm_engine_pb2.SamplingParams:
+    """Build a gRPC SamplingParams message; defaults match completions.create."""
     sampling_params = vllm_engine_pb2.SamplingParams(
         top_p=top_p,
         top_k=top_k,
@@ -659,14 +1372,11 @@ def _build_generate_request(
                 vllm_engine_pb2.ChoiceConstraint(choices=structured_outputs.choice.choices)
             )
 
-    # Build the request
-    request = vllm_engine_pb2.GenerateRequest(
-        request_id=request_id,
-        sampling_params=sampling_params,
-        stream=stream,
-    )
+    return sampling_params
+
 
-    # Set prompt input
+def _set_prompt(request: vllm_engine_pb2.GenerateRequest, prompt: PromptInput) -> None:
+    """Set the prompt input of a GenerateRequest."""
     if isinstance(prompt, str):
         request.text = prompt
     elif isinstance(prompt, TokenizedInput):
@@ -678,10 +1388,6 @@ def _build_generate_request(
         )
     elif isinstance(prompt, list):
         # List of token IDs
-        request.tokenized.CopyFrom(
-            vllm_engine_pb2.TokenizedInput(
-                input_ids=prompt,
-            )
-        )
-
-    return request
+        tokenized = request.tokenized
+        tokenized.SetInParent()
+        tokenized.input_ids.extend(prompt)
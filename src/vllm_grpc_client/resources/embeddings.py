@@ -10,19 +10,16 @@ This resource is provided for API completeness and future compatibility.
 from __future__ import annotations
 
 import uuid
-from typing import TYPE_CHECKING, List, Optional, Union
+from typing import TYPE_CHECKING, Any, List, Optional, Union
 
+from vllm_grpc_client._embedding_cache import EmbeddingCache, _embedding_key
 from vllm_grpc_client._exceptions import _exception_from_grpc_error
-from vllm_grpc_client._types import (
-    Embedding,
-    EmbeddingResponse,
-    EmbeddingUsage,
-    TokenizedInput,
-)
+from vllm_grpc_client._fast_types import _result_types
+from vllm_grpc_client._types import EmbeddingResponse, TokenizedInput
 from vllm_grpc_client.proto import vllm_engine_pb2
 
 if TYPE_CHECKING:
-    from vllm_grpc_client._client import AsyncVLLMGrpcClient, VLLMGrpcClient
+    from vllm_grpc_client.resources._base import _AsyncClient, _Client
 
 
 # Type alias for embedding input
@@ -40,7 +37,7 @@ class Embeddings:
     Calling this method will raise VLLMGrpcUnimplementedError.
     """
 
-    def __init__(self, client: "VLLMGrpcClient"):
+    def __init__(self, client: "_Client"):
         """
         Initialize the embeddings resource.
 
@@ -80,25 +77,23 @@ class Embeddings:
         # Build the gRPC request
         grpc_request = self._build_embed_request(input=input, request_id=request_id)
 
+        cache: Optional[EmbeddingCache] = getattr(self._client, "_embedding_cache", None)
+        cache_key = _embedding_key(input) if cache is not None else None
+        if cache is not None and cache_key is not None:
+            vector = cache._get(cache_key)
+            if vector is not None:
+                return _embedding_response(self._client, vector, 0, cached=True)
+
         try:
             response = self._client._stub.Embed(
                 grpc_request,
                 timeout=timeout or self._client._timeout,
             )
 
-            return EmbeddingResponse(
-                model=self._client._model_name,
-                data=[
-                    Embedding(
-                        embedding=list(response.embedding),
-                        index=0,
-                    )
-                ],
-                usage=EmbeddingUsage(
-                    prompt_tokens=response.prompt_tokens,
-                    total_tokens=response.prompt_tokens,
-                ),
-            )
+            embedding = response.embedding
+            if cache is not None and cache_key is not None:
+                embedding = _store(cache, cache_key, embedding)
+            return _embedding_response(self._client, embedding, response.prompt_tokens)
 
         except Exception as e:
             import grpc
@@ -152,7 +147,7 @@ class AsyncEmbeddings:
     Calling this method will raise VLLMGrpcUnimplementedError.
     """
 
-    def __init__(self, client: "AsyncVLLMGrpcClient"):
+    def __init__(self, client: "_AsyncClient"):
         """
         Initialize the async embeddings resource.
 
@@ -182,25 +177,23 @@ class AsyncEmbeddings:
         # Build the gRPC request
         grpc_request = _build_embed_request(input=input, request_id=request_id)
 
+        cache: Optional[EmbeddingCache] = getattr(self._client, "_embedding_cache", None)
+        cache_key = _embedding_key(input) if cache is not None else None
+        if cache is not None and cache_key is not None:
+            vector = cache._get(cache_key)
+            if vector is not None:
+                return _embedding_response(self._client, vector, 0, cached=True)
+
         try:
             response = await self._client._stub.Embed(
                 grpc_request,
                 timeout=timeout or self._client._timeout,
             )
 
-            return EmbeddingResponse(
-                model=self._client._model_name,
-                data=[
-                    Embedding(
-                        embedding=list(response.embedding),
-                        index=0,
-                    )
-                ],
-                usage=EmbeddingUsage(
-                    prompt_tokens=response.prompt_tokens,
-                    total_tokens=response.prompt_tokens,
-                ),
-            )
+            embedding = response.embedding
+            if cache is not None and cache_key is not None:
+                embedding = _store(cache, cache_key, embedding)
+            return _embedding_response(self._client, embedding, response.prompt_tokens)
 
         except Exception as e:
             import grpc
@@ -210,7 +203,44 @@ class AsyncEmbeddings:
             raise
 
 
-# Helper function (shared by sync and async)
+# Helper functions (shared by sync and async)
+def _store(cache: EmbeddingCache, key: bytes, embedding: Any) -> Any:
+    """
+    Add a vector to the cache and return its view.
+
+    Storing is best effort: if the cache cannot take the vector (a full or
+    read-only disk, or a cache of another dimension), the vector is returned
+    as a list and the response does not fail.
+    """
+    try:
+        return cache._put(key, embedding)
+    except (OSError, ValueError):
+        return list(embedding)
+
+
+def _embedding_response(
+    client: Any, embedding: Any, prompt_tokens: int, cached: bool = False
+) -> EmbeddingResponse:
+    """
+    Build the EmbeddingResponse of one vector.
+
+    A vector from an EmbeddingCache (a NumPy view) is returned as is with
+    fast_types, and copied into a list otherwise.
+    """
+    if hasattr(embedding, "tolist"):
+        embedding = embedding if client._fast_types else embedding.tolist()
+    else:
+        embedding = list(embedding)
+    types = _result_types(client._fast_types)
+    response: EmbeddingResponse = types.EmbeddingResponse(
+        model=client._model_name,
+        data=[types.Embedding(embedding=embedding, index=0)],
+        usage=types.EmbeddingUsage(prompt_tokens=prompt_tokens, total_tokens=prompt_tokens),
+        cached=cached,
+    )
+    return response
+
+
 def _build_embed_request(
     input: EmbeddingInput,
     request_id: str,
@@ -13,7 +13,7 @@ from vllm_grpc_client._types import HealthCheckResponse, ServerInfo
 from vllm_grpc_client.proto import vllm_engine_pb2
 
 if TYPE_CHECKING:
-    from vllm_grpc_client._client import AsyncVLLMGrpcClient, VLLMGrpcClient
+    from vllm_grpc_client.resources._base import _AsyncClient, _Client
 
 
 class Health:
@@ -23,7 +23,7 @@ class Health:
     Provides methods for health checking, server info, and request abortion.
     """
 
-    def __init__(self, client: "VLLMGrpcClient"):
+    def __init__(self, client: "_Client"):
         """
         Initialize the health resource.
 
@@ -127,7 +127,7 @@ class AsyncHealth:
     Provides async methods for health checking, server info, and request abortion.
     """
 
-    def __init__(self, client: "AsyncVLLMGrpcClient"):
+    def __init__(self, client: "_AsyncClient"):
         """
         Initialize the async health resource.
 
@@ -13,7 +13,7 @@ from vllm_grpc_client._types import ModelInfo
 from vllm_grpc_client.proto import vllm_engine_pb2
 
 if TYPE_CHECKING:
-    from vllm_grpc_client._client import AsyncVLLMGrpcClient, VLLMGrpcClient
+    from vllm_grpc_client.resources._base import _AsyncClient, _Client
 
 
 class Models:
@@ -23,7 +23,7 @@ class Models:
     Provides methods for retrieving model information from the vLLM gRPC server.
     """
 
-    def __init__(self, client: "VLLMGrpcClient"):
+    def __init__(self, client: "_Client"):
         """
         Initialize the models resource.
 
@@ -87,7 +87,7 @@ class AsyncModels:
     vLLM gRPC server.
     """
 
-    def __init__(self, client: "AsyncVLLMGrpcClient"):
+    def __init__(self, client: "_AsyncClient"):
         """
         Initialize the async models resource.
 
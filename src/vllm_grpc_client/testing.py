@@ -0,0 +1,409 @@
+"""
+In-process fake vLLM gRPC server for tests and benchmarks.
+
+FakeVllmServer implements the VllmEngine service without a model or GPU. It
+streams synthetic token IDs at a configurable rate, after a configurable
+time to first token, in chunks of a configurable size; reports its
+active_requests through GetServerInfo; honours Abort and client
+cancellation; and can inject errors. It runs a grpc.aio server on its own
+event loop thread, so thousands of concurrent streams cost no threads, and
+listens on a local TCP port or a Unix socket.
+
+Usage:
+    from vllm_grpc_client.testing import FakeVllmServer
+
+    with FakeVllmServer(ttft=0.05, tokens_per_second=50, chunk_size=4) as server:
+        with server.client() as client:
+            completion = client.completions.create(prompt="Hello", max_tokens=32)
+
+Generated token IDs are deterministic: the i-th output token of a request
+with a P-token prompt is (P + i) % vocab_size. Text prompts count as one
+token per four bytes. Every request generates its max_tokens (or
+default_max_tokens) tokens and finishes with "length".
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set
+
+import grpc
+
+from vllm_grpc_client.proto import vllm_engine_pb2, vllm_engine_pb2_grpc
+
+# Output tokens per request when the request does not set max_tokens (as vLLM)
+DEFAULT_MAX_TOKENS = 16
+
+
+class _Fault:
+    """An injected error for upcoming RPCs."""
+
+    __slots__ = ("method", "code", "message", "after_tokens")
+
+    def __init__(self, method: str, code: grpc.StatusCode, message: str, after_tokens: int):
+        self.method = method
+        self.code = code
+        self.message = message
+        self.after_tokens = after_tokens
+
+
+def _prompt_tokens(request: vllm_engine_pb2.GenerateRequest) -> int:
+    if request.HasField("tokenized"):
+        return len(request.tokenized.input_ids)
+    return max(1, len(request.text.encode()) // 4)
+
+
+class _Servicer(vllm_engine_pb2_grpc.VllmEngineServicer):
+    """Async VllmEngine servicer backing FakeVllmServer."""
+
+    def __init__(self, server: FakeVllmServer):
+        self._server = server
+        self._aborts: Dict[str, asyncio.Event] = {}
+
+    async def _maybe_fail(self, method: str, context: Any, tokens: Optional[int] = None) -> None:
+        fault = self._server._take_fault(method, tokens)
+        if fault is not None:
+            await context.abort(fault.code, fault.message)
+
+    async def Generate(self, request: Any, context: Any) -> Any:  # noqa: N802
+        server = self._server
+        server._received()
+        await self._maybe_fail("Generate", context)
+
+        params = request.sampling_params
+        max_tokens = params.max_tokens if params.HasField("max_tokens") else None
+        if max_tokens is None:
+            max_tokens = server.default_max_tokens
+        prompt_tokens = _prompt_tokens(request)
+        vocab_size = server.vocab_size
+        chunk_size = server.chunk_size
+        rate = server.tokens_per_second
+
+        aborted = asyncio.Event()
+        self._aborts[request.request_id] = aborted
+        server.active_requests += 1
+        try:
+            if server.ttft > 0:
+                try:
+                    await asyncio.wait_for(aborted.wait(), server.ttft)
+                except asyncio.TimeoutError:
+                    pass
+
+            start = time.perf_counter()
+            generated = 0
+            while generated < max_tokens and not aborted.is_set():
+                if server._faults:
+                    await self._maybe_fail("Generate", context, generated)
+                count = min(chunk_size, max_tokens - generated)
+                token_ids = [(prompt_tokens + generated + i) % vocab_size for i in range(count)]
+                generated += count
+                if request.stream:
+                    yield vllm_engine_pb2.GenerateResponse(
+                        chunk=vllm_engine_pb2.GenerateStreamChunk(
+                            token_ids=token_ids,
+                            prompt_tokens=prompt_tokens,
+                            completion_tokens=generated,
+                        )
+                    )
+                if rate and generated < max_tokens:
+                    # Pace against the start time so sleeps do not accumulate drift
+                    delay = start + generated / rate - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+            output_ids = []
+            if not request.stream:
+                output_ids = [(prompt_tokens + i) % vocab_size for i in range(generated)]
+            yield vllm_engine_pb2.GenerateResponse(
+                complete=vllm_engine_pb2.GenerateComplete(
+                    output_ids=output_ids,
+                    finish_reason="abort" if aborted.is_set() else "length",
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=generated,
+                )
+            )
+        finally:
+            server.active_requests -= 1
+            self._aborts.pop(request.request_id, None)
+
+    async def Embed(self, request: Any, context: Any) -> Any:  # noqa: N802
+        self._server._received()
+        await self._maybe_fail("Embed", context)
+        input_ids = request.tokenized.input_ids
+        dim = self._server.embedding_dim
+        seed = sum(input_ids) + len(input_ids)
+        return vllm_engine_pb2.EmbedResponse(
+            embedding=[((seed + i) % 97) / 97.0 for i in range(dim)],
+            prompt_tokens=len(input_ids),
+            embedding_dim=dim,
+        )
+
+    async def HealthCheck(self, request: Any, context: Any) -> Any:  # noqa: N802
+        await self._maybe_fail("HealthCheck", context)
+        healthy = self._server.healthy
+        return vllm_engine_pb2.HealthCheckResponse(
+            healthy=healthy, message="Healthy" if healthy else "Unhealthy"
+        )
+
+    async def Abort(self, request: Any, context: Any) -> Any:  # noqa: N802
+        await self._maybe_fail("Abort", context)
+        for request_id in request.request_ids:
+            self._server.aborted_request_ids.add(request_id)
+            aborted = self._aborts.get(request_id)
+            if aborted is not None:
+                aborted.set()
+        return vllm_engine_pb2.AbortResponse()
+
+    async def GetModelInfo(self, request: Any, context: Any) -> Any:  # noqa: N802
+        await self._maybe_fail("GetModelInfo", context)
+        server = self._server
+        return vllm_engine_pb2.GetModelInfoResponse(
+            model_path=server.model_path,
+            is_generation=True,
+            max_context_length=server.max_context_length,
+            vocab_size=server.vocab_size,
+        )
+
+    async def GetServerInfo(self, request: Any, context: Any) -> Any:  # noqa: N802
+        await self._maybe_fail("GetServerInfo", context)
+        server = self._server
+        return vllm_engine_pb2.GetServerInfoResponse(
+            active_requests=server.active_requests,
+            is_paused=server.is_paused,
+            last_receive_timestamp=server.last_receive_timestamp,
+            uptime_seconds=time.time() - server._start_time,
+            server_type="fake",
+        )
+
+
+class FakeVllmServer:
+    """
+    A fake VllmEngine server running in-process.
+
+    Attributes that tests may change while the server runs: ttft,
+    tokens_per_second, chunk_size, default_max_tokens, error_rate, healthy
+    and is_paused. active_requests, requests_received and
+    aborted_request_ids are read-only counters.
+
+    Usage:
+        server = FakeVllmServer(tokens_per_second=100).start()
+        client = VLLMGrpcClient(host=server.host, port=server.port, secure=False)
+        ...
+        server.stop()
+
+        # Fail the next two Generate RPCs, or one after 8 streamed tokens
+        server.fail_next(2, grpc.StatusCode.UNAVAILABLE)
+        server.fail_next(1, grpc.StatusCode.INTERNAL, after_tokens=8)
+    """
+
+    def __init__(
+        self,
+        *,
+        ttft: float = 0.0,
+        tokens_per_second: Optional[float] = None,
+        chunk_size: int = 1,
+        default_max_tokens: int = DEFAULT_MAX_TOKENS,
+        error_rate: float = 0.0,
+        error_code: grpc.StatusCode = grpc.StatusCode.UNAVAILABLE,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        unix_socket: Optional[str] = None,
+        model_path: str = "fake-model",
+        vocab_size: int = 32000,
+        max_context_length: int = 4096,
+        embedding_dim: int = 16,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the server (call start() to listen).
+
+        Args:
+            ttft: Seconds before the first token of each request.
+            tokens_per_second: Per-request generation rate after the first
+                token. None streams as fast as possible.
+            chunk_size: Tokens per streamed chunk.
+            default_max_tokens: Output length when a request sets no max_tokens.
+            error_rate: Probability that a Generate or Embed RPC fails.
+            error_code: Status code of errors injected by error_rate.
+            host: Interface to listen on.
+            port: TCP port; 0 picks a free port.
+            unix_socket: Listen on this Unix socket path instead of TCP.
+            model_path: Reported by GetModelInfo.
+            vocab_size: Reported by GetModelInfo; bounds generated token IDs.
+            max_context_length: Reported by GetModelInfo.
+            embedding_dim: Length of Embed results.
+            seed: Seed for error_rate draws.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.chunk_size = chunk_size
+        self.default_max_tokens = default_max_tokens
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.model_path = model_path
+        self.vocab_size = vocab_size
+        self.max_context_length = max_context_length
+        self.embedding_dim = embedding_dim
+        self.healthy = True
+        self.is_paused = False
+
+        self.active_requests = 0
+        self.requests_received = 0
+        self.last_receive_timestamp = 0.0
+        self.aborted_request_ids: Set[str] = set()
+
+        self._host = host
+        self._port = port
+        self._unix_socket = unix_socket
+        self._random = random.Random(seed)
+        self._faults: Deque[_Fault] = deque()
+        self._faults_lock = threading.Lock()
+        self._start_time = time.time()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._server: Optional[grpc.aio.Server] = None
+
+    @property
+    def host(self) -> str:
+        """Host to pass to a client: the TCP host, or "unix:<path>" for a Unix socket."""
+        return f"unix:{self._unix_socket}" if self._unix_socket else self._host
+
+    @property
+    def port(self) -> int:
+        """The bound TCP port (0 for a Unix socket)."""
+        return self._port
+
+    @property
+    def address(self) -> str:
+        """gRPC target of the server."""
+        return self.host if self._unix_socket else f"{self._host}:{self._port}"
+
+    def fail_next(
+        self,
+        count: int = 1,
+        code: grpc.StatusCode = grpc.StatusCode.UNAVAILABLE,
+        *,
+        method: str = "Generate",
+        message: str = "injected error",
+        after_tokens: int = 0,
+    ) -> None:
+        """
+        Fail the next RPCs of a method.
+
+        Args:
+            count: Number of RPCs to fail.
+            code: Status code to fail with.
+            method: RPC name, e.g. "Generate", "Embed" or "HealthCheck".
+            message: Error details.
+            after_tokens: For Generate, fail once this many tokens were
+                generated (0 fails before the first chunk).
+        """
+        with self._faults_lock:
+            for _ in range(count):
+                self._faults.append(_Fault(method, code, message, after_tokens))
+
+    def _take_fault(self, method: str, tokens: Optional[int]) -> Optional[_Fault]:
+        """
+        The next fault for a call, if one is due.
+
+        tokens is None when the call arrives, and the number of tokens
+        generated so far while a generation runs; faults with after_tokens=0
+        are only taken on arrival.
+        """
+        if self._faults:
+            with self._faults_lock:
+                for fault in self._faults:
+                    if tokens is None:
+                        due = fault.after_tokens == 0
+                    else:
+                        due = 0 < fault.after_tokens <= tokens
+                    if fault.method == method and due:
+                        self._faults.remove(fault)
+                        return fault
+        if tokens is None and method in ("Generate", "Embed") and self.error_rate > 0:
+            if self._random.random() < self.error_rate:
+                return _Fault(method, self.error_code, "injected error", 0)
+        return None
+
+    def _received(self) -> None:
+        self.requests_received += 1
+        self.last_receive_timestamp = time.time()
+
+    def start(self) -> FakeVllmServer:
+        """Start listening on a background event loop thread; returns self."""
+        if self._thread is not None:
+            raise RuntimeError("FakeVllmServer is already running")
+        ready = threading.Event()
+        errors = []
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            self._loop = loop
+            try:
+                loop.run_until_complete(self._serve())
+            except BaseException as exc:
+                errors.append(exc)
+                ready.set()
+                return
+            ready.set()
+            loop.run_forever()
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="fake-vllm-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            self._thread = None
+            raise errors[0]
+        return self
+
+    async def _serve(self) -> None:
+        self._server = grpc.aio.server()
+        vllm_engine_pb2_grpc.add_VllmEngineServicer_to_server(_Servicer(self), self._server)
+        if self._unix_socket:
+            self._server.add_insecure_port(f"unix:{self._unix_socket}")
+            self._port = 0
+        else:
+            self._port = self._server.add_insecure_port(f"{self._host}:{self._port}")
+        await self._server.start()
+        self._start_time = time.time()
+
+    def stop(self, grace: Optional[float] = None) -> None:
+        """Stop the server, cancelling in-flight RPCs after grace seconds."""
+        if self._thread is None:
+            return
+        loop, server = self._loop, self._server
+        assert loop is not None and server is not None
+        asyncio.run_coroutine_threadsafe(server.stop(grace), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    def client(self, **kwargs: Any) -> Any:
+        """A VLLMGrpcClient connected to this server; kwargs go to the client."""
+        from vllm_grpc_client._client import VLLMGrpcClient
+
+        return VLLMGrpcClient(host=self.host, port=self.port, secure=False, **kwargs)
+
+    def async_client(self, **kwargs: Any) -> Any:
+        """An AsyncVLLMGrpcClient connected to this server; kwargs go to the client."""
+        from vllm_grpc_client._client import AsyncVLLMGrpcClient
+
+        return AsyncVLLMGrpcClient(host=self.host, port=self.port, secure=False, **kwargs)
+
+    def __enter__(self) -> FakeVllmServer:
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def __repr__(self) -> str:
+        return (
+            f"FakeVllmServer(address={self.address!r}, active_requests={self.active_requests})"
+        )
@@ -3,7 +3,11 @@
 Helper utilities for decoding token IDs to text.
 """
 
-from typing import List, Optional
+from typing import Iterable, List, Optional
+
+# Tokens decoded before the read offset to give the tokenizer context
+# (for example the leading-space handling of SentencePiece)
+INITIAL_INCREMENTAL_DETOKENIZATION_OFFSET = 5
 
 
 class TokenDecoder:
@@ -123,6 +127,27 @@ class TokenDecoder:
         """
         return self.tokenizer.decode(token_ids, skip_special_tokens=skip_special_tokens)
 
+    def incremental(
+        self,
+        skip_special_tokens: bool = True,
+        prompt_token_ids: Optional[List[int]] = None,
+    ) -> "IncrementalDecoder":
+        """
+        Create an IncrementalDecoder for one streamed sequence.
+
+        Args:
+            skip_special_tokens: Whether to skip special tokens in output.
+            prompt_token_ids: Prompt tokens, used as decoding context.
+
+        Returns:
+            IncrementalDecoder instance.
+        """
+        return IncrementalDecoder(
+            self.tokenizer,
+            skip_special_tokens=skip_special_tokens,
+            prompt_token_ids=prompt_token_ids,
+        )
+
     def decode_completion(self, completion, skip_special_tokens: bool = True) -> str:
         """
         Decode a Completion object to text.
@@ -141,6 +166,10 @@ class TokenDecoder:
     def decode_chunk(self, chunk, skip_special_tokens: bool = True) -> str:
         """
         Decode a CompletionChunk object to text.
+
+        Each chunk is decoded on its own, which garbles characters split across
+        chunks. Prefer incremental() (or passing decoder= to
+        completions.create) for streams.
         
         Args:
             chunk: CompletionChunk object from streaming.
@@ -152,3 +181,111 @@ class TokenDecoder:
         if not chunk.choices:
             return ""
         return self.decode(chunk.choices[0].delta_token_ids, skip_special_tokens)
+
+
+class IncrementalDecoder:
+    """
+    Streaming detokenizer with vLLM-style prefix/read offsets.
+
+    Decoding each chunk on its own breaks characters spread over several
+    tokens, while re-decoding the whole sequence per chunk is O(n^2). This
+    decoder re-decodes only the tokens from prefix_offset on: the text of
+    tokens[prefix_offset:read_offset] was already emitted, so the new text is
+    whatever decode(tokens[prefix_offset:]) adds beyond it. Text ending in an
+    incomplete UTF-8 sequence is held back until the next tokens complete it.
+
+    Usage:
+        decoder = TokenDecoder.from_client(client)
+        incremental = decoder.incremental()
+        for chunk in stream:
+            print(incremental.decode(chunk.choices[0].delta_token_ids), end="")
+        print(incremental.flush())
+    """
+
+    def __init__(
+        self,
+        tokenizer,
+        skip_special_tokens: bool = True,
+        prompt_token_ids: Optional[List[int]] = None,
+    ):
+        """
+        Initialize the decoder.
+
+        Args:
+            tokenizer: A transformers tokenizer instance.
+            skip_special_tokens: Whether to skip special tokens in output.
+            prompt_token_ids: Prompt tokens, used as decoding context so the
+                first output tokens decode as they would after the prompt.
+        """
+        self._tokenizer = tokenizer
+        self._skip_special_tokens = skip_special_tokens
+        self._token_ids: List[int] = list(prompt_token_ids or [])
+        self._num_prompt_tokens = len(self._token_ids)
+        self._read_offset = len(self._token_ids)
+        self._prefix_offset = max(
+            self._read_offset - INITIAL_INCREMENTAL_DETOKENIZATION_OFFSET, 0
+        )
+        self._text_parts: List[str] = []
+
+    @property
+    def token_ids(self) -> List[int]:
+        """Output token IDs decoded so far (excluding the prompt)."""
+        return self._token_ids[self._num_prompt_tokens :]
+
+    @property
+    def text(self) -> str:
+        """Text emitted so far."""
+        parts = self._text_parts
+        if len(parts) > 1:
+            # Collapsed on read, so later reads do not join every part again
+            parts[:] = ["".join(parts)]
+        return parts[0] if parts else ""
+
+    def _decode(self, token_ids: List[int]) -> str:
+        text: str = self._tokenizer.decode(
+            token_ids, skip_special_tokens=self._skip_special_tokens
+        )
+        return text
+
+    def decode(self, delta_token_ids: Iterable[int]) -> str:
+        """
+        Add new tokens and return the text they complete.
+
+        Args:
+            delta_token_ids: Token IDs generated since the previous call.
+
+        Returns:
+            The new text, possibly empty while a character is incomplete.
+        """
+        self._token_ids.extend(delta_token_ids)
+        if len(self._token_ids) == self._read_offset:
+            return ""
+        prefix_text = self._decode(self._token_ids[self._prefix_offset : self._read_offset])
+        new_text = self._decode(self._token_ids[self._prefix_offset :])
+        if len(new_text) <= len(prefix_text) or new_text.endswith("\ufffd"):
+            # Incomplete character (or no visible text yet); wait for more tokens
+            return ""
+        delta_text = new_text[len(prefix_text) :]
+        self._prefix_offset = self._read_offset
+        self._read_offset = len(self._token_ids)
+        self._text_parts.append(delta_text)
+        return delta_text
+
+    def flush(self) -> str:
+        """
+        Return any text still held back, for the end of the sequence.
+
+        Returns:
+            The remaining text, including replacement characters for bytes
+            that never formed a complete character.
+        """
+        if len(self._token_ids) == self._read_offset:
+            return ""
+        prefix_text = self._decode(self._token_ids[self._prefix_offset : self._read_offset])
+        new_text = self._decode(self._token_ids[self._prefix_offset :])
+        delta_text = new_text[len(prefix_text) :]
+        self._prefix_offset = self._read_offset
+        self._read_offset = len(self._token_ids)
+        if delta_text:
+            self._text_parts.append(delta_text)
+        return delta_text
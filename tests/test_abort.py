@@ -0,0 +1,111 @@
+"""
+Tests for coalesced Abort RPCs.
+
+Run with:
+    pytest tests/test_abort.py -v
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from vllm_grpc_client import AbortCoalescer, AsyncAbortCoalescer
+
+
+class _RecordingStub:
+    """Records the request IDs of every Abort RPC."""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def Abort(self, request, timeout=None):  # noqa: N802
+        with self.lock:
+            self.calls.append(list(request.request_ids))
+        if self.fail:
+            raise RuntimeError("unavailable")
+
+
+class _AsyncRecordingStub(_RecordingStub):
+    async def Abort(self, request, timeout=None):  # noqa: N802
+        _RecordingStub.Abort(self, request, timeout)
+
+
+class TestAbortCoalescer:
+    """Tests for AbortCoalescer."""
+
+    def test_coalesces_within_delay(self):
+        stub = _RecordingStub()
+        coalescer = AbortCoalescer(stub, max_delay=0.05)
+        for i in range(10):
+            coalescer.submit(f"req-{i}")
+        coalescer.close()
+        assert stub.calls == [[f"req-{i}" for i in range(10)]]
+        stats = coalescer.stats
+        assert stats.flushes == 1
+        assert stats.request_ids == 10
+        assert stats.max_batch_size == 10
+        assert stats.max_flush_latency > 0
+
+    def test_flushes_at_size_limit(self):
+        stub = _RecordingStub()
+        coalescer = AbortCoalescer(stub, max_delay=10.0, max_batch_size=4)
+        for i in range(8):
+            coalescer.submit(f"req-{i}")
+        deadline = time.monotonic() + 2
+        while coalescer.stats.request_ids < 8 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [len(batch) for batch in stub.calls] == [4, 4]
+        coalescer.close()
+
+    def test_errors_are_counted(self):
+        stub = _RecordingStub(fail=True)
+        coalescer = AbortCoalescer(stub, max_delay=0.0)
+        coalescer.submit("req-1")
+        coalescer.close()
+        assert coalescer.stats.errors == 1
+
+    def test_submit_after_close_is_ignored(self):
+        stub = _RecordingStub()
+        coalescer = AbortCoalescer(stub)
+        coalescer.close()
+        coalescer.submit("req-1")
+        assert stub.calls == []
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            AbortCoalescer(_RecordingStub(), max_batch_size=0)
+
+
+class TestAsyncAbortCoalescer:
+    """Tests for AsyncAbortCoalescer."""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_within_delay(self):
+        stub = _AsyncRecordingStub()
+        coalescer = AsyncAbortCoalescer(stub, max_delay=0.01)
+        for i in range(10):
+            coalescer.submit(f"req-{i}")
+        assert coalescer.pending == 10
+        await asyncio.sleep(0.05)
+        assert stub.calls == [[f"req-{i}" for i in range(10)]]
+        assert coalescer.stats.mean_batch_size == 10
+
+    @pytest.mark.asyncio
+    async def test_flushes_at_size_limit(self):
+        stub = _AsyncRecordingStub()
+        coalescer = AsyncAbortCoalescer(stub, max_delay=10.0, max_batch_size=3)
+        for i in range(7):
+            coalescer.submit(f"req-{i}")
+        await asyncio.sleep(0)
+        assert [len(batch) for batch in stub.calls] == [3, 3]
+        await coalescer.aclose()
+        assert [len(batch) for batch in stub.calls] == [3, 3, 1]
+        assert coalescer.stats.flushes == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
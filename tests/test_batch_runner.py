@@ -0,0 +1,117 @@
+"""
+Tests for the offline JSONL batch runner.
+
+A stub client stands in for the server so runs can be interrupted and resumed.
+
+Run with:
+    pytest tests/test_batch_runner.py -v
+"""
+
+import asyncio
+import json
+import random
+
+import pytest
+
+from vllm_grpc_client import Completion, CompletionChoice, CompletionUsage
+from vllm_grpc_client.batch import run_batch
+
+
+class _StubCompletions:
+    def __init__(self, hang_from=None):
+        self.calls = []
+        self._hang_from = hang_from
+
+    async def create(self, *, prompt, request_id, **kwargs):
+        self.calls.append((request_id, kwargs))
+        await asyncio.sleep(random.random() * 0.002)
+        if self._hang_from is not None and int(request_id[1:]) >= self._hang_from:
+            # Simulates requests still running when the job is killed
+            await asyncio.Event().wait()
+        if prompt == "fail":
+            raise RuntimeError("boom")
+        return Completion(
+            id=request_id,
+            choices=[CompletionChoice(token_ids=[1, 2], finish_reason="length")],
+            usage=CompletionUsage(prompt_tokens=1, completion_tokens=2, total_tokens=3),
+        )
+
+
+class _StubClient:
+    def __init__(self, hang_from=None):
+        self.completions = _StubCompletions(hang_from)
+
+
+def _write_input(path, count):
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(json.dumps({"prompt": f"p{i}", "request_id": f"r{i}", "max_tokens": 4}))
+            f.write("\n")
+
+
+def _read_output(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.asyncio
+async def test_writes_one_record_per_line(tmp_path):
+    input_path, output_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    _write_input(input_path, 50)
+    with open(input_path, "a") as f:
+        f.write("\n")
+        f.write(json.dumps({"prompt": "fail"}) + "\n")
+        f.write(json.dumps({"title": "no prompt"}) + "\n")
+
+    client = _StubClient()
+    stats = await run_batch(client, str(input_path), str(output_path), concurrency=8)
+
+    records = _read_output(output_path)
+    assert stats.completed == 50 and stats.failed == 2
+    assert len(records) == 52
+    assert {r["request_id"] for r in records if "error" not in r} == {f"r{i}" for i in range(50)}
+    # Only create() arguments are forwarded
+    assert all(kwargs == {"max_tokens": 4} for _, kwargs in client.completions.calls[:50])
+
+
+@pytest.mark.asyncio
+async def test_resume_after_interruption(tmp_path):
+    input_path, output_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    _write_input(input_path, 400)
+
+    run = asyncio.ensure_future(
+        run_batch(
+            _StubClient(hang_from=250),
+            str(input_path),
+            str(output_path),
+            concurrency=16,
+            checkpoint_interval=0.0,
+        )
+    )
+    await asyncio.sleep(0.2)
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+
+    resumed = _StubClient()
+    await run_batch(resumed, str(input_path), str(output_path), checkpoint_interval=0.0)
+
+    request_ids = [r["request_id"] for r in _read_output(output_path)]
+    assert sorted(request_ids) == sorted(f"r{i}" for i in range(400))
+    assert len(resumed.completions.calls) <= 150
+
+
+@pytest.mark.asyncio
+async def test_completed_run_is_not_repeated(tmp_path):
+    input_path, output_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    _write_input(input_path, 10)
+    await run_batch(_StubClient(), str(input_path), str(output_path))
+
+    again = _StubClient()
+    await run_batch(again, str(input_path), str(output_path))
+    assert again.completions.calls == []
+    assert len(_read_output(output_path)) == 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
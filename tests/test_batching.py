@@ -0,0 +1,131 @@
+"""
+Tests for batched completions.
+
+create() is replaced with a stub that records concurrency, so no server is needed.
+
+Run with:
+    pytest tests/test_batching.py -v
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from vllm_grpc_client import AsyncVLLMGrpcClient, Completion, VLLMGrpcClient
+
+
+class _Tracker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def enter(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def exit(self):
+        with self.lock:
+            self.current -= 1
+
+
+class TestSyncBatch:
+    """Tests for Completions.create_batch and as_completed."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        client = VLLMGrpcClient(host="127.0.0.1", port=1)
+        tracker = _Tracker()
+
+        def create(*, prompt, **kwargs):
+            tracker.enter()
+            try:
+                # Later prompts finish first
+                time.sleep(0.02 / (len(prompt) + 1))
+                if prompt == "fail":
+                    raise RuntimeError("boom")
+                return Completion(id=prompt)
+            finally:
+                tracker.exit()
+
+        monkeypatch.setattr(client.completions, "create", create)
+        client.tracker = tracker
+        yield client
+        client.close()
+
+    def test_results_in_input_order(self, client):
+        prompts = ["p" * i for i in range(20)]
+        results = client.completions.create_batch(prompts, max_concurrency=4)
+        assert [r.id for r in results] == prompts
+        assert client.tracker.peak <= 4
+
+    def test_as_completed_yields_indices(self, client):
+        prompts = ["p" * i for i in range(10)]
+        seen = [index for index, _ in client.completions.as_completed(prompts, max_concurrency=3)]
+        assert sorted(seen) == list(range(10))
+
+    def test_exceptions(self, client):
+        with pytest.raises(RuntimeError):
+            client.completions.create_batch(["a", "fail", "b"])
+        results = client.completions.create_batch(["a", "fail"], return_exceptions=True)
+        assert isinstance(results[1], RuntimeError)
+
+    def test_rejects_per_request_arguments(self, client):
+        with pytest.raises(ValueError):
+            client.completions.create_batch(["a"], stream=True)
+        with pytest.raises(ValueError):
+            client.completions.create_batch(["a"], max_concurrency=0)
+
+
+class TestAsyncBatch:
+    """Tests for AsyncCompletions.create_batch and as_completed."""
+
+    @pytest.fixture
+    async def client(self, monkeypatch):
+        client = AsyncVLLMGrpcClient(host="127.0.0.1", port=1)
+        tracker = _Tracker()
+
+        async def create(*, prompt, **kwargs):
+            tracker.enter()
+            try:
+                await asyncio.sleep(0.02 / (len(prompt) + 1))
+                if prompt == "fail":
+                    raise RuntimeError("boom")
+                return Completion(id=prompt)
+            finally:
+                tracker.exit()
+
+        monkeypatch.setattr(client.completions, "create", create)
+        client.tracker = tracker
+        yield client
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_results_in_input_order(self, client):
+        prompts = ["p" * i for i in range(20)]
+        results = await client.completions.create_batch(prompts, max_concurrency=5)
+        assert [r.id for r in results] == prompts
+        assert client.tracker.peak <= 5
+
+    @pytest.mark.asyncio
+    async def test_as_completed_bounded(self, client):
+        prompts = iter(["p" * i for i in range(12)])
+        seen = []
+        async for index, _ in client.completions.as_completed(prompts, max_concurrency=2):
+            seen.append(index)
+        assert sorted(seen) == list(range(12))
+        assert client.tracker.peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_return_exceptions(self, client):
+        results = await client.completions.create_batch(["a", "fail"], return_exceptions=True)
+        assert isinstance(results[1], RuntimeError)
+        with pytest.raises(RuntimeError):
+            await client.completions.create_batch(["fail"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
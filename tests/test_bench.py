@@ -0,0 +1,79 @@
+"""
+Tests for the load-generation benchmark.
+
+Runs against the in-process fake server, so no vLLM server is needed.
+
+Run with:
+    pytest tests/test_bench.py -v
+"""
+
+import json
+import random
+
+import pytest
+
+from vllm_grpc_client.bench import main, parse_length, run_benchmark
+from vllm_grpc_client.testing import FakeVllmServer
+
+
+class TestParseLength:
+    """Tests for length distribution specs."""
+
+    def test_fixed(self):
+        assert parse_length("7")(random.Random(0)) == 7
+
+    def test_uniform(self):
+        sample = parse_length("uniform:3:5")
+        rng = random.Random(0)
+        assert {sample(rng) for _ in range(100)} == {3, 4, 5}
+
+    def test_clamped_to_one(self):
+        sample = parse_length("normal:0:1")
+        rng = random.Random(0)
+        assert min(sample(rng) for _ in range(100)) == 1
+
+    @pytest.mark.parametrize("spec", ["", "uniform:1", "poisson:3", "normal:a:b"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parse_length(spec)
+
+
+class TestRunBenchmark:
+    """Tests for benchmark runs."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency(self):
+        with FakeVllmServer(chunk_size=2) as server:
+            async with server.async_client() as client:
+                result = await run_benchmark(
+                    client,
+                    num_requests=20,
+                    concurrency=4,
+                    input_len=parse_length("8"),
+                    output_len=parse_length("uniform:4:6"),
+                )
+        summary = result.summary()
+        assert summary["completed"] == 20
+        assert summary["failed"] == 0
+        assert 20 * 4 <= result.output_tokens <= 20 * 6
+        assert result.prompt_tokens == 20 * 8
+        assert summary["ttft"]["count"] == 20
+        assert summary["cpu_per_token"] > 0
+
+    @pytest.mark.asyncio
+    async def test_qps_counts_errors(self):
+        with FakeVllmServer() as server:
+            server.fail_next(3)
+            async with server.async_client() as client:
+                result = await run_benchmark(
+                    client, num_requests=10, qps=1000, output_len=parse_length("2")
+                )
+        assert result.completed == 7
+        assert result.errors == {"VLLMGrpcUnavailableError": 3}
+
+    def test_cli_json(self, capsys):
+        code = main(["--fake", "--num-requests", "5", "--output-len", "3", "--json"])
+        summary = json.loads(capsys.readouterr().out)
+        assert code == 0
+        assert summary["completed"] == 5
+        assert summary["output_token_throughput"] > 0
@@ -0,0 +1,159 @@
+"""
+Tests for the deterministic completion response cache.
+
+Runs against the in-process fake server, so no vLLM server is needed.
+
+Run with:
+    pytest tests/test_cache.py -v
+"""
+
+import time
+
+import pytest
+
+from vllm_grpc_client import CompletionTemplate, ResponseCache, TokenizedInput
+from vllm_grpc_client._cache import _cache_key, _CacheEntry
+from vllm_grpc_client.resources.completions import _build_generate_request
+from vllm_grpc_client.testing import FakeVllmServer
+
+
+def _key(prompt="Hello", **sampling_kwargs):
+    return _cache_key(_build_generate_request(prompt, "req-1", False, **sampling_kwargs))
+
+
+@pytest.fixture
+def server():
+    with FakeVllmServer(default_max_tokens=6) as fake:
+        yield fake
+
+
+class TestCacheKey:
+    """Tests for which requests are cached, and under which key."""
+
+    def test_only_deterministic_requests(self):
+        assert _key() is None
+        assert _key(temperature=0.7) is None
+        assert _key(temperature=0.0) is not None
+        assert _key(temperature=0.7, seed=1) is not None
+
+    def test_key_covers_prompt_and_sampling_params(self):
+        key = _key(temperature=0.0, max_tokens=4)
+        assert key == _key(temperature=0.0, max_tokens=4)
+        assert key != _key("Goodbye", temperature=0.0, max_tokens=4)
+        assert key != _key(temperature=0.0, max_tokens=5)
+        assert _key([1, 2], temperature=0.0) == _key(
+            TokenizedInput(original_text="", input_ids=[1, 2]), temperature=0.0
+        )
+        assert _key([1, 2], temperature=0.0) != _key("\x01\x02", temperature=0.0)
+
+    def test_templates_share_keys(self):
+        template = CompletionTemplate(temperature=0.0, logit_bias={5: 1.0, 3: -1.0})
+        request = template.build_request("Hello", "req-2", stream=True)
+        assert _cache_key(request) == _key(temperature=0.0, logit_bias={3: -1.0, 5: 1.0})
+
+
+class TestResponseCache:
+    """Tests for eviction, expiry and the disk backend."""
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(2)
+        for key in ("a", "b"):
+            cache._put(key, _CacheEntry([1], "stop", 1, 1))
+        assert cache._get("a") is not None
+        cache._put("c", _CacheEntry([1], "stop", 1, 1))
+        assert cache._get("b") is None
+        assert cache._get("a") is not None
+        stats = cache.stats
+        assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (2, 1, 1, 2)
+
+    def test_ttl(self):
+        cache = ResponseCache(ttl=10)
+        cache._put("old", _CacheEntry([1], "stop", 1, 1, created=time.time() - 60))
+        cache._put("new", _CacheEntry([1], "stop", 1, 1))
+        assert cache._get("old") is None
+        assert cache._get("new") is not None
+        assert cache.stats.expired == 1
+
+    def test_disk_backend(self, tmp_path):
+        ResponseCache(directory=str(tmp_path))._put("ab12", _CacheEntry([7, 8], "length", 3, 2))
+        cache = ResponseCache(directory=str(tmp_path))
+        entry = cache._get("ab12")
+        assert (entry.token_ids, entry.finish_reason, entry.completion_tokens) == (
+            [7, 8],
+            "length",
+            2,
+        )
+        assert len(cache) == 1
+        cache.clear()
+        assert ResponseCache(directory=str(tmp_path))._get("ab12") is None
+
+    def test_disk_ttl(self, tmp_path):
+        old = _CacheEntry([1], "stop", 1, 1, created=time.time() - 60)
+        ResponseCache(directory=str(tmp_path))._put("cd34", old)
+        assert ResponseCache(ttl=10, directory=str(tmp_path))._get("cd34") is None
+        assert not list(tmp_path.rglob("*.json"))
+
+
+class TestSyncCache:
+    """Tests for the cache in the sync client."""
+
+    def test_hit_skips_the_server(self, server):
+        cache = ResponseCache()
+        with server.client(response_cache=cache) as client:
+            assert client.response_cache is cache
+            first = client.completions.create(prompt="Hello", temperature=0.0)
+            second = client.completions.create(prompt="Hello", temperature=0.0)
+        assert server.requests_received == 1
+        assert not first.cached and second.cached
+        assert second.choices[0].token_ids == first.choices[0].token_ids
+        assert second.choices[0].finish_reason == first.choices[0].finish_reason
+        assert second.usage.total_tokens == 0
+        assert cache.stats.hits == 1
+
+    def test_sampled_requests_are_not_cached(self, server):
+        cache = ResponseCache()
+        with server.client(response_cache=cache) as client:
+            for _ in range(2):
+                assert not client.completions.create(prompt="Hello").cached
+        assert server.requests_received == 2
+        assert len(cache) == 0
+
+    def test_stream_replays_a_hit(self, server):
+        cache = ResponseCache(replay_chunk_size=4)
+        with server.client(response_cache=cache) as client:
+            expected = client.completions.create(prompt="Hello", temperature=0.0)
+            stream = client.completions.create(prompt="Hello", temperature=0.0, stream=True)
+            chunks = [chunk.choices[0].delta_token_ids for chunk in stream]
+        assert stream.cached
+        assert chunks == [expected.choices[0].token_ids[:4], expected.choices[0].token_ids[4:], []]
+        final = stream.get_final_completion()
+        assert final.cached and final.usage.total_tokens == 0
+        assert final.choices[0].token_ids == expected.choices[0].token_ids
+        assert server.requests_received == 1
+
+    def test_fast_types(self, server):
+        with server.client(response_cache=ResponseCache(), fast_types=True) as client:
+            client.completions.create(prompt=[1, 2, 3], seed=7)
+            completion = client.completions.create(prompt=[1, 2, 3], seed=7)
+        assert completion.cached
+        assert completion.to_pydantic().cached
+
+
+class TestAsyncCache:
+    """Tests for the cache in the async client."""
+
+    @pytest.mark.asyncio
+    async def test_hit_and_replay(self, server):
+        cache = ResponseCache()
+        async with server.async_client(response_cache=cache) as client:
+            first = await client.completions.create(prompt="Hello", temperature=0.0)
+            second = await client.completions.create(prompt="Hello", temperature=0.0)
+            stream = await client.completions.create(
+                prompt="Hello", temperature=0.0, stream=True
+            )
+            token_ids = []
+            async for chunk in stream:
+                token_ids.extend(chunk.choices[0].delta_token_ids)
+        assert second.cached and token_ids == first.choices[0].token_ids
+        assert stream.get_final_completion().cached
+        assert server.requests_received == 1
@@ -0,0 +1,253 @@
+"""
+Tests for per-endpoint circuit breakers.
+
+Runs against the in-process fake server, so no vLLM server is needed.
+
+Run with:
+    pytest tests/test_circuit.py -v
+"""
+
+import asyncio
+import time
+
+import grpc
+import pytest
+
+from vllm_grpc_client import (
+    CircuitBreakerPolicy,
+    ClientMetrics,
+    LoadBalancedClient,
+    RetryPolicy,
+    VLLMGrpcCircuitOpenError,
+    VLLMGrpcInvalidArgumentError,
+    VLLMGrpcUnavailableError,
+)
+from vllm_grpc_client.testing import FakeVllmServer
+
+
+def _policy(**kwargs):
+    kwargs.setdefault("consecutive_failures", 3)
+    kwargs.setdefault("open_duration", 0.05)
+    return CircuitBreakerPolicy(**kwargs)
+
+
+def _fail(client, count):
+    for _ in range(count):
+        with pytest.raises(VLLMGrpcUnavailableError):
+            client.completions.create(prompt="x")
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+@pytest.fixture
+def server():
+    with FakeVllmServer(default_max_tokens=4) as fake:
+        yield fake
+
+
+class TestCircuitBreakerPolicy:
+    """Tests for CircuitBreakerPolicy settings."""
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            CircuitBreakerPolicy(consecutive_failures=0)
+        with pytest.raises(ValueError):
+            CircuitBreakerPolicy(failure_rate=0.0)
+
+
+class TestSyncCircuitBreaker:
+    """Tests for the circuit breaker of the sync client."""
+
+    def test_opens_after_consecutive_failures(self, server):
+        server.fail_next(3)
+        with server.client(circuit_breaker=_policy(open_duration=60)) as client:
+            events = []
+            client.circuit_breaker.add_listener(events.append)
+            _fail(client, 3)
+            assert client.circuit_breaker.state == "open"
+            with pytest.raises(VLLMGrpcCircuitOpenError) as info:
+                client.completions.create(prompt="x")
+            stats = client.circuit_breaker.stats
+        assert info.value.endpoint == server.address
+        assert server.requests_received == 3
+        assert (stats.failures, stats.rejected, stats.opened) == (3, 1, 1)
+        assert [(e.previous, e.state, e.reason) for e in events] == [
+            ("closed", "open", "consecutive_failures")
+        ]
+
+    def test_success_resets_the_run(self, server):
+        with server.client(circuit_breaker=_policy()) as client:
+            for _ in range(3):
+                server.fail_next(2)
+                _fail(client, 2)
+                client.completions.create(prompt="x")
+            assert client.circuit_breaker.state == "closed"
+
+    def test_opens_on_failure_rate(self, server):
+        policy = _policy(consecutive_failures=100, failure_rate=0.5, min_requests=4)
+        with server.client(circuit_breaker=policy) as client:
+            events = []
+            client.circuit_breaker.add_listener(events.append)
+            for _ in range(2):
+                client.completions.create(prompt="x")
+                server.fail_next(1)
+                _fail(client, 1)
+            assert client.circuit_breaker.state == "open"
+        assert events[0].reason == "failure_rate"
+
+    def test_other_codes_do_not_count(self, server):
+        server.fail_next(5, grpc.StatusCode.INVALID_ARGUMENT)
+        with server.client(circuit_breaker=_policy()) as client:
+            for _ in range(5):
+                with pytest.raises(VLLMGrpcInvalidArgumentError):
+                    client.completions.create(prompt="x")
+            assert client.circuit_breaker.state == "closed"
+
+    def test_probe_closes(self, server):
+        server.fail_next(3)
+        with server.client(circuit_breaker=_policy()) as client:
+            events = []
+            breaker = client.circuit_breaker
+            breaker.add_listener(events.append)
+            _fail(client, 3)
+            time.sleep(0.06)
+            # The first request after open_duration starts the probe and is rejected
+            with pytest.raises(VLLMGrpcCircuitOpenError):
+                client.completions.create(prompt="x")
+            assert _wait_for(lambda: breaker.state == "closed")
+            completion = client.completions.create(prompt="x")
+        assert completion.usage.completion_tokens == 4
+        assert [e.state for e in events] == ["open", "half_open", "closed"]
+        assert events[-1].reason == "probe_succeeded"
+
+    def test_failed_probe_reopens(self, server):
+        server.fail_next(3)
+        server.healthy = False
+        with server.client(circuit_breaker=_policy()) as client:
+            breaker = client.circuit_breaker
+            _fail(client, 3)
+            time.sleep(0.06)
+            assert not breaker.allow_request()
+            assert _wait_for(lambda: breaker.state == "open")
+            assert breaker.stats.opened == 2
+            breaker.reset()
+            assert breaker.allow_request()
+
+    def test_rejected_requests_are_not_retried(self, server):
+        server.fail_next(3)
+        policy = _policy(open_duration=60)
+        retry = RetryPolicy(max_attempts=5, initial_backoff=0.001)
+        with server.client(circuit_breaker=policy, retry_policy=retry) as client:
+            with pytest.raises(VLLMGrpcCircuitOpenError):
+                client.completions.create(prompt="x")
+            # The third retry is rejected by the open circuit, and not retried itself
+            assert client.retry_stats.retries == 3
+        assert server.requests_received == 3
+
+    def test_stream_failures_count(self, server):
+        server.fail_next(3, after_tokens=1)
+        with server.client(circuit_breaker=_policy(open_duration=60)) as client:
+            for _ in range(3):
+                with pytest.raises(VLLMGrpcUnavailableError):
+                    list(client.completions.create(prompt="x", stream=True))
+            assert _wait_for(lambda: client.circuit_breaker.state == "open")
+
+    def test_metrics(self, server):
+        metrics = ClientMetrics()
+        server.fail_next(3)
+        with server.client(circuit_breaker=_policy(open_duration=60), metrics=metrics) as client:
+            _fail(client, 3)
+            with pytest.raises(VLLMGrpcCircuitOpenError):
+                client.completions.create(prompt="x")
+        text = metrics.registry.render()
+        endpoint = server.address
+        assert f'vllm_grpc_client_circuit_breaker_state{{endpoint="{endpoint}"}} 2' in text
+        assert (
+            "vllm_grpc_client_circuit_breaker_transitions_total"
+            f'{{endpoint="{endpoint}",state="open"}} 1'
+        ) in text
+        assert "vllm_grpc_client_circuit_breaker_rejected_total 1" in text
+
+    def test_without_policy(self, server):
+        with server.client() as client:
+            assert client.circuit_breaker is None
+
+
+class TestAsyncCircuitBreaker:
+    """Tests for the circuit breaker of the async client."""
+
+    @pytest.mark.asyncio
+    async def test_open_and_probe(self, server):
+        server.fail_next(3)
+        async with server.async_client(circuit_breaker=_policy()) as client:
+            breaker = client.circuit_breaker
+            for _ in range(3):
+                with pytest.raises(VLLMGrpcUnavailableError):
+                    await client.completions.create(prompt="x")
+            assert breaker.state == "open"
+            with pytest.raises(VLLMGrpcCircuitOpenError):
+                await client.completions.create(prompt="x")
+            await asyncio.sleep(0.06)
+            with pytest.raises(VLLMGrpcCircuitOpenError):
+                await client.completions.create(prompt="x")
+            for _ in range(100):
+                if breaker.state == "closed":
+                    break
+                await asyncio.sleep(0.01)
+            assert breaker.state == "closed"
+            completion = await client.completions.create(prompt="x")
+        assert completion.usage.completion_tokens == 4
+
+
+def test_load_balanced_client_skips_open_replica():
+    with FakeVllmServer() as bad, FakeVllmServer() as good:
+        client = LoadBalancedClient(
+            [bad.address, good.address],
+            poll_interval=60,
+            circuit_breaker=_policy(consecutive_failures=1, open_duration=60),
+        )
+        try:
+            bad.fail_next(1)
+            failures = 0
+            for _ in range(6):
+                try:
+                    client.completions.create(prompt="x", max_tokens=2)
+                except VLLMGrpcUnavailableError:
+                    failures += 1
+            breakers = [replica.client.circuit_breaker for replica in client.replicas]
+        finally:
+            client.close()
+    assert failures == 1
+    assert [breaker.state for breaker in breakers] == ["open", "closed"]
+    assert not client.replicas[0].available
+
+
+def test_routing_does_not_advance_the_circuit():
+    with FakeVllmServer() as bad, FakeVllmServer() as good:
+        client = LoadBalancedClient(
+            [bad.address, good.address],
+            poll_interval=60,
+            circuit_breaker=_policy(consecutive_failures=1, open_duration=0.05),
+        )
+        try:
+            bad.fail_next(1)
+            for _ in range(4):
+                try:
+                    client.completions.create(prompt="x", max_tokens=2)
+                except VLLMGrpcUnavailableError:
+                    pass
+            replica = client.replicas[0]
+            breaker = replica.client.circuit_breaker
+            time.sleep(0.1)
+            assert not replica.available
+            assert breaker.state == "open" and breaker.stats.probes == 0
+            client.refresh()
+            assert breaker.stats.probes == 1
+            assert _wait_for(lambda: replica.available)
+        finally:
+            client.close()
@@ -0,0 +1,87 @@
+"""
+Tests for prepared completion templates.
+
+Run with:
+    pytest tests/test_completion_template.py -v
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from vllm_grpc_client import (
+    ChoiceConstraint,
+    CompletionTemplate,
+    StructuredOutputs,
+    TimingStats,
+    TokenizedInput,
+)
+from vllm_grpc_client.proto import vllm_engine_pb2
+from vllm_grpc_client.resources.completions import Completions, _build_generate_request
+
+SAMPLING_KWARGS = dict(
+    temperature=0.0,
+    max_tokens=16,
+    stop=["\n"],
+    seed=7,
+    logit_bias={1: -2.0, 2: 0.5},
+    structured_outputs=StructuredOutputs(choice=ChoiceConstraint(choices=["yes", "no"])),
+)
+
+
+class TestCompletionTemplate:
+    """Tests for CompletionTemplate."""
+
+    @pytest.mark.parametrize(
+        "prompt",
+        ["Hello", [1, 2, 3], [], TokenizedInput(original_text="Hi", input_ids=[4, 5])],
+    )
+    def test_matches_per_call_request(self, prompt):
+        template = CompletionTemplate(**SAMPLING_KWARGS)
+        expected = _build_generate_request(prompt, "req-1", True, **SAMPLING_KWARGS)
+        assert template.build_request(prompt, "req-1", True) == expected
+
+    def test_requests_are_independent(self):
+        template = CompletionTemplate(max_tokens=4)
+        first = template.build_request("a", "req-1")
+        second = template.build_request([1], "req-2")
+        assert first.text == "a" and first.request_id == "req-1"
+        assert second.WhichOneof("input") == "tokenized"
+        assert second.request_id == "req-2"
+
+    def test_frozen(self):
+        template = CompletionTemplate(max_tokens=4)
+        with pytest.raises(AttributeError):
+            template.foo = 1
+        assert template == CompletionTemplate(max_tokens=4)
+        assert hash(template) == hash(CompletionTemplate(max_tokens=4))
+        assert template.sampling_params().max_tokens == 4
+
+    def test_unknown_argument(self):
+        with pytest.raises(TypeError):
+            CompletionTemplate(bogus=1)
+
+    def test_create_uses_template(self):
+        sent = []
+
+        def generate(request, timeout=None):
+            sent.append(request)
+            return iter(
+                [vllm_engine_pb2.GenerateResponse(complete=vllm_engine_pb2.GenerateComplete())]
+            )
+
+        client = SimpleNamespace(
+            _stub=SimpleNamespace(Generate=generate),
+            _timeout=1.0,
+            _model_name="",
+            _fast_types=False,
+            _timing_stats=TimingStats(),
+        )
+        completions = Completions(client)
+        template = completions.prepare(**SAMPLING_KWARGS)
+        completions.create(prompt="Hi", request_id="req-1", template=template)
+        assert sent[0] == _build_generate_request("Hi", "req-1", False, **SAMPLING_KWARGS)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,222 @@
+"""
+Tests for the memory-mapped embedding cache.
+
+Runs against the in-process fake server, so no vLLM server is needed. Tests
+of the cache itself need numpy and are skipped without it.
+
+Run with:
+    pytest tests/test_embedding_cache.py -v
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+from vllm_grpc_client import EmbeddingCache, LoadBalancedClient, TokenizedInput
+from vllm_grpc_client._embedding_cache import (
+    INDEX_FILE,
+    INITIAL_CAPACITY,
+    KEY_SIZE,
+    VECTORS_FILE,
+    _embedding_key,
+)
+from vllm_grpc_client.testing import FakeVllmServer
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+@pytest.fixture
+def np():
+    return pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def server():
+    with FakeVllmServer(embedding_dim=8) as fake:
+        yield fake
+
+
+class TestEmbeddingKey:
+    """Tests for which inputs are cached, and under which key."""
+
+    def test_token_ids(self):
+        key = _embedding_key([1, 2, 3])
+        assert len(key) == 16
+        assert key == _embedding_key(TokenizedInput(original_text="abc", input_ids=[1, 2, 3]))
+        assert key != _embedding_key([3, 2, 1])
+
+    def test_text_is_not_cached(self):
+        assert _embedding_key("Hello") is None
+        assert _embedding_key(TokenizedInput(original_text="Hello", input_ids=[])) is None
+
+
+@pytest.mark.skipif(HAS_NUMPY, reason="numpy is installed")
+def test_requires_numpy(tmp_path):
+    with pytest.raises(ImportError, match="pip install numpy"):
+        EmbeddingCache(str(tmp_path))
+
+
+class _FullFile:
+    """A cache file whose writes fail as on a full disk."""
+
+    def __init__(self, f):
+        self._f = f
+
+    def write(self, data):
+        raise OSError(28, "No space left on device")
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+
+class TestEmbeddingCache:
+    """Tests for the cache files, driven directly."""
+
+    def test_views_into_the_vector_file(self, np, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+        stored = cache._put(b"a" * 16, [0.5, 1.5, 2.5])
+        view = cache._get(b"a" * 16)
+        assert view.tolist() == stored.tolist() == [0.5, 1.5, 2.5]
+        assert view.dtype == np.float32 and not view.flags.writeable
+        assert isinstance(view, np.memmap)
+        assert cache._get(b"b" * 16) is None
+        stats = cache.stats
+        assert (stats.hits, stats.misses, stats.stores, stats.entries) == (1, 1, 1, 1)
+
+    def test_persists_across_opens(self, np, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+        for i in range(3):
+            cache._put(bytes([i]) * 16, [float(i)] * 4)
+        cache.close()
+        reopened = EmbeddingCache(str(tmp_path))
+        assert len(reopened) == 3 and reopened.dim == 4
+        assert reopened._get(bytes([2]) * 16).tolist() == [2.0] * 4
+
+    def test_map_grows_geometrically(self, np, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+        maps = []
+        for i in range(2 * INITIAL_CAPACITY + 1):
+            view = cache._put(i.to_bytes(KEY_SIZE, "little"), [float(i), 0.0])
+            if not maps or cache._map is not maps[-1]:
+                maps.append(cache._map)
+        assert view.tolist() == [2.0 * INITIAL_CAPACITY, 0.0]
+        assert [len(m) for m in maps] == [INITIAL_CAPACITY * n for n in (1, 2, 4)]
+        cache.close()
+        # Spare rows are dropped on open
+        reopened = EmbeddingCache(str(tmp_path))
+        assert len(reopened) == 2 * INITIAL_CAPACITY + 1
+        assert os.path.getsize(tmp_path / VECTORS_FILE) == len(reopened) * 2 * 4
+        assert reopened._get((5).to_bytes(KEY_SIZE, "little")).tolist() == [5.0, 0.0]
+
+    def test_partial_rows_are_dropped(self, np, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+        cache._put(b"a" * 16, [1.0, 2.0])
+        cache.close()
+        # A crash between writing a vector and its key
+        with open(tmp_path / VECTORS_FILE, "ab") as f:
+            f.write(b"\0" * 5)
+        with open(tmp_path / INDEX_FILE, "ab") as f:
+            f.write(b"b" * 7)
+        cache = EmbeddingCache(str(tmp_path))
+        assert len(cache) == 1
+        cache._put(b"c" * 16, [3.0, 4.0])
+        assert cache._get(b"c" * 16).tolist() == [3.0, 4.0]
+        assert cache._get(b"a" * 16).tolist() == [1.0, 2.0]
+
+    def test_dimension_mismatch(self, np, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+        cache._put(b"a" * 16, [1.0, 2.0])
+        with pytest.raises(ValueError):
+            cache._put(b"b" * 16, [1.0, 2.0, 3.0])
+
+    def test_failed_write_keeps_rows_aligned(self, np, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+        cache._put(b"a" * 16, [1.0, 2.0])
+        index_file = cache._index_file
+        cache._index_file = _FullFile(index_file)
+        with pytest.raises(OSError):
+            cache._put(b"b" * 16, [3.0, 4.0])
+        cache._index_file = index_file
+        cache._put(b"c" * 16, [5.0, 6.0])
+        cache.close()
+        reopened = EmbeddingCache(str(tmp_path))
+        assert len(reopened) == 2 and reopened._get(b"b" * 16) is None
+        assert reopened._get(b"c" * 16).tolist() == [5.0, 6.0]
+
+
+class TestSyncEmbeddingCache:
+    """Tests for the cache in the sync client."""
+
+    def test_hit_skips_the_server(self, np, server, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+        with server.client(embedding_cache=cache) as client:
+            assert client.embedding_cache is cache
+            first = client.embeddings.create(input=[1, 2, 3])
+            second = client.embeddings.create(input=[1, 2, 3])
+        assert server.requests_received == 1
+        assert not first.cached and second.cached
+        assert second.data[0].embedding == pytest.approx(first.data[0].embedding)
+        assert isinstance(second.data[0].embedding, list)
+        assert second.usage.total_tokens == 0
+
+    def test_fast_types_return_views(self, np, server, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+        with server.client(embedding_cache=cache, fast_types=True) as client:
+            miss = client.embeddings.create(input=[4, 5])
+            hit = client.embeddings.create(input=[4, 5])
+        assert isinstance(miss.data[0].embedding, np.memmap)
+        assert np.shares_memory(hit.data[0].embedding, cache._get(_embedding_key([4, 5])))
+
+    def test_cached_responses_compare_equal(self, np, server, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+        with server.client(embedding_cache=cache, fast_types=True) as client:
+            miss = client.embeddings.create(input=[4, 5])
+            hits = [client.embeddings.create(input=[4, 5]) for _ in range(2)]
+            other = client.embeddings.create(input=[6, 7])
+        assert hits[0] == hits[1]
+        assert miss.data[0] == hits[0].data[0]
+        assert other.data[0] != hits[0].data[0]
+
+    def test_store_errors_do_not_fail_the_request(self, np, server, tmp_path):
+        # A directory filled by a model of another dimension
+        EmbeddingCache(str(tmp_path))._put(b"a" * 16, [1.0, 2.0])
+        cache = EmbeddingCache(str(tmp_path))
+        with server.client(embedding_cache=cache, fast_types=True) as client:
+            response = client.embeddings.create(input=[1, 2, 3])
+        assert len(response.data[0].embedding) == 8 and not response.cached
+        assert server.requests_received == 1
+        assert len(cache) == 1
+
+    def test_text_goes_to_the_server(self, np, server, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+        with server.client(embedding_cache=cache) as client:
+            for _ in range(2):
+                assert not client.embeddings.create(input="Hello").cached
+        assert server.requests_received == 2
+        assert len(cache) == 0
+
+
+class TestAsyncEmbeddingCache:
+    """Tests for the cache in the async client."""
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_the_server(self, np, server, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+        async with server.async_client(embedding_cache=cache) as client:
+            await client.embeddings.create(input=[1, 2])
+            response = await client.embeddings.create(input=[1, 2])
+        assert response.cached
+        assert server.requests_received == 1
+
+
+def test_load_balanced_client_keeps_the_cache(np, tmp_path):
+    cache = EmbeddingCache(str(tmp_path))
+    with FakeVllmServer() as first, FakeVllmServer() as second:
+        with LoadBalancedClient(
+            [first.address, second.address], poll_interval=60, embedding_cache=cache
+        ) as client:
+            assert client.embedding_cache is cache
+            for _ in range(3):
+                client.embeddings.create(input=[7, 8])
+        assert first.requests_received + second.requests_received == 1
@@ -0,0 +1,108 @@
+"""
+Tests for the slotted fast result types.
+
+Run with:
+    pytest tests/test_fast_types.py -v
+"""
+
+import inspect
+from types import SimpleNamespace
+
+import pytest
+
+from vllm_grpc_client import (
+    Completion,
+    CompletionChunk,
+    FastCompletion,
+    FastCompletionChoice,
+    FastCompletionChunk,
+    FastCompletionUsage,
+    GenerateStream,
+    TimingStats,
+)
+from vllm_grpc_client._fast_types import FAST_TYPES, PYDANTIC_TYPES
+from vllm_grpc_client.proto import vllm_engine_pb2
+from vllm_grpc_client.resources.completions import Completions
+
+
+def _complete_response():
+    return vllm_engine_pb2.GenerateResponse(
+        complete=vllm_engine_pb2.GenerateComplete(
+            output_ids=[5, 6, 7],
+            finish_reason="length",
+            prompt_tokens=4,
+            completion_tokens=3,
+        )
+    )
+
+
+def _completions(fast_types):
+    stub = SimpleNamespace(Generate=lambda request, timeout=None: iter([_complete_response()]))
+    client = SimpleNamespace(
+        _stub=stub,
+        _timeout=1.0,
+        _model_name="test-model",
+        _fast_types=fast_types,
+        _timing_stats=TimingStats(),
+    )
+    return Completions(client)
+
+
+class TestFastTypes:
+    """Tests for FastCompletion and friends."""
+
+    def test_slots(self):
+        usage = FastCompletionUsage(prompt_tokens=1, completion_tokens=2, total_tokens=3)
+        assert not hasattr(usage, "__dict__")
+        with pytest.raises(AttributeError):
+            usage.unknown = 1
+
+    def test_constructors_match_the_models(self):
+        # Result types are untyped in the resources, so drift is caught here
+        for fast, model in zip(FAST_TYPES, PYDANTIC_TYPES):
+            parameters = set(inspect.signature(fast.__init__).parameters) - {"self"}
+            assert parameters == set(model.model_fields), fast.__name__
+
+    def test_to_pydantic(self):
+        fast = FastCompletion(
+            id="req-1",
+            model="m",
+            choices=[FastCompletionChoice(token_ids=[1, 2], finish_reason="stop")],
+            usage=FastCompletionUsage(prompt_tokens=1, completion_tokens=2, total_tokens=3),
+        )
+        model = fast.to_pydantic()
+        assert isinstance(model, Completion)
+        assert model.choices[0].token_ids == [1, 2]
+        assert model.usage.total_tokens == 3
+        assert fast.model_dump() == model.model_dump()
+
+    def test_create_matches_pydantic(self):
+        fast = _completions(True).create(prompt=[1, 2, 3, 4], request_id="req-1")
+        slow = _completions(False).create(prompt=[1, 2, 3, 4], request_id="req-1")
+        assert isinstance(fast, FastCompletion)
+        assert isinstance(slow, Completion)
+        assert fast.model_dump(exclude={"created"}) == slow.model_dump(exclude={"created"})
+
+    def test_stream(self):
+        responses = [
+            vllm_engine_pb2.GenerateResponse(
+                chunk=vllm_engine_pb2.GenerateStreamChunk(
+                    token_ids=[5, 6], prompt_tokens=4, completion_tokens=2
+                )
+            ),
+            vllm_engine_pb2.GenerateResponse(
+                complete=vllm_engine_pb2.GenerateComplete(finish_reason="length", prompt_tokens=4)
+            ),
+        ]
+        stream = GenerateStream(iter(responses), request_id="req-1", fast_types=True)
+        chunks = list(stream)
+        assert all(isinstance(chunk, FastCompletionChunk) for chunk in chunks)
+        assert isinstance(chunks[0].to_pydantic(), CompletionChunk)
+        assert chunks[-1].choices[0].finish_reason == "length"
+        final = stream.get_final_completion()
+        assert isinstance(final, FastCompletion)
+        assert final.choices[0].token_ids == [5, 6]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,277 @@
+"""
+Tests for hedged Generate requests.
+
+Unit tests drive hedged calls with fake gRPC calls; the end-to-end test
+balances over a slow and a fast in-process fake server.
+
+Run with:
+    pytest tests/test_hedge.py -v
+"""
+
+import asyncio
+import threading
+import time
+
+import grpc
+import pytest
+
+from vllm_grpc_client import HedgePolicy, LoadBalancedClient, TimingStats
+from vllm_grpc_client._hedge import _AsyncHedgedCall, _HedgedCall
+from vllm_grpc_client.proto import vllm_engine_pb2
+from vllm_grpc_client.testing import FakeVllmServer
+
+
+class _DeadlineExceeded(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.DEADLINE_EXCEEDED
+
+
+class _FakeCall:
+    """Sync streaming call whose first response takes `delay` seconds."""
+
+    def __init__(self, delay, responses, error=None, late_error=None):
+        self._delay = delay
+        self._responses = list(responses)
+        self._error = error
+        self._late_error = late_error
+        self._started = False
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self._started:
+            self._started = True
+            self._cancel.wait(self._delay)
+            if self._error is not None:
+                raise self._error
+        if self.cancelled:
+            raise StopIteration
+        if not self._responses:
+            if self._late_error is not None:
+                raise self._late_error
+            raise StopIteration
+        return self._responses.pop(0)
+
+    def cancel(self):
+        self._cancel.set()
+
+
+class _FakeAsyncCall:
+    """Async streaming call whose first response takes `delay` seconds."""
+
+    def __init__(self, delay, responses, error=None, late_error=None):
+        self._delay = delay
+        self._responses = list(responses)
+        self._error = error
+        self._late_error = late_error
+        self._started = False
+        self.cancelled = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._started:
+            self._started = True
+            await asyncio.sleep(self._delay)
+            if self._error is not None:
+                raise self._error
+        if self.cancelled:
+            raise StopAsyncIteration
+        if not self._responses:
+            if self._late_error is not None:
+                raise self._late_error
+            raise StopAsyncIteration
+        return self._responses.pop(0)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class _Method:
+    """Stub method handing out prepared calls in order."""
+
+    def __init__(self, calls):
+        self.calls = list(calls)
+        self.request_ids = []
+
+    def __call__(self, request, **kwargs):
+        self.request_ids.append(request.request_id)
+        return self.calls[len(self.request_ids) - 1]
+
+
+def _request():
+    return vllm_engine_pb2.GenerateRequest(request_id="req-1", text="x")
+
+
+def _hedged(call_type, calls, policy, aborted):
+    method = _Method(calls)
+    call = call_type(method, _request(), {}, policy, policy.delay, aborted.append)
+    return call, method
+
+
+class TestHedgePolicy:
+    """Tests for the hedge delay."""
+
+    def test_fixed_delay(self):
+        assert HedgePolicy(delay=0.2).hedge_delay(TimingStats()) == 0.2
+
+    def test_percentile_delay(self):
+        stats = TimingStats()
+        policy = HedgePolicy(percentile=0.5, min_samples=10, initial_delay=1.0)
+        assert policy.hedge_delay(stats) == 1.0
+        for ttft in [0.01] * 5 + [0.1] * 5:
+            stats.ttft.record(ttft)
+        assert policy.hedge_delay(stats) == pytest.approx(0.01, rel=0.1)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            HedgePolicy(max_hedges=0)
+        with pytest.raises(ValueError):
+            HedgePolicy(percentile=1.5)
+
+
+class TestSyncHedgedCall:
+    """Tests for the sync hedged call."""
+
+    def test_fast_primary_sends_no_hedge(self):
+        policy, aborted = HedgePolicy(delay=0.5), []
+        call, method = _hedged(_HedgedCall, [_FakeCall(0, ["a", "b"])], policy, aborted)
+        assert list(call) == ["a", "b"]
+        assert method.request_ids == ["req-1"]
+        assert policy.stats.hedges == 0
+
+    def test_hedge_wins(self):
+        policy, aborted = HedgePolicy(delay=0.02), []
+        slow, fast = _FakeCall(5, ["slow"]), _FakeCall(0, ["a", "b"])
+        call, method = _hedged(_HedgedCall, [slow, fast], policy, aborted)
+        start = time.monotonic()
+        assert list(call) == ["a", "b"]
+        assert time.monotonic() - start < 1
+        assert method.request_ids == ["req-1", "req-1-hedge1"]
+        assert slow.cancelled
+        assert aborted == ["req-1"]
+        assert policy.stats.hedge_wins == 1
+
+    def test_primary_wins_after_hedge(self):
+        policy, aborted = HedgePolicy(delay=0.01), []
+        primary, hedge = _FakeCall(0.05, ["a"]), _FakeCall(5, ["h"])
+        call, _ = _hedged(_HedgedCall, [primary, hedge], policy, aborted)
+        assert list(call) == ["a"]
+        assert hedge.cancelled
+        assert aborted == ["req-1-hedge1"]
+        stats = policy.stats
+        assert (stats.hedges, stats.hedge_wins) == (1, 0)
+
+    def test_error_falls_back_to_other_attempt(self):
+        policy, aborted = HedgePolicy(delay=0.01), []
+        failing = _FakeCall(0.05, [], error=RuntimeError("boom"))
+        call, _ = _hedged(_HedgedCall, [failing, _FakeCall(0.1, ["h"])], policy, aborted)
+        assert list(call) == ["h"]
+
+    def test_all_fail(self):
+        policy = HedgePolicy(delay=0.01)
+        calls = [
+            _FakeCall(0.02, [], error=RuntimeError("first")),
+            _FakeCall(0.05, [], error=RuntimeError("second")),
+        ]
+        call, _ = _hedged(_HedgedCall, calls, policy, [])
+        with pytest.raises(RuntimeError):
+            next(call)
+
+    def test_cancel_aborts_winning_hedge(self):
+        policy, aborted = HedgePolicy(delay=0.01), []
+        slow, fast = _FakeCall(5, []), _FakeCall(0, ["a", "b"])
+        call, _ = _hedged(_HedgedCall, [slow, fast], policy, aborted)
+        assert next(call) == "a"
+        call.cancel()
+        assert fast.cancelled
+        assert aborted == ["req-1", "req-1-hedge1"]
+
+    def test_deadline_aborts_winning_hedge(self):
+        policy, aborted = HedgePolicy(delay=0.01), []
+        slow = _FakeCall(5, [])
+        fast = _FakeCall(0, ["a"], late_error=_DeadlineExceeded())
+        call, _ = _hedged(_HedgedCall, [slow, fast], policy, aborted)
+        assert next(call) == "a"
+        with pytest.raises(grpc.RpcError):
+            next(call)
+        # req-1 was aborted as the loser; the stream aborts it on timeout too
+        assert aborted == ["req-1", "req-1-hedge1"]
+
+    def test_deadline_before_a_response_aborts_hedges(self):
+        policy, aborted = HedgePolicy(delay=0.01, max_hedges=1), []
+        calls = [
+            _FakeCall(0.05, [], error=_DeadlineExceeded()),
+            _FakeCall(0.05, [], error=_DeadlineExceeded()),
+        ]
+        call, _ = _hedged(_HedgedCall, calls, policy, aborted)
+        with pytest.raises(grpc.RpcError):
+            next(call)
+        assert aborted == ["req-1-hedge1"]
+
+
+class TestAsyncHedgedCall:
+    """Tests for the async hedged call."""
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins(self):
+        policy, aborted = HedgePolicy(delay=0.02), []
+        slow, fast = _FakeAsyncCall(5, ["slow"]), _FakeAsyncCall(0, ["a", "b"])
+        call, method = _hedged(_AsyncHedgedCall, [slow, fast], policy, aborted)
+        assert [r async for r in call] == ["a", "b"]
+        assert slow.cancelled
+        assert method.request_ids == ["req-1", "req-1-hedge1"]
+        assert aborted == ["req-1"]
+        assert policy.stats.hedge_wins == 1
+
+    @pytest.mark.asyncio
+    async def test_primary_wins(self):
+        policy, aborted = HedgePolicy(delay=0.01), []
+        primary, hedge = _FakeAsyncCall(0.05, ["a"]), _FakeAsyncCall(5, ["h"])
+        call, _ = _hedged(_AsyncHedgedCall, [primary, hedge], policy, aborted)
+        assert [r async for r in call] == ["a"]
+        assert hedge.cancelled
+        assert aborted == ["req-1-hedge1"]
+
+    @pytest.mark.asyncio
+    async def test_deadline_aborts_winning_hedge(self):
+        policy, aborted = HedgePolicy(delay=0.01), []
+        slow = _FakeAsyncCall(5, [])
+        fast = _FakeAsyncCall(0, ["a"], late_error=_DeadlineExceeded())
+        call, _ = _hedged(_AsyncHedgedCall, [slow, fast], policy, aborted)
+        assert await call.__anext__() == "a"
+        with pytest.raises(grpc.RpcError):
+            await call.__anext__()
+        assert aborted == ["req-1", "req-1-hedge1"]
+
+
+def test_load_balanced_hedging():
+    hedge = HedgePolicy(delay=0.05)
+    with FakeVllmServer(ttft=5) as slow, FakeVllmServer() as fast:
+        client = LoadBalancedClient(
+            [slow.address, fast.address], secure=False, poll_interval=60
+        )
+        try:
+            for _ in range(4):
+                start = time.monotonic()
+                completion = client.completions.create(prompt="x", max_tokens=2, hedge=hedge)
+                assert time.monotonic() - start < 2
+                assert completion.usage.completion_tokens == 2
+        finally:
+            client.close()
+        stats = hedge.stats
+        assert stats.requests == 4
+        assert stats.hedges >= 1
+        assert stats.hedge_wins == stats.hedges
+        # Requests first sent to the slow replica were aborted there
+        deadline = time.monotonic() + 2
+        while len(slow.aborted_request_ids) < stats.hedges and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(slow.aborted_request_ids) == stats.hedges
@@ -0,0 +1,119 @@
+"""
+Tests for incremental streaming detokenization.
+
+A byte-level fake tokenizer (one token per UTF-8 byte) stands in for a
+transformers tokenizer, so characters spanning several tokens are easy to
+produce without downloading a model.
+
+Run with:
+    pytest tests/test_incremental_decoder.py -v
+"""
+
+import pytest
+
+from vllm_grpc_client import GenerateStream, IncrementalDecoder, TokenDecoder
+from vllm_grpc_client.proto import vllm_engine_pb2
+
+
+class _ByteTokenizer:
+    """Tokenizer whose token IDs are UTF-8 bytes; 0 is a special token."""
+
+    def decode(self, token_ids, skip_special_tokens=True):
+        if skip_special_tokens:
+            token_ids = [t for t in token_ids if t != 0]
+        return bytes(token_ids).decode("utf-8", errors="replace")
+
+
+TEXT = "héllo 世界 🎉!"
+
+
+def _token_ids(text):
+    return list(text.encode("utf-8"))
+
+
+def _chunked(token_ids, size):
+    return [token_ids[i : i + size] for i in range(0, len(token_ids), size)]
+
+
+class TestIncrementalDecoder:
+    """Tests for IncrementalDecoder."""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 5])
+    def test_multibyte_characters_are_not_split(self, size):
+        decoder = IncrementalDecoder(_ByteTokenizer())
+        deltas = [decoder.decode(chunk) for chunk in _chunked(_token_ids(TEXT), size)]
+        deltas.append(decoder.flush())
+
+        assert "".join(deltas) == TEXT
+        assert all("�" not in delta for delta in deltas)
+        assert decoder.text == TEXT
+        assert decoder.token_ids == _token_ids(TEXT)
+
+    def test_prompt_is_context_only(self):
+        decoder = IncrementalDecoder(_ByteTokenizer(), prompt_token_ids=_token_ids("prompt "))
+        assert decoder.decode(_token_ids("out")) == "out"
+        assert decoder.token_ids == _token_ids("out")
+        assert decoder.text == "out"
+
+    def test_flush_emits_incomplete_tail(self):
+        decoder = IncrementalDecoder(_ByteTokenizer())
+        assert decoder.decode(_token_ids("a")) == "a"
+        assert decoder.decode(_token_ids("世")[:2]) == ""
+        assert decoder.flush() == "�"
+
+    def test_special_tokens(self):
+        skipped = IncrementalDecoder(_ByteTokenizer())
+        kept = IncrementalDecoder(_ByteTokenizer(), skip_special_tokens=False)
+        assert skipped.decode([0, 104, 105]) == "hi"
+        assert kept.decode([0, 104, 105]) == "\x00hi"
+
+    def test_token_decoder_incremental(self):
+        decoder = TokenDecoder(_ByteTokenizer()).incremental()
+        assert isinstance(decoder, IncrementalDecoder)
+        assert decoder.decode(_token_ids("ok")) == "ok"
+
+
+class TestStreamDetokenizer:
+    """Tests for streams created with a detokenizer."""
+
+    def _responses(self, size):
+        chunks = _chunked(_token_ids(TEXT), size)
+        responses = [
+            vllm_engine_pb2.GenerateResponse(
+                chunk=vllm_engine_pb2.GenerateStreamChunk(token_ids=token_ids)
+            )
+            for token_ids in chunks
+        ]
+        responses.append(
+            vllm_engine_pb2.GenerateResponse(
+                complete=vllm_engine_pb2.GenerateComplete(finish_reason="stop")
+            )
+        )
+        return responses
+
+    def test_delta_text(self):
+        stream = GenerateStream(
+            iter(self._responses(3)),
+            request_id="req-1",
+            detokenizer=IncrementalDecoder(_ByteTokenizer()),
+        )
+        deltas = [chunk.choices[0].delta_text for chunk in stream]
+
+        assert "".join(deltas) == TEXT
+        assert stream.text == TEXT
+        assert stream.get_final_completion().choices[0].text == TEXT
+
+    def test_raw_mode_tracks_text(self):
+        stream = GenerateStream(
+            iter(self._responses(2)),
+            request_id="req-1",
+            raw=True,
+            detokenizer=IncrementalDecoder(_ByteTokenizer()),
+        )
+        list(stream)
+        assert stream.get_final_completion().choices[0].text == TEXT
+
+    def test_without_detokenizer(self):
+        stream = GenerateStream(iter(self._responses(4)), request_id="req-1")
+        assert all(chunk.choices[0].delta_text == "" for chunk in stream)
+        assert stream.text == ""
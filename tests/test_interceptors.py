@@ -0,0 +1,140 @@
+"""
+Tests for client interceptors.
+
+Runs an in-process gRPC server, so no vLLM server is needed.
+
+Run with:
+    pytest tests/test_interceptors.py -v
+"""
+
+from concurrent import futures
+
+import grpc
+import pytest
+
+from vllm_grpc_client import (
+    AsyncVLLMGrpcClient,
+    ClientInterceptor,
+    LatencyInterceptor,
+    StatusCounterInterceptor,
+    TracingInterceptor,
+    VLLMGrpcClient,
+    VLLMGrpcInvalidArgumentError,
+)
+from vllm_grpc_client.proto import vllm_engine_pb2, vllm_engine_pb2_grpc
+
+
+class _Servicer(vllm_engine_pb2_grpc.VllmEngineServicer):
+    def __init__(self):
+        self.metadata = []
+        self.prompts = []
+
+    def Generate(self, request, context):  # noqa: N802
+        self.metadata.append(dict(context.invocation_metadata()))
+        self.prompts.append(request.text)
+        if request.text.lower() == "fail":
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "bad prompt")
+        for token_id in range(3):
+            yield vllm_engine_pb2.GenerateResponse(
+                chunk=vllm_engine_pb2.GenerateStreamChunk(token_ids=[token_id])
+            )
+        yield vllm_engine_pb2.GenerateResponse(
+            complete=vllm_engine_pb2.GenerateComplete(finish_reason="stop", completion_tokens=3)
+        )
+
+    def HealthCheck(self, request, context):  # noqa: N802
+        self.metadata.append(dict(context.invocation_metadata()))
+        return vllm_engine_pb2.HealthCheckResponse(healthy=True, message="ok")
+
+
+@pytest.fixture
+def server():
+    servicer = _Servicer()
+    grpc_server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    vllm_engine_pb2_grpc.add_VllmEngineServicer_to_server(servicer, grpc_server)
+    port = grpc_server.add_insecure_port("127.0.0.1:0")
+    grpc_server.start()
+    yield servicer, port
+    grpc_server.stop(None)
+
+
+class _PromptRewriter(ClientInterceptor):
+    def start(self, method, request, metadata):
+        if method == "Generate":
+            request.text = request.text.upper()
+
+
+class _NativeHeader(grpc.UnaryUnaryClientInterceptor):
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        metadata = list(client_call_details.metadata or []) + [("x-native", "1")]
+        return continuation(client_call_details._replace(metadata=metadata), request)
+
+
+def _check_metrics(latency, counter):
+    assert counter.counts == {
+        ("HealthCheck", "OK"): 1,
+        ("Generate", "OK"): 2,
+        ("Generate", "INVALID_ARGUMENT"): 1,
+    }
+    snapshot = latency.snapshot()
+    assert snapshot["Generate"]["count"] == 3
+    assert snapshot["HealthCheck"]["count"] == 1
+
+
+class TestSyncInterceptors:
+    """Tests for interceptors on the sync client."""
+
+    def test_metrics_and_tracing(self, server):
+        servicer, port = server
+        latency, counter = LatencyInterceptor(), StatusCounterInterceptor()
+        tracing = TracingInterceptor(lambda: {"traceparent": "00-abc-def-01"})
+        with VLLMGrpcClient(
+            port=port, secure=False, interceptors=[latency, counter, tracing]
+        ) as client:
+            client.health.check()
+            client.completions.create(prompt="a")
+            assert len(list(client.completions.create(prompt="b", stream=True))) == 4
+            with pytest.raises(VLLMGrpcInvalidArgumentError):
+                client.completions.create(prompt="fail")
+
+        _check_metrics(latency, counter)
+        assert all(m["traceparent"] == "00-abc-def-01" for m in servicer.metadata)
+
+    def test_request_mutation_and_native_interceptors(self, server):
+        servicer, port = server
+        with VLLMGrpcClient(
+            port=port,
+            secure=False,
+            pool_size=2,
+            interceptors=[_NativeHeader(), _PromptRewriter(), TracingInterceptor()],
+        ) as client:
+            client.completions.create(prompt="hello")
+            client.health.check()
+
+        assert servicer.prompts == ["HELLO"]
+        assert servicer.metadata[1]["x-native"] == "1"
+        assert servicer.metadata[0]["traceparent"].startswith("00-")
+
+
+class TestAsyncInterceptors:
+    """Tests for interceptors on the async client."""
+
+    @pytest.mark.asyncio
+    async def test_metrics_and_tracing(self, server):
+        servicer, port = server
+        latency, counter = LatencyInterceptor(), StatusCounterInterceptor()
+        async with AsyncVLLMGrpcClient(
+            port=port,
+            secure=False,
+            interceptors=[latency, counter, TracingInterceptor(), _PromptRewriter()],
+        ) as client:
+            await client.health.check()
+            await client.completions.create(prompt="a")
+            stream = await client.completions.create(prompt="b", stream=True)
+            assert len([chunk async for chunk in stream]) == 4
+            with pytest.raises(VLLMGrpcInvalidArgumentError):
+                await client.completions.create(prompt="fail")
+
+        _check_metrics(latency, counter)
+        assert servicer.prompts == ["A", "B", "FAIL"]
+        assert all(m["traceparent"].startswith("00-") for m in servicer.metadata)
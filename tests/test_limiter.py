@@ -0,0 +1,283 @@
+"""
+Tests for the adaptive concurrency limiter.
+
+Runs against the in-process fake server, so no vLLM server is needed.
+
+Run with:
+    pytest tests/test_limiter.py -v
+"""
+
+import asyncio
+import threading
+import time
+
+import grpc
+import pytest
+
+from vllm_grpc_client import (
+    AdaptiveConcurrencyPolicy,
+    ClientMetrics,
+    ConcurrencyLimiter,
+    LoadBalancedClient,
+    VLLMGrpcOverloadedError,
+)
+from vllm_grpc_client.testing import FakeVllmServer
+
+
+def _limiter(**kwargs):
+    return ConcurrencyLimiter(AdaptiveConcurrencyPolicy(**kwargs), "test:1", None, aio=False)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+class _MaxActive:
+    """Samples a fake server's active requests on a thread, keeping the maximum."""
+
+    def __init__(self, server):
+        self.max = 0
+        self._server = server
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.max = max(self.max, self._server.active_requests)
+            time.sleep(0.002)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.max
+
+
+@pytest.fixture
+def slow_server():
+    with FakeVllmServer(ttft=0.1, default_max_tokens=2) as fake:
+        yield fake
+
+
+class TestAdaptiveConcurrencyPolicy:
+    """Tests for AdaptiveConcurrencyPolicy settings."""
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyPolicy(algorithm="vegas")
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyPolicy(min_limit=10, initial_limit=5)
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyPolicy(backoff_ratio=1.0)
+
+
+class TestLimitAdaptation:
+    """Tests for the limit algorithms, driven directly."""
+
+    def test_gradient_shrinks_when_latency_grows(self):
+        limiter = _limiter(initial_limit=50)
+
+        def sample(latency):
+            # Keep the limit fully used
+            limiter._in_flight = limiter.limit
+            limiter._sample(latency)
+
+        for _ in range(100):
+            sample(0.01)
+        flat = limiter.stats.estimated_limit
+        assert flat > 50
+        for _ in range(10):
+            sample(0.1)
+        assert limiter.stats.estimated_limit < flat * 0.7
+
+    def test_gradient_ignores_idle_limit(self):
+        limiter = _limiter(initial_limit=50)
+        for _ in range(20):
+            limiter._sample(0.01)
+        assert limiter.limit == 50
+
+    def test_aimd(self):
+        limiter = _limiter(algorithm="aimd", initial_limit=10, ttft_target=0.05)
+        limiter._in_flight = 10
+        limiter._sample(0.01)
+        assert limiter.limit == 11
+        limiter._sample(0.5)
+        assert limiter.stats.estimated_limit == pytest.approx(9.9)
+
+    def test_overload_codes_back_off(self):
+        limiter = _limiter(initial_limit=10)
+        limiter._in_flight = 2
+        limiter._release(grpc.StatusCode.INVALID_ARGUMENT)
+        assert limiter.limit == 10
+        limiter._release(grpc.StatusCode.RESOURCE_EXHAUSTED)
+        assert limiter.limit == 9
+
+    def test_min_and_max_limit(self):
+        limiter = _limiter(algorithm="aimd", initial_limit=2, min_limit=2, max_limit=3)
+        limiter._in_flight = 10
+        for _ in range(5):
+            limiter._sample(0.01)
+        assert limiter.limit == 3
+        for _ in range(20):
+            limiter._release(grpc.StatusCode.UNAVAILABLE)
+        assert limiter.limit == 2
+
+    def test_server_load_caps_the_limit(self):
+        limiter = _limiter(initial_limit=20, max_server_requests=16)
+        limiter._in_flight = 4
+        limiter.update_server_load(10)
+        # 6 requests from other clients leave room for 10
+        assert limiter.limit == 10
+        limiter.update_server_load(40)
+        assert limiter.limit == 1
+        stats = limiter.stats
+        assert (stats.limit, stats.estimated_limit, stats.server_active_requests) == (1, 20, 40)
+
+
+class TestSyncLimiter:
+    """Tests for the limiter of the sync client."""
+
+    def test_caps_in_flight_requests(self, slow_server):
+        policy = AdaptiveConcurrencyPolicy(initial_limit=2, min_limit=2, max_limit=2)
+        with slow_server.client(concurrency_limiter=policy) as client:
+            sampler = _MaxActive(slow_server)
+            threads = [
+                threading.Thread(target=client.completions.create, kwargs={"prompt": "x"})
+                for _ in range(6)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stats = client.concurrency_limiter.stats
+        assert sampler.stop() <= 2
+        assert stats.admitted == 6
+        assert stats.waited >= 3
+        assert stats.in_flight == 0
+
+    def test_queue_full(self, slow_server):
+        policy = AdaptiveConcurrencyPolicy(initial_limit=1, max_queue=0)
+        with slow_server.client(concurrency_limiter=policy) as client:
+            stream = client.completions.create(prompt="x", stream=True)
+            with pytest.raises(VLLMGrpcOverloadedError):
+                client.completions.create(prompt="x")
+            list(stream)
+            assert client.concurrency_limiter.stats.rejected == 1
+            client.completions.create(prompt="x")
+
+    def test_queue_timeout(self, slow_server):
+        policy = AdaptiveConcurrencyPolicy(initial_limit=1, queue_timeout=0.02)
+        with slow_server.client(concurrency_limiter=policy) as client:
+            stream = client.completions.create(prompt="x", stream=True)
+            with pytest.raises(VLLMGrpcOverloadedError):
+                client.completions.create(prompt="x")
+            stream.close()
+            assert client.concurrency_limiter.stats.timed_out == 1
+            assert _wait_for(lambda: client.concurrency_limiter.in_flight == 0)
+
+    def test_polls_server_load(self, slow_server):
+        policy = AdaptiveConcurrencyPolicy(max_server_requests=8)
+        with slow_server.client(concurrency_limiter=policy) as client:
+            client.completions.create(prompt="x")
+            limiter = client.concurrency_limiter
+            assert _wait_for(lambda: limiter.stats.server_active_requests is not None)
+
+    def test_metrics(self, slow_server):
+        metrics = ClientMetrics()
+        policy = AdaptiveConcurrencyPolicy(initial_limit=1, max_queue=0)
+        with slow_server.client(concurrency_limiter=policy, metrics=metrics) as client:
+            stream = client.completions.create(prompt="x", stream=True)
+            with pytest.raises(VLLMGrpcOverloadedError):
+                client.completions.create(prompt="x")
+            stream.close()
+        text = metrics.registry.render()
+        endpoint = slow_server.address
+        assert f'vllm_grpc_client_concurrency_limit{{endpoint="{endpoint}"}} 1' in text
+        assert "vllm_grpc_client_concurrency_rejected_total 1" in text
+
+
+class TestAsyncLimiter:
+    """Tests for the limiter of the async client."""
+
+    @pytest.mark.asyncio
+    async def test_caps_in_flight_requests(self, slow_server):
+        policy = AdaptiveConcurrencyPolicy(initial_limit=2, min_limit=2, max_limit=2)
+        async with slow_server.async_client(concurrency_limiter=policy) as client:
+            sampler = _MaxActive(slow_server)
+            completions = await asyncio.gather(
+                *[client.completions.create(prompt="x") for _ in range(6)]
+            )
+            stats = client.concurrency_limiter.stats
+        assert sampler.stop() <= 2
+        assert all(c.usage.completion_tokens == 2 for c in completions)
+        assert (stats.admitted, stats.in_flight, stats.queued) == (6, 0, 0)
+        assert stats.waited >= 3
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self, slow_server):
+        policy = AdaptiveConcurrencyPolicy(initial_limit=1, queue_timeout=0.02)
+        async with slow_server.async_client(concurrency_limiter=policy) as client:
+            stream = await client.completions.create(prompt="x", stream=True)
+            with pytest.raises(VLLMGrpcOverloadedError):
+                await client.completions.create(prompt="x")
+            await stream.aclose()
+            limiter = client.concurrency_limiter
+            stats = limiter.stats
+            assert (stats.timed_out, stats.queued) == (1, 0)
+            for _ in range(100):
+                if limiter.in_flight == 0:
+                    break
+                await asyncio.sleep(0.01)
+            assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_iterated_after_the_slot_freed(self, slow_server):
+        policy = AdaptiveConcurrencyPolicy(initial_limit=1, queue_timeout=0.5)
+        async with slow_server.async_client(concurrency_limiter=policy) as client:
+            first = await client.completions.create(prompt="x", stream=True)
+            second = await client.completions.create(prompt="x", stream=True)
+            async for _ in first:
+                pass
+            limiter = client.concurrency_limiter
+            for _ in range(100):
+                if limiter.in_flight == 0:
+                    break
+                await asyncio.sleep(0.01)
+            chunks = [chunk async for chunk in second]
+        assert chunks[-1].choices[0].finish_reason == "length"
+        assert limiter.stats.timed_out == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_its_place(self, slow_server):
+        policy = AdaptiveConcurrencyPolicy(initial_limit=1)
+        async with slow_server.async_client(concurrency_limiter=policy) as client:
+            first = asyncio.ensure_future(client.completions.create(prompt="x"))
+            await asyncio.sleep(0.01)
+            second = asyncio.ensure_future(client.completions.create(prompt="x"))
+            await asyncio.sleep(0.01)
+            assert client.concurrency_limiter.stats.queued == 1
+            second.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await second
+            await first
+            assert client.concurrency_limiter.stats.queued == 0
+            completion = await client.completions.create(prompt="x")
+        assert completion.usage.completion_tokens == 2
+
+
+def test_load_balanced_replicas_get_server_load():
+    policy = AdaptiveConcurrencyPolicy(max_server_requests=8)
+    with FakeVllmServer() as first, FakeVllmServer() as second:
+        client = LoadBalancedClient(
+            [first.address, second.address], poll_interval=60, concurrency_limiter=policy
+        )
+        try:
+            client.refresh()
+            limiters = [replica.client.concurrency_limiter for replica in client.replicas]
+            assert [limiter.stats.server_active_requests for limiter in limiters] == [0, 0]
+            assert client.completions.create(prompt="x", max_tokens=2).usage.completion_tokens
+        finally:
+            client.close()
@@ -0,0 +1,127 @@
+"""
+Tests for replica-aware load balancing.
+
+These tests exercise replica selection and abort routing without a server.
+
+Run with:
+    pytest tests/test_load_balancing.py -v
+"""
+
+import grpc
+import pytest
+
+from vllm_grpc_client import LoadBalancedClient, Replica
+from vllm_grpc_client._load_balancing import (
+    RELEASED_OWNERS,
+    _BalancedAbort,
+    _parse_endpoint,
+    _ReplicaSelector,
+)
+from vllm_grpc_client.proto import vllm_engine_pb2
+
+
+class _FakeStub:
+    def __init__(self):
+        self.aborted = []
+        self.down = False
+
+    def Abort(self, request, timeout=None):  # noqa: N802
+        if self.down:
+            raise grpc.RpcError()
+        self.aborted.append(list(request.request_ids))
+        return vllm_engine_pb2.AbortResponse()
+
+
+class _FakeClient:
+    def __init__(self):
+        self._stub = _FakeStub()
+
+
+def _replicas(*loads):
+    replicas = []
+    for i, load in enumerate(loads):
+        replica = Replica(f"10.0.0.{i}:9000", _FakeClient())
+        replica.active_requests = load
+        replicas.append(replica)
+    return replicas
+
+
+class TestReplicaSelection:
+    """Tests for picking the least-loaded available replica."""
+
+    def test_picks_fewest_active_requests(self):
+        selector = _ReplicaSelector(_replicas(5, 1, 3))
+        assert selector.pick() == 1
+
+    def test_counts_own_in_flight(self):
+        replicas = _replicas(0, 1)
+        selector = _ReplicaSelector(replicas)
+        assert selector.acquire() == 0
+        assert selector.acquire() in (0, 1)
+        assert replicas[0].in_flight + replicas[1].in_flight == 2
+        # Both replicas now carry a load of 1 or 2; the lighter one wins
+        assert replicas[selector.pick()].load == min(r.load for r in replicas)
+
+    def test_skips_paused_and_unhealthy(self):
+        replicas = _replicas(0, 0, 9)
+        replicas[0].is_paused = True
+        replicas[1].healthy = False
+        selector = _ReplicaSelector(replicas)
+        assert {selector.pick() for _ in range(6)} == {2}
+
+    def test_fails_open_when_nothing_available(self):
+        replicas = _replicas(3, 1)
+        for replica in replicas:
+            replica.healthy = False
+        assert _ReplicaSelector(replicas).pick() == 1
+
+    def test_abort_routed_to_owner(self):
+        replicas = _replicas(0, 5)
+        selector = _ReplicaSelector(replicas)
+        request = vllm_engine_pb2.GenerateRequest(request_id="req-1")
+        index = selector.acquire(request)
+        assert selector.group_by_owner(["req-1", "other"]) == {
+            index: ["req-1", "other"],
+            1 - index: ["other"],
+        }
+        selector.release(index, request)
+        assert replicas[index].in_flight == 0
+        # A cancelled call finishes before its Abort is flushed
+        assert selector.group_by_owner(["req-1"]) == {index: ["req-1"]}
+        assert selector.group_by_owner(["req-1"]) == {0: ["req-1"], 1: ["req-1"]}
+
+    def test_released_owners_are_bounded(self):
+        selector = _ReplicaSelector(_replicas(0, 0))
+        for i in range(RELEASED_OWNERS + 1):
+            request = vllm_engine_pb2.GenerateRequest(request_id=f"req-{i}")
+            selector.release(selector.acquire(request), request)
+        assert len(selector._released) == RELEASED_OWNERS
+        assert selector.group_by_owner(["req-0"]) == {0: ["req-0"], 1: ["req-0"]}
+
+    def test_abort_reaches_replicas_after_a_failing_one(self):
+        replicas = _replicas(0, 0, 0)
+        replicas[0].client._stub.down = True
+        abort = _BalancedAbort(_ReplicaSelector(replicas), aio=False)
+        with pytest.raises(grpc.RpcError):
+            abort(vllm_engine_pb2.AbortRequest(request_ids=["req-1"]))
+        assert [replica.client._stub.aborted for replica in replicas[1:]] == [[["req-1"]]] * 2
+
+
+class TestLoadBalancedClient:
+    """Tests for client construction."""
+
+    def test_parse_endpoint(self):
+        assert _parse_endpoint("localhost:9000") == ("localhost", 9000)
+        assert _parse_endpoint(("10.0.0.1", "9001")) == ("10.0.0.1", 9001)
+        with pytest.raises(ValueError):
+            _parse_endpoint("localhost")
+
+    def test_unreachable_replica_marked_unhealthy(self):
+        with LoadBalancedClient(["127.0.0.1:1"], poll_interval=60.0, poll_timeout=0.5) as client:
+            client.refresh()
+            assert client.replicas[0].healthy is False
+            assert client.replicas[0].last_error
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
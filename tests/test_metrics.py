@@ -0,0 +1,213 @@
+"""
+Tests for Prometheus metrics.
+
+Runs an in-process gRPC server, so no vLLM server is needed.
+
+Run with:
+    pytest tests/test_metrics.py -v
+"""
+
+import asyncio
+import gc
+import threading
+import time
+import urllib.request
+from concurrent import futures
+
+import grpc
+import pytest
+
+from vllm_grpc_client import (
+    AsyncVLLMGrpcClient,
+    ClientMetrics,
+    MetricsRegistry,
+    VLLMGrpcClient,
+    VLLMGrpcInvalidArgumentError,
+)
+from vllm_grpc_client.proto import vllm_engine_pb2, vllm_engine_pb2_grpc
+
+
+class _Servicer(vllm_engine_pb2_grpc.VllmEngineServicer):
+    def Generate(self, request, context):  # noqa: N802
+        if request.text == "fail":
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "bad prompt")
+        for token_id in range(3):
+            yield vllm_engine_pb2.GenerateResponse(
+                chunk=vllm_engine_pb2.GenerateStreamChunk(
+                    token_ids=[token_id], prompt_tokens=5, cached_tokens=2
+                )
+            )
+        yield vllm_engine_pb2.GenerateResponse(
+            complete=vllm_engine_pb2.GenerateComplete(
+                finish_reason="stop", completion_tokens=3, prompt_tokens=5, cached_tokens=2
+            )
+        )
+
+    def HealthCheck(self, request, context):  # noqa: N802
+        return vllm_engine_pb2.HealthCheckResponse(healthy=True, message="ok")
+
+
+@pytest.fixture
+def port():
+    grpc_server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    vllm_engine_pb2_grpc.add_VllmEngineServicer_to_server(_Servicer(), grpc_server)
+    port = grpc_server.add_insecure_port("127.0.0.1:0")
+    grpc_server.start()
+    yield port
+    grpc_server.stop(None)
+
+
+def _sample(text, line_start):
+    """The value of the sample line starting with line_start."""
+    for line in text.splitlines():
+        if line.startswith(line_start + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_start} not in output:\n{text}")
+
+
+class TestRegistry:
+    """Tests for the metric primitives and text rendering."""
+
+    def test_render(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ["rpc"])
+        in_flight = registry.gauge("in_flight", "In flight")
+        latency = registry.histogram("latency_seconds", "Latency", buckets=[0.1, 1.0])
+
+        requests.labels("Generate").inc()
+        requests.labels("Generate").inc(2)
+        in_flight.inc()
+        in_flight.inc()
+        in_flight.dec()
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(5)
+
+        text = registry.render()
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{rpc="Generate"} 3' in text
+        assert "# TYPE in_flight gauge" in text
+        assert "in_flight 1" in text
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1"} 2' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+        assert "latency_seconds_sum 5.55" in text
+        assert "latency_seconds_count 3" in text
+
+    def test_label_escaping(self):
+        registry = MetricsRegistry()
+        registry.counter("c_total", "C", ["x"]).labels('a"b\\c').inc()
+        assert 'c_total{x="a\\"b\\\\c"} 1' in registry.render()
+
+    def test_duplicate_name(self):
+        registry = MetricsRegistry()
+        registry.counter("c_total", "C")
+        with pytest.raises(ValueError):
+            registry.gauge("c_total", "C")
+
+    def test_wrong_label_count(self):
+        counter = MetricsRegistry().counter("c_total", "C", ["a", "b"])
+        with pytest.raises(ValueError):
+            counter.labels("x")
+
+    def test_threads(self):
+        counter = MetricsRegistry().counter("c_total", "C")
+
+        def work():
+            for _ in range(10000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert counter.get() == 80000
+
+    def test_exited_threads_are_folded(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("h_seconds", "H", buckets=(1.0,))
+        for _ in range(10):
+            with futures.ThreadPoolExecutor(4) as pool:
+                list(pool.map(histogram.observe, [0.5, 2.0] * 4))
+        gc.collect()
+        assert not histogram._default._cells._shards
+        text = registry.render()
+        assert _sample(text, 'h_seconds_bucket{le="1"}') == 40
+        assert _sample(text, "h_seconds_count") == 80
+
+    def test_serve(self):
+        registry = MetricsRegistry()
+        registry.counter("c_total", "C").inc()
+        server = registry.serve(port=0, host="127.0.0.1")
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert response.headers["Content-Type"].startswith("text/plain")
+                assert "c_total 1" in response.read().decode()
+        finally:
+            server.shutdown()
+
+
+class TestClientMetrics:
+    """Tests for ClientMetrics on real clients."""
+
+    def test_sync(self, port):
+        metrics = ClientMetrics()
+        with VLLMGrpcClient(port=port, secure=False, metrics=metrics) as client:
+            client.health.check()
+            client.completions.create(prompt="a")
+            stream = client.completions.create(prompt="b", stream=True)
+            next(stream)
+            text = metrics.registry.render()
+            assert _sample(text, 'vllm_grpc_client_requests_in_flight{rpc="Generate"}') == 1
+            list(stream)
+            with pytest.raises(VLLMGrpcInvalidArgumentError):
+                client.completions.create(prompt="fail")
+
+            # done() callbacks run on the gRPC thread
+            time.sleep(0.1)
+            text = metrics.registry.render()
+
+        assert _sample(text, 'vllm_grpc_client_requests_total{rpc="HealthCheck",code="OK"}') == 1
+        assert _sample(text, 'vllm_grpc_client_requests_total{rpc="Generate",code="OK"}') == 2
+        assert (
+            _sample(
+                text, 'vllm_grpc_client_requests_total{rpc="Generate",code="INVALID_ARGUMENT"}'
+            )
+            == 1
+        )
+        assert _sample(text, 'vllm_grpc_client_requests_in_flight{rpc="Generate"}') == 0
+        assert _sample(text, "vllm_grpc_client_prompt_tokens_total") == 10
+        assert _sample(text, "vllm_grpc_client_completion_tokens_total") == 6
+        assert _sample(text, "vllm_grpc_client_cached_tokens_total") == 4
+        assert _sample(text, "vllm_grpc_client_time_to_first_token_seconds_count") == 2
+        assert (
+            _sample(text, 'vllm_grpc_client_request_duration_seconds_count{rpc="Generate"}') == 3
+        )
+
+    def test_aborts(self, port):
+        metrics = ClientMetrics()
+        with VLLMGrpcClient(port=port, secure=False, metrics=metrics) as client:
+            client.abort_coalescer.submit("req-1")
+            client.abort_coalescer.submit("req-2")
+            client.abort_coalescer.flush()
+            text = metrics.registry.render()
+        assert _sample(text, "vllm_grpc_client_aborted_requests_total") == 2
+
+    @pytest.mark.asyncio
+    async def test_async(self, port):
+        metrics = ClientMetrics(prefix="app")
+        async with AsyncVLLMGrpcClient(port=port, secure=False, metrics=metrics) as client:
+            await client.completions.create(prompt="a")
+            stream = await client.completions.create(prompt="b", stream=True)
+            async for _ in stream:
+                pass
+        # Status codes are read by tasks the calls' done callbacks schedule
+        for _ in range(100):
+            text = metrics.registry.render()
+            if 'app_requests_total{rpc="Generate",code="OK"} 2' in text.splitlines():
+                break
+            await asyncio.sleep(0.01)
+        assert _sample(text, 'app_requests_total{rpc="Generate",code="OK"}') == 2
+        assert _sample(text, "app_completion_tokens_total") == 6
@@ -0,0 +1,133 @@
+"""
+Tests for channel pooling.
+
+These tests do not need a running server: channels are created lazily and
+only the routing and bookkeeping logic is exercised.
+
+Run with:
+    pytest tests/test_pool.py -v
+"""
+
+import pytest
+
+from vllm_grpc_client import AsyncVLLMGrpcClient, ChannelPool, VLLMGrpcClient
+from vllm_grpc_client._pool import _RoutedStub
+
+
+class _FakeCall:
+    """Stands in for a streaming call that finishes later."""
+
+    def __init__(self):
+        self._callbacks = []
+
+    def add_done_callback(self, fn):
+        self._callbacks.append(fn)
+
+    def finish(self):
+        for fn in self._callbacks:
+            fn(self)
+
+
+class _FakeStub:
+    def __init__(self, result=None, error=None):
+        self.calls = 0
+        self._result = result
+        self._error = error
+
+    def Generate(self, request, timeout=None):  # noqa: N802
+        self.calls += 1
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class _FakeSelector:
+    def __init__(self, stubs):
+        self.stubs = stubs
+        self.released = []
+
+    def acquire(self, request=None):
+        return 0
+
+    def release(self, index, request=None):
+        self.released.append(index)
+
+
+class TestChannelPool:
+    """Tests for ChannelPool channel selection."""
+
+    @pytest.fixture
+    def client(self):
+        client = VLLMGrpcClient(host="127.0.0.1", port=1, pool_size=3)
+        yield client
+        client.close()
+
+    def test_round_robin(self, client):
+        pool = client.pool
+        assert [pool.acquire() for _ in range(6)] == [0, 1, 2, 0, 1, 2]
+        assert pool.in_flight == [2, 2, 2]
+
+    def test_least_in_flight(self):
+        client = VLLMGrpcClient(
+            host="127.0.0.1", port=1, pool_size=3, pool_policy="least_in_flight"
+        )
+        try:
+            pool = client.pool
+            first = pool.acquire()
+            second = pool.acquire()
+            assert first != second
+            pool.release(first)
+            # Never picks the channel that is still busy
+            assert pool.acquire() != second
+            assert sorted(pool.in_flight) == [0, 1, 1]
+        finally:
+            client.close()
+
+    def test_single_channel_has_no_pool(self):
+        client = VLLMGrpcClient(host="127.0.0.1", port=1)
+        try:
+            assert client.pool is None
+        finally:
+            client.close()
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            VLLMGrpcClient(host="127.0.0.1", port=1, pool_size=0)
+        with pytest.raises(ValueError):
+            ChannelPool([object()], policy="random")
+
+    @pytest.mark.asyncio
+    async def test_async_client_pool(self):
+        client = AsyncVLLMGrpcClient(host="127.0.0.1", port=1, pool_size=4)
+        try:
+            assert len(client.pool) == 4
+            assert len(set(map(id, client.pool.channels))) == 4
+        finally:
+            await client.close()
+
+
+class TestRoutedStub:
+    """Tests for releasing pooled channels when RPCs finish."""
+
+    def test_release_on_blocking_result(self):
+        selector = _FakeSelector([_FakeStub(result="message")])
+        assert _RoutedStub(selector).Generate("request") == "message"
+        assert selector.released == [0]
+
+    def test_release_on_stream_done(self):
+        call = _FakeCall()
+        selector = _FakeSelector([_FakeStub(result=call)])
+        assert _RoutedStub(selector).Generate("request") is call
+        assert selector.released == []
+        call.finish()
+        assert selector.released == [0]
+
+    def test_release_on_error(self):
+        selector = _FakeSelector([_FakeStub(error=RuntimeError("boom"))])
+        with pytest.raises(RuntimeError):
+            _RoutedStub(selector).Generate("request")
+        assert selector.released == [0]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
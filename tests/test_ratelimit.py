@@ -0,0 +1,245 @@
+"""
+Tests for token-bucket rate limiting.
+
+Runs against the in-process fake server, so no vLLM server is needed.
+
+Run with:
+    pytest tests/test_ratelimit.py -v
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from vllm_grpc_client import (
+    AsyncLoadBalancedClient,
+    RateLimit,
+    RateLimiter,
+    RequestScheduler,
+    TokenizedInput,
+    VLLMGrpcOverloadedError,
+    VLLMGrpcRateLimitedError,
+    VLLMGrpcUnavailableError,
+)
+from vllm_grpc_client._ratelimit import PRUNE_THRESHOLD
+from vllm_grpc_client.testing import FakeVllmServer
+
+
+class _WordTokenizer:
+    """Tokenizer stand-in with one token per word."""
+
+    def encode(self, text, add_special_tokens=True):
+        return text.split()
+
+
+@pytest.fixture
+def server():
+    with FakeVllmServer(default_max_tokens=4) as fake:
+        yield fake
+
+
+class TestRateLimit:
+    """Tests for RateLimit settings."""
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            RateLimit()
+        with pytest.raises(ValueError):
+            RateLimit(requests_per_second=0)
+        with pytest.raises(ValueError):
+            RateLimit(tokens_per_second=100, token_burst=-1)
+
+    def test_default_bursts(self):
+        limit = RateLimit(requests_per_second=0.5, tokens_per_second=1000)
+        assert (limit.request_burst, limit.token_burst) == (1.0, 1000)
+
+
+class TestRateLimiter:
+    """Tests for the token buckets, driven directly."""
+
+    def test_rejects_over_budget(self):
+        limiter = RateLimiter(RateLimit(requests_per_second=10, request_burst=2), block=False)
+        assert limiter._reserve(None, 0) == 0
+        assert limiter._reserve(None, 0) == 0
+        with pytest.raises(VLLMGrpcRateLimitedError) as info:
+            limiter._reserve(None, 0)
+        assert info.value.retry_after == pytest.approx(0.1, abs=0.01)
+        stats = limiter.stats
+        assert (stats.admitted, stats.rejected) == (2, 1)
+
+    def test_delay_grows_with_debt(self):
+        limiter = RateLimiter(RateLimit(tokens_per_second=100))
+        assert limiter._reserve(None, 100) == 0
+        assert limiter._reserve(None, 50) == pytest.approx(0.5, abs=0.01)
+        assert limiter._reserve(None, 50) == pytest.approx(1.0, abs=0.01)
+        assert limiter.stats.delayed == 2
+
+    def test_large_charge_waits_for_a_full_bucket_only(self):
+        limiter = RateLimiter(RateLimit(tokens_per_second=100))
+        assert limiter._reserve(None, 500) == 0
+        # The debt of the large charge throttles what follows
+        assert limiter._reserve(None, 1) == pytest.approx(4.01, abs=0.01)
+
+    def test_max_wait(self):
+        limiter = RateLimiter(RateLimit(requests_per_second=1), max_wait=0.5)
+        limiter._reserve(None, 0)
+        with pytest.raises(VLLMGrpcRateLimitedError):
+            limiter._reserve(None, 0)
+
+    def test_tenants_have_separate_budgets(self):
+        limiter = RateLimiter(
+            RateLimit(requests_per_second=1),
+            tenants={"vip": RateLimit(requests_per_second=100)},
+            block=False,
+        )
+        limiter._reserve("a", 0)
+        with pytest.raises(VLLMGrpcRateLimitedError) as info:
+            limiter._reserve("a", 0)
+        assert info.value.tenant == "a"
+        limiter._reserve("b", 0)
+        for _ in range(100):
+            limiter._reserve("vip", 0)
+        limiter.set_limit("a", RateLimit(requests_per_second=100))
+        limiter._reserve("a", 0)
+
+    def test_unlimited_without_default(self):
+        limiter = RateLimiter(tenants={"a": RateLimit(requests_per_second=1)}, block=False)
+        for _ in range(10):
+            assert limiter._reserve("b", 10**6) == 0
+        assert "b" not in limiter._buckets
+
+    def test_refilled_buckets_are_pruned(self):
+        limiter = RateLimiter(RateLimit(requests_per_second=1000))
+        for tenant in range(PRUNE_THRESHOLD):
+            limiter._reserve(str(tenant), 0)
+        time.sleep(0.01)
+        limiter._reserve("last", 0)
+        assert list(limiter._buckets) == ["last"]
+
+    def test_reconcile(self):
+        limiter = RateLimiter(RateLimit(tokens_per_second=100), block=False)
+        limiter._reserve(None, 10)
+        limiter._reconcile(None, 10, 100)
+        with pytest.raises(VLLMGrpcRateLimitedError):
+            limiter._reserve(None, 1)
+        assert limiter.stats.reconciled_tokens == 90
+
+    def test_estimate(self):
+        limiter = RateLimiter()
+        assert limiter._estimate([1, 2, 3]) == 3
+        assert limiter._estimate(TokenizedInput(original_text="", input_ids=[1, 2])) == 2
+        assert limiter._estimate("abcdefghi") == 3
+        tokenized = RateLimiter(tokenizer=_WordTokenizer())
+        assert tokenized._estimate("one two three four") == 4
+
+
+class TestSyncRateLimiting:
+    """Tests for rate limiting in the sync client."""
+
+    def test_blocks_until_budget_refills(self, server):
+        limiter = RateLimiter(RateLimit(requests_per_second=20, request_burst=1))
+        with server.client(rate_limiter=limiter) as client:
+            assert client.rate_limiter is limiter
+            start = time.monotonic()
+            for _ in range(3):
+                client.completions.create(prompt="x")
+            elapsed = time.monotonic() - start
+        assert elapsed >= 0.09
+        stats = limiter.stats
+        assert (stats.admitted, stats.delayed) == (3, 2)
+
+    def test_rejects_without_blocking(self, server):
+        limiter = RateLimiter(RateLimit(requests_per_second=1), block=False)
+        with server.client(rate_limiter=limiter) as client:
+            client.completions.create(prompt="x", tenant="a")
+            with pytest.raises(VLLMGrpcRateLimitedError):
+                client.completions.create(prompt="x", tenant="a")
+            client.completions.create(prompt="x", tenant="b")
+        assert server.requests_received == 2
+
+    def test_reconciles_actual_usage(self, server):
+        limiter = RateLimiter(RateLimit(tokens_per_second=1000))
+        with server.client(rate_limiter=limiter) as client:
+            client.completions.create(prompt=[1, 2, 3], max_tokens=5)
+            stats = limiter.stats
+        assert stats.estimated_tokens == 3
+        assert stats.reconciled_tokens == 5
+
+    def test_reconciles_streams(self, server):
+        limiter = RateLimiter(RateLimit(tokens_per_second=1000))
+        with server.client(rate_limiter=limiter) as client:
+            list(client.completions.create(prompt="abcdefgh", stream=True))
+            # Text prompts are estimated at 4 characters per token
+            assert limiter.stats.estimated_tokens == 2
+            assert limiter.stats.reconciled_tokens == 4
+
+    def test_failed_requests_are_refunded(self, server):
+        limiter = RateLimiter(RateLimit(requests_per_second=1), block=False)
+        server.fail_next(2)
+        with server.client(rate_limiter=limiter) as client:
+            with pytest.raises(VLLMGrpcUnavailableError):
+                client.completions.create(prompt="x")
+            with pytest.raises(VLLMGrpcUnavailableError):
+                list(client.completions.create(prompt="x", stream=True))
+            client.completions.create(prompt="x")
+        assert limiter.stats.admitted == 1
+
+
+class TestAsyncRateLimiting:
+    """Tests for rate limiting in the async client."""
+
+    @pytest.mark.asyncio
+    async def test_blocks_and_reconciles(self, server):
+        limiter = RateLimiter(RateLimit(requests_per_second=20, request_burst=1))
+        async with server.async_client(rate_limiter=limiter) as client:
+            start = time.monotonic()
+            completions = await asyncio.gather(
+                *[client.completions.create(prompt=[1, 2]) for _ in range(3)]
+            )
+            elapsed = time.monotonic() - start
+            stream = await client.completions.create(prompt=[1, 2], stream=True)
+            async for _ in stream:
+                pass
+        assert all(c.usage.completion_tokens == 4 for c in completions)
+        assert elapsed >= 0.09
+        stats = limiter.stats
+        assert (stats.admitted, stats.estimated_tokens, stats.reconciled_tokens) == (4, 8, 16)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_wait_is_refunded(self, server):
+        limiter = RateLimiter(RateLimit(requests_per_second=1))
+        async with server.async_client(rate_limiter=limiter) as client:
+            await client.completions.create(prompt="x")
+            waiting = asyncio.ensure_future(client.completions.create(prompt="x"))
+            await asyncio.sleep(0.01)
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+        assert limiter.stats.admitted == 1
+        assert server.requests_received == 1
+
+    @pytest.mark.asyncio
+    async def test_scheduler_rejection_is_refunded(self, server):
+        limiter = RateLimiter(RateLimit(requests_per_second=1), block=False)
+        scheduler = RequestScheduler(max_in_flight=1, max_queue=0)
+        async with server.async_client(rate_limiter=limiter, scheduler=scheduler) as client:
+            await scheduler._acquire(None, None)
+            with pytest.raises(VLLMGrpcOverloadedError):
+                await client.completions.create(prompt="x")
+            scheduler._release()
+            await client.completions.create(prompt="x")
+        assert limiter.stats.admitted == 1
+
+
+@pytest.mark.asyncio
+async def test_load_balanced_client_shares_the_limiter():
+    limiter = RateLimiter(RateLimit(requests_per_second=1), block=False)
+    with FakeVllmServer() as first, FakeVllmServer() as second:
+        async with AsyncLoadBalancedClient(
+            [first.address, second.address], poll_interval=60, rate_limiter=limiter
+        ) as client:
+            assert client.rate_limiter is limiter
+            await client.completions.create(prompt="x", max_tokens=2)
+            with pytest.raises(VLLMGrpcRateLimitedError):
+                await client.completions.create(prompt="x", max_tokens=2)
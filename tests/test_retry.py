@@ -0,0 +1,155 @@
+"""
+Tests for retry policies.
+
+Runs against the in-process fake server, so no vLLM server is needed.
+
+Run with:
+    pytest tests/test_retry.py -v
+"""
+
+import grpc
+import pytest
+
+from vllm_grpc_client import (
+    ClientMetrics,
+    RetryPolicy,
+    VLLMGrpcInvalidArgumentError,
+    VLLMGrpcUnavailableError,
+)
+from vllm_grpc_client.testing import FakeVllmServer
+
+
+def _policy(**kwargs):
+    kwargs.setdefault("initial_backoff", 0.001)
+    return RetryPolicy(**kwargs)
+
+
+@pytest.fixture
+def server():
+    with FakeVllmServer(default_max_tokens=4) as fake:
+        yield fake
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy settings."""
+
+    def test_backoff_grows_and_caps(self):
+        policy = RetryPolicy(initial_backoff=0.1, max_backoff=0.3, jitter=0.0)
+        assert [policy.backoff(a) for a in (1, 2, 3, 4)] == [0.1, 0.2, 0.3, 0.3]
+
+    def test_jitter_range(self):
+        policy = RetryPolicy(initial_backoff=1.0, jitter=0.5)
+        delays = [policy.backoff(1) for _ in range(200)]
+        assert all(0.5 <= d <= 1.0 for d in delays)
+        assert len(set(delays)) > 1
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+        with pytest.raises(ValueError):
+            RetryPolicy(jitter=2.0)
+
+
+class TestSyncRetries:
+    """Tests for retries on the sync client."""
+
+    def test_generate_recovers(self, server):
+        server.fail_next(2)
+        with server.client(retry_policy=_policy()) as client:
+            completion = client.completions.create(prompt="x")
+            stats = client.retry_stats
+        assert completion.choices[0].finish_reason == "length"
+        assert server.requests_received == 3
+        assert stats.retries == 2
+        assert stats.recovered == 1
+        assert stats.retries_by_code == {"UNAVAILABLE": 2}
+
+    def test_stream_recovers(self, server):
+        server.fail_next(1)
+        with server.client(retry_policy=_policy()) as client:
+            chunks = list(client.completions.create(prompt="x", stream=True))
+        assert len(chunks) == 5
+
+    def test_no_retry_after_first_response(self, server):
+        server.fail_next(1, after_tokens=2)
+        with server.client(retry_policy=_policy()) as client:
+            with pytest.raises(VLLMGrpcUnavailableError):
+                list(client.completions.create(prompt="x", stream=True))
+            assert client.retry_stats.retries == 0
+
+    def test_non_retryable_code(self, server):
+        server.fail_next(1, grpc.StatusCode.INVALID_ARGUMENT)
+        with server.client(retry_policy=_policy()) as client:
+            with pytest.raises(VLLMGrpcInvalidArgumentError):
+                client.completions.create(prompt="x")
+            assert client.retry_stats.retries == 0
+
+    def test_max_attempts(self, server):
+        server.fail_next(5)
+        with server.client(retry_policy=_policy(max_attempts=3)) as client:
+            with pytest.raises(VLLMGrpcUnavailableError):
+                client.completions.create(prompt="x")
+            stats = client.retry_stats
+        assert stats.retries == 2
+        assert stats.exhausted == 1
+        assert server.requests_received == 3
+
+    def test_budget_limits_retries(self, server):
+        policy = _policy(
+            max_attempts=10, budget_ratio=0.0, budget_min_per_second=0.0, budget_max_tokens=2
+        )
+        server.fail_next(10)
+        with server.client(retry_policy=policy) as client:
+            with pytest.raises(VLLMGrpcUnavailableError):
+                client.completions.create(prompt="x")
+            with pytest.raises(VLLMGrpcUnavailableError):
+                client.completions.create(prompt="x")
+            stats = client.retry_stats
+        assert stats.retries == 2
+        assert stats.budget_exhausted == 2
+        assert server.requests_received == 4
+
+    def test_unary_rpcs(self, server):
+        server.fail_next(1, method="HealthCheck")
+        server.fail_next(1, method="GetModelInfo")
+        with server.client(retry_policy=_policy()) as client:
+            assert client.health.check().healthy
+            assert client.models.retrieve().model_path == "fake-model"
+            assert client.retry_stats.retries == 2
+
+    def test_without_policy(self, server):
+        server.fail_next(1)
+        with server.client() as client:
+            with pytest.raises(VLLMGrpcUnavailableError):
+                client.completions.create(prompt="x")
+            assert client.retry_stats.retries == 0
+
+    def test_metrics(self, server):
+        metrics = ClientMetrics()
+        server.fail_next(1)
+        with server.client(retry_policy=_policy(), metrics=metrics) as client:
+            client.completions.create(prompt="x")
+        assert "vllm_grpc_client_retries_total 1" in metrics.registry.render()
+
+
+class TestAsyncRetries:
+    """Tests for retries on the async client."""
+
+    @pytest.mark.asyncio
+    async def test_stream_recovers(self, server):
+        server.fail_next(2)
+        async with server.async_client(retry_policy=_policy()) as client:
+            stream = await client.completions.create(prompt="x", stream=True)
+            chunks = [chunk async for chunk in stream]
+            assert client.retry_stats.recovered == 1
+        assert len(chunks) == 5
+
+    @pytest.mark.asyncio
+    async def test_unary_and_non_stream(self, server):
+        server.fail_next(1, method="GetModelInfo")
+        server.fail_next(1)
+        async with server.async_client(retry_policy=_policy()) as client:
+            assert (await client.models.retrieve()).model_path == "fake-model"
+            completion = await client.completions.create(prompt="x")
+            assert client.retry_stats.retries == 2
+        assert completion.usage.completion_tokens == 4
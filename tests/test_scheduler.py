@@ -0,0 +1,245 @@
+"""
+Tests for the priority and fair-share request scheduler.
+
+Runs against the in-process fake server, so no vLLM server is needed.
+
+Run with:
+    pytest tests/test_scheduler.py -v
+"""
+
+import asyncio
+import gc
+
+import pytest
+
+from vllm_grpc_client import (
+    AsyncLoadBalancedClient,
+    ClientMetrics,
+    RequestScheduler,
+    VLLMGrpcOverloadedError,
+)
+from vllm_grpc_client.testing import FakeVllmServer
+
+
+async def _admission_order(scheduler, requests):
+    """Queue (priority, tenant) requests behind a held slot and return their admission order."""
+    await scheduler._acquire(None, None)
+    order = []
+
+    async def run(index, priority, tenant):
+        await scheduler._acquire(priority, tenant)
+        order.append(index)
+
+    tasks = [
+        asyncio.ensure_future(run(index, priority, tenant))
+        for index, (priority, tenant) in enumerate(requests)
+    ]
+    await asyncio.sleep(0.01)
+    for _ in requests:
+        scheduler._release()
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return order
+
+
+async def _wait_for(predicate, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return True
+        await asyncio.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def slow_server():
+    with FakeVllmServer(ttft=0.05, default_max_tokens=2) as fake:
+        yield fake
+
+
+class TestRequestScheduler:
+    """Tests for the scheduling order, driven directly."""
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            RequestScheduler(0)
+        with pytest.raises(ValueError):
+            RequestScheduler(classes=("a", "a"))
+        with pytest.raises(ValueError):
+            RequestScheduler(default_class="realtime")
+        with pytest.raises(ValueError):
+            RequestScheduler(tenant_weights={"a": 0})
+
+    @pytest.mark.asyncio
+    async def test_priority_classes_are_strict(self):
+        scheduler = RequestScheduler(1)
+        order = await _admission_order(
+            scheduler,
+            [("batch", "a"), ("batch", "b"), ("interactive", "c"), ("interactive", "a")],
+        )
+        assert order == [2, 3, 0, 1]
+
+    @pytest.mark.asyncio
+    async def test_tenants_share_a_class(self):
+        scheduler = RequestScheduler(1)
+        # A flood from tenant "a" does not hold back tenant "b"
+        order = await _admission_order(scheduler, [(None, "a")] * 4 + [(None, "b")] * 2)
+        assert order == [0, 4, 1, 5, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_tenant_weights(self):
+        scheduler = RequestScheduler(1, tenant_weights={"a": 2.0})
+        order = await _admission_order(scheduler, [(None, "a")] * 4 + [(None, "b")] * 2)
+        assert order == [0, 1, 4, 2, 3, 5]
+
+    @pytest.mark.asyncio
+    async def test_unknown_priority(self):
+        scheduler = RequestScheduler()
+        with pytest.raises(ValueError):
+            await scheduler._acquire("realtime", None)
+
+    @pytest.mark.asyncio
+    async def test_queue_full_and_timeout(self):
+        scheduler = RequestScheduler(1, max_queue=1, queue_timeout=0.02)
+        await scheduler._acquire(None, None)
+        waiter = asyncio.ensure_future(scheduler._acquire(None, None))
+        await asyncio.sleep(0)
+        with pytest.raises(VLLMGrpcOverloadedError):
+            await scheduler._acquire(None, None)
+        with pytest.raises(VLLMGrpcOverloadedError):
+            await waiter
+        stats = scheduler.stats
+        assert (stats.rejected, stats.timed_out, stats.in_flight) == (1, 1, 1)
+        assert stats.queued == {"interactive": 0, "batch": 0}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_its_place(self):
+        scheduler = RequestScheduler(1)
+        await scheduler._acquire(None, None)
+        first = asyncio.ensure_future(scheduler._acquire(None, "a"))
+        second = asyncio.ensure_future(scheduler._acquire(None, "b"))
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth("batch") == 2
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        scheduler._release()
+        await second
+        assert (scheduler.in_flight, scheduler.queue_depth("batch")) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_stats_and_listener(self):
+        scheduler = RequestScheduler(1)
+        waits = []
+        scheduler.add_listener(lambda priority, wait: waits.append((priority, wait)))
+        await _admission_order(scheduler, [("interactive", "a")])
+        stats = scheduler.stats
+        assert stats.admitted == {"interactive": 1, "batch": 1}
+        assert stats.wait["interactive"]["count"] == 1
+        assert [priority for priority, _ in waits] == ["batch", "interactive"]
+        assert waits[1][1] > 0
+
+    @pytest.mark.asyncio
+    async def test_raising_listener_keeps_the_slot(self):
+        scheduler = RequestScheduler(1)
+
+        def listener(priority, wait):
+            raise RuntimeError("observer failed")
+
+        scheduler.add_listener(listener)
+        await scheduler._acquire(None, None)
+        assert scheduler.in_flight == 1
+        scheduler._release()
+        assert scheduler.in_flight == 0
+
+
+class TestAsyncClientScheduler:
+    """Tests for the scheduler in front of AsyncCompletions.create."""
+
+    @pytest.mark.asyncio
+    async def test_caps_in_flight_requests(self, slow_server):
+        scheduler = RequestScheduler(2)
+        async with slow_server.async_client(scheduler=scheduler) as client:
+            assert client.scheduler is scheduler
+            completions = await asyncio.gather(
+                *[client.completions.create(prompt="x", tenant=str(i)) for i in range(6)]
+            )
+        assert all(c.usage.completion_tokens == 2 for c in completions)
+        stats = scheduler.stats
+        assert (stats.in_flight, stats.admitted["batch"]) == (0, 6)
+        assert stats.wait["batch"]["max"] >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_interactive_overtakes_batch(self, slow_server):
+        scheduler = RequestScheduler(1)
+        finished = []
+
+        async def create(priority):
+            await client.completions.create(prompt="x", priority=priority)
+            finished.append(priority)
+
+        async with slow_server.async_client(scheduler=scheduler) as client:
+            tasks = [asyncio.ensure_future(create("batch")) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            tasks.append(asyncio.ensure_future(create("interactive")))
+            await asyncio.gather(*tasks)
+        assert finished == ["batch", "interactive", "batch", "batch"]
+
+    @pytest.mark.asyncio
+    async def test_stream_holds_its_slot(self, slow_server):
+        scheduler = RequestScheduler(1)
+        async with slow_server.async_client(scheduler=scheduler) as client:
+            stream = await client.completions.create(prompt="x", stream=True)
+            assert scheduler.in_flight == 1
+            async for _ in stream:
+                pass
+            assert scheduler.in_flight == 0
+
+            stream = await client.completions.create(prompt="x", stream=True)
+            await stream.aclose()
+            assert scheduler.in_flight == 0
+
+            stream = await client.completions.create(prompt="x", stream=True)
+            del stream
+            gc.collect()
+            assert await _wait_for(lambda: scheduler.in_flight == 0)
+
+    @pytest.mark.asyncio
+    async def test_failed_request_releases(self, slow_server):
+        scheduler = RequestScheduler(1)
+        slow_server.fail_next(1)
+        async with slow_server.async_client(scheduler=scheduler) as client:
+            with pytest.raises(Exception):
+                await client.completions.create(prompt="x")
+            assert scheduler.in_flight == 0
+            completion = await client.completions.create(prompt="x")
+        assert completion.usage.completion_tokens == 2
+
+    @pytest.mark.asyncio
+    async def test_metrics(self, slow_server):
+        metrics = ClientMetrics()
+        scheduler = RequestScheduler(1)
+        async with slow_server.async_client(scheduler=scheduler, metrics=metrics) as client:
+            await asyncio.gather(
+                client.completions.create(prompt="x", priority="interactive"),
+                client.completions.create(prompt="x"),
+            )
+        text = metrics.registry.render()
+        assert 'vllm_grpc_client_scheduler_queued{priority="batch"} 0' in text
+        assert 'vllm_grpc_client_scheduler_wait_seconds_count{priority="interactive"} 1' in text
+        assert 'vllm_grpc_client_scheduler_wait_seconds_count{priority="batch"} 1' in text
+
+
+@pytest.mark.asyncio
+async def test_load_balanced_client_shares_the_scheduler():
+    scheduler = RequestScheduler(1)
+    with FakeVllmServer(ttft=0.02) as first, FakeVllmServer(ttft=0.02) as second:
+        async with AsyncLoadBalancedClient(
+            [first.address, second.address], poll_interval=60, scheduler=scheduler
+        ) as client:
+            assert client.scheduler is scheduler
+            assert all(replica.client.scheduler is None for replica in client.replicas)
+            await asyncio.gather(
+                *[client.completions.create(prompt="x", max_tokens=2) for _ in range(4)]
+            )
+    stats = scheduler.stats
+    assert (stats.admitted["batch"], stats.in_flight) == (4, 0)
@@ -0,0 +1,206 @@
+"""
+Tests for in-flight de-duplication of identical completions.
+
+Runs against the in-process fake server, so no vLLM server is needed.
+
+Run with:
+    pytest tests/test_singleflight.py -v
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import grpc
+import pytest
+
+from vllm_grpc_client import (
+    AsyncLoadBalancedClient,
+    RateLimit,
+    RateLimiter,
+    SingleFlight,
+    VLLMGrpcError,
+)
+from vllm_grpc_client.testing import FakeVllmServer
+
+
+@pytest.fixture
+def server():
+    with FakeVllmServer(ttft=0.2, tokens_per_second=200, default_max_tokens=6) as fake:
+        yield fake
+
+
+class TestSyncSingleFlight:
+    """Tests for de-duplication in the sync client."""
+
+    def test_concurrent_requests_share_one_rpc(self, server):
+        flights = SingleFlight()
+        with server.client(singleflight=flights) as client:
+            assert client.singleflight is flights
+            with ThreadPoolExecutor(4) as pool:
+                completions = list(
+                    pool.map(
+                        lambda _: client.completions.create(prompt="Hello", temperature=0.0),
+                        range(4),
+                    )
+                )
+        assert server.requests_received == 1
+        assert len({tuple(c.choices[0].token_ids) for c in completions}) == 1
+        assert all(c.usage.completion_tokens == 6 for c in completions)
+        stats = flights.stats
+        assert (stats.calls, stats.joined, stats.in_flight) == (1, 3, 0)
+
+    def test_streams_share_the_chunks(self, server):
+        flights = SingleFlight()
+        with server.client(singleflight=flights) as client:
+
+            def read(_):
+                stream = client.completions.create(prompt="Hello", seed=3, stream=True)
+                return [chunk.choices[0].delta_token_ids for chunk in stream]
+
+            with ThreadPoolExecutor(3) as pool:
+                results = list(pool.map(read, range(3)))
+        assert server.requests_received == 1
+        assert results[0] == results[1] == results[2]
+        assert sum(len(ids) for ids in results[0]) == 6
+
+    def test_clients_of_other_servers_do_not_share(self, server):
+        flights = SingleFlight()
+        with FakeVllmServer(ttft=0.2, default_max_tokens=6) as other:
+            first = server.client(singleflight=flights)
+            second = other.client(singleflight=flights)
+            with first, second:
+                with ThreadPoolExecutor(4) as pool:
+                    list(
+                        pool.map(
+                            lambda client: client.completions.create(
+                                prompt="Hello", temperature=0.0
+                            ),
+                            [first, second, first, second],
+                        )
+                    )
+            assert (server.requests_received, other.requests_received) == (1, 1)
+        assert (flights.stats.calls, flights.stats.joined) == (2, 2)
+
+    def test_sampled_requests_are_not_shared(self, server):
+        flights = SingleFlight()
+        with server.client(singleflight=flights) as client:
+            with ThreadPoolExecutor(2) as pool:
+                list(pool.map(lambda _: client.completions.create(prompt="Hello"), range(2)))
+        assert server.requests_received == 2
+        assert flights.stats.calls == 0
+
+
+class TestAsyncSingleFlight:
+    """Tests for de-duplication in the async client."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_rpc(self, server):
+        flights = SingleFlight()
+        async with server.async_client(singleflight=flights) as client:
+            completions = await asyncio.gather(
+                *[client.completions.create(prompt="Hello", temperature=0.0) for _ in range(5)]
+            )
+            other = await client.completions.create(prompt="Goodbye, world", temperature=0.0)
+        assert server.requests_received == 2
+        assert len({tuple(c.choices[0].token_ids) for c in completions}) == 1
+        assert other.choices[0].token_ids != completions[0].choices[0].token_ids
+        assert (flights.stats.calls, flights.stats.joined) == (2, 4)
+
+    @pytest.mark.asyncio
+    async def test_late_stream_replays_from_the_start(self, server):
+        async with server.async_client(singleflight=SingleFlight()) as client:
+            first = await client.completions.create(prompt="Hello", temperature=0.0, stream=True)
+            first_ids = []
+            async for chunk in first:
+                first_ids.extend(chunk.choices[0].delta_token_ids)
+                if len(first_ids) == 3:
+                    late = await client.completions.create(
+                        prompt="Hello", temperature=0.0, stream=True
+                    )
+            late_ids = []
+            async for chunk in late:
+                late_ids.extend(chunk.choices[0].delta_token_ids)
+        assert late_ids == first_ids and len(first_ids) == 6
+        assert server.requests_received == 1
+        assert late.get_final_completion().usage.completion_tokens == 6
+
+    @pytest.mark.asyncio
+    async def test_closing_one_stream_keeps_the_shared_call(self, server):
+        async with server.async_client(singleflight=SingleFlight()) as client:
+            streams = [
+                await client.completions.create(prompt="Hello", temperature=0.0, stream=True)
+                for _ in range(2)
+            ]
+            async for _ in streams[0]:
+                break
+            await streams[0].aclose()
+            token_ids = []
+            async for chunk in streams[1]:
+                token_ids.extend(chunk.choices[0].delta_token_ids)
+        assert len(token_ids) == 6
+        assert not any(rid.endswith("-shared") for rid in server.aborted_request_ids)
+
+    @pytest.mark.asyncio
+    async def test_last_caller_leaving_aborts_the_call(self, server):
+        flights = SingleFlight()
+        async with server.async_client(singleflight=flights) as client:
+            tasks = [
+                asyncio.ensure_future(client.completions.create(prompt="Hello", temperature=0.0))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.05)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            assert flights.stats.in_flight == 0
+            await asyncio.sleep(0.2)
+        assert any(rid.endswith("-shared") for rid in server.aborted_request_ids)
+
+    def test_event_loops_do_not_share(self, server):
+        flights = SingleFlight()
+
+        async def run():
+            async with server.async_client(singleflight=flights) as client:
+                return await client.completions.create(prompt="Hello", temperature=0.0)
+
+        with ThreadPoolExecutor(2) as pool:
+            completions = list(pool.map(lambda _: asyncio.run(run()), range(2)))
+        assert server.requests_received == 2
+        assert completions[0].choices[0].token_ids == completions[1].choices[0].token_ids
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self, server):
+        server.fail_next(code=grpc.StatusCode.INTERNAL)
+        async with server.async_client(singleflight=SingleFlight()) as client:
+            results = await asyncio.gather(
+                *[client.completions.create(prompt="Hello", temperature=0.0) for _ in range(3)],
+                return_exceptions=True,
+            )
+        assert all(isinstance(result, VLLMGrpcError) for result in results)
+        assert server.requests_received == 1
+
+    @pytest.mark.asyncio
+    async def test_joined_requests_skip_the_rate_limiter(self, server):
+        limiter = RateLimiter(RateLimit(requests_per_second=1), block=False)
+        async with server.async_client(singleflight=SingleFlight(), rate_limiter=limiter) as client:
+            await asyncio.gather(
+                *[client.completions.create(prompt="Hello", temperature=0.0) for _ in range(3)]
+            )
+        assert limiter.stats.admitted == 1
+
+
+@pytest.mark.asyncio
+async def test_load_balanced_client_shares_calls_across_replicas():
+    flights = SingleFlight()
+    with FakeVllmServer(ttft=0.2) as first, FakeVllmServer(ttft=0.2) as second:
+        async with AsyncLoadBalancedClient(
+            [first.address, second.address], poll_interval=60, singleflight=flights
+        ) as client:
+            assert client.singleflight is flights
+            await asyncio.gather(
+                *[
+                    client.completions.create(prompt="x", max_tokens=2, temperature=0.0)
+                    for _ in range(4)
+                ]
+            )
+        assert first.requests_received + second.requests_received == 1
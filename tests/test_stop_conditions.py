@@ -0,0 +1,229 @@
+"""
+Tests for client-side stop conditions.
+
+Streams are fed protobuf responses whose token IDs are UTF-8 bytes, decoded
+by a byte-level fake tokenizer, so no server or model is needed.
+
+Run with:
+    pytest tests/test_stop_conditions.py -v
+"""
+
+import asyncio
+
+import pytest
+
+from vllm_grpc_client import (
+    AsyncGenerateStream,
+    GenerateStream,
+    IncrementalDecoder,
+    JsonStop,
+    RegexStop,
+    StopCondition,
+)
+from vllm_grpc_client.proto import vllm_engine_pb2
+
+
+class _ByteTokenizer:
+    def decode(self, token_ids, skip_special_tokens=True):
+        return bytes(token_ids).decode("utf-8", errors="replace")
+
+
+class _FakeCall:
+    """Sync stand-in for a gRPC streaming call."""
+
+    def __init__(self, responses):
+        self._responses = iter(responses)
+        self.cancelled = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.cancelled:
+            raise StopIteration
+        return next(self._responses)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class _FakeAsyncCall:
+    """Async stand-in for a gRPC streaming call that never finishes."""
+
+    def __init__(self, responses):
+        self._responses = list(responses)
+        self.cancelled = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._responses:
+            return self._responses.pop(0)
+        await asyncio.sleep(3600)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def _responses(*pieces, complete=True):
+    responses = [
+        vllm_engine_pb2.GenerateResponse(
+            chunk=vllm_engine_pb2.GenerateStreamChunk(
+                token_ids=list(piece.encode("utf-8")), prompt_tokens=4
+            )
+        )
+        for piece in pieces
+    ]
+    if complete:
+        responses.append(
+            vllm_engine_pb2.GenerateResponse(
+                complete=vllm_engine_pb2.GenerateComplete(finish_reason="length")
+            )
+        )
+    return responses
+
+
+def _stream(call, stop_conditions, aborted, **kwargs):
+    return GenerateStream(
+        call,
+        request_id="req-1",
+        on_abandon=aborted.append,
+        detokenizer=IncrementalDecoder(_ByteTokenizer()),
+        stop_conditions=stop_conditions,
+        **kwargs,
+    )
+
+
+class _RecordingStop(StopCondition):
+    """Records the text it is given and never stops."""
+
+    lookback = 3
+
+    def __init__(self):
+        self.texts = []
+
+    def check(self, text, start):
+        self.texts.append(text)
+        return None
+
+
+class TestStopConditions:
+    """Tests for the stop condition classes."""
+
+    def test_check_is_abstract(self):
+        with pytest.raises(TypeError):
+            StopCondition()
+
+    def test_regex(self):
+        condition = RegexStop(r"\d{3}")
+        assert condition.check("ab12", 2) is None
+        assert condition.check("ab1234", 4) == 5
+
+    def test_regex_lookback(self):
+        condition = RegexStop("abc", lookback=2)
+        assert condition.check("abcdef", 5) is None
+        assert condition.check("xxabc", 4) == 5
+
+    def test_json_object(self):
+        condition = JsonStop().fork()
+        text = 'Answer: {"a": [1, {"b": "}"}]'
+        assert condition.check(text, 0) is None
+        text += "} trailing"
+        assert condition.check(text, len(text) - 10) == len(text) - len(" trailing")
+
+    def test_json_escaped_quote(self):
+        condition = JsonStop()
+        assert condition.check('["a\\"]", 1]', 0) == 11
+
+    def test_fork_gives_independent_state(self):
+        shared = JsonStop()
+        first, second = shared.fork(), shared.fork()
+        assert first.check("{", 0) is None
+        assert second.check("}", 0) is None
+
+
+class TestStreamStop:
+    """Tests for streams ending on a stop condition."""
+
+    def test_regex_truncates_and_aborts(self):
+        aborted = []
+        call = _FakeCall(_responses("Hello ", "wor", "ld. Next", " sentence"))
+        stream = _stream(call, [RegexStop(r"world\.")], aborted)
+        chunks = list(stream)
+
+        assert [c.choices[0].delta_text for c in chunks] == ["Hello ", "wor", "ld."]
+        assert chunks[-1].choices[0].finish_reason == "stop"
+        assert call.cancelled
+        assert aborted == ["req-1"]
+        assert stream.text == "Hello world."
+        assert isinstance(stream.stopped_by, RegexStop)
+
+        final = stream.get_final_completion()
+        assert final.choices[0].text == "Hello world."
+        assert final.choices[0].finish_reason == "stop"
+        assert final.usage.completion_tokens == len("Hello world. Next")
+
+    def test_json_stop(self):
+        aborted = []
+        call = _FakeCall(_responses('{"x": ', '"y"}', "\n\nmore"))
+        stream = _stream(call, [JsonStop()], aborted)
+        list(stream)
+        assert stream.text == '{"x": "y"}'
+        assert aborted == ["req-1"]
+
+    def test_bounded_lookback_sees_only_the_tail(self):
+        aborted = []
+        condition = _RecordingStop()
+        call = _FakeCall(_responses("abcdef", "gh", "ijkl", "mn"))
+        stream = _stream(call, [condition, RegexStop("hij", lookback=3)], aborted)
+        chunks = list(stream)
+        assert condition.texts == ["abcdef", "defgh", "fghijkl"]
+        assert isinstance(stream.stopped_by, RegexStop)
+        assert chunks[-1].choices[0].delta_text == "ij"
+        assert stream.text == "abcdefghij"
+
+    def test_predicate(self):
+        aborted = []
+        call = _FakeCall(_responses("a", "b", "c"))
+        stream = _stream(call, [lambda text: len(text) >= 2], aborted)
+        assert len(list(stream)) == 2
+        assert stream.text == "ab"
+
+    def test_no_match_runs_to_completion(self):
+        aborted = []
+        call = _FakeCall(_responses("a", "b"))
+        stream = _stream(call, [RegexStop("z")], aborted)
+        chunks = list(stream)
+        assert chunks[-1].choices[0].finish_reason == "length"
+        assert stream.stopped_by is None
+        assert aborted == []
+
+    def test_raw_mode(self):
+        aborted = []
+        call = _FakeCall(_responses("x", "END", "y"))
+        stream = _stream(call, [RegexStop("END")], aborted, raw=True)
+        assert len(list(stream)) == 2
+        assert aborted == ["req-1"]
+        assert stream.get_final_completion().choices[0].text == "xEND"
+
+    def test_requires_detokenizer(self):
+        with pytest.raises(ValueError):
+            GenerateStream(_FakeCall([]), request_id="req-1", stop_conditions=[JsonStop()])
+
+    @pytest.mark.asyncio
+    async def test_async_stream(self):
+        aborted = []
+        call = _FakeAsyncCall(_responses("[1, ", "2]", " and", complete=False))
+        stream = AsyncGenerateStream(
+            call,
+            request_id="req-1",
+            on_abandon=aborted.append,
+            detokenizer=IncrementalDecoder(_ByteTokenizer()),
+            stop_conditions=[JsonStop()],
+        )
+        chunks = [chunk async for chunk in stream]
+        assert len(chunks) == 2
+        assert stream.text == "[1, 2]"
+        assert call.cancelled
+        assert aborted == ["req-1"]
@@ -0,0 +1,222 @@
+"""
+Tests for streaming response handling.
+
+Streams are fed pre-built protobuf responses, so no server is needed.
+
+Run with:
+    pytest tests/test_streaming.py -v
+"""
+
+import asyncio
+import gc
+
+import grpc
+import pytest
+
+from vllm_grpc_client import (
+    AsyncGenerateStream,
+    CompletionChunk,
+    GenerateStream,
+    VLLMGrpcTimeoutError,
+)
+from vllm_grpc_client.proto import vllm_engine_pb2
+
+
+def _responses():
+    return [
+        vllm_engine_pb2.GenerateResponse(
+            chunk=vllm_engine_pb2.GenerateStreamChunk(
+                token_ids=[1, 2], prompt_tokens=5, completion_tokens=2, cached_tokens=1
+            )
+        ),
+        vllm_engine_pb2.GenerateResponse(
+            chunk=vllm_engine_pb2.GenerateStreamChunk(
+                token_ids=[3], prompt_tokens=5, completion_tokens=3, cached_tokens=1
+            )
+        ),
+        vllm_engine_pb2.GenerateResponse(
+            complete=vllm_engine_pb2.GenerateComplete(
+                finish_reason="length", prompt_tokens=5, completion_tokens=3
+            )
+        ),
+    ]
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+class TestGenerateStream:
+    """Tests for GenerateStream."""
+
+    def test_chunks(self):
+        stream = GenerateStream(iter(_responses()), request_id="req-1")
+        chunks = list(stream)
+        assert all(isinstance(chunk, CompletionChunk) for chunk in chunks)
+        assert [c.choices[0].delta_token_ids for c in chunks] == [[1, 2], [3], []]
+        assert chunks[-1].choices[0].finish_reason == "length"
+
+        final = stream.get_final_completion()
+        assert final.choices[0].token_ids == [1, 2, 3]
+        assert final.usage.completion_tokens == 3
+        assert final.usage.cached_tokens == 1
+
+    def test_raw_yields_protobuf(self):
+        responses = _responses()
+        stream = GenerateStream(iter(responses), request_id="req-1", raw=True)
+        items = list(stream)
+        assert all(a is b for a, b in zip(items, responses))
+
+        default = GenerateStream(iter(_responses()), request_id="req-1")
+        list(default)
+        assert stream.get_final_completion() == default.get_final_completion()
+
+
+class TestAsyncGenerateStream:
+    """Tests for AsyncGenerateStream."""
+
+    @pytest.mark.asyncio
+    async def test_raw_yields_protobuf(self):
+        responses = _responses()
+        stream = AsyncGenerateStream(_aiter(responses), request_id="req-1", raw=True)
+        items = [item async for item in stream]
+        assert items == responses
+        assert stream.get_final_completion().choices[0].token_ids == [1, 2, 3]
+
+
+class _DeadlineExceeded(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.DEADLINE_EXCEEDED
+
+    def details(self):
+        return "Deadline Exceeded"
+
+
+class _FakeCall:
+    """Sync stand-in for a gRPC streaming call."""
+
+    def __init__(self, responses, error=None):
+        self._responses = iter(responses)
+        self._error = error
+        self.cancelled = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.cancelled:
+            raise StopIteration
+        try:
+            return next(self._responses)
+        except StopIteration:
+            if self._error is not None:
+                raise self._error
+            raise
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class _FakeAsyncCall:
+    """Async stand-in for a gRPC streaming call that never finishes."""
+
+    def __init__(self, responses):
+        self._responses = list(responses)
+        self.cancelled = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._responses:
+            return self._responses.pop(0)
+        await asyncio.sleep(3600)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TestStreamAbort:
+    """Tests for cancelling and aborting abandoned streams."""
+
+    def test_close_before_complete_aborts(self):
+        aborted = []
+        call = _FakeCall(_responses())
+        stream = GenerateStream(call, request_id="req-1", on_abandon=aborted.append)
+        with stream:
+            next(stream)
+        assert call.cancelled
+        assert aborted == ["req-1"]
+        assert stream.closed
+        assert list(stream) == []
+
+    def test_finished_stream_is_not_aborted(self):
+        aborted = []
+        call = _FakeCall(_responses())
+        with GenerateStream(call, request_id="req-1", on_abandon=aborted.append) as stream:
+            list(stream)
+        assert not call.cancelled
+        assert aborted == []
+
+    def test_garbage_collection_aborts(self):
+        aborted = []
+        stream = GenerateStream(
+            _FakeCall(_responses()), request_id="req-1", on_abandon=aborted.append
+        )
+        next(stream)
+        del stream
+        gc.collect()
+        assert aborted == ["req-1"]
+
+    def test_deadline_aborts(self):
+        aborted = []
+        call = _FakeCall(_responses()[:1], error=_DeadlineExceeded())
+        stream = GenerateStream(call, request_id="req-1", on_abandon=aborted.append)
+        with pytest.raises(VLLMGrpcTimeoutError):
+            list(stream)
+        assert aborted == ["req-1"]
+
+    @pytest.mark.asyncio
+    async def test_async_aclose_aborts(self):
+        aborted = []
+        call = _FakeAsyncCall(_responses()[:1])
+        stream = AsyncGenerateStream(call, request_id="req-1", on_abandon=aborted.append)
+        async with stream:
+            await stream.__anext__()
+        assert call.cancelled
+        assert aborted == ["req-1"]
+
+    @pytest.mark.asyncio
+    async def test_async_task_cancellation_aborts(self):
+        aborted = []
+        call = _FakeAsyncCall(_responses()[:1])
+        stream = AsyncGenerateStream(call, request_id="req-1", on_abandon=aborted.append)
+
+        async def consume():
+            async for _ in stream:
+                pass
+
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert call.cancelled
+        assert aborted == ["req-1"]
+
+    @pytest.mark.asyncio
+    async def test_async_garbage_collection_aborts(self):
+        aborted = []
+        stream = AsyncGenerateStream(
+            _FakeAsyncCall(_responses()), request_id="req-1", on_abandon=aborted.append
+        )
+        await stream.__anext__()
+        del stream
+        gc.collect()
+        await asyncio.sleep(0)
+        assert aborted == ["req-1"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,132 @@
+"""
+Tests for the in-process fake vLLM server.
+
+Run with:
+    pytest tests/test_testing.py -v
+"""
+
+import os
+import tempfile
+import time
+
+import grpc
+import pytest
+
+from vllm_grpc_client import VLLMGrpcInvalidArgumentError, VLLMGrpcUnavailableError
+from vllm_grpc_client.testing import FakeVllmServer
+
+
+@pytest.fixture
+def server():
+    with FakeVllmServer() as fake:
+        yield fake
+
+
+class TestFakeVllmServer:
+    """Tests for FakeVllmServer."""
+
+    def test_completion(self, server):
+        with server.client() as client:
+            completion = client.completions.create(prompt=[1, 2, 3], max_tokens=5)
+        choice = completion.choices[0]
+        assert choice.token_ids == [3, 4, 5, 6, 7]
+        assert choice.finish_reason == "length"
+        assert completion.usage.prompt_tokens == 3
+        assert completion.usage.completion_tokens == 5
+        assert server.requests_received == 1
+
+    def test_stream_chunk_size(self):
+        with FakeVllmServer(chunk_size=4, default_max_tokens=10) as server:
+            with server.client() as client:
+                chunks = list(client.completions.create(prompt="abcdefgh", stream=True))
+        assert [len(c.choices[0].delta_token_ids) for c in chunks[:-1]] == [4, 4, 2]
+        final = chunks[-1]
+        assert final.choices[0].finish_reason == "length"
+
+    def test_pacing(self):
+        with FakeVllmServer(ttft=0.05, tokens_per_second=200) as server:
+            with server.client() as client:
+                completion = client.completions.create(prompt="x", max_tokens=11)
+        assert completion.timing.ttft >= 0.05
+        # 10 tokens after the first at 200 tokens/s
+        assert completion.timing.e2e_latency >= 0.05 + 0.05
+
+    def test_active_requests_and_abort(self):
+        with FakeVllmServer(tokens_per_second=20) as server:
+            with server.client() as client:
+                stream = client.completions.create(prompt="x", max_tokens=1000, stream=True)
+                next(stream)
+                assert server.active_requests == 1
+                assert client.health.server_info().active_requests == 1
+                client.health.abort([stream.request_id])
+                chunks = list(stream)
+                assert chunks[-1].choices[0].finish_reason == "abort"
+            assert stream.request_id in server.aborted_request_ids
+            assert server.active_requests == 0
+
+    def test_client_cancel_releases_request(self):
+        with FakeVllmServer(ttft=10) as server:
+            with server.client() as client:
+                stream = client.completions.create(prompt="x", stream=True)
+                deadline = time.monotonic() + 5
+                while server.active_requests == 0 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                stream.close()
+                while server.active_requests and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            assert server.active_requests == 0
+
+    def test_fail_next(self, server):
+        server.fail_next(1, grpc.StatusCode.INVALID_ARGUMENT)
+        with server.client() as client:
+            with pytest.raises(VLLMGrpcInvalidArgumentError):
+                client.completions.create(prompt="x")
+            assert client.completions.create(prompt="x").choices[0].finish_reason == "length"
+
+    def test_fail_mid_stream(self, server):
+        server.fail_next(1, grpc.StatusCode.UNAVAILABLE, after_tokens=3)
+        received = []
+        with server.client() as client:
+            with pytest.raises(VLLMGrpcUnavailableError):
+                for chunk in client.completions.create(prompt="x", stream=True):
+                    received.extend(chunk.choices[0].delta_token_ids)
+        assert len(received) == 3
+
+    def test_fail_next_spares_running_requests(self):
+        with FakeVllmServer(tokens_per_second=100) as server:
+            with server.client() as client:
+                stream = client.completions.create(prompt="x", max_tokens=5, stream=True)
+                next(stream)
+                server.fail_next(1, grpc.StatusCode.INVALID_ARGUMENT)
+                assert list(stream)[-1].choices[0].finish_reason == "length"
+                with pytest.raises(VLLMGrpcInvalidArgumentError):
+                    client.completions.create(prompt="x")
+
+    def test_error_rate(self):
+        with FakeVllmServer(error_rate=1.0) as server:
+            with server.client() as client:
+                with pytest.raises(VLLMGrpcUnavailableError):
+                    client.completions.create(prompt="x")
+                assert client.health.check().healthy
+
+    def test_model_info_and_health(self, server):
+        server.healthy = False
+        with server.client() as client:
+            assert client.models.retrieve().model_path == "fake-model"
+            assert not client.health.check().healthy
+
+    def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "vllm.sock")
+            with FakeVllmServer(unix_socket=path) as server:
+                assert server.address == f"unix:{path}"
+                with server.client() as client:
+                    completion = client.completions.create(prompt="x", max_tokens=2)
+        assert len(completion.choices[0].token_ids) == 2
+
+    @pytest.mark.asyncio
+    async def test_async_client(self, server):
+        async with server.async_client() as client:
+            stream = await client.completions.create(prompt="x", max_tokens=3, stream=True)
+            chunks = [chunk async for chunk in stream]
+        assert len(chunks) == 4
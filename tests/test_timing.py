@@ -0,0 +1,130 @@
+"""
+Tests for per-request timing and the client-level timing aggregator.
+
+Run with:
+    pytest tests/test_timing.py -v
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from vllm_grpc_client import (
+    Completion,
+    GenerateStream,
+    LatencyHistogram,
+    RequestTiming,
+    TimingStats,
+)
+from vllm_grpc_client.proto import vllm_engine_pb2
+from vllm_grpc_client.resources.completions import Completions
+
+
+def _responses():
+    return [
+        vllm_engine_pb2.GenerateResponse(
+            chunk=vllm_engine_pb2.GenerateStreamChunk(token_ids=[1, 2], prompt_tokens=3)
+        ),
+        vllm_engine_pb2.GenerateResponse(
+            chunk=vllm_engine_pb2.GenerateStreamChunk(token_ids=[3], prompt_tokens=3)
+        ),
+        vllm_engine_pb2.GenerateResponse(
+            complete=vllm_engine_pb2.GenerateComplete(
+                finish_reason="stop", prompt_tokens=3, completion_tokens=3
+            )
+        ),
+    ]
+
+
+class TestRequestTiming:
+    """Tests for RequestTiming."""
+
+    def test_derived_latencies(self):
+        timing = RequestTiming(enqueue_time=10.0)
+        timing.rpc_start_time = 10.5
+        timing.first_chunk_time = 11.0
+        timing.chunk_times = [11.0, 11.25, 12.0]
+        timing.complete_time = 13.0
+        timing.output_tokens = 5
+
+        assert timing.queueing_delay == 0.5
+        assert timing.ttft == 1.0
+        assert timing.tpot == 0.5
+        assert timing.e2e_latency == 3.0
+        assert timing.tokens_per_second == pytest.approx(5 / 3)
+        assert timing.inter_chunk_latencies == [0.25, 0.75]
+
+    def test_unfinished(self):
+        timing = RequestTiming()
+        assert timing.ttft is None
+        assert timing.tpot is None
+        assert timing.tokens_per_second is None
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_quantiles(self):
+        histogram = LatencyHistogram()
+        for i in range(1, 1001):
+            histogram.record(i / 1000)
+        assert histogram.count == 1000
+        assert histogram.mean == pytest.approx(0.5005)
+        assert histogram.quantile(0.5) == pytest.approx(0.5, rel=0.05)
+        assert histogram.quantile(0.9) == pytest.approx(0.9, rel=0.05)
+        assert histogram.quantile(0.99) == pytest.approx(0.99, rel=0.05)
+        assert histogram.quantile(1.0) == 1.0
+
+    def test_empty_and_extremes(self):
+        histogram = LatencyHistogram()
+        assert histogram.quantile(0.99) == 0.0
+        histogram.record(0.0)
+        histogram.record(1e12)
+        assert histogram.quantile(0.0) == 0.0
+        assert histogram.quantile(1.0) == 1e12
+
+
+class TestTimingCollection:
+    """Tests for timings recorded by streams and completions."""
+
+    def test_stream_records_timing(self):
+        stats = TimingStats()
+        stream = GenerateStream(iter(_responses()), request_id="req-1", timing_stats=stats)
+        list(stream)
+
+        timing = stream.timing
+        assert len(timing.chunk_times) == 3
+        assert timing.output_tokens == 3
+        assert timing.ttft is not None and timing.tpot is not None
+        assert stream.get_final_completion().timing is timing
+        assert stats.snapshot()["ttft"]["count"] == 1
+
+    def test_create_records_timing(self):
+        stats = TimingStats()
+        client = SimpleNamespace(
+            _stub=SimpleNamespace(Generate=lambda request, timeout=None: iter(_responses())),
+            _timeout=1.0,
+            _model_name="",
+            _fast_types=False,
+            _timing_stats=stats,
+        )
+        completion = Completions(client).create(prompt="Hi")
+
+        timing = completion.timing
+        assert timing.rpc_start_time >= timing.enqueue_time
+        assert timing.queueing_delay is not None
+        assert timing.output_tokens == 3
+        snapshot = stats.snapshot()
+        assert set(snapshot) == set(TimingStats.METRICS)
+        assert snapshot["tpot"]["count"] == 1
+        assert set(snapshot["ttft"]) == {"count", "mean", "p50", "p90", "p99", "max"}
+
+        stats.reset()
+        assert stats.snapshot()["ttft"]["count"] == 0
+
+    def test_timing_is_not_part_of_the_result(self):
+        first = Completion(id="a", created=1, timing=RequestTiming())
+        second = Completion(id="a", created=1, timing=RequestTiming())
+        assert first == second
+        assert "timing" not in first.model_dump()
+        assert "timing" not in repr(first)